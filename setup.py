@@ -192,10 +192,22 @@ extensions = [
         extra_compile_args=ssw_extra_compile_args,
         include_dirs=[np.get_include()],
     ),
+    Extension(
+        "skbio.alignment._cutils",
+        ["skbio/alignment/_cutils" + ext],
+    ),
+    Extension(
+        "skbio.diversity._cutils",
+        ["skbio/diversity/_cutils" + ext],
+        extra_compile_args=stats_extra_compile_args,
+        extra_link_args=stats_extra_link_args,
+    ),
     Extension(
         "skbio.diversity._phylogenetic",
         ["skbio/diversity/_phylogenetic" + ext],
         include_dirs=[np.get_include()],
+        extra_compile_args=stats_extra_compile_args,
+        extra_link_args=stats_extra_link_args,
     ),
     Extension(
         "skbio.stats.ordination._cutils",
@@ -231,7 +243,7 @@ setup(
     packages=find_packages(),
     ext_modules=extensions,
     include_dirs=[np.get_include()],
-    tests_require=["pytest", "coverage"],
+    tests_require=["pytest", "coverage", "hdmedians >= 0.14.1"],
     install_requires=[
         "requests >= 2.20.0",
         "decorator >= 3.4.2",
@@ -240,7 +252,6 @@ setup(
         "pandas >= 1.5.0",
         "scipy >= 1.9.0",
         "h5py >= 3.6.0",
-        "hdmedians >= 0.14.1",
     ],
     classifiers=classifiers,
     package_data={
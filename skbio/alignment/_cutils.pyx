@@ -0,0 +1,441 @@
+# -----------------------------------------------------------------------------
+#  Copyright (c) 2013--, scikit-bio development team.
+#
+#  Distributed under the terms of the Modified BSD License.
+#
+#  The full license is in the file LICENSE.txt, distributed with this software.
+# -----------------------------------------------------------------------------
+
+import numpy as np
+cimport cython
+from libc.math cimport INFINITY
+from libc.stdint cimport int8_t, uint8_t
+
+# Traceback encoding. Must be consistent with
+# skbio.alignment._pairwise._traceback_encoding.
+cdef int8_t _AEND = 0
+cdef int8_t _MATCH = 1
+cdef int8_t _VGAP = 2
+cdef int8_t _HGAP = 3
+
+# Additional flags of the Gotoh traceback matrix, indicating whether a
+# horizontal (E) or vertical (F) gap at a cell extends an existing gap.
+cdef uint8_t _EEXT = 4
+cdef uint8_t _FEXT = 8
+
+
+cdef inline Py_ssize_t _band_offset(Py_ssize_t row,
+                                    Py_ssize_t band_lo) noexcept nogil:
+    """Column of the first cell of a row stored in a banded matrix."""
+    return row + band_lo if row + band_lo > 0 else 0
+
+
+cdef _band_limits(object band, Py_ssize_t n_rows, Py_ssize_t n_cols):
+    """Convert a band (or None) into the diagonals and width it spans."""
+    cdef Py_ssize_t band_lo, band_hi
+    if band is None:
+        band_lo, band_hi = 1 - n_rows, n_cols - 1
+    else:
+        band_lo, band_hi = band
+        band_lo = max(band_lo, 1 - n_rows)
+        band_hi = min(band_hi, n_cols - 1)
+    return band_lo, band_hi, min(n_cols, band_hi - band_lo + 1)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef double _gotoh_core(
+        Py_ssize_t[::1] idx1, Py_ssize_t[::1] idx2, double[:, ::1] lookup,
+        double gap_open_penalty, double gap_extend_penalty, bint local,
+        bint free_top, bint free_bottom, bint free_left, bint free_right,
+        bint start_vgap, Py_ssize_t band_lo, Py_ssize_t band_hi,
+        double[::1] h_row, double[::1] h_buf, double[::1] f_row,
+        uint8_t[:, ::1] tb, bint traceback,
+        Py_ssize_t* best_row, Py_ssize_t* best_col) noexcept nogil:
+    """Perform the three-state affine gap (Gotoh) recursion.
+
+    Three scores are maintained for every cell: H (best alignment ending at
+    the cell), E (best alignment ending with a gap in aln2, i.e., a
+    horizontal move) and F (best alignment ending with a gap in aln1, i.e.,
+    a vertical move). Only two rows of H and one row of F are kept in
+    memory. Upon return, h_row and f_row contain the last row of H and F.
+
+    Gap costs of the first and last rows and columns may be waived (free_*)
+    to leave terminal gaps unpenalized. If start_vgap is set, the alignment
+    is considered to start within a vertical gap, i.e., a vertical move out
+    of the first cell costs gap_extend_penalty rather than
+    gap_open_penalty.
+
+    Only cells whose diagonal (col - row) is within band_lo and band_hi are
+    computed; the others are unreachable. Row i of the traceback matrix
+    stores the band of the row, starting from column
+    _band_offset(i, band_lo).
+
+    Returns the score of the best local alignment (and its end cell in
+    best_row and best_col), or of the global alignment ending in the last
+    cell (the caller may alternatively read f_row).
+    """
+    cdef Py_ssize_t n_rows = idx2.shape[0] + 1
+    cdef Py_ssize_t n_cols = idx1.shape[0] + 1
+    cdef Py_ssize_t last_row = n_rows - 1
+    cdef Py_ssize_t last_col = n_cols - 1
+
+    cdef double neg_inf = -INFINITY
+    cdef double new_score = 0.0 if local else neg_inf
+    cdef double* h_prev = &h_row[0]
+    cdef double* h_curr = &h_buf[0]
+    cdef double* h_tmp
+
+    cdef Py_ssize_t row, col, sub_row, first_col, end_col, offset
+    cdef double h, e, f, score, best_score
+    cdef double row_open, row_extend, col_open, col_extend
+    cdef uint8_t flags
+
+    for col in range(n_cols):
+        h_prev[col] = neg_inf
+        h_curr[col] = neg_inf
+        f_row[col] = neg_inf
+
+    # first row
+    end_col = min(last_col, band_hi)
+    h_prev[0] = 0.0
+    f_row[0] = 0.0 if start_vgap else neg_inf
+    if traceback:
+        tb[0, 0] = _AEND
+    if (free_top or (last_row == 0 and free_bottom)) and not local:
+        row_open = row_extend = 0.0
+    else:
+        row_open = gap_open_penalty
+        row_extend = gap_extend_penalty
+    e = neg_inf
+    for col in range(1, end_col + 1):
+        if local:
+            h_prev[col] = 0.0
+            if traceback:
+                tb[0, col] = _AEND
+        else:
+            flags = _HGAP
+            score = e - row_extend
+            e = h_prev[col - 1] - row_open
+            if score >= e:
+                e = score
+                flags |= _EEXT
+            h_prev[col] = e
+            if traceback:
+                tb[0, col] = flags
+    best_score = 0.0 if local else h_prev[last_col]
+    best_row[0] = 0
+    best_col[0] = 0 if local else last_col
+
+    for row in range(1, n_rows):
+        sub_row = idx2[row - 1]
+        offset = _band_offset(row, band_lo)
+        end_col = min(last_col, row + band_hi)
+
+        # horizontal gaps in the first and last rows may be free
+        if row == last_row and free_bottom and not local:
+            row_open = row_extend = 0.0
+        else:
+            row_open = gap_open_penalty
+            row_extend = gap_extend_penalty
+
+        if offset == 0:
+            # first column
+            first_col = 1
+            if local:
+                h_curr[0] = 0.0
+                if traceback:
+                    tb[row, 0] = _AEND
+            else:
+                if ((free_left or (last_col == 0 and free_right))):
+                    col_open = col_extend = 0.0
+                else:
+                    col_open = gap_open_penalty
+                    col_extend = gap_extend_penalty
+                flags = _VGAP
+                score = f_row[0] - col_extend
+                f = h_prev[0] - col_open
+                if score >= f:
+                    f = score
+                    flags |= _FEXT
+                f_row[0] = f
+                h_curr[0] = f
+                if traceback:
+                    tb[row, 0] = flags
+        else:
+            # the cell left of the band is unreachable
+            first_col = offset
+            h_curr[offset - 1] = neg_inf
+        e = neg_inf
+
+        for col in range(first_col, end_col + 1):
+            flags = 0
+
+            # E: horizontal gap, extended (preferred in case of a tie) or
+            # opened
+            score = e - row_extend
+            e = h_curr[col - 1] - row_open
+            if score >= e:
+                e = score
+                flags |= _EEXT
+
+            # F: vertical gap, extended (preferred in case of a tie) or
+            # opened; vertical gaps in the last column may be free
+            if col == last_col and free_right and not local:
+                col_open = col_extend = 0.0
+            else:
+                col_open = gap_open_penalty
+                col_extend = gap_extend_penalty
+            score = f_row[col] - col_extend
+            f = h_prev[col] - col_open
+            if score >= f:
+                f = score
+                flags |= _FEXT
+            f_row[col] = f
+
+            # H: first largest of new alignment, horizontal gap, match and
+            # vertical gap
+            h = new_score
+            if e > h:
+                h = e
+                flags |= _HGAP
+            score = h_prev[col - 1] + lookup[sub_row, idx1[col - 1]]
+            if score > h:
+                h = score
+                flags = (flags & ~3) | _MATCH
+            if f > h:
+                h = f
+                flags = (flags & ~3) | _VGAP
+
+            h_curr[col] = h
+            if traceback:
+                tb[row, col - offset] = flags
+
+            if local and h > best_score:
+                best_score = h
+                best_row[0] = row
+                best_col[0] = col
+
+        # the cell right of the band is unreachable from the next row
+        if end_col < last_col:
+            h_curr[end_col + 1] = neg_inf
+            f_row[end_col + 1] = neg_inf
+
+        h_tmp = h_prev
+        h_prev = h_curr
+        h_curr = h_tmp
+
+    if not local:
+        best_score = h_prev[last_col]
+        best_row[0] = last_row
+
+    # make sure the last row of H is in h_row
+    if n_rows % 2 == 0:
+        for col in range(n_cols):
+            h_row[col] = h_prev[col]
+
+    return best_score
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _gotoh_fill_cy(Py_ssize_t[::1] idx1, Py_ssize_t[::1] idx2,
+                   double[:, ::1] lookup, double gap_open_penalty,
+                   double gap_extend_penalty, bint local,
+                   bint free_top=False, bint free_bottom=False,
+                   bint free_left=False, bint free_right=False,
+                   bint start_vgap=False, bint end_vgap=False, band=None):
+    """
+    Fill a traceback matrix using the three-state affine gap (Gotoh) recursion.
+
+    A gap of length L costs gap_open_penalty + (L - 1) * gap_extend_penalty.
+
+    Parameters
+    ----------
+    idx1 : 1D array_like
+        Substitution lookup indices of the positions of aln1 (columns).
+    idx2 : 1D array_like
+        Substitution lookup indices of the positions of aln2 (rows).
+    lookup : 2D array_like
+        Substitution scores, in which cell (idx2[i], idx1[j]) is the score of
+        aligning position i of aln2 against position j of aln1.
+    gap_open_penalty : double
+        Penalty for opening a gap.
+    gap_extend_penalty : double
+        Penalty for extending a gap.
+    local : bool
+        Perform local (Smith-Waterman) instead of global alignment.
+    free_top, free_bottom : bool, optional
+        Whether horizontal gaps in the first or last row are free (global
+        alignment only).
+    free_left, free_right : bool, optional
+        Whether vertical gaps in the first or last column are free (global
+        alignment only).
+    start_vgap : bool, optional
+        Whether the alignment starts within a vertical gap (global alignment
+        only).
+    end_vgap : bool, optional
+        Whether the alignment must end with a vertical gap (global alignment
+        only).
+    band : tuple of int, optional
+        Lowest and highest diagonal (col - row) of the cells to compute. For
+        global alignment, it must include diagonals 0 and len1 - len2.
+
+    Returns
+    -------
+    2D np.ndarray of uint8
+        Traceback matrix of shape (len2 + 1, width), where width is the
+        number of cells per row within the band. The lowest two bits encode
+        the origin of H (see _traceback_encoding), bit 2 is set if E extends
+        an existing horizontal gap, and bit 3 is set if F extends an existing
+        vertical gap.
+    float
+        Alignment score.
+    int
+        Row of the cell where the alignment ends.
+    int
+        Column of the cell where the alignment ends.
+    """
+    cdef Py_ssize_t n_rows = idx2.shape[0] + 1
+    cdef Py_ssize_t n_cols = idx1.shape[0] + 1
+    cdef Py_ssize_t band_lo, band_hi, width
+    band_lo, band_hi, width = _band_limits(band, n_rows, n_cols)
+    tback = np.empty((n_rows, width), dtype=np.uint8)
+    cdef uint8_t[:, ::1] tb = tback
+    cdef double[::1] h_row = np.empty(n_cols)
+    cdef double[::1] h_buf = np.empty(n_cols)
+    cdef double[::1] f_row = np.empty(n_cols)
+    cdef Py_ssize_t best_row, best_col
+    cdef double score
+
+    with nogil:
+        score = _gotoh_core(idx1, idx2, lookup, gap_open_penalty,
+                            gap_extend_penalty, local, free_top, free_bottom,
+                            free_left, free_right, start_vgap, band_lo,
+                            band_hi, h_row, h_buf, f_row, tb, True,
+                            &best_row, &best_col)
+    if end_vgap:
+        score = f_row[n_cols - 1]
+    return tback, score, best_row, best_col
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _gotoh_score_cy(Py_ssize_t[::1] idx1, Py_ssize_t[::1] idx2,
+                    double[:, ::1] lookup, double gap_open_penalty,
+                    double gap_extend_penalty, bint local,
+                    bint free_top=False, bint free_bottom=False,
+                    bint free_left=False, bint free_right=False,
+                    bint start_vgap=False, band=None):
+    """
+    Compute the last rows of H and F of the Gotoh recursion.
+
+    This performs the same recursion as _gotoh_fill_cy without recording
+    traceback, therefore it only requires memory linear to the length of
+    aln1. Callers that only need the alignment score should pass the shorter
+    alignment as aln1 (which is permitted since the optimal score is
+    symmetric).
+
+    Parameters
+    ----------
+    See _gotoh_fill_cy.
+
+    Returns
+    -------
+    float
+        Alignment score.
+    1D np.ndarray of float
+        Last row of H, i.e., the best scores of alignments ending at each
+        cell of the last row.
+    1D np.ndarray of float
+        Last row of F, i.e., the best scores of alignments ending at each
+        cell of the last row with a vertical gap.
+    """
+    cdef Py_ssize_t n_rows = idx2.shape[0] + 1
+    cdef Py_ssize_t n_cols = idx1.shape[0] + 1
+    cdef Py_ssize_t band_lo, band_hi
+    band_lo, band_hi, _ = _band_limits(band, n_rows, n_cols)
+    h_arr = np.empty(n_cols)
+    f_arr = np.empty(n_cols)
+    cdef double[::1] h_row = h_arr
+    cdef double[::1] h_buf = np.empty(n_cols)
+    cdef double[::1] f_row = f_arr
+    cdef Py_ssize_t best_row, best_col
+    cdef double score
+
+    with nogil:
+        score = _gotoh_core(idx1, idx2, lookup, gap_open_penalty,
+                            gap_extend_penalty, local, free_top, free_bottom,
+                            free_left, free_right, start_vgap, band_lo,
+                            band_hi, h_row, h_buf, f_row, None, False,
+                            &best_row, &best_col)
+    return score, h_arr, f_arr
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _gotoh_traceback_cy(uint8_t[:, ::1] tb, Py_ssize_t end_row,
+                        Py_ssize_t end_col, bint end_vgap=False, band=None):
+    """
+    Trace back an optimal path through a Gotoh traceback matrix.
+
+    Parameters
+    ----------
+    tb : 2D array_like
+        Traceback matrix generated by _gotoh_fill_cy.
+    end_row : int
+        Row of the cell where the alignment ends.
+    end_col : int
+        Column of the cell where the alignment ends.
+    end_vgap : bool, optional
+        Whether the alignment ends with a vertical gap.
+    band : tuple of int, optional
+        Band passed to _gotoh_fill_cy.
+
+    Returns
+    -------
+    1D np.ndarray of int8
+        Path of the alignment from start to end, in which each element is
+        a move encoded as in _traceback_encoding (match, vertical gap or
+        horizontal gap).
+    int
+        Row of the cell where the alignment starts.
+    int
+        Column of the cell where the alignment starts.
+    """
+    cdef Py_ssize_t band_lo = -tb.shape[0] if band is None else band[0]
+    path = np.empty(end_row + end_col, dtype=np.int8)
+    cdef int8_t[::1] path_view = path
+    cdef Py_ssize_t row = end_row, col = end_col, n = 0
+    cdef uint8_t cell, direction
+    # 0: H, 1: E (horizontal gap), 2: F (vertical gap)
+    cdef int state = 2 if end_vgap else 0
+
+    with nogil:
+        while row > 0 or col > 0:
+            cell = tb[row, col - _band_offset(row, band_lo)]
+            if state == 0:
+                direction = cell & 3
+                if direction == _AEND:
+                    break
+                elif direction == _MATCH:
+                    path_view[n] = _MATCH
+                    n += 1
+                    row -= 1
+                    col -= 1
+                elif direction == _HGAP:
+                    state = 1
+                else:
+                    state = 2
+            elif state == 1:
+                path_view[n] = _HGAP
+                n += 1
+                state = 1 if cell & _EEXT else 0
+                col -= 1
+            else:
+                path_view[n] = _VGAP
+                n += 1
+                state = 2 if cell & _FEXT else 0
+                row -= 1
+
+    return path[:n][::-1].copy(), row, col
@@ -7,12 +7,16 @@
 # ----------------------------------------------------------------------------
 
 from warnings import warn
-from itertools import product
 
 import numpy as np
 
 from skbio.alignment import TabularMSA
 from skbio.alignment._ssw_wrapper import StripedSmithWaterman
+from skbio.alignment._cutils import (
+    _gotoh_fill_cy,
+    _gotoh_score_cy,
+    _gotoh_traceback_cy,
+)
 from skbio.sequence import DNA, RNA, Protein
 from skbio.sequence import GrammaredSequence
 from skbio.sequence import SubstitutionMatrix
@@ -29,6 +33,8 @@ def local_pairwise_align_nucleotide(
     match_score=2,
     mismatch_score=-3,
     substitution_matrix=None,
+    score_only=False,
+    band_width=None,
 ):
     """Locally align exactly two nucleotide seqs with Smith-Waterman.
 
@@ -51,10 +57,26 @@ def local_pairwise_align_nucleotide(
         The score to add for a mismatch between a pair of bases (this is
         added to the previous best alignment score, so is typically
         negative).
-    substitution_matrix: 2D dict (or similar)
+    substitution_matrix: 2D dict (or similar) or SubstitutionMatrix
         Lookup for substitution scores (these values are added to the
         previous best alignment score). If provided, this overrides
         ``match_score`` and ``mismatch_score``.
+    score_only : bool, optional
+        If ``True``, only compute the alignment score, which requires less time
+        and memory (linear to the length of the shorter sequence). ``None`` is
+        returned in place of the aligned sequences and start/end positions.
+    band_width : int, optional
+        If provided, restrict the alignment to a diagonal band of the dynamic
+        programming matrix, such that gaps may shift the sequences relative to
+        each other by up to ``band_width`` positions (in addition to the
+        difference between their lengths). This reduces time and memory from
+        proportional to the product of the sequence lengths to proportional
+        to their length times ``band_width``, which is suitable for closely
+        related sequences. If the alignment found reaches the edge of the
+        band, the band width is doubled and the alignment repeated. An
+        alignment lying entirely outside of the band cannot be found,
+        therefore ``band_width`` should not be smaller than the expected net
+        length of indels.
 
     Returns
     -------
@@ -98,13 +120,25 @@ def local_pairwise_align_nucleotide(
         ).to_dict()
 
     return local_pairwise_align(
-        seq1, seq2, gap_open_penalty, gap_extend_penalty, substitution_matrix
+        seq1,
+        seq2,
+        gap_open_penalty,
+        gap_extend_penalty,
+        substitution_matrix,
+        score_only=score_only,
+        band_width=band_width,
     )
 
 
 @experimental(as_of="0.4.0")
 def local_pairwise_align_protein(
-    seq1, seq2, gap_open_penalty=11, gap_extend_penalty=1, substitution_matrix=None
+    seq1,
+    seq2,
+    gap_open_penalty=11,
+    gap_extend_penalty=1,
+    substitution_matrix=None,
+    score_only=False,
+    band_width=None,
 ):
     """Locally align exactly two protein seqs with Smith-Waterman.
 
@@ -120,9 +154,25 @@ def local_pairwise_align_protein(
     gap_extend_penalty : int or float, optional
         Penalty for extending a gap (this is substracted from previous best
         alignment score, so is typically positive).
-    substitution_matrix: 2D dict (or similar), optional
+    substitution_matrix: 2D dict (or similar) or SubstitutionMatrix, optional
         Lookup for substitution scores (these values are added to the
         previous best alignment score); default is BLOSUM 50.
+    score_only : bool, optional
+        If ``True``, only compute the alignment score, which requires less time
+        and memory (linear to the length of the shorter sequence). ``None`` is
+        returned in place of the aligned sequences and start/end positions.
+    band_width : int, optional
+        If provided, restrict the alignment to a diagonal band of the dynamic
+        programming matrix, such that gaps may shift the sequences relative to
+        each other by up to ``band_width`` positions (in addition to the
+        difference between their lengths). This reduces time and memory from
+        proportional to the product of the sequence lengths to proportional
+        to their length times ``band_width``, which is suitable for closely
+        related sequences. If the alignment found reaches the edge of the
+        band, the band width is doubled and the alignment repeated. An
+        alignment lying entirely outside of the band cannot be found,
+        therefore ``band_width`` should not be smaller than the expected net
+        length of indels.
 
     Returns
     -------
@@ -167,13 +217,25 @@ def local_pairwise_align_protein(
         substitution_matrix = SubstitutionMatrix.by_name("BLOSUM50").to_dict()
 
     return local_pairwise_align(
-        seq1, seq2, gap_open_penalty, gap_extend_penalty, substitution_matrix
+        seq1,
+        seq2,
+        gap_open_penalty,
+        gap_extend_penalty,
+        substitution_matrix,
+        score_only=score_only,
+        band_width=band_width,
     )
 
 
 @experimental(as_of="0.4.0")
 def local_pairwise_align(
-    seq1, seq2, gap_open_penalty, gap_extend_penalty, substitution_matrix
+    seq1,
+    seq2,
+    gap_open_penalty,
+    gap_extend_penalty,
+    substitution_matrix,
+    score_only=False,
+    band_width=None,
 ):
     """Locally align exactly two seqs with Smith-Waterman.
 
@@ -189,9 +251,25 @@ def local_pairwise_align(
     gap_extend_penalty : int or float
         Penalty for extending a gap (this is substracted from previous best
         alignment score, so is typically positive).
-    substitution_matrix: 2D dict (or similar)
+    substitution_matrix: 2D dict (or similar) or SubstitutionMatrix
         Lookup for substitution scores (these values are added to the
         previous best alignment score).
+    score_only : bool, optional
+        If ``True``, only compute the alignment score, which requires less time
+        and memory (linear to the length of the shorter sequence). ``None`` is
+        returned in place of the aligned sequences and start/end positions.
+    band_width : int, optional
+        If provided, restrict the alignment to a diagonal band of the dynamic
+        programming matrix, such that gaps may shift the sequences relative to
+        each other by up to ``band_width`` positions (in addition to the
+        difference between their lengths). This reduces time and memory from
+        proportional to the product of the sequence lengths to proportional
+        to their length times ``band_width``, which is suitable for closely
+        related sequences. If the alignment found reaches the edge of the
+        band, the band width is doubled and the alignment repeated. An
+        alignment lying entirely outside of the band cannot be found,
+        therefore ``band_width`` should not be smaller than the expected net
+        length of indels.
 
     Returns
     -------
@@ -215,18 +293,27 @@ def local_pairwise_align(
     This algorithm was originally described in [1]_. The scikit-bio
     implementation was validated against the EMBOSS water web server [2]_.
 
+    Affine gap penalties are computed exactly using the three-state dynamic
+    programming algorithm described in [3]_, i.e., a gap of length L costs
+    ``gap_open_penalty + (L - 1) * gap_extend_penalty``. Substitution scores
+    of all pairs of positions are precomputed from the integer-encoded
+    sequences, and the dynamic programming is performed by a compiled routine.
+
     References
     ----------
     .. [1] Identification of common molecular subsequences.
        Smith TF, Waterman MS.
        J Mol Biol. 1981 Mar 25;147(1):195-7.
     .. [2] http://www.ebi.ac.uk/Tools/psa/emboss_water/
+    .. [3] An improved algorithm for matching biological sequences.
+       Gotoh O.
+       J Mol Biol. 1982 Dec 15;162(3):705-8.
 
     """
     warn(
-        "You're using skbio's python implementation of Smith-Waterman "
-        "alignment. This will be very slow (e.g., thousands of times slower) "
-        "than skbio.alignment.local_pairwise_align_ssw.",
+        "You're using skbio's generic implementation of Smith-Waterman "
+        "alignment. This will be considerably slower than the SIMD-accelerated "
+        "skbio.alignment.local_pairwise_align_ssw.",
         EfficiencyWarning,
     )
 
@@ -243,35 +330,25 @@ def local_pairwise_align(
             % (type(seq1).__name__, type(seq2).__name__)
         )
 
+    if band_width is not None and not (int(band_width) == band_width >= 0):
+        raise ValueError(
+            "`band_width` must be a non-negative integer, not %r" % (band_width,)
+        )
+
     seq1 = _coerce_alignment_input_type(seq1)
     seq2 = _coerce_alignment_input_type(seq2)
 
-    score_matrix, traceback_matrix = _compute_score_and_traceback_matrices(
+    return _affine_align(
         seq1,
         seq2,
         gap_open_penalty,
         gap_extend_penalty,
         substitution_matrix,
-        new_alignment_score=0.0,
-        init_matrices_f=_init_matrices_sw,
-    )
-
-    end_row_position, end_col_position = np.unravel_index(
-        np.argmax(score_matrix), score_matrix.shape
+        local=True,
+        score_only=score_only,
+        band_width=band_width,
     )
 
-    aligned1, aligned2, score, seq1_start_position, seq2_start_position = _traceback(
-        traceback_matrix, score_matrix, seq1, seq2, end_row_position, end_col_position
-    )
-    start_end_positions = [
-        (seq1_start_position, end_col_position - 1),
-        (seq2_start_position, end_row_position - 1),
-    ]
-
-    msa = TabularMSA(aligned1 + aligned2)
-
-    return msa, score, start_end_positions
-
 
 @experimental(as_of="0.4.0")
 def global_pairwise_align_nucleotide(
@@ -283,6 +360,9 @@ def global_pairwise_align_nucleotide(
     mismatch_score=-2,
     substitution_matrix=None,
     penalize_terminal_gaps=False,
+    score_only=False,
+    memory="quadratic",
+    band_width=None,
 ):
     """Globally align nucleotide seqs or alignments with Needleman-Wunsch.
 
@@ -305,7 +385,7 @@ def global_pairwise_align_nucleotide(
         The score to add for a mismatch between a pair of bases (this is
         added to the previous best alignment score, so is typically
         negative).
-    substitution_matrix: 2D dict (or similar)
+    substitution_matrix: 2D dict (or similar) or SubstitutionMatrix
         Lookup for substitution scores (these values are added to the
         previous best alignment score). If provided, this overrides
         ``match_score`` and ``mismatch_score``.
@@ -316,6 +396,31 @@ def global_pairwise_align_nucleotide(
         the sequences being aligned are of different length. This is ``False``
         by default, which is very likely to be the behavior you want in all or
         nearly all cases.
+    score_only : bool, optional
+        If ``True``, only compute the alignment score, which requires less time
+        and memory (linear to the length of the shorter sequence). ``None`` is
+        returned in place of the aligned sequences and start/end positions.
+    memory : {"quadratic", "linear"}, optional
+        Memory model used to find the alignment. ``"quadratic"`` (default)
+        stores a traceback matrix of one byte per pair of positions.
+        ``"linear"`` finds the same optimal alignment score by divide and
+        conquer, at about twice the computation time but using memory linear
+        to the lengths of the sequences, which allows aligning long sequences
+        (e.g., whole genes or genomes). ``"linear"`` cannot be combined with
+        ``band_width``.
+    band_width : int, optional
+        If provided, restrict the alignment to a diagonal band of the dynamic
+        programming matrix, such that gaps may shift the sequences relative to
+        each other by up to ``band_width`` positions (in addition to the
+        difference between their lengths). This reduces time and memory from
+        proportional to the product of the sequence lengths to proportional
+        to their length times ``band_width``, which is suitable for closely
+        related sequences. If the alignment found reaches the edge of the
+        band, the band width is doubled and the alignment repeated. An
+        alignment lying entirely outside of the band cannot be found,
+        therefore ``band_width`` should not be smaller than the expected net
+        length of indels. Banded alignment keeps a traceback of the band in
+        memory, and cannot be combined with ``memory="linear"``.
 
     Returns
     -------
@@ -374,6 +479,9 @@ def global_pairwise_align_nucleotide(
         gap_extend_penalty,
         substitution_matrix,
         penalize_terminal_gaps=penalize_terminal_gaps,
+        score_only=score_only,
+        memory=memory,
+        band_width=band_width,
     )
 
 
@@ -385,6 +493,9 @@ def global_pairwise_align_protein(
     gap_extend_penalty=1,
     substitution_matrix=None,
     penalize_terminal_gaps=False,
+    score_only=False,
+    memory="quadratic",
+    band_width=None,
 ):
     """Globally align pair of protein seqs or alignments with Needleman-Wunsch.
 
@@ -400,7 +511,7 @@ def global_pairwise_align_protein(
     gap_extend_penalty : int or float, optional
         Penalty for extending a gap (this is substracted from previous best
         alignment score, so is typically positive).
-    substitution_matrix: 2D dict (or similar), optional
+    substitution_matrix: 2D dict (or similar) or SubstitutionMatrix, optional
         Lookup for substitution scores (these values are added to the
         previous best alignment score); default is BLOSUM 50.
     penalize_terminal_gaps: bool, optional
@@ -410,6 +521,31 @@ def global_pairwise_align_protein(
         the sequences being aligned are of different length. This is ``False``
         by default, which is very likely to be the behavior you want in all or
         nearly all cases.
+    score_only : bool, optional
+        If ``True``, only compute the alignment score, which requires less time
+        and memory (linear to the length of the shorter sequence). ``None`` is
+        returned in place of the aligned sequences and start/end positions.
+    memory : {"quadratic", "linear"}, optional
+        Memory model used to find the alignment. ``"quadratic"`` (default)
+        stores a traceback matrix of one byte per pair of positions.
+        ``"linear"`` finds the same optimal alignment score by divide and
+        conquer, at about twice the computation time but using memory linear
+        to the lengths of the sequences, which allows aligning long sequences
+        (e.g., whole genes or genomes). ``"linear"`` cannot be combined with
+        ``band_width``.
+    band_width : int, optional
+        If provided, restrict the alignment to a diagonal band of the dynamic
+        programming matrix, such that gaps may shift the sequences relative to
+        each other by up to ``band_width`` positions (in addition to the
+        difference between their lengths). This reduces time and memory from
+        proportional to the product of the sequence lengths to proportional
+        to their length times ``band_width``, which is suitable for closely
+        related sequences. If the alignment found reaches the edge of the
+        band, the band width is doubled and the alignment repeated. An
+        alignment lying entirely outside of the band cannot be found,
+        therefore ``band_width`` should not be smaller than the expected net
+        length of indels. Banded alignment keeps a traceback of the band in
+        memory, and cannot be combined with ``memory="linear"``.
 
     Returns
     -------
@@ -469,6 +605,9 @@ def global_pairwise_align_protein(
         gap_extend_penalty,
         substitution_matrix,
         penalize_terminal_gaps=penalize_terminal_gaps,
+        score_only=score_only,
+        memory=memory,
+        band_width=band_width,
     )
 
 
@@ -480,6 +619,9 @@ def global_pairwise_align(
     gap_extend_penalty,
     substitution_matrix,
     penalize_terminal_gaps=False,
+    score_only=False,
+    memory="quadratic",
+    band_width=None,
 ):
     """Globally align a pair of seqs or alignments with Needleman-Wunsch.
 
@@ -495,7 +637,7 @@ def global_pairwise_align(
     gap_extend_penalty : int or float
         Penalty for extending a gap (this is substracted from previous best
         alignment score, so is typically positive).
-    substitution_matrix: 2D dict (or similar)
+    substitution_matrix: 2D dict (or similar) or SubstitutionMatrix
         Lookup for substitution scores (these values are added to the
         previous best alignment score).
     penalize_terminal_gaps: bool, optional
@@ -505,6 +647,31 @@ def global_pairwise_align(
         the sequences being aligned are of different length. This is ``False``
         by default, which is very likely to be the behavior you want in all or
         nearly all cases.
+    score_only : bool, optional
+        If ``True``, only compute the alignment score, which requires less time
+        and memory (linear to the length of the shorter sequence). ``None`` is
+        returned in place of the aligned sequences and start/end positions.
+    memory : {"quadratic", "linear"}, optional
+        Memory model used to find the alignment. ``"quadratic"`` (default)
+        stores a traceback matrix of one byte per pair of positions.
+        ``"linear"`` finds the same optimal alignment score by divide and
+        conquer, at about twice the computation time but using memory linear
+        to the lengths of the sequences, which allows aligning long sequences
+        (e.g., whole genes or genomes). ``"linear"`` cannot be combined with
+        ``band_width``.
+    band_width : int, optional
+        If provided, restrict the alignment to a diagonal band of the dynamic
+        programming matrix, such that gaps may shift the sequences relative to
+        each other by up to ``band_width`` positions (in addition to the
+        difference between their lengths). This reduces time and memory from
+        proportional to the product of the sequence lengths to proportional
+        to their length times ``band_width``, which is suitable for closely
+        related sequences. If the alignment found reaches the edge of the
+        band, the band width is doubled and the alignment repeated. An
+        alignment lying entirely outside of the band cannot be found,
+        therefore ``band_width`` should not be smaller than the expected net
+        length of indels. Banded alignment keeps a traceback of the band in
+        memory, and cannot be combined with ``memory="linear"``.
 
     Returns
     -------
@@ -532,6 +699,17 @@ def global_pairwise_align(
     This function can be use to align either a pair of sequences, a pair of
     alignments, or a sequence and an alignment.
 
+    Affine gap penalties are computed exactly using the three-state dynamic
+    programming algorithm described in [3]_, i.e., a gap of length L costs
+    ``gap_open_penalty + (L - 1) * gap_extend_penalty``. Substitution scores
+    of all pairs of positions are precomputed from the integer-encoded
+    sequences (averaged over all pairs of sequences if alignments are
+    provided), and the dynamic programming is performed by a compiled routine.
+
+    With ``memory="linear"``, the alignment is found by the divide-and-conquer
+    algorithm of Hirschberg [4]_, adapted to affine gap penalties as described
+    in [5]_.
+
     References
     ----------
     .. [1] A general method applicable to the search for similarities in
@@ -539,17 +717,18 @@ def global_pairwise_align(
        Needleman SB, Wunsch CD.
        J Mol Biol. 1970 Mar;48(3):443-53.
     .. [2] http://www.ebi.ac.uk/Tools/psa/emboss_needle/
+    .. [3] An improved algorithm for matching biological sequences.
+       Gotoh O.
+       J Mol Biol. 1982 Dec 15;162(3):705-8.
+    .. [4] A linear space algorithm for computing maximal common
+       subsequences.
+       Hirschberg DS.
+       Commun ACM. 1975 Jun;18(6):341-3.
+    .. [5] Optimal alignments in linear space.
+       Myers EW, Miller W.
+       Comput Appl Biosci. 1988 Mar;4(1):11-7.
 
     """
-    warn(
-        "You're using skbio's python implementation of Needleman-Wunsch "
-        "alignment. This is known to be very slow (e.g., thousands of times "
-        "slower than a native C implementation). We'll be adding a faster "
-        "version soon (see https://github.com/scikit-bio/scikit-bio/issues/"
-        "254 to track progress on this).",
-        EfficiencyWarning,
-    )
-
     for seq in seq1, seq2:
         # We don't need to check the case where `seq` is a `TabularMSA` with a
         # dtype that isn't a subclass of `GrammaredSequence`, this is
@@ -560,6 +739,17 @@ def global_pairwise_align(
                 "TabularMSA, not type %r" % type(seq).__name__
             )
 
+    if band_width is not None and not (int(band_width) == band_width >= 0):
+        raise ValueError(
+            "`band_width` must be a non-negative integer, not %r" % (band_width,)
+        )
+
+    if memory not in ("quadratic", "linear"):
+        raise ValueError("`memory` must be 'quadratic' or 'linear', not %r" % (memory,))
+
+    if band_width is not None and memory == "linear":
+        raise ValueError("`band_width` cannot be combined with `memory='linear'`.")
+
     seq1 = _coerce_alignment_input_type(seq1)
     seq2 = _coerce_alignment_input_type(seq2)
 
@@ -569,37 +759,19 @@ def global_pairwise_align(
             % (seq1.dtype.__name__, seq2.dtype.__name__)
         )
 
-    if penalize_terminal_gaps:
-        init_matrices_f = _init_matrices_nw
-    else:
-        init_matrices_f = _init_matrices_nw_no_terminal_gap_penalty
-
-    score_matrix, traceback_matrix = _compute_score_and_traceback_matrices(
+    return _affine_align(
         seq1,
         seq2,
         gap_open_penalty,
         gap_extend_penalty,
         substitution_matrix,
-        new_alignment_score=-np.inf,
-        init_matrices_f=init_matrices_f,
+        local=False,
         penalize_terminal_gaps=penalize_terminal_gaps,
+        score_only=score_only,
+        memory=memory,
+        band_width=band_width,
     )
 
-    end_row_position = traceback_matrix.shape[0] - 1
-    end_col_position = traceback_matrix.shape[1] - 1
-
-    aligned1, aligned2, score, seq1_start_position, seq2_start_position = _traceback(
-        traceback_matrix, score_matrix, seq1, seq2, end_row_position, end_col_position
-    )
-    start_end_positions = [
-        (seq1_start_position, end_col_position - 1),
-        (seq2_start_position, end_row_position - 1),
-    ]
-
-    msa = TabularMSA(aligned1 + aligned2)
-
-    return msa, score, start_end_positions
-
 
 @deprecated(
     as_of="0.5.8",
@@ -771,282 +943,454 @@ _traceback_encoding = {
 }
 
 
-def _init_matrices_sw(aln1, aln2, gap_open_penalty, gap_extend_penalty):
-    shape = (aln2.shape.position + 1, aln1.shape.position + 1)
-    score_matrix = np.zeros(shape)
-    traceback_matrix = np.zeros(shape, dtype=int)
-    traceback_matrix += _traceback_encoding["uninitialized"]
-    traceback_matrix[0, :] = _traceback_encoding["alignment-end"]
-    traceback_matrix[:, 0] = _traceback_encoding["alignment-end"]
-    return score_matrix, traceback_matrix
-
-
-def _init_matrices_nw(aln1, aln2, gap_open_penalty, gap_extend_penalty):
-    shape = (aln2.shape.position + 1, aln1.shape.position + 1)
-    score_matrix = np.zeros(shape)
-    traceback_matrix = np.zeros(shape, dtype=int)
-    traceback_matrix += _traceback_encoding["uninitialized"]
-    traceback_matrix[0, 0] = _traceback_encoding["alignment-end"]
-
-    # cache some values for quicker access
-    vgap = _traceback_encoding["vertical-gap"]
-    hgap = _traceback_encoding["horizontal-gap"]
-
-    for i in range(1, shape[0]):
-        score_matrix[i, 0] = -gap_open_penalty - ((i - 1) * gap_extend_penalty)
-        traceback_matrix[i, 0] = vgap
-
-    for i in range(1, shape[1]):
-        score_matrix[0, i] = -gap_open_penalty - ((i - 1) * gap_extend_penalty)
-        traceback_matrix[0, i] = hgap
-
-    return score_matrix, traceback_matrix
+def _encode_substitution_scores(
+    aln1, aln2, substitution_matrix, gap_substitution_score, gap_chars
+):
+    """Integer-encode two alignments and the substitution scores between them.
 
+    Positions (columns) of each alignment are encoded as indices into the
+    unique positions of the alignment, which are single characters if the
+    alignment consists of one sequence. A lookup table stores the
+    substitution score of every pair of unique positions. The characters are
+    integer-encoded as well, and the character frequencies of the unique
+    positions (i.e., profiles) are multiplied through a table of substitution
+    scores of the observed characters.
 
-def _init_matrices_nw_no_terminal_gap_penalty(
-    aln1, aln2, gap_open_penalty, gap_extend_penalty
-):
-    shape = (aln2.shape.position + 1, aln1.shape.position + 1)
-    score_matrix = np.zeros(shape)
-    traceback_matrix = np.zeros(shape, dtype=int)
-    traceback_matrix += _traceback_encoding["uninitialized"]
-    traceback_matrix[0, 0] = _traceback_encoding["alignment-end"]
+    Returns
+    -------
+    1D np.ndarray of intp
+        Indices of the positions of ``aln1`` in the lookup table (columns).
+    1D np.ndarray of intp
+        Indices of the positions of ``aln2`` in the lookup table (rows).
+    2D np.ndarray of float
+        Lookup table of substitution scores.
 
-    # cache some values for quicker access
-    vgap = _traceback_encoding["vertical-gap"]
-    hgap = _traceback_encoding["horizontal-gap"]
+    """
+    bytes1, idx1 = _unique_positions(_alignment_to_bytes(aln1))
+    bytes2, idx2 = _unique_positions(_alignment_to_bytes(aln2))
+
+    # integer-encode the non-gap characters observed in either alignment
+    gap_codes = np.frombuffer("".join(gap_chars).encode("ascii"), dtype=np.uint8)
+    observed = np.union1d(bytes1, bytes2)
+    observed = observed[~np.isin(observed, gap_codes)]
+    chars = [chr(x) for x in observed]
+    hashes = np.full(256, -1, dtype=np.intp)
+    hashes[observed] = np.arange(observed.size)
+
+    # lookup table of substitution scores of the observed characters
+    if isinstance(substitution_matrix, SubstitutionMatrix):
+        char_map = substitution_matrix._char_map
+        offending_chars = [c for c in chars if c not in char_map]
+        if not offending_chars:
+            idx = np.array([char_map[c] for c in chars], dtype=np.intp)
+            char_scores = substitution_matrix.scores[np.ix_(idx, idx)]
+    else:
+        offending_chars = [
+            c
+            for c in chars
+            if c not in substitution_matrix
+            or any(
+                x in substitution_matrix and c not in substitution_matrix[x]
+                for x in chars
+            )
+        ]
+        if not offending_chars:
+            char_scores = np.array(
+                [[substitution_matrix[c1][c2] for c2 in chars] for c1 in chars],
+                dtype=float,
+            ).reshape(len(chars), len(chars))
+    if offending_chars:
+        raise ValueError(
+            "One of the sequences contains a character that is "
+            "not contained in the substitution matrix. Are you "
+            "using an appropriate substitution matrix for your "
+            "sequence type (e.g., a nucleotide substitution "
+            "matrix does not make sense for aligning protein "
+            "sequences)? Does your sequence contain invalid "
+            "characters? The offending character(s) is: "
+            " %s." % ", ".join(offending_chars)
+        )
 
-    for i in range(1, shape[0]):
-        traceback_matrix[i, 0] = vgap
+    profile1 = _alignment_profile(bytes1, hashes, observed.size)
+    profile2 = _alignment_profile(bytes2, hashes, observed.size)
+
+    # sum of scores of all non-gap character pairs, plus the gap substitution
+    # score for every pair involving a gap, averaged over all pairs
+    n_pairs = bytes1.shape[0] * bytes2.shape[0]
+    lookup = profile2 @ (profile1 @ char_scores).T
+    if gap_substitution_score:
+        n_chars1 = profile1.sum(axis=1)
+        n_chars2 = profile2.sum(axis=1)
+        lookup += gap_substitution_score * (n_pairs - np.outer(n_chars2, n_chars1))
+    if n_pairs != 1:
+        lookup /= n_pairs
+    return idx1, idx2, np.ascontiguousarray(lookup)
+
+
+def _alignment_to_bytes(aln):
+    """Stack the ASCII code points of all sequences in an alignment."""
+    if aln.shape.sequence == 0:
+        return np.empty((0, aln.shape.position), dtype=np.uint8)
+    return np.vstack([seq._bytes for seq in aln])
+
+
+def _unique_positions(bytes_):
+    """Find unique positions (columns) of an alignment and their indices."""
+    if bytes_.shape[0] == 1:
+        uniq, idx = np.unique(bytes_[0], return_inverse=True)
+        uniq = uniq.reshape(1, -1)
+    else:
+        uniq, idx = np.unique(bytes_.T, axis=0, return_inverse=True)
+        uniq = uniq.T
+    return uniq, idx.ravel().astype(np.intp)
 
-    for i in range(1, shape[1]):
-        traceback_matrix[0, i] = hgap
 
-    return score_matrix, traceback_matrix
+def _alignment_profile(bytes_, hashes, n_chars):
+    """Count non-gap characters (columns) at each position (rows)."""
+    n_seqs, n_pos = bytes_.shape
+    profile = np.zeros((n_pos, n_chars))
+    idx = hashes[bytes_]
+    mask = idx >= 0
+    pos = np.broadcast_to(np.arange(n_pos), (n_seqs, n_pos))
+    np.add.at(profile, (pos[mask], idx[mask]), 1)
+    return profile
 
 
-def _compute_substitution_score(
-    aln1_chars, aln2_chars, substitution_matrix, gap_substitution_score, gap_chars
-):
-    substitution_score = 0
-    for aln1_char, aln2_char in product(aln1_chars, aln2_chars):
-        if aln1_char in gap_chars or aln2_char in gap_chars:
-            substitution_score += gap_substitution_score
-        else:
-            try:
-                substitution_score += substitution_matrix[aln1_char][aln2_char]
-            except KeyError:
-                offending_chars = [
-                    c for c in (aln1_char, aln2_char) if c not in substitution_matrix
-                ]
-                raise ValueError(
-                    "One of the sequences contains a character that is "
-                    "not contained in the substitution matrix. Are you "
-                    "using an appropriate substitution matrix for your "
-                    "sequence type (e.g., a nucleotide substitution "
-                    "matrix does not make sense for aligning protein "
-                    "sequences)? Does your sequence contain invalid "
-                    "characters? The offending character(s) is: "
-                    " %s." % ", ".join(offending_chars)
-                )
-    substitution_score /= len(aln1_chars) * len(aln2_chars)
-    return substitution_score
-
-
-def _compute_score_and_traceback_matrices(
+def _affine_align(
     aln1,
     aln2,
     gap_open_penalty,
     gap_extend_penalty,
     substitution_matrix,
-    new_alignment_score=-np.inf,
-    init_matrices_f=_init_matrices_nw,
+    local,
     penalize_terminal_gaps=True,
-    gap_substitution_score=0,
+    score_only=False,
+    memory="quadratic",
+    band_width=None,
 ):
-    """Return dynamic programming (score) and traceback matrices.
-
-    A note on the ``penalize_terminal_gaps`` parameter. When this value is
-    ``False``, this function is no longer true Smith-Waterman/Needleman-Wunsch
-    scoring, but when ``True`` it can result in biologically irrelevant
-    artifacts in Needleman-Wunsch (global) alignments. Specifically, if one
-    sequence is longer than the other (e.g., if aligning a primer sequence to
-    an amplification product, or searching for a gene in a genome) the shorter
-    sequence will have a long gap inserted. The parameter is ``True`` by
-    default (so that this function computes the score and traceback matrices as
-    described by the original authors) but the global alignment wrappers pass
-    ``False`` by default, so that the global alignment API returns the result
-    that users are most likely to be looking for.
+    """Align a pair of alignments with affine gap penalties.
+
+    This function implements the three-state dynamic programming algorithm
+    described by Gotoh, which scores a gap of length L as ``gap_open_penalty +
+    (L - 1) * gap_extend_penalty`` exactly. Only a traceback matrix of one byte
+    per cell is kept in memory. If ``score_only`` is ``True``, the traceback
+    is skipped and memory use is linear to the length of the shorter
+    alignment. If ``memory`` is ``"linear"`` (global alignment only), the
+    alignment is found by divide and conquer (see ``_linear_space_path``).
+    If ``band_width`` is provided, the alignment is restricted to a diagonal
+    band (see ``_banded_path``).
+
+    Returns
+    -------
+    tuple
+        ``TabularMSA`` object containing the aligned sequences (or ``None`` if
+        ``score_only``), alignment score (float), and start/end positions of
+        each input alignment (or ``None`` if ``score_only``).
 
     """
-    aln1_length = aln1.shape.position
-    aln2_length = aln2.shape.position
-    # cache some values for quicker/simpler access
-    aend = _traceback_encoding["alignment-end"]
+    idx1, idx2, lookup = _encode_substitution_scores(
+        aln1, aln2, substitution_matrix, 0, aln1.dtype.gap_chars
+    )
+    free = not (local or penalize_terminal_gaps)
+    free_ends = dict(free_top=free, free_bottom=free, free_left=free, free_right=free)
+
+    if band_width is not None:
+        # the path is needed to check whether the band is wide enough, even
+        # if only the score is requested
+        path, score, start_row, start_col, end_row, end_col = _banded_path(
+            idx1,
+            idx2,
+            lookup,
+            gap_open_penalty,
+            gap_extend_penalty,
+            local,
+            free,
+            int(band_width),
+        )
+        if score_only:
+            return None, score, None
+
+    elif score_only:
+        # the optimal score is symmetric, therefore let the shorter alignment
+        # span the rows that are kept in memory
+        if idx1.size > idx2.size:
+            idx1, idx2, lookup = idx2, idx1, np.ascontiguousarray(lookup.T)
+        score, _, _ = _gotoh_score_cy(
+            idx1,
+            idx2,
+            lookup,
+            gap_open_penalty,
+            gap_extend_penalty,
+            local,
+            **free_ends,
+        )
+        return None, score, None
+
+    elif memory == "linear" and not local:
+        path, score = _linear_space_path(
+            idx1, idx2, lookup, gap_open_penalty, gap_extend_penalty, free
+        )
+        start_row = start_col = 0
+        end_row, end_col = idx2.size, idx1.size
+    else:
+        traceback_matrix, score, end_row, end_col = _gotoh_fill_cy(
+            idx1,
+            idx2,
+            lookup,
+            gap_open_penalty,
+            gap_extend_penalty,
+            local,
+            **free_ends,
+        )
+        path, start_row, start_col = _gotoh_traceback_cy(
+            traceback_matrix, end_row, end_col
+        )
+
     match = _traceback_encoding["match"]
     vgap = _traceback_encoding["vertical-gap"]
     hgap = _traceback_encoding["horizontal-gap"]
+    aligned1 = _path_to_aligned_seqs(path, aln1, start_col, (match, hgap))
+    aligned2 = _path_to_aligned_seqs(path, aln2, start_row, (match, vgap))
 
-    new_alignment_score = (new_alignment_score, aend)
+    msa = TabularMSA(aligned1 + aligned2)
+    start_end_positions = [(start_col, end_col - 1), (start_row, end_row - 1)]
 
-    # Initialize a matrix to use for scoring the alignment and for tracing
-    # back the best alignment
-    score_matrix, traceback_matrix = init_matrices_f(
-        aln1, aln2, gap_open_penalty, gap_extend_penalty
-    )
+    return msa, score, start_end_positions
 
-    # Iterate over the characters in aln2 (which corresponds to the vertical
-    # sequence in the matrix)
-    for aln2_pos, aln2_chars in enumerate(aln2.iter_positions(ignore_metadata=True), 1):
-        aln2_chars = str(aln2_chars)
 
-        # Iterate over the characters in aln1 (which corresponds to the
-        # horizontal sequence in the matrix)
-        for aln1_pos, aln1_chars in enumerate(
-            aln1.iter_positions(ignore_metadata=True), 1
-        ):
-            aln1_chars = str(aln1_chars)
-
-            # compute the score for a match/mismatch
-            substitution_score = _compute_substitution_score(
-                aln1_chars,
-                aln2_chars,
-                substitution_matrix,
-                gap_substitution_score,
-                aln1.dtype.gap_chars,
-            )
+def _banded_path(
+    idx1, idx2, lookup, gap_open_penalty, gap_extend_penalty, local, free, band_width
+):
+    """Find an optimal alignment path within a diagonal band.
 
-            diag_score = (
-                score_matrix[aln2_pos - 1, aln1_pos - 1] + substitution_score,
-                match,
-            )
+    Only cells whose diagonal (column - row) is at most ``band_width`` below
+    the lower and above the upper of diagonals 0 and ``len1 - len2`` are
+    computed, which costs time and memory proportional to the sequence
+    length times the band width. If the resulting path touches an edge of
+    the band, a better path may run outside of it, therefore the band width
+    is doubled and the alignment repeated, until the path stays strictly
+    within the band or the band covers the whole matrix.
 
-            # compute the score for adding a gap in aln2 (vertical)
-            if not penalize_terminal_gaps and (aln1_pos == aln1_length):
-                # we've reached the end of aln1, so adding vertical gaps
-                # (which become gaps in aln1) should no longer
-                # be penalized (if penalize_terminal_gaps == False)
-                up_score = (score_matrix[aln2_pos - 1, aln1_pos], vgap)
-            elif traceback_matrix[aln2_pos - 1, aln1_pos] == vgap:
-                # gap extend, because the cell above was also a gap
-                up_score = (
-                    score_matrix[aln2_pos - 1, aln1_pos] - gap_extend_penalty,
-                    vgap,
-                )
-            else:
-                # gap open, because the cell above was not a gap
-                up_score = (
-                    score_matrix[aln2_pos - 1, aln1_pos] - gap_open_penalty,
-                    vgap,
-                )
-
-            # compute the score for adding a gap in aln1 (horizontal)
-            if not penalize_terminal_gaps and (aln2_pos == aln2_length):
-                # we've reached the end of aln2, so adding horizontal gaps
-                # (which become gaps in aln2) should no longer
-                # be penalized (if penalize_terminal_gaps == False)
-                left_score = (score_matrix[aln2_pos, aln1_pos - 1], hgap)
-            elif traceback_matrix[aln2_pos, aln1_pos - 1] == hgap:
-                # gap extend, because the cell to the left was also a gap
-                left_score = (
-                    score_matrix[aln2_pos, aln1_pos - 1] - gap_extend_penalty,
-                    hgap,
-                )
-            else:
-                # gap open, because the cell to the left was not a gap
-                left_score = (
-                    score_matrix[aln2_pos, aln1_pos - 1] - gap_open_penalty,
-                    hgap,
-                )
-
-            # identify the largest score, and use that information to populate
-            # the score and traceback matrices
-            best_score = _first_largest(
-                [new_alignment_score, left_score, diag_score, up_score]
-            )
-            score_matrix[aln2_pos, aln1_pos] = best_score[0]
-            traceback_matrix[aln2_pos, aln1_pos] = best_score[1]
-
-    return score_matrix, traceback_matrix
+    Parameters
+    ----------
+    idx1, idx2, lookup : np.ndarray
+        Encoded alignments and substitution scores, as returned by
+        ``_encode_substitution_scores``.
+    gap_open_penalty, gap_extend_penalty : float
+        Gap penalties.
+    local : bool
+        Perform local instead of global alignment.
+    free : bool
+        Whether terminal gaps are free (global alignment only).
+    band_width : int
+        Initial band width.
 
+    Returns
+    -------
+    1D np.ndarray of int8
+        Alignment path, encoded as in ``_traceback_encoding``.
+    float
+        Alignment score.
+    int, int, int, int
+        Start row, start column, end row and end column of the path.
 
-def _traceback(traceback_matrix, score_matrix, aln1, aln2, start_row, start_col):
-    # cache some values for simpler reference
-    aend = _traceback_encoding["alignment-end"]
-    match = _traceback_encoding["match"]
+    """
+    n1, n2 = idx1.size, idx2.size
     vgap = _traceback_encoding["vertical-gap"]
     hgap = _traceback_encoding["horizontal-gap"]
-    gap_character = aln1.dtype.default_gap_char
-
-    # initialize the result alignments
-    aln1_sequence_count = aln1.shape.sequence
-    aligned_seqs1 = [[] for e in range(aln1_sequence_count)]
-
-    aln2_sequence_count = aln2.shape.sequence
-    aligned_seqs2 = [[] for e in range(aln2_sequence_count)]
-
-    current_row = start_row
-    current_col = start_col
-
-    best_score = score_matrix[current_row, current_col]
-    current_value = None
-
-    while current_value != aend:
-        current_value = traceback_matrix[current_row, current_col]
-
-        if current_value == match:
-            for aligned_seq, input_seq in zip(aligned_seqs1, aln1):
-                aligned_seq.append(str(input_seq[current_col - 1]))
-            for aligned_seq, input_seq in zip(aligned_seqs2, aln2):
-                aligned_seq.append(str(input_seq[current_row - 1]))
-            current_row -= 1
-            current_col -= 1
-        elif current_value == vgap:
-            for aligned_seq in aligned_seqs1:
-                aligned_seq.append(gap_character)
-            for aligned_seq, input_seq in zip(aligned_seqs2, aln2):
-                aligned_seq.append(str(input_seq[current_row - 1]))
-            current_row -= 1
-        elif current_value == hgap:
-            for aligned_seq, input_seq in zip(aligned_seqs1, aln1):
-                aligned_seq.append(str(input_seq[current_col - 1]))
-            for aligned_seq in aligned_seqs2:
-                aligned_seq.append(gap_character)
-            current_col -= 1
-        elif current_value == aend:
+    while True:
+        band = (min(0, n1 - n2) - band_width, max(0, n1 - n2) + band_width)
+        full = band[0] <= -n2 and band[1] >= n1
+        if full:
+            band = None
+        traceback_matrix, score, end_row, end_col = _gotoh_fill_cy(
+            idx1,
+            idx2,
+            lookup,
+            gap_open_penalty,
+            gap_extend_penalty,
+            local,
+            free_top=free,
+            free_bottom=free,
+            free_left=free,
+            free_right=free,
+            band=band,
+        )
+        path, start_row, start_col = _gotoh_traceback_cy(
+            traceback_matrix, end_row, end_col, band=band
+        )
+        if full:
+            break
+
+        # diagonals of the cells visited by the path
+        diagonals = (start_col - start_row) + np.cumsum(
+            (path != vgap).astype(np.intp) - (path != hgap)
+        )
+        diagonals = np.append(diagonals, start_col - start_row)
+        if (band[0] > -n2 and diagonals.min() <= band[0]) or (
+            band[1] < n1 and diagonals.max() >= band[1]
+        ):
+            band_width = max(1, band_width * 2)
+        else:
+            break
+
+    return path, score, start_row, start_col, end_row, end_col
+
+
+def _linear_space_path(
+    idx1, idx2, lookup, gap_open_penalty, gap_extend_penalty, free, max_cells=2**22
+):
+    """Find an optimal global alignment path in linear space.
+
+    This is Hirschberg's divide-and-conquer algorithm, adapted to affine gap
+    penalties as described by Myers and Miller. The middle row of the
+    dynamic programming matrix is scored from the top (forward) and from the
+    bottom (on reversed sequences). The optimal path either passes through a
+    cell of the middle row, or crosses it within a vertical gap, in which case
+    the two halves of the gap must be charged a single gap opening. The two
+    resulting subproblems (top-left and bottom-right) are then solved in the
+    same way, until they are small enough (up to ``max_cells`` cells, or a
+    single row) to be solved with a full traceback matrix.
+
+    Parameters
+    ----------
+    idx1, idx2, lookup : np.ndarray
+        Encoded alignments and substitution scores, as returned by
+        ``_encode_substitution_scores``.
+    gap_open_penalty, gap_extend_penalty : float
+        Gap penalties.
+    free : bool
+        Whether terminal gaps are free.
+    max_cells : int, optional
+        Maximum number of cells of a subproblem to be solved directly.
+
+    Returns
+    -------
+    1D np.ndarray of int8
+        Alignment path, encoded as in ``_traceback_encoding``.
+    float
+        Alignment score.
+
+    """
+    n1, n2 = idx1.size, idx2.size
+    score = None
+    segments = []
+
+    # subproblems are rectangles of rows r0 to r1 and columns c0 to c1, which
+    # may start and/or end within a vertical gap; they are solved from the
+    # top-left to the bottom-right, such that path segments are in order
+    stack = [(0, n2, 0, n1, False, False)]
+    while stack:
+        r0, r1, c0, c1, start_vgap, end_vgap = stack.pop()
+        free_ends = dict(
+            free_top=free and r0 == 0,
+            free_bottom=free and r1 == n2,
+            free_left=free and c0 == 0,
+            free_right=free and c1 == n1,
+        )
+        sub1 = idx1[c0:c1]
+
+        if r1 - r0 < 2 or (r1 - r0 + 1) * (c1 - c0 + 1) <= max_cells:
+            traceback_matrix, sub_score, _, _ = _gotoh_fill_cy(
+                sub1,
+                idx2[r0:r1],
+                lookup,
+                gap_open_penalty,
+                gap_extend_penalty,
+                False,
+                start_vgap=start_vgap,
+                end_vgap=end_vgap,
+                **free_ends,
+            )
+            path, _, _ = _gotoh_traceback_cy(
+                traceback_matrix, r1 - r0, c1 - c0, end_vgap
+            )
+            segments.append(path)
+            if score is None:
+                score = sub_score
             continue
+
+        mid = (r0 + r1) // 2
+        _, h_fwd, f_fwd = _gotoh_score_cy(
+            sub1,
+            idx2[r0:mid],
+            lookup,
+            gap_open_penalty,
+            gap_extend_penalty,
+            False,
+            free_top=free_ends["free_top"],
+            free_left=free_ends["free_left"],
+            free_right=free_ends["free_right"],
+            start_vgap=start_vgap,
+        )
+        _, h_rev, f_rev = _gotoh_score_cy(
+            np.ascontiguousarray(sub1[::-1]),
+            np.ascontiguousarray(idx2[mid:r1][::-1]),
+            lookup,
+            gap_open_penalty,
+            gap_extend_penalty,
+            False,
+            free_top=free_ends["free_bottom"],
+            free_left=free_ends["free_right"],
+            free_right=free_ends["free_left"],
+            start_vgap=end_vgap,
+        )
+
+        # a vertical gap crossing the middle row is charged one gap opening
+        # less and one gap extension more than its two halves
+        merge = np.full(c1 - c0 + 1, gap_open_penalty - gap_extend_penalty)
+        if free_ends["free_left"]:
+            merge[0] = 0.0
+        if free_ends["free_right"]:
+            merge[-1] = 0.0
+        through = h_fwd + h_rev[::-1]
+        crossing = f_fwd + f_rev[::-1] + merge
+        j_through = np.argmax(through)
+        j_crossing = np.argmax(crossing)
+        if crossing[j_crossing] > through[j_through]:
+            split, vgap = c0 + j_crossing, True
+            best = crossing[j_crossing]
         else:
-            raise ValueError("Invalid value in traceback matrix: %s" % current_value)
+            split, vgap = c0 + j_through, False
+            best = through[j_through]
+        if score is None:
+            score = best
 
-    for i, (aligned_seq, original) in enumerate(zip(aligned_seqs1, aln1)):
-        aligned_seq = "".join(aligned_seq)[::-1]
-        constructor = aln1.dtype
-        metadata = None
-        if original.has_metadata():
-            metadata = original.metadata
-        aligned_seqs1[i] = constructor(aligned_seq, metadata=metadata, validate=False)
+        stack.append((mid, r1, split, c1, vgap, end_vgap))
+        stack.append((r0, mid, c0, split, start_vgap, vgap))
+
+    return np.concatenate(segments), float(score)
 
-    for i, (aligned_seq, original) in enumerate(zip(aligned_seqs2, aln2)):
-        aligned_seq = "".join(aligned_seq)[::-1]
-        constructor = aln2.dtype
-        metadata = None
-        if original.has_metadata():
-            metadata = original.metadata
-        aligned_seqs2[i] = constructor(aligned_seq, metadata=metadata, validate=False)
 
-    return aligned_seqs1, aligned_seqs2, best_score, current_col, current_row
+def _path_to_aligned_seqs(path, aln, start, moves):
+    """Insert gaps into the sequences of an alignment along a path.
 
+    Parameters
+    ----------
+    path : 1D np.ndarray
+        Moves of the alignment path, encoded as in ``_traceback_encoding``.
+    aln : TabularMSA
+        Input alignment.
+    start : int
+        Position in ``aln`` where the path starts.
+    moves : tuple of int
+        Moves that consume a position of ``aln``. Other moves insert a gap.
 
-def _first_largest(scores):
-    """Similar to max, but returns the first element achieving the high score.
+    Returns
+    -------
+    list of GrammaredSequence
+        Aligned sequences.
 
-    If max receives a tuple, it will break a tie for the highest value
-    of entry[i] with entry[i+1]. We don't want that here - to better match
-    with the results of other tools, we want to be able to define which
-    entry is returned in the case of a tie.
     """
-    result = scores[0]
-    for score, direction in scores[1:]:
-        if score > result[0]:
-            result = (score, direction)
-    return result
+    consumed = np.isin(path, moves)
+    end = start + np.count_nonzero(consumed)
+    gap_code = ord(aln.dtype.default_gap_char)
+    aligned_seqs = []
+    for seq in aln:
+        aligned = np.full(path.size, gap_code, dtype=np.uint8)
+        aligned[consumed] = seq._bytes[start:end]
+        metadata = None
+        if seq.has_metadata():
+            metadata = seq.metadata
+        aligned_seqs.append(aln.dtype(aligned, metadata=metadata, validate=False))
+    return aligned_seqs
@@ -6,9 +6,14 @@
 #  The full license is in the file LICENSE.txt, distributed with this software.
 # -----------------------------------------------------------------------------
 
+from concurrent.futures import ThreadPoolExecutor
+import os
+
 from cpython cimport bool
+from libc.stdlib cimport calloc, free
 import numpy as np
 cimport numpy as cnp
+cimport cython
 from skbio.sequence import Protein, Sequence
 
 cdef extern from "_lib/ssw.h":
@@ -43,9 +48,9 @@ cdef extern from "_lib/ssw.h":
                             const cnp.uint8_t flag,
                             const cnp.uint16_t filters,
                             const cnp.int32_t filterd,
-                            const cnp.int32_t maskLen)
+                            const cnp.int32_t maskLen) nogil
 
-    cdef void align_destroy(s_align* a)
+    cdef void align_destroy(s_align* a) nogil
 
 np_aa_table = np.array([
     23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23,
@@ -67,7 +72,27 @@ np_nt_table = np.array([
     4,  0,  4,  1,  4,  4,  4,  2,  4,  4,  4,  4,  4,  4,  4,  4,
     4,  4,  4,  4,  3,  0,  4,  4,  4,  4,  4,  4,  4,  4,  4,  4])
 
-mid_table = np.array(['M', 'I', 'D'])
+# fields of the structured array returned by StripedSmithWaterman.align_many,
+# named after the properties of AlignmentStructure
+align_many_dtype = np.dtype([
+    ('optimal_alignment_score', np.uint16),
+    ('suboptimal_alignment_score', np.uint16),
+    ('target_begin', np.int32),
+    ('target_end_optimal', np.int32),
+    ('target_end_suboptimal', np.int32),
+    ('query_begin', np.int32),
+    ('query_end', np.int32),
+    ('cigar', object)])
+
+
+cdef str _cigar_to_str(const s_align* a):
+    # stored the same as that in BAM format,
+    # high 28 bits: length, low 4 bits: M/I/D (0/1/2)
+    cdef cnp.int32_t i
+    if a is NULL:
+        return ""
+    return "".join(["%d%s" % (a.cigar[i] >> 4, "MID"[a.cigar[i] & 0xf])
+                    for i in range(a.cigarLen)])
 
 
 cdef class AlignmentStructure:
@@ -261,17 +286,8 @@ cdef class AlignmentStructure:
         # Memoization! (1/2)
         if self._cigar_string is not None:
             return self._cigar_string
-        cigar_list = []
-        for i in range(self.p.cigarLen):
-            # stored the same as that in BAM format,
-            # high 28 bits: length, low 4 bits: M/I/D (0/1/2)
-
-            # Length, remove first 4 bits
-            cigar_list.append(str(self.p.cigar[i] >> 4))
-            # M/I/D, lookup first 4 bits in the mid_table
-            cigar_list.append(mid_table[self.p.cigar[i] & 0xf])
         # Memoization! (2/2)
-        self._cigar_string = "".join(cigar_list)
+        self._cigar_string = _cigar_to_str(self.p)
         return self._cigar_string
 
     @property
@@ -647,6 +663,150 @@ cdef class StripedSmithWaterman:
         alignment.__constructor(align)  # Hack to get a pointer through
         return alignment
 
+    def align_many(self, target_sequences, n_jobs=1, chunk_size=1024):
+        """Align many target sequences to `query_sequence`
+
+        The query profile is built once (when this object is instantiated)
+        and reused for every target. Alignments are computed without holding
+        the GIL, and may be distributed across multiple threads.
+
+        Parameters
+        ----------
+        target_sequences : iterable of str
+            Target sequences to align to `query_sequence`.
+        n_jobs : int, optional
+            Number of threads to use. If -1, all available CPUs are used.
+            Default is 1.
+        chunk_size : int, optional
+            Number of targets aligned per task.
+            Default is 1024.
+
+        Returns
+        -------
+        np.ndarray
+            Structured array with one element per target sequence and fields
+            ``optimal_alignment_score``, ``suboptimal_alignment_score``,
+            ``target_begin``, ``target_end_optimal``,
+            ``target_end_suboptimal``, ``query_begin``, ``query_end`` and
+            ``cigar``. The fields have the same meaning as the properties of
+            ``AlignmentStructure``.
+
+        See Also
+        --------
+        skbio.alignment.AlignmentStructure
+
+        Notes
+        -----
+        This is considerably faster than calling this object on each target
+        sequence, because no ``AlignmentStructure`` object (and no copy of
+        the aligned sequences) is created.
+
+        Examples
+        --------
+        >>> from skbio.alignment import StripedSmithWaterman
+        >>> query = StripedSmithWaterman("ACTAAGGCTCTCTACCC")
+        >>> res = query.align_many(["AGGCTCTCT", "TTTTACTAAGG"])
+        >>> res['optimal_alignment_score']
+        array([18, 14], dtype=uint16)
+        >>> res['cigar']
+        array(['9M', '7M'], dtype=object)
+
+        """
+        if chunk_size < 1:
+            raise ValueError("`chunk_size` must be >= 1")
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        elif n_jobs < 1:
+            raise ValueError("`n_jobs` must be >= 1 or -1")
+
+        table = np_aa_table if self.is_protein else np_nt_table
+        table = table.astype(np.int8)
+        encoded = [table[np.frombuffer(str(seq).encode("ascii"),
+                                       dtype=np.uint8)]
+                   for seq in target_sequences]
+        cdef Py_ssize_t n = len(encoded)
+        offsets = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum([x.size for x in encoded], out=offsets[1:])
+        # one padding byte, such that there is always a valid pointer
+        references = np.concatenate(encoded + [np.zeros(1, dtype=np.int8)])
+
+        scores = np.empty((n, 2), dtype=np.uint16)
+        positions = np.empty((n, 5), dtype=np.int32)
+        cigars = np.empty(n, dtype=object)
+
+        chunks = [(start, min(start + chunk_size, n))
+                  for start in range(0, n, chunk_size)]
+        args = (references, offsets, scores, positions, cigars)
+        if n_jobs == 1 or len(chunks) < 2:
+            for start, stop in chunks:
+                self._align_chunk(start, stop, *args)
+        else:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                # consume the results to raise any exception
+                list(executor.map(
+                    lambda chunk: self._align_chunk(*chunk, *args), chunks))
+
+        result = np.empty(n, dtype=align_many_dtype)
+        result['optimal_alignment_score'] = scores[:, 0]
+        result['suboptimal_alignment_score'] = scores[:, 1]
+        for i, name in enumerate(align_many_dtype.names[2:7]):
+            result[name] = positions[:, i]
+        result['cigar'] = cigars
+        return result
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def _align_chunk(self, Py_ssize_t start, Py_ssize_t stop,
+                     const cnp.int8_t[::1] references,
+                     const Py_ssize_t[::1] offsets,
+                     cnp.uint16_t[:, ::1] scores,
+                     cnp.int32_t[:, ::1] positions, object[::1] cigars):
+        cdef Py_ssize_t i
+        cdef cnp.int32_t base = self.index_starts_at
+        cdef s_align* a
+        cdef bint failed = False
+        # zero-initialized, such that entries left unset are NULL
+        cdef s_align** aligns = <s_align**> calloc(
+            stop - start, sizeof(s_align*))
+        if aligns is NULL:
+            raise MemoryError()
+
+        try:
+            with nogil:
+                for i in range(start, stop):
+                    a = ssw_align(self.profile, &references[offsets[i]],
+                                  offsets[i + 1] - offsets[i],
+                                  self.gap_open_penalty,
+                                  self.gap_extend_penalty, self.bit_flag,
+                                  self.score_filter, self.distance_filter,
+                                  self.mask_length)
+                    if a is NULL:
+                        # the 8-bit score saturated and no 16-bit profile
+                        # is available (score_size=0)
+                        failed = True
+                        break
+                    aligns[i - start] = a
+                    scores[i, 0] = a.score1
+                    scores[i, 1] = a.score2
+                    positions[i, 0] = (a.ref_begin1 + base
+                                       if a.ref_begin1 >= 0 else -1)
+                    positions[i, 1] = a.ref_end1 + base
+                    positions[i, 2] = a.ref_end2 + base
+                    positions[i, 3] = (a.read_begin1 + base
+                                       if a.read_begin1 >= 0 else -1)
+                    positions[i, 4] = a.read_end1 + base
+            if failed:
+                raise RuntimeError(
+                    "Alignment score overflowed the 8-bit score range. "
+                    "Use `score_size=2` (or 1) to allow 16-bit scores.")
+            for i in range(start, stop):
+                cigars[i] = _cigar_to_str(aligns[i - start])
+        finally:
+            for i in range(stop - start):
+                if aligns[i] is not NULL:
+                    align_destroy(aligns[i])
+            free(aligns)
+
     def __dealloc__(self):
         if self.profile is not NULL:
             init_destroy(self.profile)
@@ -7,9 +7,11 @@
 # ----------------------------------------------------------------------------
 
 from unittest import TestCase, main
+import re
 import warnings
 
 import numpy as np
+import numpy.testing as npt
 
 from skbio import Sequence, Protein, DNA, RNA, TabularMSA, SubstitutionMatrix
 from skbio.alignment import (
@@ -18,9 +20,7 @@ from skbio.alignment import (
     make_identity_substitution_matrix, local_pairwise_align,
     global_pairwise_align)
 from skbio.alignment._pairwise import (
-    _init_matrices_sw, _init_matrices_nw,
-    _compute_score_and_traceback_matrices, _traceback, _first_largest,
-    _compute_substitution_score)
+    _encode_substitution_scores, _linear_space_path, _banded_path)
 from skbio.sequence import GrammaredSequence
 from skbio.util import classproperty
 from skbio.util._decorator import overrides
@@ -48,6 +48,78 @@ class CustomSequence(GrammaredSequence):
         return {}
 
 
+def _score_alignment(msa, gap_open_penalty, gap_extend_penalty,
+                     substitution_matrix, penalize_terminal_gaps):
+    """Score a pairwise alignment with affine gap penalties."""
+    aln1, aln2 = (str(x) for x in msa)
+    score = 0.0
+    for gapped in aln1, aln2:
+        runs = [(m.start(), m.end()) for m in re.finditer('-+', gapped)]
+        for start, end in runs:
+            if not penalize_terminal_gaps and (
+                    start == 0 or end == len(gapped)):
+                continue
+            score -= gap_open_penalty + (end - start - 1) * gap_extend_penalty
+    for c1, c2 in zip(aln1, aln2):
+        if c1 != '-' and c2 != '-':
+            score += substitution_matrix[c1][c2]
+    return score
+
+
+def _reference_gotoh(aln1, aln2, gap_open_penalty, gap_extend_penalty,
+                     substitution_matrix, local, penalize_terminal_gaps=True):
+    """Align with the three-state recurrences of Gotoh in plain Python.
+
+    This is the reference against which the compiled engine is validated.
+    Returns the matrix of the best scores of alignments ending at each cell
+    (rows are positions of aln2 and columns positions of aln1), and the
+    optimal score.
+    """
+    gap_chars = aln1.dtype.gap_chars
+    cols1 = [str(aln1.iloc[:, i]) for i in range(aln1.shape.position)]
+    cols2 = [str(aln2.iloc[:, i]) for i in range(aln2.shape.position)]
+
+    def substitution_score(col1, col2):
+        scores = [0.0 if c1 in gap_chars or c2 in gap_chars
+                  else substitution_matrix[c1][c2]
+                  for c1 in col1 for c2 in col2]
+        return sum(scores) / len(scores)
+
+    n_rows, n_cols = len(cols2) + 1, len(cols1) + 1
+    free = not (local or penalize_terminal_gaps)
+    # best scores of alignments ending with a match, a horizontal gap
+    # (gap in aln2) or a vertical gap (gap in aln1), and overall
+    M = np.full((n_rows, n_cols), -np.inf)
+    X = np.full((n_rows, n_cols), -np.inf)
+    Y = np.full((n_rows, n_cols), -np.inf)
+    H = np.zeros((n_rows, n_cols))
+    if not (local or free):
+        for col in range(1, n_cols):
+            X[0, col] = H[0, col] = -(gap_open_penalty +
+                                      (col - 1) * gap_extend_penalty)
+        for row in range(1, n_rows):
+            Y[row, 0] = H[row, 0] = -(gap_open_penalty +
+                                      (row - 1) * gap_extend_penalty)
+    for row in range(1, n_rows):
+        for col in range(1, n_cols):
+            M[row, col] = H[row - 1, col - 1] + substitution_score(
+                cols1[col - 1], cols2[row - 1])
+            # trailing gaps are free if terminal gaps are not penalized
+            free_h = free and row == n_rows - 1
+            X[row, col] = max(
+                H[row, col - 1] - (0 if free_h else gap_open_penalty),
+                X[row, col - 1] - (0 if free_h else gap_extend_penalty))
+            free_v = free and col == n_cols - 1
+            Y[row, col] = max(
+                H[row - 1, col] - (0 if free_v else gap_open_penalty),
+                Y[row - 1, col] - (0 if free_v else gap_extend_penalty))
+            H[row, col] = max(M[row, col], X[row, col], Y[row, col])
+            if local:
+                H[row, col] = max(H[row, col], 0.0)
+    score = H.max() if local else H[-1, -1]
+    return H, score
+
+
 class PairwiseAlignmentTests(TestCase):
     """
         Note: In the high-level tests, the expected results were derived with
@@ -278,6 +350,171 @@ class PairwiseAlignmentTests(TestCase):
         self.assertRaises(TypeError, global_pairwise_align_protein,
                           Protein("HEAGAWGHEE"), 42)
 
+    def test_global_pairwise_align_substitution_matrix_object(self):
+        # a SubstitutionMatrix object is equivalent to its dict form
+        blosum50 = SubstitutionMatrix.by_name("BLOSUM50")
+        seq1, seq2 = Protein("HEAGAWGHEE"), Protein("PAWHEAE")
+        obs = global_pairwise_align(seq1, seq2, 10., 5., blosum50)
+        exp = global_pairwise_align(seq1, seq2, 10., 5., blosum50.to_dict())
+        self.assertEqual(obs, exp)
+        obs = local_pairwise_align(seq1, seq2, 10., 5., blosum50)
+        exp = local_pairwise_align(seq1, seq2, 10., 5., blosum50.to_dict())
+        self.assertEqual(obs, exp)
+
+    def test_global_pairwise_align_affine_gaps(self):
+        # a gap of length L costs gap_open_penalty + (L - 1) *
+        # gap_extend_penalty: -5 + 1 + 1 - (5 + 2)
+        obs_msa, obs_score, obs_start_end = global_pairwise_align_nucleotide(
+            DNA("TACC"), DNA("CTA"), gap_open_penalty=5,
+            gap_extend_penalty=2, penalize_terminal_gaps=True)
+        self.assertEqual(obs_msa, TabularMSA([DNA("-TACC"), DNA("CTA--")]))
+        self.assertEqual(obs_score, -10.0)
+        self.assertEqual(obs_start_end, [(0, 3), (0, 2)])
+
+        # the reported score is the score of the returned alignment
+        m = make_identity_substitution_matrix(2, -3)
+        rng = np.random.default_rng(42)
+        for _ in range(20):
+            seq1 = DNA(''.join(rng.choice(list('ACGT'), rng.integers(1, 20))))
+            seq2 = DNA(''.join(rng.choice(list('ACGT'), rng.integers(1, 20))))
+            for penalize in True, False:
+                obs_msa, obs_score, _ = global_pairwise_align(
+                    seq1, seq2, 5, 2, m, penalize_terminal_gaps=penalize)
+                self.assertAlmostEqual(obs_score, _score_alignment(
+                    obs_msa, 5, 2, m, penalize))
+            obs_msa, obs_score, _ = local_pairwise_align(seq1, seq2, 5, 2, m)
+            self.assertAlmostEqual(obs_score, _score_alignment(
+                obs_msa, 5, 2, m, True))
+
+    def test_pairwise_align_score_only(self):
+        seq1, seq2 = Protein("HEAGAWGHEE"), Protein("PAWHEAE")
+        for penalize in True, False:
+            exp = global_pairwise_align_protein(
+                seq1, seq2, 10., 5., penalize_terminal_gaps=penalize)[1]
+            # either sequence can be the shorter one
+            for args in (seq1, seq2), (seq2, seq1):
+                obs = global_pairwise_align_protein(
+                    *args, 10., 5., penalize_terminal_gaps=penalize,
+                    score_only=True)
+                self.assertEqual(obs, (None, exp, None))
+        exp = local_pairwise_align_protein(seq1, seq2, 10., 5.)[1]
+        for args in (seq1, seq2), (seq2, seq1):
+            obs = local_pairwise_align_protein(*args, 10., 5.,
+                                               score_only=True)
+            self.assertEqual(obs, (None, exp, None))
+
+        seq1, seq2 = DNA("GACCTTGACCAGGTACC"), DNA("GAACTTTGACGTAAC")
+        exp = global_pairwise_align_nucleotide(seq1, seq2)[1]
+        obs = global_pairwise_align_nucleotide(seq1, seq2, score_only=True)
+        self.assertEqual(obs, (None, exp, None))
+        exp = local_pairwise_align_nucleotide(seq1, seq2)[1]
+        obs = local_pairwise_align_nucleotide(seq1, seq2, score_only=True)
+        self.assertEqual(obs, (None, exp, None))
+
+    def test_global_pairwise_align_linear_memory(self):
+        seq1, seq2 = Protein("HEAGAWGHEE"), Protein("PAWHEAE")
+        for penalize in True, False:
+            exp = global_pairwise_align_protein(
+                seq1, seq2, 10., 5., penalize_terminal_gaps=penalize)
+            obs = global_pairwise_align_protein(
+                seq1, seq2, 10., 5., penalize_terminal_gaps=penalize,
+                memory="linear")
+            self.assertEqual(obs[1], exp[1])
+            self.assertEqual(obs[2], exp[2])
+
+        subs = make_identity_substitution_matrix(2, -3)
+        rng = np.random.default_rng(42)
+        for _ in range(50):
+            seq1 = DNA("".join(rng.choice(list("ACGT"), rng.integers(1, 60))))
+            seq2 = DNA("".join(rng.choice(list("ACGT"), rng.integers(1, 60))))
+            for penalize in True, False:
+                exp = global_pairwise_align(
+                    seq1, seq2, 5., 2., subs, penalize_terminal_gaps=penalize,
+                    score_only=True)[1]
+                msa1, msa2 = TabularMSA([seq1]), TabularMSA([seq2])
+                idx1, idx2, lookup = _encode_substitution_scores(
+                    msa1, msa2, subs, 0, DNA.gap_chars)
+                # force divide and conquer down to tiny subproblems
+                for max_cells in 1, 30:
+                    path, obs = _linear_space_path(
+                        idx1, idx2, lookup, 5., 2., not penalize, max_cells)
+                    self.assertEqual(obs, exp)
+                    self.assertEqual((path != 2).sum(), len(seq1))
+                    self.assertEqual((path != 3).sum(), len(seq2))
+                obs_msa, obs, _ = global_pairwise_align(
+                    seq1, seq2, 5., 2., subs, penalize_terminal_gaps=penalize,
+                    memory="linear")
+                self.assertEqual(obs, exp)
+                self.assertEqual(
+                    _score_alignment(obs_msa, 5., 2., subs, penalize), exp)
+
+    def test_global_pairwise_align_invalid_memory(self):
+        with self.assertRaisesRegex(ValueError, "'quadratic' or 'linear'"):
+            global_pairwise_align_nucleotide(DNA("ACGT"), DNA("ACT"),
+                                             memory="cubic")
+        with self.assertRaisesRegex(ValueError, "band_width.*linear"):
+            global_pairwise_align_nucleotide(DNA("ACGT"), DNA("ACT"),
+                                             memory="linear", band_width=2)
+
+    def test_pairwise_align_band_width(self):
+        rng = np.random.default_rng(42)
+        for _ in range(20):
+            seq = "".join(rng.choice(list("ACGT"), rng.integers(30, 80)))
+            # a handful of indels and substitutions
+            mutated = list(seq)
+            for _ in range(3):
+                pos = rng.integers(len(mutated))
+                mutated[pos:pos + rng.integers(3)] = rng.choice(
+                    list("ACGT"), rng.integers(3))
+            seq1, seq2 = DNA(seq), DNA("".join(mutated))
+            for penalize in True, False:
+                exp = global_pairwise_align_nucleotide(
+                    seq1, seq2, penalize_terminal_gaps=penalize)
+                for band_width in 0, 3, 100:
+                    obs = global_pairwise_align_nucleotide(
+                        seq1, seq2, penalize_terminal_gaps=penalize,
+                        band_width=band_width)
+                    self.assertEqual(obs[1], exp[1])
+                    self.assertEqual(obs[2], exp[2])
+                    obs = global_pairwise_align_nucleotide(
+                        seq1, seq2, penalize_terminal_gaps=penalize,
+                        band_width=band_width, score_only=True)
+                    self.assertEqual(obs, (None, exp[1], None))
+            # a local alignment may lie entirely on diagonals outside of a
+            # band narrower than the shift caused by indels
+            exp = local_pairwise_align_nucleotide(seq1, seq2)
+            for band_width in 6, 100:
+                obs = local_pairwise_align_nucleotide(
+                    seq1, seq2, band_width=band_width)
+                self.assertEqual(obs[1], exp[1])
+
+    def test_banded_path_widening(self):
+        # the optimal path shifts by 4 diagonals (and back), which is outside
+        # of the initial band
+        seq1 = TabularMSA([DNA("ACGTTGCAAGCTAGCATCAGGCTAGTCCAGT")])
+        seq2 = TabularMSA([DNA("ACGTTGCAAGCTAGCATTTTTCAGGCTAGTCCGT")])
+        subs = make_identity_substitution_matrix(2, -3)
+        idx1, idx2, lookup = _encode_substitution_scores(
+            seq1, seq2, subs, 0, DNA.gap_chars)
+        path, score, start_row, start_col, end_row, end_col = _banded_path(
+            idx1, idx2, lookup, 5., 2., False, False, 0)
+        exp = global_pairwise_align(seq1, seq2, 5., 2., subs,
+                                    penalize_terminal_gaps=True)
+        self.assertEqual(score, exp[1])
+        self.assertEqual((start_row, start_col, end_row, end_col),
+                         (0, 0, 34, 31))
+        self.assertEqual((path == 2).sum(), 4)
+        self.assertEqual((path == 3).sum(), 1)
+
+    def test_pairwise_align_invalid_band_width(self):
+        for band_width in -1, 2.5:
+            with self.assertRaisesRegex(ValueError, "non-negative integer"):
+                global_pairwise_align_nucleotide(DNA("ACGT"), DNA("ACT"),
+                                                 band_width=band_width)
+            with self.assertRaisesRegex(ValueError, "non-negative integer"):
+                local_pairwise_align_nucleotide(DNA("ACGT"), DNA("ACT"),
+                                                band_width=band_width)
+
     def test_global_pairwise_align_protein_invalid_dtype(self):
         with self.assertRaisesRegex(TypeError,
                                     r"TabularMSA with Protein dtype.*dtype "
@@ -290,8 +527,9 @@ class PairwiseAlignmentTests(TestCase):
             Protein("HEAGAWGHEE"), Protein("PAWHEAE"), gap_open_penalty=10.,
             gap_extend_penalty=5., penalize_terminal_gaps=True)
 
+        # EMBOSS result: ---PAWHEAE, which has the same score
         self.assertEqual(obs_msa, TabularMSA([Protein("HEAGAWGHEE"),
-                                              Protein("---PAWHEAE")]))
+                                              Protein("P---AWHEAE")]))
         self.assertEqual(obs_score, 1.0)
         self.assertEqual(obs_start_end, [(0, 9), (0, 6)])
 
@@ -559,227 +797,144 @@ class PairwiseAlignmentTests(TestCase):
                                     r"same type: 'DNA' != 'RNA'"):
             local_pairwise_align(DNA('ACGT'), RNA('ACGU'), 1.0, 1.0, {})
 
-    def test_init_matrices_sw(self):
-        expected_score_m = np.zeros((5, 4))
-        expected_tback_m = [[0, 0, 0, 0],
-                            [0, -1, -1, -1],
-                            [0, -1, -1, -1],
-                            [0, -1, -1, -1],
-                            [0, -1, -1, -1]]
-        actual_score_m, actual_tback_m = _init_matrices_sw(
-            TabularMSA([DNA('AAA', metadata={'id': 'id'})]),
-            TabularMSA([DNA('AAAA', metadata={'id': 'id'})]), 5, 2)
-        np.testing.assert_array_equal(actual_score_m, expected_score_m)
-        np.testing.assert_array_equal(actual_tback_m, expected_tback_m)
-
-    def test_init_matrices_nw(self):
-        expected_score_m = [[0, -5, -7, -9],
-                            [-5, 0, 0, 0],
-                            [-7, 0, 0, 0],
-                            [-9, 0, 0, 0],
-                            [-11, 0, 0, 0]]
-        expected_tback_m = [[0, 3, 3, 3],
-                            [2, -1, -1, -1],
-                            [2, -1, -1, -1],
-                            [2, -1, -1, -1],
-                            [2, -1, -1, -1]]
-        actual_score_m, actual_tback_m = _init_matrices_nw(
-            TabularMSA([DNA('AAA', metadata={'id': 'id'})]),
-            TabularMSA([DNA('AAAA', metadata={'id': 'id'})]), 5, 2)
-        np.testing.assert_array_equal(actual_score_m, expected_score_m)
-        np.testing.assert_array_equal(actual_tback_m, expected_tback_m)
-
-    def test_compute_substitution_score(self):
+    def test_encode_substitution_scores(self):
         # these results were computed manually
         subs_m = make_identity_substitution_matrix(5, -4)
-        gap_chars = set('-.')
 
-        self.assertEqual(
-            _compute_substitution_score(['A'], ['A'], subs_m, 0, gap_chars),
-            5.0)
-        self.assertEqual(
-            _compute_substitution_score(['A', 'A'], ['A'], subs_m, 0,
-                                        gap_chars),
-            5.0)
-        self.assertEqual(
-            _compute_substitution_score(['A', 'C'], ['A'], subs_m, 0,
-                                        gap_chars),
-            0.5)
-        self.assertEqual(
-            _compute_substitution_score(['A', 'C'], ['A', 'C'], subs_m, 0,
-                                        gap_chars),
-            0.5)
-        self.assertEqual(
-            _compute_substitution_score(['A', 'A'], ['A', '-'], subs_m, 0,
-                                        gap_chars),
-            2.5)
-        self.assertEqual(
-            _compute_substitution_score(['A', 'A'], ['A', '-'], subs_m, 1,
-                                        gap_chars),
-            3)
+        def score(col1, col2, gap_score=0, subs_m=subs_m):
+            aln1 = TabularMSA([DNA(c) for c in col1])
+            aln2 = TabularMSA([DNA(c) for c in col2])
+            idx1, idx2, lookup = _encode_substitution_scores(
+                aln1, aln2, subs_m, gap_score, DNA.gap_chars)
+            return lookup[idx2[0], idx1[0]]
+
+        self.assertEqual(score('A', 'A'), 5.0)
+        self.assertEqual(score('AA', 'A'), 5.0)
+        self.assertEqual(score('AC', 'A'), 0.5)
+        self.assertEqual(score('AC', 'AC'), 0.5)
+        self.assertEqual(score('AA', 'A-'), 2.5)
+        self.assertEqual(score('AA', 'A-', gap_score=1), 3)
 
         # alt subs_m
         subs_m = make_identity_substitution_matrix(1, -2)
+        self.assertEqual(score('AA', 'A-', subs_m=subs_m), 0.5)
 
-        self.assertEqual(
-            _compute_substitution_score(['A', 'A'], ['A', '-'], subs_m, 0,
-                                        gap_chars),
-            0.5)
-
-    def test_compute_score_and_traceback_matrices(self):
+    def test_reference_gotoh(self):
         # these results were computed manually
-        expected_score_m = [[0, -5, -7, -9],
-                            [-5, 2, -3, -5],
-                            [-7, -3, 4, -1],
-                            [-9, -5, -1, 6],
-                            [-11, -7, -3, 1]]
-        expected_tback_m = [[0, 3, 3, 3],
-                            [2, 1, 3, 3],
-                            [2, 2, 1, 3],
-                            [2, 2, 2, 1],
-                            [2, 2, 2, 2]]
         m = make_identity_substitution_matrix(2, -1)
-        actual_score_m, actual_tback_m = _compute_score_and_traceback_matrices(
+        exp = [[0, -5, -7, -9],
+               [-5, 2, -3, -5],
+               [-7, -3, 4, -1],
+               [-9, -5, -1, 6],
+               [-11, -7, -3, 1]]
+        obs, score = _reference_gotoh(
             TabularMSA([DNA('ACG', metadata={'id': 'id'})]),
-            TabularMSA([DNA('ACGT', metadata={'id': 'id'})]), 5, 2, m)
-        np.testing.assert_array_equal(actual_score_m, expected_score_m)
-        np.testing.assert_array_equal(actual_tback_m, expected_tback_m)
-
-        # different sequences
+            TabularMSA([DNA('ACGT', metadata={'id': 'id'})]), 5, 2, m, False)
+        npt.assert_array_equal(obs, exp)
+        self.assertEqual(score, 1)
+
+        # different sequences, and four sequences provided in two alignments
+        exp = [[0, -5, -7, -9],
+               [-5, 2, -3, -5],
+               [-7, -3, 4, -1],
+               [-9, -5, -1, 3],
+               [-11, -7, -3, -2]]
+        for aln1, aln2 in (
+                (TabularMSA([DNA('ACC', metadata={'id': 'id'})]),
+                 TabularMSA([DNA('ACGT', metadata={'id': 'id'})])),
+                (TabularMSA([DNA('ACC', metadata={'id': 's1'}),
+                             DNA('ACC', metadata={'id': 's2'})]),
+                 TabularMSA([DNA('ACGT', metadata={'id': 's3'}),
+                             DNA('ACGT', metadata={'id': 's4'})]))):
+            obs, score = _reference_gotoh(aln1, aln2, 5, 2, m, False)
+            npt.assert_array_equal(obs, exp)
+            self.assertEqual(score, -2)
+
+        # local alignment
+        obs, score = _reference_gotoh(
+            TabularMSA([DNA('AAA', metadata={'id': 'id'})]),
+            TabularMSA([DNA('AAAA', metadata={'id': 'id'})]), 5, 2, m, True)
+        npt.assert_array_equal(obs[0], np.zeros(4))
+        npt.assert_array_equal(obs[:, 0], np.zeros(5))
+        self.assertEqual(score, 6)
+
+    def test_pairwise_align_reference(self):
+        # the compiled engine finds alignments of optimal score, whatever the
+        # memory mode or band
+        rng = np.random.default_rng(42)
+
+        def random_seq(chars):
+            length = rng.integers(1, 25)
+            p = np.array([1 / 3 if c == '-' else 1 for c in chars])
+            return DNA(''.join(rng.choice(list(chars), length,
+                                          p=p / p.sum())))
+
+        for _ in range(30):
+            subs = make_identity_substitution_matrix(
+                rng.integers(1, 4), -rng.integers(1, 4))
+            gap_open = float(rng.integers(1, 8))
+            gap_extend = float(rng.integers(1, gap_open + 1))
+            gaps = (gap_open, gap_extend, subs)
+
+            # global alignment of profiles
+            aln1, aln2 = [
+                TabularMSA([random_seq('ACGT-')] * rng.integers(1, 3))
+                for _ in range(2)]
+            band = max(aln1.shape.position, aln2.shape.position)
+            for penalize in True, False:
+                _, exp = _reference_gotoh(aln1, aln2, *gaps, False, penalize)
+                for kwargs in ({}, {'memory': 'linear'},
+                               {'band_width': None}, {'band_width': band},
+                               {'score_only': True}):
+                    _, obs, _ = global_pairwise_align(
+                        aln1, aln2, *gaps, penalize_terminal_gaps=penalize,
+                        **kwargs)
+                    npt.assert_allclose(obs, exp, err_msg=str(kwargs))
+
+            # local alignment of sequences
+            seq1, seq2 = random_seq('ACGT'), random_seq('ACGT')
+            _, exp = _reference_gotoh(TabularMSA([seq1]), TabularMSA([seq2]),
+                                      *gaps, True)
+            band = max(len(seq1), len(seq2))
+            for kwargs in ({}, {'band_width': None}, {'band_width': band},
+                           {'score_only': True}):
+                _, obs, _ = local_pairwise_align(seq1, seq2, *gaps, **kwargs)
+                npt.assert_allclose(obs, exp, err_msg=str(kwargs))
+
+    def test_pairwise_align_traceback(self):
         # these results were computed manually
-        expected_score_m = [[0, -5, -7, -9],
-                            [-5, 2, -3, -5],
-                            [-7, -3, 4, -1],
-                            [-9, -5, -1, 3],
-                            [-11, -7, -3, -2]]
-        expected_tback_m = [[0, 3, 3, 3],
-                            [2, 1, 3, 3],
-                            [2, 2, 1, 3],
-                            [2, 2, 2, 1],
-                            [2, 2, 2, 1]]
         m = make_identity_substitution_matrix(2, -1)
-        actual_score_m, actual_tback_m = _compute_score_and_traceback_matrices(
-            TabularMSA([DNA('ACC', metadata={'id': 'id'})]),
-            TabularMSA([DNA('ACGT', metadata={'id': 'id'})]), 5, 2, m)
-        np.testing.assert_array_equal(actual_score_m, expected_score_m)
-        np.testing.assert_array_equal(actual_tback_m, expected_tback_m)
+        obs_msa, obs_score, obs_start_end = global_pairwise_align(
+            TabularMSA([DNA('ACG')]), TabularMSA([DNA('ACGT')]), 5, 2, m,
+            penalize_terminal_gaps=True)
+        self.assertEqual([str(seq) for seq in obs_msa], ['ACG-', 'ACGT'])
+        self.assertEqual(obs_score, 1)
+        self.assertEqual(obs_start_end, [(0, 2), (0, 3)])
 
-        # four sequences provided in two alignments
-        # these results were computed manually
-        expected_score_m = [[0, -5, -7, -9],
-                            [-5, 2, -3, -5],
-                            [-7, -3, 4, -1],
-                            [-9, -5, -1, 3],
-                            [-11, -7, -3, -2]]
-        expected_tback_m = [[0, 3, 3, 3],
-                            [2, 1, 3, 3],
-                            [2, 2, 1, 3],
-                            [2, 2, 2, 1],
-                            [2, 2, 2, 1]]
-        m = make_identity_substitution_matrix(2, -1)
-        actual_score_m, actual_tback_m = _compute_score_and_traceback_matrices(
-            TabularMSA([DNA('ACC', metadata={'id': 's1'}),
-                        DNA('ACC', metadata={'id': 's2'})]),
-            TabularMSA([DNA('ACGT', metadata={'id': 's3'}),
-                        DNA('ACGT', metadata={'id': 's4'})]), 5, 2, m)
-        np.testing.assert_array_equal(actual_score_m, expected_score_m)
-        np.testing.assert_array_equal(actual_tback_m, expected_tback_m)
-
-    def test_compute_score_and_traceback_matrices_invalid(self):
+        # four sequences in two alignments
+        obs_msa, obs_score, obs_start_end = global_pairwise_align(
+            TabularMSA([DNA('ACG'), DNA('ACG')]),
+            TabularMSA([DNA('ACGT'), DNA('ACGT')]), 5, 2, m,
+            penalize_terminal_gaps=True)
+        self.assertEqual([str(seq) for seq in obs_msa],
+                         ['ACG-', 'ACG-', 'ACGT', 'ACGT'])
+        self.assertEqual(obs_score, 1)
+
+        # local alignment stops at the highest score
+        obs_msa, obs_score, obs_start_end = local_pairwise_align(
+            DNA('ACG'), DNA('ACGT'), 5, 2, m)
+        self.assertEqual([str(seq) for seq in obs_msa], ['ACG', 'ACG'])
+        self.assertEqual(obs_score, 6)
+        self.assertEqual(obs_start_end, [(0, 2), (0, 2)])
+
+    def test_global_pairwise_align_invalid_character(self):
         # if the sequence contains a character that is not in the
         # substitution matrix, an informative error should be raised
         m = make_identity_substitution_matrix(2, -1)
-        self.assertRaises(ValueError, _compute_score_and_traceback_matrices,
-                          TabularMSA([DNA('AWG', metadata={'id': 'id'})]),
-                          TabularMSA([DNA('ACGT', metadata={'id': 'id'})]),
-                          5, 2, m)
-
-    def test_traceback(self):
-        score_m = [[0, -5, -7, -9],
-                   [-5, 2, -3, -5],
-                   [-7, -3, 4, -1],
-                   [-9, -5, -1, 6],
-                   [-11, -7, -3, 1]]
-        score_m = np.array(score_m)
-        tback_m = [[0, 3, 3, 3],
-                   [2, 1, 3, 3],
-                   [2, 2, 1, 3],
-                   [2, 2, 2, 1],
-                   [2, 2, 2, 2]]
-        tback_m = np.array(tback_m)
-        # start at bottom-right
-        expected = ([DNA("ACG-", metadata={'id': 'foo'})],
-                    [DNA("ACGT", metadata={'id': 'bar'})], 1, 0, 0)
-        actual = _traceback(tback_m, score_m,
-                            TabularMSA([DNA('ACG', metadata={'id': 'foo'})]),
-                            TabularMSA([DNA('ACGT', metadata={'id': 'bar'})]),
-                            4, 3)
-        self.assertEqual(actual, expected)
-
-        # four sequences in two alignments
-        score_m = [[0, -5, -7, -9],
-                   [-5, 2, -3, -5],
-                   [-7, -3, 4, -1],
-                   [-9, -5, -1, 6],
-                   [-11, -7, -3, 1]]
-        score_m = np.array(score_m)
-        tback_m = [[0, 3, 3, 3],
-                   [2, 1, 3, 3],
-                   [2, 2, 1, 3],
-                   [2, 2, 2, 1],
-                   [2, 2, 2, 2]]
-        tback_m = np.array(tback_m)
-        # start at bottom-right
-        expected = ([DNA("ACG-", metadata={'id': 's1'}),
-                     DNA("ACG-", metadata={'id': 's2'})],
-                    [DNA("ACGT", metadata={'id': 's3'}),
-                     DNA("ACGT", metadata={'id': 's4'})],
-                    1, 0, 0)
-        actual = _traceback(tback_m, score_m,
-                            TabularMSA([DNA('ACG', metadata={'id': 's1'}),
-                                        DNA('ACG', metadata={'id': 's2'})]),
-                            TabularMSA([DNA('ACGT', metadata={'id': 's3'}),
-                                        DNA('ACGT', metadata={'id': 's4'})]),
-                            4, 3)
-        self.assertEqual(actual, expected)
-
-        # start at highest-score
-        expected = ([DNA("ACG", metadata={'id': 'foo'})],
-                    [DNA("ACG", metadata={'id': 'bar'})], 6, 0, 0)
-        actual = _traceback(tback_m, score_m,
-                            TabularMSA([DNA('ACG', metadata={'id': 'foo'})]),
-                            TabularMSA([DNA('ACGT', metadata={'id': 'bar'})]),
-                            3, 3)
-        self.assertEqual(actual, expected)
-
-        # terminate traceback before top-right
-        tback_m = [[0, 3, 3, 3],
-                   [2, 1, 3, 3],
-                   [2, 2, 0, 3],
-                   [2, 2, 2, 1],
-                   [2, 2, 2, 2]]
-        tback_m = np.array(tback_m)
-        expected = ([DNA("G", metadata={'id': 'a'})],
-                    [DNA("G", metadata={'id': 'a'})], 6, 2, 2)
-        actual = _traceback(tback_m, score_m,
-                            TabularMSA([DNA('ACG', metadata={'id': 'a'})]),
-                            TabularMSA([DNA('ACGT', metadata={'id': 'a'})]),
-                            3, 3)
-        self.assertEqual(actual, expected)
-
-    def test_first_largest(self):
-        input = [(5, 'a'), (5, 'b'), (5, 'c')]
-        self.assertEqual(_first_largest(input), (5, 'a'))
-        input = [(5, 'c'), (5, 'b'), (5, 'a')]
-        self.assertEqual(_first_largest(input), (5, 'c'))
-        input = [(5, 'c'), (6, 'b'), (5, 'a')]
-        self.assertEqual(_first_largest(input), (6, 'b'))
-        # works for more than three entries
-        input = [(5, 'c'), (6, 'b'), (5, 'a'), (7, 'd')]
-        self.assertEqual(_first_largest(input), (7, 'd'))
-        # Note that max([(5, 'a'), (5, 'c')]) == max([(5, 'c'), (5, 'a')])
-        # but for the purposes needed here, we want the max to be the same
-        # regardless of what the second item in the tuple is.
+        with self.assertRaisesRegex(ValueError, 'not contained in the'):
+            global_pairwise_align(
+                TabularMSA([DNA('AWG', metadata={'id': 'id'})]),
+                TabularMSA([DNA('ACGT', metadata={'id': 'id'})]), 5, 2, m)
 
 
 if __name__ == "__main__":
@@ -556,6 +556,54 @@ class TestStripedSmithWaterman(TestSSW):
         alignment = query("CGCGCGCCGCCGGGGGGCCGGCCGGCGCCGGGGGGCGCCCCGGGCGGGGC")
         self._check_alignment(alignment, expected)
 
+    def test_align_many_same_as_calling_object(self):
+        q_seq = "AGGGTAATTAGGCGTGTTCACCTA"
+        targets = [
+            "TTATAATTTTCTTATTATTATCAATATTTATAATTTGATTTTGTTGTAAT",
+            "AGGGTAATTAGGCGTGTTCACCTA",
+            "AGGGTAATTAGGCGTGTTCACCTACAGGGTAATTAGG",
+            "TGTTCACCTAGGGTAATTAGGCGTGTTC",
+            "",
+        ]
+        protein = {'protein': True, 'substitution_matrix': self.blosum50}
+        for kwargs in ({}, {'zero_index': False}, {'score_only': True},
+                       protein):
+            query = StripedSmithWaterman(q_seq, **kwargs)
+            for n_jobs, chunk_size in (1, 1024), (2, 2), (-1, 1):
+                obs = query.align_many(targets, n_jobs=n_jobs,
+                                       chunk_size=chunk_size)
+                self.assertEqual(obs.shape, (len(targets),))
+                for target, result in zip(targets, obs):
+                    exp = query(target)
+                    for name in obs.dtype.names:
+                        self.assertEqual(result[name], exp[name])
+
+    def test_align_many_empty(self):
+        query = StripedSmithWaterman("ACGT")
+        obs = query.align_many([])
+        self.assertEqual(obs.shape, (0,))
+        self.assertIn('cigar', obs.dtype.names)
+
+    def test_align_many_score_overflow(self):
+        # with score_size=0 only the 8-bit profile exists, and ssw_align
+        # gives up on alignments scoring 255 or more
+        seq = "ACGT" * 100
+        query = StripedSmithWaterman(seq, score_size=0)
+        with self.assertRaisesRegex(RuntimeError, "score_size"):
+            query.align_many(["ACGT", seq])
+        with self.assertRaisesRegex(RuntimeError, "score_size"):
+            query.align_many(["ACGT", seq, "ACGT"], n_jobs=2, chunk_size=1)
+        # short alignments still work with the 8-bit profile
+        obs = query.align_many(["ACGT"])
+        self.assertEqual(obs['cigar'][0], "4M")
+
+    def test_align_many_invalid_arguments(self):
+        query = StripedSmithWaterman("ACGT")
+        with self.assertRaisesRegex(ValueError, "n_jobs"):
+            query.align_many(["ACGT"], n_jobs=0)
+        with self.assertRaisesRegex(ValueError, "chunk_size"):
+            query.align_many(["ACGT"], chunk_size=0)
+
 
 class TestAlignStripedSmithWaterman(TestSSW):
 
@@ -163,9 +163,18 @@ Functions
     beta_diversity
     partial_beta_diversity
     block_beta_diversity
+    jackknifed_pcoa
     get_alpha_diversity_metrics
     get_beta_diversity_metrics
 
+Classes
+-------
+
+.. autosummary::
+   :toctree: generated/
+
+    PreparedTree
+
 Examples
 --------
 Create a matrix containing 6 samples (rows) and 7 OTUs (columns):
@@ -408,6 +417,8 @@ from ._driver import (
     get_beta_diversity_metrics,
 )
 from ._block import block_beta_diversity
+from ._jackknife import jackknifed_pcoa
+from ._prepared_tree import PreparedTree
 
 __all__ = [
     "alpha_diversity",
@@ -416,4 +427,6 @@ __all__ = [
     "get_beta_diversity_metrics",
     "partial_beta_diversity",
     "block_beta_diversity",
+    "jackknifed_pcoa",
+    "PreparedTree",
 ]
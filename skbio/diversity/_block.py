@@ -6,12 +6,18 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+from collections import deque
+from functools import partial
+import os
+
 import numpy as np
+from scipy.sparse import issparse
 
 from skbio.util._decorator import experimental
 from skbio.diversity._driver import partial_beta_diversity
 from skbio.stats.distance import DistanceMatrix
 from skbio.diversity._util import _validate_counts_matrix
+from skbio.diversity._prepared_tree import PreparedTree
 
 
 def _generate_id_blocks(ids, k=64):
@@ -99,7 +105,11 @@ def _block_party(counts=None, row_ids=None, col_ids=None, **kwargs):
 
     # remove from the block any empty observations
     # NOTE: this will perform an implicit copy
-    nonzero_cols = (counts_block != 0).any(axis=0)
+    if issparse(counts_block):
+        nonzero_cols = np.zeros(counts_block.shape[1], dtype=bool)
+        nonzero_cols[counts_block.indices[counts_block.data != 0]] = True
+    else:
+        nonzero_cols = (counts_block != 0).any(axis=0)
     counts_block = counts_block[:, nonzero_cols]
 
     kwargs["counts"] = counts_block
@@ -107,7 +117,10 @@ def _block_party(counts=None, row_ids=None, col_ids=None, **kwargs):
 
     if "tree" in kwargs and "otu_ids" in kwargs:
         kwargs["otu_ids"] = np.asarray(kwargs["otu_ids"])[nonzero_cols]
-        kwargs["tree"] = kwargs["tree"].shear(kwargs["otu_ids"])
+        tree = kwargs["tree"]
+        if isinstance(tree, PreparedTree):
+            tree = tree.tree
+        kwargs["tree"] = tree.shear(kwargs["otu_ids"])
 
     return kwargs
 
@@ -209,7 +222,47 @@ def _map(func, kw_gen):
         yield func(**kwargs)
 
 
-def _reduce(blocks):
+def _executor_map(executor, max_pending=None):
+    """Create a map function which distributes blocks over an executor.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor
+        Any object exposing a ``concurrent.futures``-compatible ``submit``
+        method (e.g., ``ProcessPoolExecutor``, ``ThreadPoolExecutor`` or a
+        ``dask.distributed`` client).
+    max_pending : int, optional
+        The maximum number of blocks in flight at any time. Defaults to twice
+        the number of CPUs.
+
+    Returns
+    -------
+    function
+        A function with the same signature as ``_map``.
+
+    Notes
+    -----
+    Blocks are submitted lazily and results are yielded in submission order,
+    so the reduce can proceed while later blocks are still being computed and
+    only ``max_pending`` blocks are held in memory at once.
+
+    """
+    if max_pending is None:
+        max_pending = 2 * (os.cpu_count() or 1)
+
+    def map_f(func, kw_gen):
+        pending = deque()
+        for kwargs in kw_gen:
+            pending.append(executor.submit(func, **kwargs))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    return map_f
+
+
+def _reduce(blocks, n_ids=None):
     """Reduce an iterable of partial distance matrices into a full matrix.
 
     Note, the reduce doesn't actually care about what pairs are computed
@@ -217,42 +270,42 @@ def _reduce(blocks):
     added. as such, this reduction is only safe to perform if by
     the block_beta_diversity method which assures that distances are not
     computed multiple times.
+
+    If ``n_ids`` is provided, the full matrix is preallocated and the blocks
+    are consumed as they arrive, without holding all of them in memory.
     """
-    all_blocks = list(blocks)
+    if n_ids is None:
+        blocks = list(blocks)
 
-    # Determine the maximum integer ID observed in the blocks. There exists a
-    # 1-1 mapping between the integer ID and a sample ID. We increment by 1
-    # as the integer ID space begins with zero, and we'll be using this value
-    # to determine the size of the resulting full distance matrix.
-    n_ids = max(map(lambda x: max(x.ids), all_blocks)) + 1
+        # Determine the maximum integer ID observed in the blocks. There
+        # exists a 1-1 mapping between the integer ID and a sample ID. We
+        # increment by 1 as the integer ID space begins with zero, and we'll
+        # be using this value to determine the size of the resulting full
+        # distance matrix.
+        n_ids = max(map(lambda x: max(x.ids), blocks)) + 1
 
     mat = np.zeros((n_ids, n_ids), dtype=float)
 
-    # TODO: something smarter.
-    for block in all_blocks:
-        n_blk_ids = len(block.ids)
-
-        # get the corresponding coordinates in the master matrix
-        master_idx = [
-            (i, j) for row, i in enumerate(block.ids) for j in block.ids[row + 1 :]
-        ]
-
-        # get the corresponding coordinates within the current block
-        block_idx = [
-            (i, j)
-            for row, i in enumerate(range(n_blk_ids))
-            for j in range(row + 1, n_blk_ids)
-        ]
-
-        for (m_i, m_j), (b_i, b_j) in zip(master_idx, block_idx):
-            mat[m_i, m_j] += block.data[b_i, b_j]
+    for block in blocks:
+        # scatter the upper triangle of the block into the master matrix
+        blk_ids = np.asarray(block.ids, dtype=np.intp)
+        b_i, b_j = np.triu_indices(len(blk_ids), 1)
+        mat[blk_ids[b_i], blk_ids[b_j]] += block.data[b_i, b_j]
 
     return DistanceMatrix(mat + mat.T, list(range(n_ids)))
 
 
 @experimental(as_of="0.5.1")
 def block_beta_diversity(
-    metric, counts, ids, validate=True, k=64, reduce_f=None, map_f=None, **kwargs
+    metric,
+    counts,
+    ids,
+    validate=True,
+    k=64,
+    reduce_f=None,
+    map_f=None,
+    executor=None,
+    **kwargs,
 ):
     """Perform a block-decomposition beta diversity calculation.
 
@@ -262,7 +315,7 @@ def block_beta_diversity(
         The pairwise distance function to apply. If ``metric`` is a string, it
         must be resolvable by scikit-bio (e.g., UniFrac methods), or must be
         callable.
-    counts : 2D array_like of ints or floats
+    counts : 2D array_like of ints or floats, or scipy.sparse matrix
         Matrix containing count/abundance data where each row contains counts
         of OTUs in a given sample.
     ids : iterable of strs
@@ -283,6 +336,12 @@ def block_beta_diversity(
 
         NOTE: ipyparallel's `map_async` will not work here as we need to be
         able to pass around `**kwargs``.
+    executor : concurrent.futures.Executor, optional
+        An executor (e.g., ``concurrent.futures.ProcessPoolExecutor``) over
+        which blocks are distributed. Each block's counts and, if applicable,
+        its sheared tree are prepared in the calling process and only those
+        are shipped to the workers. When using a process pool, ``metric`` and
+        ``kwargs`` must be picklable. Cannot be combined with ``map_f``.
     k : int, optional
         The blocksize used when computing distances
     kwargs : kwargs, optional
@@ -313,18 +372,18 @@ def block_beta_diversity(
     .. [1] http://www.earthmicrobiome.org/
 
     """
+    if executor is not None and map_f is not None:
+        raise ValueError("`executor` and `map_f` cannot both be specified.")
+
     if validate:
         counts = _validate_counts_matrix(counts, ids=ids)
 
     if reduce_f is None:
-        reduce_f = _reduce
-
-    if map_f is None:
-        map_f = _map
+        reduce_f = partial(_reduce, n_ids=counts.shape[0])
 
     # The block method uses numeric IDs to take advantage of fancy indexing
     # with numpy.
-    tmp_ids = np.arange(len(counts))
+    tmp_ids = np.arange(counts.shape[0])
     kwargs["ids"] = tmp_ids
 
     kwargs["metric"] = metric
@@ -332,7 +391,15 @@ def block_beta_diversity(
     kwargs["k"] = k
     kwargs["validate"] = False  # we've already validated if necessary
 
-    dm = reduce_f(map_f(_block_compute, _block_kwargs(**kwargs)))
+    if executor is not None:
+        # subset the counts and shear the tree locally so that workers only
+        # receive the data relevant to their block
+        blocks = (_block_party(**kw) for kw in _block_kwargs(**kwargs))
+        dm = reduce_f(_executor_map(executor)(partial_beta_diversity, blocks))
+    else:
+        if map_f is None:
+            map_f = _map
+        dm = reduce_f(map_f(_block_compute, _block_kwargs(**kwargs)))
     dm.ids = ids
 
     return dm
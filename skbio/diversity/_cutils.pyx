@@ -0,0 +1,133 @@
+# -----------------------------------------------------------------------------
+#  Copyright (c) 2013--, scikit-bio development team.
+#
+#  Distributed under the terms of the Modified BSD License.
+#
+#  The full license is in the file LICENSE.txt, distributed with this software.
+# -----------------------------------------------------------------------------
+
+cimport cython
+from cython.parallel import prange
+from libc.math cimport fabs
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _sparse_braycurtis_pdist(const Py_ssize_t[::1] indptr,
+                             const Py_ssize_t[::1] indices,
+                             const double[::1] data,
+                             double[::1] out):
+    """Compute Bray-Curtis distances between all rows of a CSR matrix.
+
+    Parameters
+    ----------
+    indptr, indices, data : 1D array_like
+        Components of a CSR matrix in canonical format (sorted indices, no
+        duplicates), in which each row is a sample.
+    out : 1D array_like of double
+        Condensed distance matrix of length ``n * (n - 1) / 2``, where ``n``
+        is the number of rows, to be filled in.
+
+    Notes
+    -----
+    Only the union of the stored entries of each pair of rows is visited, in
+    column order. Entries absent from both rows contribute nothing to the
+    sums, therefore results are identical to those of ``pdist(...,
+    'braycurtis')`` on the equivalent dense matrix, including ``nan`` for
+    pairs of empty rows.
+
+    """
+    cdef Py_ssize_t n = indptr.shape[0] - 1
+    cdef Py_ssize_t i, j, a, b, a_end, b_end, base
+    cdef double s1, s2, u, v
+
+    for i in prange(n, nogil=True, schedule='dynamic'):
+        base = n * i - i * (i + 1) // 2 - i - 1
+        a_end = indptr[i + 1]
+        for j in range(i + 1, n):
+            s1 = 0.0
+            s2 = 0.0
+            a = indptr[i]
+            b = indptr[j]
+            b_end = indptr[j + 1]
+            while a < a_end or b < b_end:
+                if b == b_end or (a < a_end and indices[a] < indices[b]):
+                    u = data[a]
+                    v = 0.0
+                    a = a + 1
+                elif a == a_end or indices[b] < indices[a]:
+                    u = 0.0
+                    v = data[b]
+                    b = b + 1
+                else:
+                    u = data[a]
+                    v = data[b]
+                    a = a + 1
+                    b = b + 1
+                s1 = s1 + fabs(u - v)
+                s2 = s2 + fabs(u + v)
+            out[base + j] = s1 / s2
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _sparse_jaccard_pdist(const Py_ssize_t[::1] indptr,
+                          const Py_ssize_t[::1] indices,
+                          const double[::1] data,
+                          double[::1] out):
+    """Compute Jaccard distances between all rows of a CSR matrix.
+
+    Parameters
+    ----------
+    indptr, indices, data : 1D array_like
+        Components of a CSR matrix in canonical format (sorted indices, no
+        duplicates), in which each row is a sample.
+    out : 1D array_like of double
+        Condensed distance matrix of length ``n * (n - 1) / 2``, where ``n``
+        is the number of rows, to be filled in.
+
+    Notes
+    -----
+    Follows the definition of ``pdist(..., 'jaccard')``: the proportion of
+    positions that are nonzero in at least one row where the two rows differ,
+    or zero if neither row has any nonzero position.
+
+    """
+    cdef Py_ssize_t n = indptr.shape[0] - 1
+    cdef Py_ssize_t i, j, a, b, a_end, b_end, base
+    cdef Py_ssize_t num, denom
+    cdef double u, v
+
+    for i in prange(n, nogil=True, schedule='dynamic'):
+        base = n * i - i * (i + 1) // 2 - i - 1
+        a_end = indptr[i + 1]
+        for j in range(i + 1, n):
+            num = 0
+            denom = 0
+            a = indptr[i]
+            b = indptr[j]
+            b_end = indptr[j + 1]
+            while a < a_end or b < b_end:
+                if b == b_end or (a < a_end and indices[a] < indices[b]):
+                    u = data[a]
+                    v = 0.0
+                    a = a + 1
+                elif a == a_end or indices[b] < indices[a]:
+                    u = 0.0
+                    v = data[b]
+                    b = b + 1
+                else:
+                    u = data[a]
+                    v = data[b]
+                    a = a + 1
+                    b = b + 1
+                if u != 0 or v != 0:
+                    denom = denom + 1
+                    if u != v:
+                        num = num + 1
+            if denom == 0:
+                out[base + j] = 0.0
+            else:
+                out[base + j] = <double>num / denom
@@ -10,14 +10,22 @@ import functools
 import itertools
 
 import numpy as np
+import scipy.sparse
 import scipy.spatial.distance
+from scipy.sparse import issparse
 import pandas as pd
 
 import skbio
+from skbio.diversity._prepared_tree import _prepare_tree
 from skbio.diversity.alpha._pd import _faith_pd, _phydiv, _setup_pd
+from skbio.diversity.alpha._vectorized import (
+    _get_vectorized_alpha_diversity_metric_map,
+)
 from skbio.diversity.beta._unifrac import (
     _setup_multiple_unweighted_unifrac,
     _setup_multiple_weighted_unifrac,
+    _multiple_unweighted_unifrac,
+    _multiple_weighted_unifrac,
     _normalize_weighted_unifrac_by_default,
 )
 from skbio.util._decorator import experimental, deprecated
@@ -26,6 +34,7 @@ from skbio.diversity._util import (
     _validate_counts_matrix,
     _get_phylogenetic_kwargs,
     _quantitative_to_qualitative_counts,
+    _sparse_pdist,
 )
 
 
@@ -129,7 +138,7 @@ def alpha_diversity(metric, counts, ids=None, validate=True, **kwargs):
         The alpha diversity metric to apply to the sample(s). Passing metric as
         a string is preferable as this often results in an optimized version of
         the metric being used.
-    counts : 1D or 2D array_like of ints or floats
+    counts : 1D or 2D array_like of ints or floats, or scipy.sparse matrix
         Vector or matrix containing count/abundance data. If a matrix, each row
         should contain counts of OTUs in a given sample.
     ids : iterable of strs, optional
@@ -166,14 +175,40 @@ def alpha_diversity(metric, counts, ids=None, validate=True, **kwargs):
     skbio.diversity.get_alpha_diversity_metrics
     skbio.diversity.beta_diversity
 
+    Notes
+    -----
+    Many of the closed-form metrics (e.g., ``shannon``, ``simpson``,
+    ``chao1``, ``sobs``) are computed over all samples at once, rather than by
+    calling the metric function once per sample. These metrics also operate
+    directly on a ``scipy.sparse`` ``counts`` matrix without densifying it.
+
     """
     metric_map = _get_alpha_diversity_metric_map()
+    vectorized_map = _get_vectorized_alpha_diversity_metric_map()
 
     if validate:
         counts = _validate_counts_matrix(counts, ids=ids)
 
+    if isinstance(metric, str) and metric in vectorized_map:
+        if issparse(counts):
+            counts = counts.tocsr()
+        else:
+            counts = np.atleast_2d(np.asarray(counts))
+            # most feature tables are dominated by zeros, which the metrics
+            # don't need to visit
+            if np.count_nonzero(counts) < counts.size // 4:
+                counts = scipy.sparse.csr_matrix(counts)
+        results = vectorized_map[metric](counts, **kwargs)
+        return pd.Series(results, index=ids)
+
+    # phylogenetic metrics propagate sparse counts up the tree, others are
+    # applied to one (dense) sample at a time
+    if issparse(counts) and metric not in ("faith_pd", "phydiv"):
+        counts = counts.toarray()
+
     if metric == "faith_pd":
         otu_ids, tree, kwargs = _get_phylogenetic_kwargs(counts, **kwargs)
+        tree = _prepare_tree(tree)
         counts_by_node, branch_lengths = _setup_pd(
             counts, otu_ids, tree, validate, rooted=True, single_sample=False
         )
@@ -182,12 +217,13 @@ def alpha_diversity(metric, counts, ids=None, validate=True, **kwargs):
 
     elif metric == "phydiv":
         otu_ids, tree, kwargs = _get_phylogenetic_kwargs(counts, **kwargs)
+        tree = _prepare_tree(tree)
         counts_by_node, branch_lengths = _setup_pd(
             counts, otu_ids, tree, validate, rooted=False, single_sample=False
         )
         counts = counts_by_node
         if "rooted" not in kwargs:
-            kwargs["rooted"] = len(tree.root().children) == 2
+            kwargs["rooted"] = tree.rooted
         if "weight" not in kwargs:
             kwargs["weight"] = False
         metric = functools.partial(_phydiv, branch_lengths=branch_lengths, **kwargs)
@@ -223,7 +259,7 @@ def partial_beta_diversity(metric, counts, ids, id_pairs, validate=True, **kwarg
         The pairwise distance function to apply. If ``metric`` is a string, it
         must be resolvable by scikit-bio (e.g., UniFrac methods), or must be
         callable.
-    counts : 2D array_like of ints or floats
+    counts : 2D array_like of ints or floats, or scipy.sparse matrix
         Matrix containing count/abundance data where each row contains counts
         of OTUs in a given sample.
     ids : iterable of strs
@@ -292,6 +328,8 @@ def partial_beta_diversity(metric, counts, ids, id_pairs, validate=True, **kwarg
         # remove all values from kwargs, since they have already been provided
         # through the partial
         kwargs = {}
+        if issparse(counts):
+            counts = counts.toarray()
     else:
         raise ValueError(
             "partial_beta_diversity is only compatible with "
@@ -364,7 +402,9 @@ def beta_diversity(
         results in an optimized version of the metric being used.
     counts : 2D array_like of ints or floats or 2D pandas DataFrame
         Matrix containing count/abundance data where each row contains counts
-        of OTUs in a given sample.
+        of OTUs in a given sample. A ``scipy.sparse`` matrix is also accepted:
+        UniFrac, Bray-Curtis and Jaccard distances are computed without
+        densifying it.
     ids : iterable of strs, optional
         Identifiers for each sample in ``counts``. By default, samples will be
         assigned integer identifiers in the order that they were provided
@@ -385,7 +425,12 @@ def beta_diversity(
         ``sklearn.metrics.pairwise_distances``. By default,
         ``scipy.spatial.distance.pdist`` will be used.
     kwargs : kwargs, optional
-        Metric-specific parameters.
+        Metric-specific parameters. The UniFrac metrics also accept
+        ``n_jobs``, the number of threads computing the pairs of samples when
+        `pairwise_func` is not provided. If not provided, the default number
+        of threads of OpenMP is used (``OMP_NUM_THREADS`` if set, otherwise
+        all CPUs available to the process). If -1, all available CPUs are
+        used.
 
     Returns
     -------
@@ -425,7 +470,14 @@ def beta_diversity(
 
     if metric == "unweighted_unifrac":
         counts = _quantitative_to_qualitative_counts(counts)
+        n_jobs = kwargs.pop("n_jobs", None)
         otu_ids, tree, kwargs = _get_phylogenetic_kwargs(counts, **kwargs)
+        if pairwise_func is None and not kwargs:
+            # compute all pairs at once with a compiled routine
+            distances = _multiple_unweighted_unifrac(
+                counts, otu_ids=otu_ids, tree=tree, validate=validate, n_jobs=n_jobs
+            )
+            return DistanceMatrix(distances, ids)
         metric, counts_by_node = _setup_multiple_unweighted_unifrac(
             counts, otu_ids=otu_ids, tree=tree, validate=validate
         )
@@ -434,7 +486,18 @@ def beta_diversity(
         # get the value for normalized. if it was not provided, it will fall
         # back to the default value inside of _weighted_unifrac_pdist_f
         normalized = kwargs.pop("normalized", _normalize_weighted_unifrac_by_default)
+        n_jobs = kwargs.pop("n_jobs", None)
         otu_ids, tree, kwargs = _get_phylogenetic_kwargs(counts, **kwargs)
+        if pairwise_func is None and not kwargs:
+            distances = _multiple_weighted_unifrac(
+                counts,
+                otu_ids=otu_ids,
+                tree=tree,
+                normalized=normalized,
+                validate=validate,
+                n_jobs=n_jobs,
+            )
+            return DistanceMatrix(distances, ids)
         metric, counts_by_node = _setup_multiple_weighted_unifrac(
             counts, otu_ids=otu_ids, tree=tree, normalized=normalized, validate=validate
         )
@@ -462,6 +525,12 @@ def beta_diversity(
         # example one of the SciPy metrics
         pass
 
+    if issparse(counts) and pairwise_func is None:
+        if metric in ("braycurtis", "jaccard") and not kwargs:
+            # compute distances on sparse rows without densifying the matrix
+            return DistanceMatrix(_sparse_pdist(counts, metric), ids)
+        counts = counts.toarray()
+
     if pairwise_func is None:
         pairwise_func = scipy.spatial.distance.pdist
 
@@ -0,0 +1,234 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix, issparse
+
+from skbio.util import get_rng
+from skbio.util._decorator import experimental
+from skbio.stats import subsample_counts
+from skbio.stats.ordination import pcoa
+from skbio.stats.ordination._utils import _procrustes
+from skbio.diversity._driver import beta_diversity
+from skbio.diversity._util import _validate_counts_matrix
+from skbio.diversity._block import _executor_map, _map
+
+
+@experimental(as_of="0.6.0")
+def jackknifed_pcoa(
+    metric,
+    counts,
+    ids,
+    depth,
+    replicates=100,
+    number_of_dimensions=3,
+    master=None,
+    seed=None,
+    executor=None,
+    validate=True,
+    **kwargs,
+):
+    """Assess the stability of a PCoA by jackknifing the counts.
+
+    Each replicate rarefies every sample to `depth` counts, computes the beta
+    diversity between the rarefied samples and their principal coordinates,
+    which are then aligned to the master ordination by Procrustes analysis.
+    The dispersion of the aligned coordinates of a sample across replicates
+    reflects how much its position depends on the sequencing depth.
+
+    Parameters
+    ----------
+    metric : str or callable
+        The pairwise distance function to apply. See
+        ``skbio.diversity.beta_diversity`` for details.
+    counts : 2D array_like of ints, or scipy.sparse matrix
+        Matrix containing count data where each row contains counts of OTUs
+        in a given sample.
+    ids : iterable of strs
+        Identifiers for each sample in ``counts``.
+    depth : int
+        Number of counts to which each sample is rarefied. All samples must
+        have at least that many counts.
+    replicates : int, optional
+        Number of jackknife replicates.
+    number_of_dimensions : int, optional
+        Number of axes of the ordinations on which the replicates are aligned
+        and summarized.
+    master : OrdinationResults, optional
+        Master ordination to which the replicates are aligned. Its samples
+        must include `ids`. If not provided, it is the PCoA of the beta
+        diversity between the samples, computed from all their counts.
+    seed : int or np.random.Generator, optional
+        A user-provided random seed or random generator instance used to
+        rarefy the samples. Each replicate is rarefied with its own seed drawn
+        from it, so the results do not depend on `executor`.
+    executor : concurrent.futures.Executor, optional
+        An executor (e.g., ``concurrent.futures.ProcessPoolExecutor``) over
+        which replicates are distributed. When using a process pool,
+        ``metric`` and ``kwargs`` must be picklable. If not provided, the
+        replicates are computed in the calling process. With an executor,
+        the UniFrac metrics use a single thread per replicate, unless
+        ``n_jobs`` is provided in `kwargs`.
+    validate : bool, optional
+        See ``skbio.diversity.beta_diversity`` for details.
+    kwargs : kwargs, optional
+        Metric-specific parameters.
+
+    Returns
+    -------
+    master : OrdinationResults
+        The master ordination (`master` if provided).
+    dispersion : pd.DataFrame
+        Standard deviation of the aligned coordinates of each sample (rows)
+        on each axis (columns) across replicates.
+    m_squared : pd.Series
+        Procrustes M^2 statistic between each replicate and the master
+        ordination.
+
+    Raises
+    ------
+    ValueError
+        If a sample has fewer than `depth` counts, or if `master` lacks
+        samples.
+
+    See Also
+    --------
+    skbio.diversity.beta_diversity
+    skbio.stats.subsample_counts
+    skbio.stats.ordination.pcoa
+
+    Notes
+    -----
+    This is the jackknifed beta diversity procedure of QIIME [1]_, in which
+    the master ordination is computed from the full counts.
+
+    The replicates are submitted to `executor` lazily, and the results are
+    accumulated as they are collected, so that only the coordinates of a
+    bounded number of replicates, and no distance matrix, are held at once
+    by the calling process. Only the aligned coordinates are sent back by
+    the workers.
+
+    References
+    ----------
+    .. [1] Caporaso, J. G., et al. "QIIME allows analysis of high-throughput
+       community sequencing data." Nature methods 7.5 (2010): 335-336.
+
+    Examples
+    --------
+    >>> from skbio.diversity import jackknifed_pcoa
+    >>> counts = [[23, 64, 14, 0, 0, 3, 1],
+    ...           [0, 3, 35, 42, 0, 12, 1],
+    ...           [0, 5, 5, 0, 40, 40, 0],
+    ...           [44, 35, 9, 0, 1, 0, 0],
+    ...           [0, 2, 8, 0, 35, 45, 1],
+    ...           [0, 0, 25, 35, 0, 19, 0]]
+    >>> ids = list('ABCDEF')
+    >>> master, dispersion, m_squared = jackknifed_pcoa(
+    ...     'braycurtis', counts, ids, depth=70, replicates=10, seed=42)
+    >>> dispersion.shape
+    (6, 3)
+    >>> len(m_squared)
+    10
+
+    """
+    if depth < 1:
+        raise ValueError("`depth` must be at least 1.")
+    if replicates < 1:
+        raise ValueError("`replicates` must be at least 1.")
+    if number_of_dimensions < 1:
+        raise ValueError("`number_of_dimensions` must be at least 1.")
+
+    ids = list(ids)
+    if validate:
+        counts = _validate_counts_matrix(counts, ids=ids)
+    elif issparse(counts):
+        counts = counts.tocsr()
+    else:
+        counts = np.asarray(counts)
+
+    totals = np.asarray(counts.sum(axis=1)).ravel()
+    if (totals < depth).any():
+        shallow = [id_ for id_, total in zip(ids, totals) if total < depth]
+        raise ValueError(
+            "All samples must have at least %d counts. Samples with fewer "
+            "counts: %s" % (depth, ", ".join(map(str, shallow)))
+        )
+
+    number_of_dimensions = min(number_of_dimensions, len(ids))
+    if master is None:
+        dm = beta_diversity(metric, counts, ids, validate=False, **kwargs)
+        master = pcoa(dm, number_of_dimensions=number_of_dimensions)
+    missing = pd.Index(ids).difference(master.samples.index)
+    if len(missing):
+        raise ValueError(
+            "The master ordination lacks samples: %s" % ", ".join(map(str, missing))
+        )
+    reference = master.samples.loc[ids].iloc[:, :number_of_dimensions]
+
+    replicate_kwargs = kwargs
+    if executor is not None and metric in ("unweighted_unifrac", "weighted_unifrac"):
+        # the replicates already run in parallel, so that each of them using
+        # all CPUs would oversubscribe the machine
+        replicate_kwargs = dict(kwargs)
+        replicate_kwargs.setdefault("n_jobs", 1)
+
+    rng = get_rng(seed)
+    seeds = rng.integers(np.iinfo(np.int64).max, size=replicates)
+    kw_gen = (
+        dict(
+            replicate_kwargs,
+            metric=metric,
+            counts=counts,
+            ids=ids,
+            depth=depth,
+            seed=int(replicate_seed),
+            reference=reference.values,
+        )
+        for replicate_seed in seeds
+    )
+    map_f = _map if executor is None else _executor_map(executor)
+
+    # accumulate the mean and the sum of squared deviations of the aligned
+    # coordinates one replicate at a time (Welford's algorithm)
+    mean = np.zeros(reference.shape)
+    sum_sq = np.zeros(reference.shape)
+    m_squared = np.empty(replicates)
+    for i, (aligned, m_sq) in enumerate(map_f(_jackknife_replicate, kw_gen)):
+        m_squared[i] = m_sq
+        delta = aligned - mean
+        mean += delta / (i + 1)
+        sum_sq += delta * (aligned - mean)
+
+    ddof = 1 if replicates > 1 else 0
+    dispersion = pd.DataFrame(
+        np.sqrt(sum_sq / (replicates - ddof)),
+        index=reference.index,
+        columns=reference.columns,
+    )
+    return master, dispersion, pd.Series(m_squared, name="M^2")
+
+
+def _jackknife_replicate(metric, counts, ids, depth, seed, reference, **kwargs):
+    """Compute the PCoA of rarefied counts, aligned to the reference."""
+    rng = get_rng(seed)
+    if issparse(counts):
+        # only the stored counts of each sample are subsampled
+        data = np.empty(counts.data.shape, dtype=int)
+        for i in range(counts.shape[0]):
+            start, stop = counts.indptr[i], counts.indptr[i + 1]
+            data[start:stop] = subsample_counts(
+                counts.data[start:stop], depth, seed=rng
+            )
+        rarefied = csr_matrix((data, counts.indices, counts.indptr), counts.shape)
+    else:
+        rarefied = np.array([subsample_counts(row, depth, seed=rng) for row in counts])
+
+    dm = beta_diversity(metric, rarefied, ids, validate=False, **kwargs)
+    coords = pcoa(dm, number_of_dimensions=reference.shape[1]).samples.values
+    return _procrustes(reference, coords)
@@ -9,6 +9,9 @@
 import numpy as np
 cimport numpy as np
 cimport cython
+from cython.parallel import prange, parallel, threadid
+from libc.math cimport fabs
+from scipy.sparse import issparse
 
 DTYPE = np.int64
 ctypedef np.int64_t DTYPE_t
@@ -140,22 +143,27 @@ cdef _traverse_reduce(np.ndarray[DTYPE_t, ndim=2] child_index,
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def _nodes_by_counts(np.ndarray counts,
+def _nodes_by_counts(object counts,
                      np.ndarray tip_ids,
-                     dict indexed):
+                     dict indexed,
+                     dict node_lookup=None):
     """Construct the count array, and the counts up the tree
 
     Parameters
     ----------
-    counts : np.array of int
+    counts : np.array of int or scipy.sparse matrix
         A 1D or 2D vector in which each row corresponds to the observed counts
         in an environment. The rows are expected to be in order with respect to
-        `tip_ids`.
+        `tip_ids`. A sparse matrix is not densified: only its stored counts
+        are placed at the tips before being propagated up the tree.
     tip_ids : np.array of str
         A vector of tip names that correspond to the columns in the `counts`
         matrix.
     indexed : dict
         The result of `index_tree`.
+    node_lookup : dict, optional
+        A mapping of node names to their positions in `indexed`, which is
+        built from `indexed` if not provided.
 
     Returns
     -------
@@ -170,27 +178,36 @@ def _nodes_by_counts(np.ndarray counts,
         Py_ssize_t i, j
         set observed_ids_set
         object n
-        dict node_lookup
         DTYPE_t n_count_vectors, n_count_otus
+        bint is_sparse
 
     nodes = indexed['name']
 
-    # allow counts to be a vector
-    counts = np.atleast_2d(counts)
-    counts = counts.astype(DTYPE, copy=False)
-
-    # determine observed IDs. It may be possible to unroll these calls to
-    # squeeze a little more performance
-    observed_indices = counts.sum(0).nonzero()[0]
+    is_sparse = issparse(counts)
+    if is_sparse:
+        counts = counts.tocoo()
+        counts.sum_duplicates()
+        counts = counts.astype(DTYPE, copy=False)
+        observed_indices = np.unique(counts.col[counts.data != 0]).astype(
+            DTYPE, copy=False)
+    else:
+        # allow counts to be a vector
+        counts = np.atleast_2d(counts)
+        counts = counts.astype(DTYPE, copy=False)
+
+        # determine observed IDs. It may be possible to unroll these calls to
+        # squeeze a little more performance
+        observed_indices = counts.sum(0).nonzero()[0]
     observed_ids = tip_ids[observed_indices]
-    observed_ids_set = set(observed_ids)
 
     # construct mappings of the observed to their positions in the node array
-    node_lookup = {}
-    for i in range(nodes.shape[0]):
-        n = nodes[i]
-        if n in observed_ids_set:
-            node_lookup[n] = i
+    if node_lookup is None:
+        observed_ids_set = set(observed_ids)
+        node_lookup = {}
+        for i in range(nodes.shape[0]):
+            n = nodes[i]
+            if n in observed_ids_set:
+                node_lookup[n] = i
 
     # determine the positions of the observed IDs in nodes
     otus_in_nodes = np.zeros(observed_ids.shape[0], dtype=DTYPE)
@@ -204,13 +221,192 @@ def _nodes_by_counts(np.ndarray counts,
 
     # populate the counts array with the counts of each observation in each
     # env
-    counts_t = counts.transpose()
-    n_count_otus = otus_in_nodes.shape[0]
-    for i in range(n_count_otus):
-        for j in range(n_count_vectors):
-            count_array[otus_in_nodes[i], j] = counts_t[observed_indices[i], j]
+    if is_sparse:
+        # scatter the stored counts to the rows of their tips
+        tip_rows = np.full(counts.shape[1], -1, dtype=DTYPE)
+        tip_rows[observed_indices] = otus_in_nodes
+        keep = counts.data != 0
+        count_array[tip_rows[counts.col[keep]], counts.row[keep]] = \
+            counts.data[keep]
+    else:
+        counts_t = counts.transpose()
+        n_count_otus = otus_in_nodes.shape[0]
+        for i in range(n_count_otus):
+            for j in range(n_count_vectors):
+                count_array[otus_in_nodes[i], j] = \
+                    counts_t[observed_indices[i], j]
 
     child_index = indexed['child_index'].astype(DTYPE, copy=False)
-    _traverse_reduce(child_index, count_array)
+
+    # a tree made of a single tip (e.g., sheared to one OTU) has no internal
+    # nodes to propagate counts to
+    if child_index.shape[1] != 0:
+        _traverse_reduce(child_index, count_array)
 
     return count_array
+
+
+
+cdef double _pairwise_sum(const double* a, Py_ssize_t n) noexcept nogil:
+    """Sum a vector in the same order as NumPy (pairwise summation).
+
+    This makes the results identical to those calculated by NumPy, e.g., by
+    ``_unweighted_unifrac`` and ``_weighted_unifrac``.
+    """
+    cdef Py_ssize_t i, j, n2
+    cdef double res
+    cdef double r[8]
+    if n < 8:
+        res = 0.0
+        for i in range(n):
+            res += a[i]
+        return res
+    elif n <= 128:
+        for j in range(8):
+            r[j] = a[j]
+        i = 8
+        while i < n - (n % 8):
+            for j in range(8):
+                r[j] += a[i + j]
+            i += 8
+        res = ((r[0] + r[1]) + (r[2] + r[3])) + ((r[4] + r[5]) + (r[6] + r[7]))
+        while i < n:
+            res += a[i]
+            i += 1
+        return res
+    else:
+        # divide by two but avoid non-multiples of unroll factor
+        n2 = n // 2
+        n2 -= n2 % 8
+        return _pairwise_sum(a, n2) + _pairwise_sum(a + n2, n - n2)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _unweighted_unifrac_pdist(const np.uint8_t[:, ::1] presence,
+                              const double[::1] branch_lengths,
+                              double[::1] out,
+                              int num_threads):
+    """Calculate unweighted UniFrac distances between all pairs of samples
+
+    Parameters
+    ----------
+    presence : np.ndarray of uint8
+        A matrix in which each row corresponds to a sample and each column to
+        a node in the tree (in the order of ``branch_lengths``), indicating
+        the presence (1) or absence (0) of the node in the sample.
+    branch_lengths : np.ndarray of double
+        Branch lengths of all nodes in the tree.
+    out : np.ndarray of double
+        Condensed distance matrix (see ``scipy.spatial.distance.pdist``) of
+        length n * (n - 1) / 2, where n is the number of samples. It is
+        filled in place.
+    num_threads : int
+        Number of threads to use.
+
+    Notes
+    -----
+    Pairs of samples are distributed across threads.
+    """
+    cdef:
+        Py_ssize_t n_samples = presence.shape[0]
+        Py_ssize_t n_nodes = presence.shape[1]
+        Py_ssize_t i, j, k, pos
+        double unique, observed
+        double* unique_lengths
+        double* observed_lengths
+        # scratch space of each thread, allocated while holding the GIL so
+        # that running out of memory raises a MemoryError
+        double[:, ::1] buffers = np.empty((num_threads, 2 * n_nodes))
+
+    with nogil, parallel(num_threads=num_threads):
+        unique_lengths = &buffers[threadid(), 0]
+        observed_lengths = unique_lengths + n_nodes
+        for i in prange(n_samples, schedule='dynamic'):
+            # position of pair (i, i + 1) in the condensed matrix
+            pos = n_samples * i - i * (i + 1) // 2
+            for j in range(i + 1, n_samples):
+                for k in range(n_nodes):
+                    unique_lengths[k] = branch_lengths[k] * (
+                        presence[i, k] ^ presence[j, k])
+                    observed_lengths[k] = branch_lengths[k] * (
+                        presence[i, k] | presence[j, k])
+                unique = _pairwise_sum(unique_lengths, n_nodes)
+                observed = _pairwise_sum(observed_lengths, n_nodes)
+                # handle special case to avoid division by zero
+                if observed == 0.0:
+                    out[pos] = 0.0
+                else:
+                    out[pos] = unique / observed
+                pos = pos + 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _weighted_unifrac_pdist(const double[:, ::1] proportions,
+                            const double[::1] branch_lengths,
+                            const double[::1] node_to_root_distances,
+                            const np.uint8_t[::1] empty,
+                            bint normalized,
+                            double[::1] out,
+                            int num_threads):
+    """Calculate weighted UniFrac distances between all pairs of samples
+
+    Parameters
+    ----------
+    proportions : np.ndarray of double
+        A matrix in which each row corresponds to a sample and each column to
+        a node in the tree (in the order of ``branch_lengths``), indicating
+        the proportional abundance of the node in the sample.
+    branch_lengths : np.ndarray of double
+        Branch lengths of all nodes in the tree.
+    node_to_root_distances : np.ndarray of double
+        Distances of the tips to the root (zero for internal nodes). Ignored
+        if ``normalized`` is False.
+    empty : np.ndarray of uint8
+        Whether each sample has no counts. The normalized distance between
+        two empty samples is 0.
+    normalized : bool
+        Whether to normalize the distances.
+    out : np.ndarray of double
+        Condensed distance matrix (see ``scipy.spatial.distance.pdist``) of
+        length n * (n - 1) / 2, where n is the number of samples. It is
+        filled in place.
+    num_threads : int
+        Number of threads to use.
+
+    Notes
+    -----
+    Pairs of samples are distributed across threads.
+    """
+    cdef:
+        Py_ssize_t n_samples = proportions.shape[0]
+        Py_ssize_t n_nodes = proportions.shape[1]
+        Py_ssize_t i, j, k, pos
+        double dist
+        double* terms
+        # scratch space of each thread (see _unweighted_unifrac_pdist)
+        double[:, ::1] buffers = np.empty((num_threads, n_nodes))
+
+    with nogil, parallel(num_threads=num_threads):
+        terms = &buffers[threadid(), 0]
+        for i in prange(n_samples, schedule='dynamic'):
+            # position of pair (i, i + 1) in the condensed matrix
+            pos = n_samples * i - i * (i + 1) // 2
+            for j in range(i + 1, n_samples):
+                if normalized and empty[i] and empty[j]:
+                    # handle special case to avoid division by zero
+                    out[pos] = 0.0
+                else:
+                    for k in range(n_nodes):
+                        terms[k] = branch_lengths[k] * fabs(
+                            proportions[i, k] - proportions[j, k])
+                    dist = _pairwise_sum(terms, n_nodes)
+                    if normalized:
+                        # branch length correction
+                        for k in range(n_nodes):
+                            terms[k] = node_to_root_distances[k] * (
+                                proportions[i, k] + proportions[j, k])
+                        dist = dist / _pairwise_sum(terms, n_nodes)
+                    out[pos] = dist
+                pos = pos + 1
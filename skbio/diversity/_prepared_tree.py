@@ -0,0 +1,181 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+
+from skbio.util._decorator import experimental
+from skbio.diversity._phylogenetic import _tip_distances
+
+
+class PreparedTree:
+    r"""A phylogenetic tree prepared for repeated diversity calculations.
+
+    Phylogenetic diversity metrics (e.g., ``faith_pd``, ``phydiv``,
+    ``unweighted_unifrac`` and ``weighted_unifrac``) need an array
+    representation of the tree, and validate the tree before using it. A
+    ``PreparedTree`` performs these steps once, so that it can be passed as
+    ``tree`` to any of these metrics, or to the diversity driver functions,
+    without repeating them on every call.
+
+    Parameters
+    ----------
+    tree : skbio.TreeNode
+        The tree to prepare. It should not be modified afterwards.
+
+    Attributes
+    ----------
+    tree : skbio.TreeNode
+        The prepared tree.
+    tree_index : dict
+        The array representation of the tree as returned by
+        ``TreeNode.to_array``, with missing branch lengths set to zero.
+    branch_lengths : np.ndarray of float
+        Branch length of each node, in postorder.
+    child_index : np.ndarray of int
+        Index of the children of each internal node, in postorder.
+    tip_indices : np.ndarray of int
+        Positions of the tips in the postorder arrays.
+    node_lookup : dict
+        Mapping of node names to their positions in the postorder arrays.
+
+    See Also
+    --------
+    skbio.diversity.alpha.faith_pd
+    skbio.diversity.alpha.phydiv
+    skbio.diversity.beta.unweighted_unifrac
+    skbio.diversity.beta.weighted_unifrac
+
+    Notes
+    -----
+    Phylogenetic metrics called with a ``TreeNode`` also keep the prepared
+    versions of the most recently used trees in a small cache keyed by tree
+    identity, so that repeated calls with the same tree object skip most of
+    the setup. A cached version is only reused if the names, branch lengths
+    and topology of the tree did not change since it was prepared, which
+    still requires a traversal of the tree on every call. A
+    ``PreparedTree`` skips this check, and does not reflect later changes
+    to its tree.
+
+    The cache holds references to up to 8 trees and their array
+    representations for the lifetime of the process. Call
+    ``PreparedTree.clear_cache()`` to release them, e.g., after working with
+    a large reference tree.
+
+    Examples
+    --------
+    >>> from skbio import TreeNode
+    >>> from skbio.diversity import PreparedTree
+    >>> from skbio.diversity.alpha import faith_pd
+    >>> tree = TreeNode.read(['((A:0.1,B:0.2):0.3,C:0.4);'])
+    >>> prepared = PreparedTree(tree)
+    >>> faith_pd([1, 0, 2], ['A', 'B', 'C'], prepared)
+    0.8
+    >>> faith_pd([0, 1, 0], ['A', 'B', 'C'], prepared)
+    0.5
+
+    """
+
+    @experimental(as_of="0.6.0")
+    def __init__(self, tree):
+        self.tree = tree
+        self.tree_index = tree.to_array(nan_length_value=0.0)
+        self.branch_lengths = self.tree_index["length"]
+        self.child_index = self.tree_index["child_index"]
+        self.node_lookup = {name: i for i, name in enumerate(self.tree_index["name"])}
+
+        tip_indices, tip_names = [], []
+        self._missing_length = False
+        for node in self.tree_index["id_index"].values():
+            if node.is_tip():
+                tip_indices.append(node.id)
+                tip_names.append(node.name)
+            if node.length is None and not node.is_root():
+                self._missing_length = True
+        self.tip_indices = np.array(tip_indices, dtype=np.int64)
+        self._tip_names = set(tip_names)
+        self._duplicate_tips = len(tip_names) != len(self._tip_names)
+        self._n_root_children = len(tree.root().children)
+        self._node_to_root_distances = None
+
+    @staticmethod
+    @experimental(as_of="0.6.0")
+    def clear_cache():
+        """Release the prepared trees cached by the phylogenetic metrics.
+
+        Trees passed as ``TreeNode`` are prepared again on their next use.
+
+        """
+        with _prepared_tree_cache_lock:
+            _prepared_tree_cache.clear()
+
+    @property
+    def rooted(self):
+        """Whether the tree is rooted (i.e., its root has two children)."""
+        return self._n_root_children == 2
+
+    @property
+    def node_to_root_distances(self):
+        """Distance from each tip to the root (zero for internal nodes)."""
+        if self._node_to_root_distances is None:
+            self._node_to_root_distances = _tip_distances(
+                self.branch_lengths, self.tree, self.tip_indices
+            )
+        return self._node_to_root_distances
+
+
+_prepared_tree_cache = OrderedDict()
+_prepared_tree_cache_lock = Lock()
+_PREPARED_TREE_CACHE_SIZE = 8
+
+
+def _prepare_tree(tree):
+    """Return the prepared version of a tree, reusing recent ones.
+
+    Prepared trees are cached by identity of the ``TreeNode`` in a
+    least-recently used cache. An entry is only reused if the fingerprint of
+    the tree (see ``_tree_fingerprint``) did not change since preparation,
+    so that trees edited in place (e.g., branch lengths or tip names) are
+    prepared again.
+
+    """
+    if isinstance(tree, PreparedTree):
+        return tree
+
+    key = id(tree)
+    fingerprint = _tree_fingerprint(tree)
+    with _prepared_tree_cache_lock:
+        entry = _prepared_tree_cache.get(key)
+        if entry is not None and entry[0].tree is tree and entry[1] == fingerprint:
+            _prepared_tree_cache.move_to_end(key)
+            return entry[0]
+
+    prepared = PreparedTree(tree)
+    with _prepared_tree_cache_lock:
+        _prepared_tree_cache[key] = (prepared, fingerprint)
+        _prepared_tree_cache.move_to_end(key)
+        while len(_prepared_tree_cache) > _PREPARED_TREE_CACHE_SIZE:
+            _prepared_tree_cache.popitem(last=False)
+    return prepared
+
+
+def _tree_fingerprint(tree):
+    """Summarize everything a prepared tree depends on.
+
+    The name, branch length and number of children of each node in postorder
+    determine the topology and the branch lengths of the tree, and the
+    number of children of the root determines whether it is rooted.
+
+    """
+    nodes = tuple(
+        (node.name, node.length, len(node.children))
+        for node in tree.postorder(include_self=True)
+    )
+    return nodes, len(tree.root().children)
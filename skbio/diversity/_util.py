@@ -10,9 +10,12 @@ import collections.abc
 
 import numpy as np
 import pandas as pd
+from scipy.sparse import issparse
 
 from skbio.tree import DuplicateNodeError, MissingNodeError
 from skbio.diversity._phylogenetic import _nodes_by_counts
+from skbio.diversity._prepared_tree import _prepare_tree
+from skbio.diversity._cutils import _sparse_braycurtis_pdist, _sparse_jaccard_pdist
 
 
 def _validate_counts_vector(counts, suppress_cast=False):
@@ -48,6 +51,17 @@ def _validate_counts_matrix(counts, ids=None, suppress_cast=False):
                 " must be equal to number of provided ``ids``."
             )
         return np.asarray(counts)
+    elif issparse(counts):
+        # sparse matrices are kept sparse (in CSR format, so that samples can
+        # be accessed efficiently), and only the stored values are checked
+        counts = counts.tocsr()
+        if ids is not None and counts.shape[0] != len(ids):
+            raise ValueError(
+                "Number of rows in ``counts`` must be equal "
+                "to number of provided ``ids``."
+            )
+        _validate_counts_vector(counts.data)
+        return counts
     else:
         if len(counts) == 0 or not isinstance(counts[0], collections.abc.Iterable):
             counts = [counts]
@@ -64,6 +78,12 @@ def _validate_counts_matrix(counts, ids=None, suppress_cast=False):
                 "to number of provided ``ids``."
             )
 
+        # a regular numeric matrix can be validated as a whole
+        if counts.ndim == 2 and counts.dtype.kind in "biuf":
+            if (counts < 0).any():
+                raise ValueError("Counts vector cannot contain negative values.")
+            return counts
+
         lens = []
         for v in counts:
             results.append(_validate_counts_vector(v, suppress_cast))
@@ -79,15 +99,17 @@ def _validate_otu_ids_and_tree(counts, otu_ids, tree, rooted=True):
     if len_otu_ids != len(set_otu_ids):
         raise ValueError("``otu_ids`` cannot contain duplicated ids.")
 
-    if len(counts) != len_otu_ids:
-        raise ValueError(
-            "``otu_ids`` must be the same length as ``counts`` " "vector(s)."
-        )
+    n_counts = counts.shape[1] if issparse(counts) else len(counts)
+    if n_counts != len_otu_ids:
+        raise ValueError("``otu_ids`` must be the same length as ``counts`` vector(s).")
+
+    # the checks of the tree itself are only performed once per tree
+    tree = _prepare_tree(tree)
 
-    if len(tree.root().children) == 0:
+    if tree._n_root_children == 0:
         raise ValueError("``tree`` must contain more than just a root node.")
 
-    if rooted is True and len(tree.root().children) > 2:
+    if rooted is True and tree._n_root_children > 2:
         # this is an imperfect check for whether the tree is rooted or not.
         # can this be improved?
         raise ValueError("``tree`` must be rooted.")
@@ -95,20 +117,12 @@ def _validate_otu_ids_and_tree(counts, otu_ids, tree, rooted=True):
     # all nodes (except the root node) have corresponding branch lengths
     # all tip names in tree are unique
     # all otu_ids correspond to tip names in tree
-    branch_lengths = []
-    tip_names = []
-    for e in tree.traverse():
-        if not e.is_root():
-            branch_lengths.append(e.length)
-        if e.is_tip():
-            tip_names.append(e.name)
-    set_tip_names = set(tip_names)
-    if len(tip_names) != len(set_tip_names):
+    if tree._duplicate_tips:
         raise DuplicateNodeError("All tip names must be unique.")
 
-    if np.array([branch is None for branch in branch_lengths]).any():
-        raise ValueError("All non-root nodes in ``tree`` must have a branch " "length.")
-    missing_tip_names = set_otu_ids - set_tip_names
+    if tree._missing_length:
+        raise ValueError("All non-root nodes in ``tree`` must have a branch length.")
+    missing_tip_names = set_otu_ids - tree._tip_names
     if missing_tip_names != set():
         n_missing_tip_names = len(missing_tip_names)
         raise MissingNodeError(
@@ -120,11 +134,13 @@ def _validate_otu_ids_and_tree(counts, otu_ids, tree, rooted=True):
 
 def _vectorize_counts_and_tree(counts, otu_ids, tree):
     """Index tree and convert counts to np.array in corresponding order."""
-    tree_index = tree.to_array(nan_length_value=0.0)
+    tree = _prepare_tree(tree)
+    tree_index = tree.tree_index
     otu_ids = np.asarray(otu_ids)
-    counts = np.atleast_2d(counts)
-    counts_by_node = _nodes_by_counts(counts, otu_ids, tree_index)
-    branch_lengths = tree_index["length"]
+    if not issparse(counts):
+        counts = np.atleast_2d(counts)
+    counts_by_node = _nodes_by_counts(counts, otu_ids, tree_index, tree.node_lookup)
+    branch_lengths = tree.branch_lengths
 
     # branch_lengths is just a reference to the array inside of tree_index,
     # but it's used so much that it's convenient to just pull it out here.
@@ -135,16 +151,54 @@ def _get_phylogenetic_kwargs(counts, **kwargs):
     try:
         otu_ids = kwargs.pop("otu_ids")
     except KeyError:
-        raise ValueError(
-            "``otu_ids`` is required for phylogenetic diversity " "metrics."
-        )
+        raise ValueError("``otu_ids`` is required for phylogenetic diversity metrics.")
     try:
         tree = kwargs.pop("tree")
     except KeyError:
-        raise ValueError("``tree`` is required for phylogenetic diversity " "metrics.")
+        raise ValueError("``tree`` is required for phylogenetic diversity metrics.")
 
     return otu_ids, tree, kwargs
 
 
 def _quantitative_to_qualitative_counts(counts):
+    if issparse(counts):
+        # only the stored values need to be converted
+        counts = counts.astype(bool)
+        counts.eliminate_zeros()
+        return counts
     return counts > 0.0
+
+
+def _sparse_pdist(counts, metric):
+    """Compute distances between all rows of a sparse counts matrix.
+
+    Parameters
+    ----------
+    counts : scipy.sparse matrix
+        Matrix containing count/abundance data where each row contains counts
+        of OTUs in a given sample.
+    metric : {'braycurtis', 'jaccard'}
+        The distance metric, as defined by ``scipy.spatial.distance.pdist``.
+
+    Returns
+    -------
+    np.ndarray of float
+        Condensed distance matrix, as returned by
+        ``scipy.spatial.distance.pdist`` on the equivalent dense matrix.
+
+    """
+    counts = counts.tocsr().astype(float)
+    counts.sum_duplicates()
+    n = counts.shape[0]
+    distances = np.empty(n * (n - 1) // 2)
+    func = {
+        "braycurtis": _sparse_braycurtis_pdist,
+        "jaccard": _sparse_jaccard_pdist,
+    }[metric]
+    func(
+        counts.indptr.astype(np.intp, copy=False),
+        counts.indices.astype(np.intp, copy=False),
+        counts.data,
+        distances,
+    )
+    return distances
@@ -14,9 +14,13 @@ from skbio.diversity._util import (
     _validate_otu_ids_and_tree,
     _vectorize_counts_and_tree,
 )
+from skbio.diversity._prepared_tree import _prepare_tree
 
 
 def _setup_pd(counts, otu_ids, tree, validate, rooted, single_sample):
+    # prepare the tree once, as checking that a cached version is up to date
+    # requires a traversal of the tree
+    tree = _prepare_tree(tree)
     if validate:
         if single_sample:
             # only validate count if operating in single sample mode, they
@@ -60,7 +64,7 @@ def faith_pd(counts, otu_ids, tree, validate=True):
     otu_ids : list, np.array
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``counts``.
-    tree : skbio.TreeNode
+    tree : skbio.TreeNode or skbio.diversity.PreparedTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     validate: bool, optional
@@ -226,7 +230,7 @@ def phydiv(counts, otu_ids, tree, rooted=None, weight=False, validate=True):
     otu_ids : list, np.array
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``counts``.
-    tree : skbio.TreeNode
+    tree : skbio.TreeNode or skbio.diversity.PreparedTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     rooted : bool, optional
@@ -397,6 +401,9 @@ def phydiv(counts, otu_ids, tree, rooted=None, weight=False, validate=True):
        Bioinformatics, 28(16), 2106-2113.
 
     """
+    # prepare the tree once (see _setup_pd)
+    tree = _prepare_tree(tree)
+
     # whether tree is rooted should not affect whether metric can be calculated
     # ; it is common unrooted PD is calculated on a rooted tree
     counts_by_node, branch_lengths = _setup_pd(
@@ -406,7 +413,7 @@ def phydiv(counts, otu_ids, tree, rooted=None, weight=False, validate=True):
     # if not specified, determine whether metric should be calculated in rooted
     # mode according to the tree
     if rooted is None:
-        rooted = len(tree.root().children) == 2
+        rooted = tree.rooted
 
     # validate weight parameter
     if (
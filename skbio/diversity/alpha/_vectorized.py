@@ -0,0 +1,196 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+"""Alpha diversity metrics computed over all samples of a counts matrix.
+
+Each function in this module mirrors the metric of the same name in
+``skbio.diversity.alpha``, but accepts a 2D counts matrix (a NumPy array or a
+``scipy.sparse`` matrix, samples by features) and returns a 1D array holding
+one value per sample. The matrix is processed in a few NumPy passes instead of
+one Python call per sample, and sparse matrices are never densified. Inputs
+are assumed to be validated already.
+
+"""
+
+import numpy as np
+from scipy.sparse import issparse
+from scipy.special import gammaln, xlogy
+
+
+def _row_sum(counts, func=None):
+    """Sum the (optionally transformed) entries of each row.
+
+    ``func`` must map zero to zero, so that only the stored entries of a
+    sparse matrix need to be visited.
+
+    """
+    if issparse(counts):
+        data = counts.data if func is None else func(counts.data)
+        rows = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+        res = np.bincount(rows, weights=data, minlength=counts.shape[0])
+        return res.astype(data.dtype, copy=False)
+    return (counts if func is None else func(counts)).sum(axis=1)
+
+
+def _row_max(counts):
+    """Maximum of each row (zero for rows without any feature)."""
+    if counts.shape[1] == 0:
+        return np.zeros(counts.shape[0], dtype=counts.dtype)
+    if issparse(counts):
+        return counts.max(axis=1).toarray().ravel()
+    return counts.max(axis=1)
+
+
+def _scale_rows(counts, factors):
+    """Multiply each row by the corresponding factor."""
+    if issparse(counts):
+        scaled = counts.astype(float)
+        scaled.data *= np.repeat(factors, np.diff(counts.indptr))
+        return scaled
+    return counts * factors[:, None]
+
+
+def _total(counts):
+    """Total counts of each sample, and a version safe to divide by."""
+    N = _row_sum(counts)
+    return N, np.where(N == 0, 1, N)
+
+
+def _sobs(counts):
+    return _row_sum(counts, lambda x: (x != 0).astype(np.int64))
+
+
+def _singles(counts):
+    return _row_sum(counts, lambda x: (x == 1).astype(np.int64))
+
+
+def _doubles(counts):
+    return _row_sum(counts, lambda x: (x == 2).astype(np.int64))
+
+
+def _berger_parker_d(counts):
+    N, N_safe = _total(counts)
+    return np.where(N == 0, 0.0, _row_max(counts) / N_safe)
+
+
+def _brillouin_d(counts):
+    N, N_safe = _total(counts)
+    res = (gammaln(N + 1) - _row_sum(counts, lambda x: gammaln(x + 1))) / N_safe
+    return np.where(N == 0, 0.0, res)
+
+
+def _dominance(counts):
+    N, N_safe = _total(counts)
+    freqs = _scale_rows(counts, 1 / N_safe)
+    return np.where(N == 0, 0.0, _row_sum(freqs, np.square))
+
+
+def _enspie(counts):
+    dominance = _dominance(counts)
+    # like enspie, whose dominance is zero for an empty sample
+    if (dominance == 0).any():
+        raise ZeroDivisionError("float division by zero")
+    return 1 / dominance
+
+
+def _goods_coverage(counts):
+    N, N_safe = _total(counts)
+    return np.where(N == 0, 0.0, 1 - _singles(counts) / N_safe)
+
+
+def _shannon(counts, base=2):
+    N, N_safe = _total(counts)
+    freqs = _scale_rows(counts, 1 / N_safe)
+    H = -_row_sum(freqs, lambda p: xlogy(p, p)) / np.log(base)
+    return np.where(_sobs(counts) <= 1, 0.0, H)
+
+
+def _heip_e(counts):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (np.exp(_shannon(counts, base=np.e)) - 1) / (_sobs(counts) - 1)
+
+
+def _margalef(counts):
+    N, N_safe = _total(counts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res = (_sobs(counts) - 1) / np.log(N_safe)
+    return np.where(N == 0, 0.0, res)
+
+
+def _mcintosh_d(counts):
+    N, N_safe = _total(counts)
+    u = np.sqrt(_row_sum(counts, np.square))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res = (N - u) / (N - np.sqrt(N))
+    return np.where(N == 0, 0.0, res)
+
+
+def _mcintosh_e(counts):
+    N = _row_sum(counts)
+    S = _sobs(counts)
+    numerator = np.sqrt(_row_sum(counts, np.square))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return numerator / np.sqrt((N - S + 1) ** 2 + S - 1)
+
+
+def _menhinick(counts):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _sobs(counts) / np.sqrt(_row_sum(counts))
+
+
+def _pielou_e(counts):
+    H = _shannon(counts, base=np.e)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(H == 0.0, 0.0, H / np.log(_sobs(counts)))
+
+
+def _robbins(counts):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _singles(counts) / _row_sum(counts)
+
+
+def _simpson(counts):
+    return 1 - _dominance(counts)
+
+
+def _simpson_e(counts):
+    return _enspie(counts) / _sobs(counts)
+
+
+def _chao1(counts, bias_corrected=True):
+    o, s, d = _sobs(counts), _singles(counts), _doubles(counts)
+    corrected = o + s * (s - 1) / (2 * (d + 1))
+    if bias_corrected:
+        return corrected
+    uncorrected = o + s**2 / (2 * np.where(d == 0, 1, d))
+    return np.where((s != 0) & (d != 0), uncorrected, corrected)
+
+
+def _get_vectorized_alpha_diversity_metric_map():
+    return {
+        "berger_parker_d": _berger_parker_d,
+        "brillouin_d": _brillouin_d,
+        "chao1": _chao1,
+        "dominance": _dominance,
+        "doubles": _doubles,
+        "enspie": _enspie,
+        "goods_coverage": _goods_coverage,
+        "heip_e": _heip_e,
+        "margalef": _margalef,
+        "mcintosh_d": _mcintosh_d,
+        "mcintosh_e": _mcintosh_e,
+        "menhinick": _menhinick,
+        "observed_features": _sobs,
+        "pielou_e": _pielou_e,
+        "robbins": _robbins,
+        "shannon": _shannon,
+        "simpson": _simpson,
+        "simpson_e": _simpson_e,
+        "singles": _singles,
+        "sobs": _sobs,
+    }
@@ -6,7 +6,8 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
-from unittest import TestCase, main
+from functools import partial
+from unittest import TestCase, main, mock
 from io import StringIO
 import os
 
@@ -16,6 +17,7 @@ import pandas as pd
 from skbio import TreeNode
 from skbio.util import get_data_path
 from skbio.tree import DuplicateNodeError, MissingNodeError
+from skbio.diversity import alpha_diversity, _prepared_tree
 from skbio.diversity.alpha import faith_pd, phydiv
 
 
@@ -148,6 +150,23 @@ class FaithPDTests(TestCase):
         expected = 2.3
         self.assertAlmostEqual(actual, expected)
 
+    def test_tree_prepared_once(self):
+        # checking that a cached prepared tree is up to date traverses the
+        # tree, which is done once per call
+        calls = [
+            partial(faith_pd, self.b1[0], self.oids1, self.t1),
+            partial(phydiv, self.b1[0], self.oids1, self.t1),
+            partial(alpha_diversity, 'faith_pd', self.b1,
+                    otu_ids=self.oids1, tree=self.t1),
+            partial(alpha_diversity, 'phydiv', self.b1,
+                    otu_ids=self.oids1, tree=self.t1)]
+        for call in calls:
+            with mock.patch.object(
+                    _prepared_tree, '_tree_fingerprint',
+                    wraps=_prepared_tree._tree_fingerprint) as fingerprint:
+                call()
+            self.assertEqual(fingerprint.call_count, 1)
+
     def test_faith_pd_invalid_input(self):
         # tree has duplicated tip ids
         t = TreeNode.read(
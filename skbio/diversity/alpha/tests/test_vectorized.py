@@ -0,0 +1,79 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+from unittest import TestCase, main
+import warnings
+
+import numpy as np
+import numpy.testing as npt
+from scipy.sparse import csr_matrix, issparse
+
+from skbio.diversity._driver import _get_alpha_diversity_metric_map
+from skbio.diversity.alpha._vectorized import (
+    _get_vectorized_alpha_diversity_metric_map)
+
+
+class VectorizedAlphaTests(TestCase):
+    def setUp(self):
+        # includes an empty sample, a single-feature sample and samples with
+        # and without singletons and doubletons
+        self.counts = np.array([[0, 1, 1, 4, 2, 5, 2, 4, 1, 2],
+                                [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                [0, 0, 3, 0, 0, 0, 0, 0, 0, 0],
+                                [0, 2, 2, 4, 5, 0, 0, 0, 0, 0],
+                                [0, 1, 1, 4, 5, 0, 0, 0, 0, 0],
+                                [1, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+                                [9, 3, 7, 1, 0, 0, 8, 2, 2, 6]])
+        self.metrics = _get_alpha_diversity_metric_map()
+        self.kwargs = {'shannon': [{}, {'base': np.e}],
+                       'chao1': [{}, {'bias_corrected': False}]}
+
+    def check(self, counts):
+        dense = counts.toarray() if issparse(counts) else counts
+        for name, func in _get_vectorized_alpha_diversity_metric_map().items():
+            for kwargs in self.kwargs.get(name, [{}]):
+                exp = []
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    try:
+                        for row in dense:
+                            exp.append(self.metrics[name](row, **kwargs))
+                    except ZeroDivisionError:
+                        # so does the vectorized metric, for the whole matrix
+                        with self.assertRaises(ZeroDivisionError):
+                            func(counts, **kwargs)
+                        continue
+                    obs = func(counts, **kwargs)
+                self.assertEqual(obs.shape, (len(dense),))
+                npt.assert_allclose(obs, exp, rtol=1e-12, err_msg=name)
+
+    def test_dense(self):
+        self.check(self.counts)
+        self.check(self.counts * 1.5)
+        # without the empty sample
+        self.check(np.delete(self.counts, 1, axis=0))
+
+    def test_sparse(self):
+        self.check(csr_matrix(self.counts))
+        self.check(csr_matrix(np.delete(self.counts, 1, axis=0)))
+
+    def test_no_features(self):
+        counts = np.empty((2, 0), dtype=int)
+        for name, func in _get_vectorized_alpha_diversity_metric_map().items():
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                if name in ('enspie', 'simpson_e'):
+                    # the samples are empty
+                    self.assertRaises(ZeroDivisionError, func, counts)
+                    continue
+                self.assertEqual(func(counts).shape, (2,))
+                self.assertEqual(func(csr_matrix(counts)).shape, (2,))
+
+
+if __name__ == '__main__':
+    main()
@@ -16,7 +16,12 @@ from skbio.diversity._util import (
     _validate_otu_ids_and_tree,
     _vectorize_counts_and_tree,
 )
-from skbio.diversity._phylogenetic import _tip_distances
+from skbio.diversity._prepared_tree import _prepare_tree
+from skbio.util._parallel import _get_num_threads
+from skbio.diversity._phylogenetic import (
+    _unweighted_unifrac_pdist,
+    _weighted_unifrac_pdist,
+)
 
 
 # The default value indicating whether normalization should be applied
@@ -38,7 +43,7 @@ def unweighted_unifrac(u_counts, v_counts, otu_ids, tree, validate=True):
     otu_ids: list, np.array
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``u_counts`` and ``v_counts``.
-    tree: skbio.TreeNode
+    tree: skbio.TreeNode or skbio.diversity.PreparedTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     validate: bool, optional
@@ -149,10 +154,10 @@ def unweighted_unifrac(u_counts, v_counts, otu_ids, tree, validate=True):
     0.37
 
     """
-    u_node_counts, v_node_counts, _, _, tree_index = _setup_pairwise_unifrac(
+    u_node_counts, v_node_counts, _, _, tree = _setup_pairwise_unifrac(
         u_counts, v_counts, otu_ids, tree, validate, normalized=False, unweighted=True
     )
-    return _unweighted_unifrac(u_node_counts, v_node_counts, tree_index["length"])
+    return _unweighted_unifrac(u_node_counts, v_node_counts, tree.branch_lengths)
 
 
 @experimental(as_of="0.4.1")
@@ -174,7 +179,7 @@ def weighted_unifrac(
     otu_ids: list, np.array
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``u_counts`` and ``v_counts``.
-    tree: skbio.TreeNode
+    tree: skbio.TreeNode or skbio.diversity.PreparedTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     normalized: boolean, optional
@@ -297,7 +302,7 @@ def weighted_unifrac(
         v_node_counts,
         u_total_count,
         v_total_count,
-        tree_index,
+        tree,
     ) = _setup_pairwise_unifrac(
         u_counts,
         v_counts,
@@ -307,18 +312,16 @@ def weighted_unifrac(
         normalized=normalized,
         unweighted=False,
     )
-    branch_lengths = tree_index["length"]
+    branch_lengths = tree.branch_lengths
 
     if normalized:
-        tip_indices = _get_tip_indices(tree_index)
-        node_to_root_distances = _tip_distances(branch_lengths, tree, tip_indices)
         return _weighted_unifrac_normalized(
             u_node_counts,
             v_node_counts,
             u_total_count,
             v_total_count,
             branch_lengths,
-            node_to_root_distances,
+            tree.node_to_root_distances,
         )
     else:
         return _weighted_unifrac(
@@ -334,6 +337,9 @@ def _validate(u_counts, v_counts, otu_ids, tree):
 def _setup_pairwise_unifrac(
     u_counts, v_counts, otu_ids, tree, validate, normalized, unweighted
 ):
+    # prepare the tree once, as checking that a cached version is up to date
+    # requires a traversal of the tree
+    tree = _prepare_tree(tree)
     if validate:
         _validate(u_counts, v_counts, otu_ids, tree)
 
@@ -342,9 +348,7 @@ def _setup_pairwise_unifrac(
     u_counts = np.asarray(u_counts)
     v_counts = np.asarray(v_counts)
     counts = np.vstack([u_counts, v_counts])
-    counts_by_node, tree_index, branch_lengths = _vectorize_counts_and_tree(
-        counts, otu_ids, tree
-    )
+    counts_by_node, _, _ = _vectorize_counts_and_tree(counts, otu_ids, tree)
     # unpack counts vectors for single pairwise UniFrac calculation
     u_node_counts = counts_by_node[0]
     v_node_counts = counts_by_node[1]
@@ -352,7 +356,7 @@ def _setup_pairwise_unifrac(
     u_total_count = u_counts.sum()
     v_total_count = v_counts.sum()
 
-    return (u_node_counts, v_node_counts, u_total_count, v_total_count, tree_index)
+    return (u_node_counts, v_node_counts, u_total_count, v_total_count, tree)
 
 
 def _unweighted_unifrac(u_node_counts, v_node_counts, branch_lengths):
@@ -490,14 +494,16 @@ def _weighted_unifrac_normalized(
 
 
 def _setup_multiple_unifrac(counts, otu_ids, tree, validate):
+    # prepare the tree once (see _setup_pairwise_unifrac)
+    tree = _prepare_tree(tree)
     if validate:
         _validate_otu_ids_and_tree(counts[0], otu_ids, tree)
 
-    counts_by_node, tree_index, branch_lengths = _vectorize_counts_and_tree(
+    counts_by_node, _, branch_lengths = _vectorize_counts_and_tree(
         counts, otu_ids, tree
     )
 
-    return counts_by_node, tree_index, branch_lengths
+    return counts_by_node, tree, branch_lengths
 
 
 def _setup_multiple_unweighted_unifrac(counts, otu_ids, tree, validate):
@@ -512,7 +518,7 @@ def _setup_multiple_unweighted_unifrac(counts, otu_ids, tree, validate):
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``u_counts`` and ``v_counts``. These IDs do not need to
         be in tip order with respect to the tree.
-    tree: skbio.TreeNode
+    tree: skbio.TreeNode or skbio.diversity.PreparedTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     validate: bool, optional
@@ -548,7 +554,7 @@ def _setup_multiple_weighted_unifrac(counts, otu_ids, tree, normalized, validate
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``u_counts`` and ``v_counts``. These IDs do not need to
         be in tip order with respect to the tree.
-    tree : skbio.TreeNode
+    tree : skbio.TreeNode or skbio.diversity.PreparedTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     normalized : bool
@@ -565,13 +571,13 @@ def _setup_multiple_weighted_unifrac(counts, otu_ids, tree, normalized, validate
         Counts of all nodes in ``tree``.
 
     """
-    counts_by_node, tree_index, branch_lengths = _setup_multiple_unifrac(
+    counts_by_node, tree, branch_lengths = _setup_multiple_unifrac(
         counts, otu_ids, tree, validate
     )
-    tip_indices = _get_tip_indices(tree_index)
+    tip_indices = tree.tip_indices
 
     if normalized:
-        node_to_root_distances = _tip_distances(branch_lengths, tree, tip_indices)
+        node_to_root_distances = tree.node_to_root_distances
 
         def f(u_node_counts, v_node_counts):
             u_total_count = np.take(u_node_counts, tip_indices).sum()
@@ -602,11 +608,118 @@ def _setup_multiple_weighted_unifrac(counts, otu_ids, tree, normalized, validate
     return f, counts_by_node
 
 
-def _get_tip_indices(tree_index):
-    tip_indices = np.array(
-        [n.id for n in tree_index["id_index"].values() if n.is_tip()]
+def _multiple_unweighted_unifrac(counts, otu_ids, tree, validate, n_jobs=None):
+    """Compute unweighted UniFrac between all pairs of samples.
+
+    Parameters
+    ----------
+    counts : 2D array_like of ints or floats
+        Matrix containing count/abundance data where each row contains counts
+        of observations in a given sample.
+    otu_ids: list, np.array
+        Vector of OTU ids corresponding to tip names in ``tree``.
+    tree: skbio.TreeNode or skbio.diversity.PreparedTree
+        Tree relating the OTUs in otu_ids.
+    validate: bool, optional
+        If `False`, validation of the input won't be performed.
+    n_jobs : int, optional
+        Number of threads computing the pairs. If not provided, the default
+        number of threads of OpenMP is used. If -1, all available CPUs are
+        used.
+
+    Returns
+    -------
+    np.ndarray of float
+        Condensed distance matrix, as returned by
+        ``scipy.spatial.distance.pdist``.
+
+    Notes
+    -----
+    Unlike passing the function created by
+    ``_setup_multiple_unweighted_unifrac`` to ``pdist``, all pairs of samples
+    are computed by a compiled routine, in parallel if OpenMP is available.
+
+    """
+    counts_by_node, _, branch_lengths = _setup_multiple_unifrac(
+        counts, otu_ids, tree, validate
+    )
+    presence = np.ascontiguousarray(counts_by_node != 0, dtype=np.uint8)
+    n = presence.shape[0]
+    distances = np.empty(n * (n - 1) // 2)
+    _unweighted_unifrac_pdist(
+        presence,
+        np.ascontiguousarray(branch_lengths, dtype=float),
+        distances,
+        _get_num_threads(n_jobs),
+    )
+    return distances
+
+
+def _multiple_weighted_unifrac(
+    counts, otu_ids, tree, normalized, validate, n_jobs=None
+):
+    """Compute weighted UniFrac between all pairs of samples.
+
+    Parameters
+    ----------
+    counts : 2D array_like of ints or floats
+        Matrix containing count/abundance data where each row contains counts
+        of observations in a given sample.
+    otu_ids : list, np.array
+        Vector of OTU ids corresponding to tip names in ``tree``.
+    tree : skbio.TreeNode or skbio.diversity.PreparedTree
+        Tree relating the OTUs in otu_ids.
+    normalized : bool
+        If `True`, output will be normalized.
+    validate: bool, optional
+        If `False`, validation of the input won't be performed.
+    n_jobs : int, optional
+        Number of threads computing the pairs. If not provided, the default
+        number of threads of OpenMP is used. If -1, all available CPUs are
+        used.
+
+    Returns
+    -------
+    np.ndarray of float
+        Condensed distance matrix, as returned by
+        ``scipy.spatial.distance.pdist``.
+
+    Notes
+    -----
+    Proportional abundances are computed once per sample, then all pairs of
+    samples are computed by a compiled routine, in parallel if OpenMP is
+    available.
+
+    """
+    counts_by_node, tree, branch_lengths = _setup_multiple_unifrac(
+        counts, otu_ids, tree, validate
+    )
+    branch_lengths = np.ascontiguousarray(branch_lengths, dtype=float)
+
+    total_counts = np.take(counts_by_node, tree.tip_indices, axis=1).sum(axis=1)
+    empty = total_counts == 0
+    # convert to relative abundances if there are any counts
+    proportions = np.ascontiguousarray(
+        counts_by_node / np.where(empty, 1, total_counts)[:, None]
+    )
+
+    if normalized:
+        node_to_root_distances = tree.node_to_root_distances
+    else:
+        node_to_root_distances = np.zeros_like(branch_lengths)
+
+    n = proportions.shape[0]
+    distances = np.empty(n * (n - 1) // 2)
+    _weighted_unifrac_pdist(
+        proportions,
+        branch_lengths,
+        np.ascontiguousarray(node_to_root_distances.ravel()),
+        empty.astype(np.uint8),
+        normalized,
+        distances,
+        _get_num_threads(n_jobs),
     )
-    return tip_indices
+    return distances
 
 
 def _weighted_unifrac_branch_correction(
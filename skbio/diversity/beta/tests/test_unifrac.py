@@ -6,17 +6,22 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+from functools import partial
 from io import StringIO
-from unittest import main, TestCase
+from unittest import main, mock, TestCase
 
 import numpy as np
+import numpy.testing as npt
 
 from skbio import TreeNode
 from skbio.tree import DuplicateNodeError, MissingNodeError
+from skbio.diversity import _prepared_tree
 from skbio.diversity.beta import unweighted_unifrac, weighted_unifrac
 from skbio.diversity.beta._unifrac import (_unweighted_unifrac,
                                            _weighted_unifrac,
-                                           _weighted_unifrac_branch_correction)
+                                           _weighted_unifrac_branch_correction,
+                                           _multiple_unweighted_unifrac,
+                                           _multiple_weighted_unifrac)
 
 
 class UnifracTests(TestCase):
@@ -169,6 +174,25 @@ class UnifracTests(TestCase):
         expected = 0.1818181818
         self.assertAlmostEqual(actual, expected)
 
+    def test_tree_prepared_once(self):
+        # checking that a cached prepared tree is up to date traverses the
+        # tree, which is done once per call
+        calls = [
+            partial(unweighted_unifrac, self.b1[0], self.b1[1], self.oids1,
+                    self.t1),
+            partial(weighted_unifrac, self.b1[0], self.b1[1], self.oids1,
+                    self.t1, normalized=True),
+            partial(_multiple_unweighted_unifrac, self.b1, self.oids1,
+                    self.t1, True),
+            partial(_multiple_weighted_unifrac, self.b1, self.oids1, self.t1,
+                    True, True)]
+        for call in calls:
+            with mock.patch.object(
+                    _prepared_tree, '_tree_fingerprint',
+                    wraps=_prepared_tree._tree_fingerprint) as fingerprint:
+                call()
+            self.assertEqual(fingerprint.call_count, 1)
+
     def test_unweighted_unifrac_identity(self):
         for i in range(len(self.b1)):
             actual = unweighted_unifrac(
@@ -684,5 +708,42 @@ class UnifracTests(TestCase):
             _weighted_unifrac(m[:, 1], m[:, 2], m1s, m2s, bl)[0], 4.5)
 
 
+    def test_multiple_unweighted_unifrac(self):
+        # include an empty sample and a duplicated sample
+        counts = np.vstack([self.b1, np.zeros(5, dtype=int), self.b1[0]])
+        n = counts.shape[0]
+        exp = [unweighted_unifrac(counts[i], counts[j], self.oids1, self.t1)
+               for i in range(n) for j in range(i + 1, n)]
+        obs = _multiple_unweighted_unifrac(counts, self.oids1, self.t1, True)
+        # the results are identical to those computed per pair
+        npt.assert_array_equal(obs, exp)
+
+        obs = _multiple_unweighted_unifrac(counts[:1], self.oids1, self.t1,
+                                           True)
+        self.assertEqual(obs.shape, (0,))
+
+    def test_multiple_weighted_unifrac(self):
+        counts = np.vstack([self.b1, np.zeros(5, dtype=int),
+                            np.zeros(5, dtype=int), self.b1[0]])
+        n = counts.shape[0]
+        for normalized in False, True:
+            exp = [weighted_unifrac(counts[i], counts[j], self.oids1,
+                                    self.t1, normalized=normalized)
+                   for i in range(n) for j in range(i + 1, n)]
+            obs = _multiple_weighted_unifrac(counts, self.oids1, self.t1,
+                                             normalized, True)
+            npt.assert_array_equal(obs, exp)
+
+        # tree with extra tips and OTUs out of order
+        counts = self.b1[:, ::-1]
+        oids = self.oids1[::-1]
+        exp = [weighted_unifrac(counts[i], counts[j], oids,
+                                self.t1_w_extra_tips, normalized=True)
+               for i in range(6) for j in range(i + 1, 6)]
+        obs = _multiple_weighted_unifrac(counts, oids, self.t1_w_extra_tips,
+                                         True, True)
+        npt.assert_array_equal(obs, exp)
+
+
 if __name__ == '__main__':
     main()
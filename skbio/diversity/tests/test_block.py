@@ -7,15 +7,18 @@
 # ----------------------------------------------------------------------------
 
 from unittest import TestCase, main
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import numpy as np
 import numpy.testing as npt
+from scipy.sparse import csr_matrix
 
 from skbio import TreeNode, DistanceMatrix
 from skbio.diversity import beta_diversity, block_beta_diversity
 from skbio.diversity._block import (_block_party, _generate_id_blocks,
                                     _pairs_to_compute, _block_compute,
-                                    _block_kwargs, _map, _reduce)
+                                    _block_kwargs, _map, _reduce,
+                                    _executor_map)
 
 
 class ParallelBetaDiversity(TestCase):
@@ -123,6 +126,58 @@ class ParallelBetaDiversity(TestCase):
         npt.assert_equal(obs.data, exp.data)
         self.assertEqual(obs.ids, exp.ids)
 
+    def test_executor_map(self):
+        def func(a, b, c=5):
+            return a + b + c
+
+        kwargs = [{'a': i, 'b': 1} for i in range(10)]
+        exp = [i + 6 for i in range(10)]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            obs = list(_executor_map(executor, max_pending=3)(func, kwargs))
+        self.assertEqual(obs, exp)
+
+    def test_reduce_preallocated(self):
+        dm1 = DistanceMatrix(np.array([[0, 1],
+                                       [1, 0]]), (0, 2))
+        dm2 = DistanceMatrix(np.array([[0, 2],
+                                       [2, 0]]), (1, 2))
+        exp = DistanceMatrix(np.array([[0, 0, 1, 0],
+                                       [0, 0, 2, 0],
+                                       [1, 2, 0, 0],
+                                       [0, 0, 0, 0]]), list(range(4)))
+        obs = _reduce(iter([dm1, dm2]), n_ids=4)
+        npt.assert_equal(obs.data, exp.data)
+        self.assertEqual(obs.ids, exp.ids)
+
+    def test_block_beta_diversity_sparse(self):
+        exp = beta_diversity('unweighted_unifrac', self.table1, self.sids1,
+                             tree=self.tree1, otu_ids=self.oids1)
+        obs = block_beta_diversity('unweighted_unifrac',
+                                   csr_matrix(self.table1), self.sids1,
+                                   otu_ids=self.oids1, tree=self.tree1, k=2)
+        npt.assert_equal(obs.data, exp.data)
+        self.assertEqual(obs.ids, exp.ids)
+
+    def test_block_beta_diversity_executor(self):
+        exp = beta_diversity('unweighted_unifrac', self.table1, self.sids1,
+                             tree=self.tree1, otu_ids=self.oids1)
+        for cls in ThreadPoolExecutor, ProcessPoolExecutor:
+            with cls(max_workers=2) as executor:
+                obs = block_beta_diversity('unweighted_unifrac', self.table1,
+                                           self.sids1, otu_ids=self.oids1,
+                                           tree=self.tree1, k=2,
+                                           executor=executor)
+            npt.assert_equal(obs.data, exp.data)
+            self.assertEqual(obs.ids, exp.ids)
+
+    def test_block_beta_diversity_executor_and_map_f(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with self.assertRaisesRegex(ValueError, 'executor'):
+                block_beta_diversity('unweighted_unifrac', self.table1,
+                                     self.sids1, otu_ids=self.oids1,
+                                     tree=self.tree1, executor=executor,
+                                     map_f=_map)
+
     def test_generate_id_blocks(self):
         ids = [1, 2, 3, 4, 5]
         exp = [(np.array((0, 1)), np.array((0, 1))),
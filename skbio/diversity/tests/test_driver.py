@@ -12,6 +12,7 @@ from unittest import TestCase, main
 import pandas as pd
 import numpy as np
 import numpy.testing as npt
+from scipy.sparse import csr_matrix
 
 from skbio import DistanceMatrix, TreeNode
 from skbio.util._testing import assert_series_almost_equal
@@ -217,6 +218,23 @@ class AlphaDiversityTests(TestCase):
         self.assertAlmostEqual(list_result[0], 4.5)
         assert_series_almost_equal(list_result, array_result)
 
+    def test_sparse_input(self):
+        for metric in 'sobs', 'shannon', 'chao1', 'strong':
+            exp = alpha_diversity(metric, self.table1, self.sids1)
+            obs = alpha_diversity(metric, csr_matrix(self.table1),
+                                  self.sids1)
+            assert_series_almost_equal(obs, exp)
+
+        exp = alpha_diversity('faith_pd', self.table1, self.sids1,
+                              otu_ids=self.oids1, tree=self.tree1)
+        obs = alpha_diversity('faith_pd', csr_matrix(self.table1), self.sids1,
+                              otu_ids=self.oids1, tree=self.tree1)
+        assert_series_almost_equal(obs, exp)
+
+        # negative values are detected in sparse input
+        with self.assertRaises(ValueError):
+            alpha_diversity('sobs', csr_matrix([[1, 0, -1]]))
+
     def test_sobs(self):
         # expected values hand-calculated
         expected = pd.Series([3, 3, 3, 3], index=self.sids1)
@@ -553,6 +571,20 @@ class BetaDiversityTests(TestCase):
                 npt.assert_almost_equal(actual_dm[id1, id2],
                                         expected_dm[id1, id2], 6)
 
+    def test_sparse_input(self):
+        for metric in 'braycurtis', 'jaccard', 'euclidean':
+            exp = beta_diversity(metric, self.table1, self.sids1)
+            obs = beta_diversity(metric, csr_matrix(self.table1), self.sids1)
+            npt.assert_array_equal(obs.data, exp.data)
+            self.assertEqual(obs.ids, exp.ids)
+
+        for metric in 'unweighted_unifrac', 'weighted_unifrac':
+            exp = beta_diversity(metric, self.table1, self.sids1,
+                                 otu_ids=self.oids1, tree=self.tree1)
+            obs = beta_diversity(metric, csr_matrix(self.table1), self.sids1,
+                                 otu_ids=self.oids1, tree=self.tree1)
+            npt.assert_array_equal(obs.data, exp.data)
+
     def test_braycurtis(self):
         # TODO: update npt.assert_almost_equal calls to use DistanceMatrix
         # near-equality testing when that support is available
@@ -643,6 +675,19 @@ class BetaDiversityTests(TestCase):
                 npt.assert_almost_equal(dm1[id1, id2],
                                         expected_dm[id1, id2], 6)
 
+    def test_unifrac_n_jobs(self):
+        for metric in 'unweighted_unifrac', 'weighted_unifrac':
+            exp = beta_diversity(metric, self.table1, self.sids1,
+                                 otu_ids=self.oids1, tree=self.tree1)
+            for n_jobs in 1, 2, -1:
+                obs = beta_diversity(metric, self.table1, self.sids1,
+                                     otu_ids=self.oids1, tree=self.tree1,
+                                     n_jobs=n_jobs)
+                self.assertEqual(obs, exp)
+            with self.assertRaisesRegex(ValueError, 'n_jobs'):
+                beta_diversity(metric, self.table1, self.sids1,
+                               otu_ids=self.oids1, tree=self.tree1, n_jobs=0)
+
     def test_scipy_kwargs(self):
         # confirm that p can be passed to SciPy's minkowski, and that it
         # gives a different result than not passing it (the off-diagonal
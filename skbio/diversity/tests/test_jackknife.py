@@ -0,0 +1,132 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+from unittest import TestCase, main, mock
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import numpy.testing as npt
+import pandas.testing as pdt
+from scipy.sparse import csr_matrix
+
+from skbio import TreeNode
+from skbio.diversity import beta_diversity, jackknifed_pcoa, _driver
+from skbio.stats.ordination import pcoa
+
+
+class JackknifedPCoATests(TestCase):
+    def setUp(self):
+        self.counts = np.array([[23, 64, 14, 0, 0, 3, 1],
+                                [0, 3, 35, 42, 0, 12, 1],
+                                [0, 5, 5, 0, 40, 40, 0],
+                                [44, 35, 9, 0, 1, 0, 0],
+                                [0, 2, 8, 0, 35, 45, 1],
+                                [0, 0, 25, 35, 0, 19, 0]])
+        self.ids = list('ABCDEF')
+        self.tree = TreeNode.read([
+            '(((O1:0.5,O2:0.5):0.5,O3:1.0):1.0,((O4:0.75,O5:0.75):0.5,'
+            '(O6:0.25,O7:0.25):1.0):1.25):0.0;'])
+        self.otu_ids = ['O1', 'O2', 'O3', 'O4', 'O5', 'O6', 'O7']
+
+    def test_jackknifed_pcoa(self):
+        master, dispersion, m_squared = jackknifed_pcoa(
+            'braycurtis', self.counts, self.ids, depth=60, replicates=20,
+            seed=42)
+
+        exp = pcoa(beta_diversity('braycurtis', self.counts, self.ids),
+                   number_of_dimensions=3)
+        pdt.assert_frame_equal(master.samples, exp.samples)
+
+        self.assertEqual(dispersion.shape, (6, 3))
+        self.assertEqual(list(dispersion.index), self.ids)
+        self.assertEqual(list(dispersion.columns), ['PC1', 'PC2', 'PC3'])
+        self.assertTrue((dispersion.values > 0).all())
+        self.assertEqual(len(m_squared), 20)
+        self.assertTrue(((m_squared > 0) & (m_squared < 1)).all())
+
+        # the same seed yields the same results
+        obs = jackknifed_pcoa('braycurtis', self.counts, self.ids, depth=60,
+                              replicates=20, seed=42)
+        pdt.assert_frame_equal(obs[1], dispersion)
+        pdt.assert_series_equal(obs[2], m_squared)
+
+    def test_jackknifed_pcoa_full_depth(self):
+        # rarefying to the depth of all samples leaves them unchanged
+        counts = np.array([[10, 5, 0], [0, 5, 10], [5, 5, 5]])
+        master, dispersion, m_squared = jackknifed_pcoa(
+            'euclidean', counts, list('abc'), depth=15, replicates=3,
+            number_of_dimensions=2, seed=0)
+        npt.assert_allclose(dispersion.values, 0, atol=1e-12)
+        npt.assert_allclose(m_squared.values, 0, atol=1e-12)
+
+    def test_jackknifed_pcoa_executor(self):
+        exp = jackknifed_pcoa('unweighted_unifrac', self.counts, self.ids,
+                              depth=60, replicates=4, seed=0,
+                              otu_ids=self.otu_ids, tree=self.tree)
+        for cls in ThreadPoolExecutor, ProcessPoolExecutor:
+            with cls(max_workers=2) as executor:
+                obs = jackknifed_pcoa('unweighted_unifrac', self.counts,
+                                      self.ids, depth=60, replicates=4,
+                                      seed=0, otu_ids=self.otu_ids,
+                                      tree=self.tree, executor=executor)
+            pdt.assert_frame_equal(obs[1], exp[1])
+            pdt.assert_series_equal(obs[2], exp[2])
+
+    def test_jackknifed_pcoa_executor_n_jobs(self):
+        # replicates run concurrently use a single thread each by default
+        for kwargs, exp in ({}, 1), ({'n_jobs': 2}, 2):
+            with mock.patch.object(
+                    _driver, '_multiple_unweighted_unifrac',
+                    wraps=_driver._multiple_unweighted_unifrac) as unifrac, \
+                    ThreadPoolExecutor(max_workers=2) as executor:
+                jackknifed_pcoa('unweighted_unifrac', self.counts, self.ids,
+                                depth=60, replicates=2, seed=0,
+                                otu_ids=self.otu_ids, tree=self.tree,
+                                executor=executor, **kwargs)
+            # the master ordination, then the replicates
+            obs = [call.kwargs['n_jobs'] for call in unifrac.call_args_list]
+            self.assertEqual(obs, [kwargs.get('n_jobs'), exp, exp])
+
+    def test_jackknifed_pcoa_sparse(self):
+        master, dispersion, m_squared = jackknifed_pcoa(
+            'braycurtis', csr_matrix(self.counts), self.ids, depth=60,
+            replicates=5, seed=0)
+        exp = jackknifed_pcoa('braycurtis', self.counts, self.ids, depth=60,
+                              replicates=5, seed=0)
+        pdt.assert_frame_equal(master.samples, exp[0].samples)
+        self.assertEqual(dispersion.shape, (6, 3))
+        self.assertEqual(len(m_squared), 5)
+
+    def test_jackknifed_pcoa_master(self):
+        master = pcoa(beta_diversity('jaccard', self.counts[::-1],
+                                     self.ids[::-1]))
+        obs, dispersion, _ = jackknifed_pcoa(
+            'braycurtis', self.counts, self.ids, depth=60, replicates=3,
+            number_of_dimensions=2, master=master, seed=0)
+        self.assertIs(obs, master)
+        self.assertEqual(list(dispersion.index), self.ids)
+        self.assertEqual(list(dispersion.columns), ['PC1', 'PC2'])
+
+    def test_jackknifed_pcoa_invalid_input(self):
+        with self.assertRaisesRegex(ValueError, 'at least 80 counts.*F'):
+            jackknifed_pcoa('braycurtis', self.counts, self.ids, depth=80)
+
+        master = pcoa(beta_diversity('braycurtis', self.counts[:4],
+                                     self.ids[:4]))
+        with self.assertRaisesRegex(ValueError, 'lacks samples: E, F'):
+            jackknifed_pcoa('braycurtis', self.counts, self.ids, depth=60,
+                            master=master)
+
+        for kwargs in ({'depth': 0}, {'depth': 10, 'replicates': 0},
+                       {'depth': 10, 'number_of_dimensions': 0}):
+            with self.assertRaises(ValueError):
+                jackknifed_pcoa('braycurtis', self.counts, self.ids, **kwargs)
+
+
+if __name__ == '__main__':
+    main()
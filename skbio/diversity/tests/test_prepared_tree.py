@@ -0,0 +1,158 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+from unittest import TestCase, main
+
+import numpy as np
+import numpy.testing as npt
+
+from skbio import TreeNode
+from skbio.diversity import PreparedTree, alpha_diversity, beta_diversity
+from skbio.diversity.alpha import faith_pd, phydiv
+from skbio.diversity.beta import unweighted_unifrac, weighted_unifrac
+from skbio.diversity._prepared_tree import (_prepare_tree,
+                                            _prepared_tree_cache,
+                                            _PREPARED_TREE_CACHE_SIZE)
+from skbio.tree import DuplicateNodeError, MissingNodeError
+
+
+class PreparedTreeTests(TestCase):
+
+    def setUp(self):
+        self.tree = TreeNode.read(
+            ['(((OTU1:0.5,OTU2:0.5):0.5,OTU3:1.0):1.0,'
+             '(OTU4:0.75,OTU5:0.75):1.25):0.0;'])
+        self.otu_ids = ['OTU1', 'OTU2', 'OTU3', 'OTU4', 'OTU5']
+        self.counts = np.array([[1, 1, 0, 0, 2],
+                                [0, 3, 1, 0, 0],
+                                [4, 0, 0, 2, 1]])
+        self.ids = ['a', 'b', 'c']
+
+    def test_init(self):
+        obs = PreparedTree(self.tree)
+        self.assertIs(obs.tree, self.tree)
+        self.assertTrue(obs.rooted)
+        self.assertEqual(len(obs.branch_lengths), 9)
+        self.assertEqual(len(obs.tip_indices), 5)
+        for i in obs.tip_indices:
+            node = obs.tree_index['id_index'][i]
+            self.assertTrue(node.is_tip())
+            self.assertEqual(obs.node_lookup[node.name], i)
+
+    def test_node_to_root_distances(self):
+        obs = PreparedTree(self.tree).node_to_root_distances
+        self.assertEqual(obs.shape, (9,))
+        npt.assert_array_almost_equal(
+            obs, [2.0, 2.0, 0.0, 2.0, 2.0, 2.0, 0.0, 0.0, 0.0])
+
+    def test_alpha_metrics(self):
+        prepared = PreparedTree(self.tree)
+        for counts in self.counts:
+            self.assertAlmostEqual(
+                faith_pd(counts, self.otu_ids, prepared),
+                faith_pd(counts, self.otu_ids, self.tree))
+            self.assertAlmostEqual(
+                phydiv(counts, self.otu_ids, prepared, weight=True),
+                phydiv(counts, self.otu_ids, self.tree, weight=True))
+
+        obs = alpha_diversity('faith_pd', self.counts, self.ids,
+                              otu_ids=self.otu_ids, tree=prepared)
+        exp = alpha_diversity('faith_pd', self.counts, self.ids,
+                              otu_ids=self.otu_ids, tree=self.tree)
+        npt.assert_array_almost_equal(obs.values, exp.values)
+
+    def test_beta_metrics(self):
+        prepared = PreparedTree(self.tree)
+        for metric in unweighted_unifrac, weighted_unifrac:
+            self.assertAlmostEqual(
+                metric(self.counts[0], self.counts[1], self.otu_ids,
+                       prepared),
+                metric(self.counts[0], self.counts[1], self.otu_ids,
+                       self.tree))
+
+        for metric in 'unweighted_unifrac', 'weighted_unifrac':
+            obs = beta_diversity(metric, self.counts, self.ids,
+                                 otu_ids=self.otu_ids, tree=prepared)
+            exp = beta_diversity(metric, self.counts, self.ids,
+                                 otu_ids=self.otu_ids, tree=self.tree)
+            npt.assert_array_almost_equal(obs.data, exp.data)
+
+    def test_validation(self):
+        tree = TreeNode.read(['((OTU1:0.5,OTU1:0.5):0.5,OTU3:1.0);'])
+        with self.assertRaises(DuplicateNodeError):
+            faith_pd([1, 2], ['OTU1', 'OTU3'], PreparedTree(tree))
+
+        tree = TreeNode.read(['((OTU1,OTU2:0.5):0.5,OTU3:1.0);'])
+        with self.assertRaisesRegex(ValueError, 'branch length'):
+            faith_pd([1, 2], ['OTU1', 'OTU3'], PreparedTree(tree))
+
+        prepared = PreparedTree(self.tree)
+        with self.assertRaises(MissingNodeError):
+            faith_pd([1, 2], ['OTU1', 'OTU42'], prepared)
+
+        tree = TreeNode.read(['(OTU1:0.5,OTU2:0.5,OTU3:1.0);'])
+        with self.assertRaisesRegex(ValueError, 'rooted'):
+            faith_pd([1, 2], ['OTU1', 'OTU3'], PreparedTree(tree))
+
+    def test_prepare_tree_cache(self):
+        prepared = PreparedTree(self.tree)
+        self.assertIs(_prepare_tree(prepared), prepared)
+
+        obs = _prepare_tree(self.tree)
+        self.assertIs(_prepare_tree(self.tree), obs)
+        faith_pd(self.counts[0], self.otu_ids, self.tree)
+        self.assertIs(_prepare_tree(self.tree), obs)
+
+    def test_prepare_tree_cache_invalidated(self):
+        obs = _prepare_tree(self.tree)
+        self.tree.find('OTU5').parent.remove(self.tree.find('OTU5'))
+        exp = _prepare_tree(self.tree)
+        self.assertIsNot(exp, obs)
+        self.assertNotIn('OTU5', exp._tip_names)
+        with self.assertRaises(MissingNodeError):
+            faith_pd(self.counts[0], self.otu_ids, self.tree)
+
+    def test_prepare_tree_cache_edited_in_place(self):
+        counts = [1, 0, 0, 0, 0]
+        tip = self.tree.find('OTU1')
+        self.assertAlmostEqual(
+            faith_pd(counts, self.otu_ids, self.tree), 2.0)
+
+        # branch lengths
+        tip.length = 10.0
+        self.assertAlmostEqual(
+            faith_pd(counts, self.otu_ids, self.tree), 11.5)
+
+        # tip names
+        tip.name = 'OTU6'
+        with self.assertRaises(MissingNodeError):
+            faith_pd(counts, self.otu_ids, self.tree)
+        self.assertAlmostEqual(
+            faith_pd(counts, ['OTU6'] + self.otu_ids[1:], self.tree), 11.5)
+
+    def test_prepare_tree_cache_size(self):
+        trees = [self.tree.copy()
+                 for _ in range(_PREPARED_TREE_CACHE_SIZE + 1)]
+        for tree in trees:
+            _prepare_tree(tree)
+        self.assertLessEqual(len(_prepared_tree_cache),
+                             _PREPARED_TREE_CACHE_SIZE)
+        self.assertNotIn(id(trees[0]), _prepared_tree_cache)
+        self.assertIn(id(trees[-1]), _prepared_tree_cache)
+
+    def test_clear_cache(self):
+        tree = self.tree.copy()
+        obs = _prepare_tree(tree)
+        self.assertIn(id(tree), _prepared_tree_cache)
+        PreparedTree.clear_cache()
+        self.assertEqual(len(_prepared_tree_cache), 0)
+        self.assertIsNot(_prepare_tree(tree), obs)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,13 +12,16 @@ from unittest import TestCase, main
 import numpy as np
 import pandas as pd
 import numpy.testing as npt
+from scipy.sparse import csr_matrix
+from scipy.spatial.distance import pdist
 
 from skbio import TreeNode
 from skbio.diversity._util import (_validate_counts_vector,
                                    _validate_counts_matrix,
                                    _validate_otu_ids_and_tree,
                                    _vectorize_counts_and_tree,
-                                   _quantitative_to_qualitative_counts)
+                                   _quantitative_to_qualitative_counts,
+                                   _sparse_pdist)
 from skbio.tree import DuplicateNodeError, MissingNodeError
 
 
@@ -119,6 +122,17 @@ class ValidationTests(TestCase):
         with self.assertRaises(ValueError):
             _validate_counts_matrix([[0, 0, 2, -1, 3], [0, 1, 1, 0, 2]])
 
+    def test_validate_counts_matrix_sparse(self):
+        counts = csr_matrix([[0, 1, 1, 0, 2], [0, 0, 2, 1, 3]]).tocsc()
+        obs = _validate_counts_matrix(counts, ids=['a', 'b'])
+        self.assertEqual(obs.format, 'csr')
+        npt.assert_array_equal(obs.toarray(), counts.toarray())
+
+        with self.assertRaises(ValueError):
+            _validate_counts_matrix(counts, ids=['a', 'b', 'c'])
+        with self.assertRaises(ValueError):
+            _validate_counts_matrix(csr_matrix([[0, 0, 2, -1, 3]]))
+
     def test_validate_counts_matrix_unequal_lengths(self):
         # len of vectors not equal
         with self.assertRaises(ValueError):
@@ -251,6 +265,17 @@ class ValidationTests(TestCase):
         exp_counts = np.array([[0, 1, 10], [1, 5, 1], [1, 6, 11], [1, 6, 11]])
         npt.assert_equal(count_array, exp_counts.T)
 
+        # sparse counts give the same result
+        count_array, indexed, branch_lengths = _vectorize_counts_and_tree(
+            csr_matrix(counts), np.array(['a', 'b']), t)
+        npt.assert_equal(count_array, exp_counts.T)
+
+    def test_vectorize_counts_and_tree_single_tip(self):
+        t = TreeNode.read(io.StringIO("a:1;"))
+        count_array, indexed, branch_lengths = \
+            _vectorize_counts_and_tree(np.array([[0], [3]]), np.array(['a']), t)
+        npt.assert_equal(count_array, np.array([[0], [3]]))
+
     def test_quantitative_to_qualitative_counts(self):
         counts = np.array([[0, 1], [1, 5], [10, 1]])
         exp = np.array([[False, True], [True, True], [True, True]])
@@ -262,6 +287,21 @@ class ValidationTests(TestCase):
         obs = _quantitative_to_qualitative_counts(counts)
         npt.assert_equal(obs, exp)
 
+        obs = _quantitative_to_qualitative_counts(csr_matrix(counts))
+        npt.assert_equal(obs.toarray(), exp)
+
+    def test_sparse_pdist(self):
+        counts = np.array([[0, 1, 0, 4, 2],
+                           [0, 0, 0, 0, 0],
+                           [3, 1, 0, 0, 2],
+                           [0, 0, 0, 0, 0],
+                           [1, 0, 2, 4, 0]], dtype=float)
+        for metric in 'braycurtis', 'jaccard':
+            with np.errstate(invalid='ignore'):
+                exp = pdist(counts, metric)
+            obs = _sparse_pdist(csr_matrix(counts), metric)
+            npt.assert_array_equal(obs, exp)
+
 
 if __name__ == "__main__":
     main()
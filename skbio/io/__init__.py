@@ -15,6 +15,7 @@ see the associated documentation.
    :toctree: generated/
 
    binary_dm
+   binary_ordination
    blast6
    blast7
    clustal
@@ -271,6 +272,7 @@ import_module("skbio.io.format.genbank")
 import_module("skbio.io.format.gff3")
 import_module("skbio.io.format.stockholm")
 import_module("skbio.io.format.binary_dm")
+import_module("skbio.io.format.binary_ordination")
 import_module("skbio.io.format.taxdump")
 
 # This is meant to be a handy indicator to the user that they have done
@@ -59,6 +59,38 @@ Required attributes:
    distance matrix, such as when calculating within and between distances for a
    subset of samples in a large matrix.
 
+Format Parameters
+-----------------
+The reader accepts the parameter ``lazy`` (defaults to ``False``). If
+``True``, the matrix is not loaded into memory. Instead, the returned object
+reads the dataset, either through a ``numpy.memmap`` of the file (if the
+dataset is stored contiguously and uncompressed, as written by scikit-bio) or
+through the ``h5py`` dataset itself, only for the rows needed by indexing,
+``filter``, ``within`` and ``between``. The dissimilarities are not validated
+in this mode. The whole matrix is loaded whenever the ``data`` attribute (or
+a method that relies on it) is accessed. Lazy reading requires an
+uncompressed file on disk, i.e., a file path or an open file.
+
+The HDF5 file is closed once the matrix is mapped into memory. A dataset that
+cannot be mapped (e.g., chunked or compressed) keeps the file open instead,
+until the returned object, and any lazy copy of it, is garbage collected.
+Delete these objects (or load the matrix with ``lazy=False``) to release the
+file, e.g., before it is modified or removed.
+
+The writer writes the matrix a block of rows at a time, so that matrices
+stored in condensed form or read lazily are never fully loaded into memory.
+This applies when writing to an uncompressed file on disk; other outputs
+(e.g., compressed files) are built in memory before being written.
+
+Examples
+--------
+Subset a large distance matrix without loading it:
+
+>>> from skbio import DistanceMatrix
+>>> dm = DistanceMatrix.read('big.h5', format='binary_dm',
+...                          lazy=True) # doctest: +SKIP
+>>> sub = dm.filter(['s1', 's2', 's3']) # doctest: +SKIP
+
 References
 ----------
 .. [1] http://www.hdfgroup.org/
@@ -74,10 +106,16 @@ References
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import io
+import os
+from stat import S_ISREG
+
 import h5py
+import numpy as np
 
 from skbio.io import create_format
 from skbio.stats.distance import DissimilarityMatrix, DistanceMatrix
+from skbio.stats.distance._base import _LAZY_BLOCK_SIZE
 
 
 binary_dm = create_format("binary_dm", encoding="binary")
@@ -111,27 +149,121 @@ def _binary_dm_sniffer(fh):
 
 
 @binary_dm.reader(DissimilarityMatrix)
-def _binary_dm_to_dissimilarity(fh):
-    return _h5py_mat_to_skbio_mat(fh)
+def _binary_dm_to_dissimilarity(fh, lazy=False):
+    return _read_binary_dm(DissimilarityMatrix, fh, lazy)
 
 
 @binary_dm.reader(DistanceMatrix)
-def _binary_dm_to_distance(fh):
-    return _h5py_mat_to_skbio_mat(fh)
+def _binary_dm_to_distance(fh, lazy=False):
+    return _read_binary_dm(DistanceMatrix, fh, lazy)
 
 
 @binary_dm.writer(DissimilarityMatrix)
 def _dissimilarity_to_binary_dm(obj, fh):
-    return _skbio_mat_to_h5py_mat(fh)
+    _write_binary_dm(obj, fh)
 
 
 @binary_dm.writer(DistanceMatrix)
 def _distance_to_binary_dm(obj, fh):
-    return _skbio_mat_to_h5py_mat(fh)
+    _write_binary_dm(obj, fh)
+
+
+def _read_binary_dm(cls, fh, lazy):
+    if not lazy:
+        with h5py.File(fh, "r") as f:
+            return _h5py_mat_to_skbio_mat(cls, f)
+
+    # The file handle is closed by the I/O registry once reading is done, so
+    # the file is mapped by name.
+    name = _disk_file_name(fh)
+    if name is None:
+        raise ValueError("Lazy reading requires an uncompressed file on disk.")
+    with h5py.File(name, "r") as f:
+        ids = _parse_ids(f["order"][:])
+        matrix = _lazy_matrix(f["matrix"])
+    if not isinstance(matrix, np.memmap):
+        # The dataset is read through h5py, so the file is reopened to stay
+        # available to the returned object. It is closed once the dataset is
+        # garbage collected.
+        matrix = h5py.File(name, "r")["matrix"]
+    return cls._from_lazy(matrix, ids)
+
+
+def _write_binary_dm(obj, fh):
+    _write_hdf5(obj, fh, _skbio_mat_to_h5py_mat)
+
+
+def _write_hdf5(obj, fh, write_f):
+    """Write an object into an HDF5 file through a file handle.
+
+    HDF5 reads back what it writes, which the write-only file handle opened
+    by the I/O registry does not allow. Plain files on disk written from
+    their start are reopened by name, so that the content is not held in
+    memory. Any other file handle (e.g., compressed, at an offset, or not a
+    file on disk) receives the content of an in-memory file.
+
+    """
+    name = _disk_file_name(fh, at_start=True)
+    if name is not None:
+        with h5py.File(name, "w") as f:
+            write_f(obj, f)
+    else:
+        buf = io.BytesIO()
+        with h5py.File(buf, "w") as f:
+            write_f(obj, f)
+        fh.write(buf.getvalue())
+
+
+def _disk_file_name(fh, at_start=False):
+    """Return the name of the regular file a file handle reads or writes.
+
+    ``None`` is returned if the handle does not directly wrap a regular file
+    (e.g., it decompresses or compresses its content, it is an in-memory
+    file or a standard stream), or, if `at_start`, if it is not positioned
+    at the start of the file.
+
+    """
+    raw = fh
+    while not isinstance(raw, io.FileIO):
+        raw = getattr(raw, "raw", None)
+        if raw is None:
+            return None
+
+    name = raw.name
+    if not isinstance(name, str):
+        return None
+    try:
+        if at_start and (fh.tell() != 0 or raw.tell() != 0):
+            return None
+        stat = os.fstat(raw.fileno())
+        if not S_ISREG(stat.st_mode) or not os.path.samestat(stat, os.stat(name)):
+            return None
+    except (OSError, ValueError):
+        return None
+    return name
 
 
 def _h5py_mat_to_skbio_mat(cls, fh):
-    return cls(fh["matrix"], _parse_ids(fh["order"]))
+    return cls(fh["matrix"][()], _parse_ids(fh["order"][:]))
+
+
+def _lazy_matrix(dataset):
+    """Map a contiguous dataset into memory, or return the dataset itself."""
+    if (
+        dataset.chunks is None
+        and dataset.compression is None
+        and dataset.dtype in (np.float32, np.float64)
+    ):
+        offset = dataset.id.get_offset()
+        if offset is not None:
+            return np.memmap(
+                dataset.file.filename,
+                dtype=dataset.dtype,
+                mode="r",
+                offset=offset,
+                shape=dataset.shape,
+            )
+    return dataset
 
 
 def _skbio_mat_to_h5py_mat(obj, fh):
@@ -139,7 +271,14 @@ def _skbio_mat_to_h5py_mat(obj, fh):
 
     ids = fh.create_dataset("order", shape=(len(obj.ids),), dtype=_vlen_dtype)
     ids[:] = obj.ids
-    fh.create_dataset("matrix", data=obj.data)
+
+    n = obj.shape[0]
+    mat = fh.create_dataset("matrix", shape=(n, n), dtype=obj.dtype)
+    columns = np.arange(n)
+    step = max(1, _LAZY_BLOCK_SIZE // (n * obj.dtype.itemsize))
+    for start in range(0, n, step):
+        rows = np.arange(start, min(start + step, n))
+        mat[start : start + rows.size] = obj._submatrix(rows, columns)
 
 
 def _get_header(fh):
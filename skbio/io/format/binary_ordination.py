@@ -0,0 +1,280 @@
+"""Binary ordination results format (:mod:`skbio.io.format.binary_ordination`)
+=========================================================================
+
+.. currentmodule:: skbio.io.format.binary_ordination
+
+The binary ordination results format (``binary_ordination``) stores the
+results of an ordination method in a binary, columnar representation. It
+holds the same attributes as the text-based ``ordination`` format, and is
+designed to make large ordinations (e.g., the PCoA of many samples) fast to
+write and to read, entirely or only their first axes.
+
+Format Support
+--------------
+**Has Sniffer: Yes**
+
++------+------+---------------------------------------------------------------+
+|Reader|Writer|                          Object Class                         |
++======+======+===============================================================+
+|Yes   |Yes   |:mod:`skbio.stats.ordination.OrdinationResults`                |
++------+------+---------------------------------------------------------------+
+
+Format Specification
+--------------------
+The ordination results are stored within an HDF5 [1]_ file. Strings are of a
+variable length unicode type, and values are floating point.
+
+Required datasets:
+
++--------------------+---------+-----------------------------------------+
+|Dataset             |Value    |Description                              |
+|                    |type     |                                         |
++====================+=========+=========================================+
+|format              |string   |A string identifying the file as binary  |
+|                    |         |ordination format                        |
++--------------------+---------+-----------------------------------------+
+|version             |string   |The version of the current binary        |
+|                    |         |ordination format                        |
++--------------------+---------+-----------------------------------------+
+|method              |string   |A (2,) dataset of the short and long     |
+|                    |         |names of the ordination method           |
++--------------------+---------+-----------------------------------------+
+|axes                |string or|A (K,) dataset of the axis labels, where |
+|                    |integer  |K is the number of axes                  |
++--------------------+---------+-----------------------------------------+
+|eigvals             |float    |A (K,) dataset of the eigenvalues        |
++--------------------+---------+-----------------------------------------+
+
+Optional datasets and groups:
+
++--------------------+---------+-----------------------------------------+
+|Dataset or group    |Value    |Description                              |
+|                    |type     |                                         |
++====================+=========+=========================================+
+|proportion_explained|float    |A (K,) dataset of the proportions        |
+|                    |         |explained by the axes                    |
++--------------------+---------+-----------------------------------------+
+|samples             |group    |Coordinates of the samples               |
++--------------------+---------+-----------------------------------------+
+|features            |group    |Coordinates of the features              |
++--------------------+---------+-----------------------------------------+
+|biplot_scores       |group    |Biplot scores                            |
++--------------------+---------+-----------------------------------------+
+|sample_constraints  |group    |Sample constraints                       |
++--------------------+---------+-----------------------------------------+
+
+Each group of scores of N objects on k axes contains a (N,) dataset ``ids`` of
+the object IDs, a (k,) dataset ``axes`` of the axis labels, and a (k, N) float
+dataset ``scores``. IDs and axis labels are stored as integers if they are all
+integers (e.g., the axes of results read from the ``ordination`` format), and
+as strings otherwise. The scores are stored by axis (i.e.,
+transposed with respect to ``OrdinationResults``), so that the scores of the
+first axes are stored contiguously. Scores may be stored on fewer axes than
+there are eigenvalues.
+
+Format Parameters
+-----------------
+The reader accepts the following parameters:
+
+- ``number_of_dimensions`` (defaults to 0): if positive, only the scores on
+  the first ``number_of_dimensions`` axes are read. The eigenvalues and the
+  proportions explained of all the axes are read regardless. Note that the
+  text-based ``ordination`` format cannot store the resulting object, which
+  has fewer scores than eigenvalues per object.
+- ``lazy`` (defaults to ``False``): if ``True``, the scores are not loaded
+  into memory. Instead, the data frames of the returned object are views of
+  a ``numpy.memmap`` of the file, whose values are read when accessed. This
+  requires an uncompressed file on disk (i.e., a file path or an open
+  file), and scores stored contiguously and uncompressed, as written by
+  scikit-bio (otherwise they are loaded into memory).
+
+The writer writes the scores a block of axes at a time. Outputs other than
+uncompressed files on disk (e.g., compressed files) are built in memory
+before being written.
+
+Examples
+--------
+Read the coordinates of the samples on the first 10 axes of a large PCoA,
+without reading the other axes:
+
+>>> from skbio import OrdinationResults
+>>> res = OrdinationResults.read('big_pcoa.h5', format='binary_ordination',
+...                              number_of_dimensions=10,
+...                              lazy=True) # doctest: +SKIP
+>>> res.samples.shape # doctest: +SKIP
+(100000, 10)
+
+References
+----------
+.. [1] http://www.hdfgroup.org/
+
+
+"""  # noqa: D205, D415
+
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import h5py
+import numpy as np
+import pandas as pd
+
+from skbio.io import create_format
+from skbio.io.format.binary_dm import (
+    _disk_file_name,
+    _lazy_matrix,
+    _parse_ids,
+    _write_hdf5,
+)
+from skbio.stats.distance._base import _LAZY_BLOCK_SIZE
+from skbio.stats.ordination import OrdinationResults
+
+
+binary_ordination = create_format("binary_ordination", encoding="binary")
+_vlen_dtype = h5py.special_dtype(vlen=str)
+
+# Attributes of OrdinationResults holding scores, also the names of the
+# groups storing them
+_SCORES = ("samples", "features", "biplot_scores", "sample_constraints")
+
+
+@binary_ordination.sniffer()
+def _binary_ordination_sniffer(fh):
+    try:
+        f = h5py.File(fh, "r")
+    except OSError:
+        return False, {}
+
+    format_ = f.get("format")
+    if format_ is None or format_[0] != b"BORD":
+        return False, {}
+
+    for name in "method", "axes", "eigvals":
+        if name not in f:
+            return False, {}
+
+    return True, {}
+
+
+@binary_ordination.reader(OrdinationResults)
+def _binary_ordination_to_ordination_results(fh, number_of_dimensions=0, lazy=False):
+    if not lazy:
+        with h5py.File(fh, "r") as f:
+            return _h5py_to_ordination_results(f, number_of_dimensions)
+
+    # The file handle is closed by the I/O registry once reading is done, so
+    # the file is mapped by name.
+    name = _disk_file_name(fh)
+    if name is None:
+        raise ValueError("Lazy reading requires an uncompressed file on disk.")
+    with h5py.File(name, "r") as f:
+        return _h5py_to_ordination_results(f, number_of_dimensions, lazy=True)
+
+
+@binary_ordination.writer(OrdinationResults)
+def _ordination_results_to_binary_ordination(obj, fh):
+    _write_hdf5(obj, fh, _ordination_results_to_h5py)
+
+
+def _h5py_to_ordination_results(f, number_of_dimensions=0, lazy=False):
+    short_method_name, long_method_name = _parse_ids(f["method"][:])
+    axes = _read_labels(f["axes"])
+    eigvals = pd.Series(f["eigvals"][:], index=axes)
+
+    proportion_explained = None
+    if "proportion_explained" in f:
+        proportion_explained = pd.Series(f["proportion_explained"][:], index=axes)
+
+    scores = {}
+    for attr in _SCORES:
+        if attr in f:
+            scores[attr] = _read_scores(f[attr], number_of_dimensions, lazy)
+
+    return OrdinationResults(
+        short_method_name,
+        long_method_name,
+        eigvals,
+        scores.get("samples"),
+        features=scores.get("features"),
+        biplot_scores=scores.get("biplot_scores"),
+        sample_constraints=scores.get("sample_constraints"),
+        proportion_explained=proportion_explained,
+    )
+
+
+def _read_scores(group, number_of_dimensions, lazy):
+    """Read (the first axes of) a group of scores into a data frame."""
+    dataset = group["scores"]
+    stop = number_of_dimensions or dataset.shape[0]
+    data = _lazy_matrix(dataset) if lazy else dataset
+    # Slicing a memory map returns a view of the file, slicing a dataset
+    # reads the selected axes only
+    data = np.asarray(data[:stop])
+    # The transposed (Fortran-ordered) array is what pandas stores, so the
+    # data frame does not copy it
+    return pd.DataFrame(
+        data.T,
+        index=_read_labels(group["ids"]),
+        columns=_read_labels(group["axes"], stop),
+        copy=False,
+    )
+
+
+def _ordination_results_to_h5py(obj, f):
+    _set_header(f)
+
+    method = f.create_dataset("method", shape=(2,), dtype=_vlen_dtype)
+    method[:] = [obj.short_method_name, obj.long_method_name]
+    _write_labels(f, "axes", obj.eigvals.index)
+    f.create_dataset("eigvals", data=obj.eigvals.values)
+    if obj.proportion_explained is not None:
+        f.create_dataset("proportion_explained", data=obj.proportion_explained.values)
+
+    for attr in _SCORES:
+        data = getattr(obj, attr)
+        if data is not None:
+            _write_scores(f.create_group(attr), data)
+
+
+def _write_scores(group, data):
+    """Write a data frame of scores into a group, by axis."""
+    _write_labels(group, "ids", data.index)
+    _write_labels(group, "axes", data.columns)
+
+    values = data.values
+    n, k = values.shape
+    scores = group.create_dataset("scores", shape=(k, n), dtype=values.dtype)
+    step = max(1, _LAZY_BLOCK_SIZE // (max(n, 1) * values.dtype.itemsize))
+    for start in range(0, k, step):
+        scores[start : start + step] = values[:, start : start + step].T
+
+
+def _write_labels(f, name, index):
+    """Write IDs or axis labels, keeping integer labels as integers."""
+    if pd.api.types.is_integer_dtype(index):
+        f.create_dataset(name, data=np.asarray(index, dtype=np.int64))
+    else:
+        dataset = f.create_dataset(name, shape=(len(index),), dtype=_vlen_dtype)
+        dataset[:] = [str(value) for value in index]
+
+
+def _read_labels(dataset, stop=None):
+    """Read IDs or axis labels written by ``_write_labels``."""
+    values = dataset[:stop]
+    if dataset.dtype.kind in "iu":
+        return pd.Index(values)
+    return _parse_ids(values)
+
+
+def _set_header(h5grp):
+    """Set format spec header information."""
+    h5grp["format"] = [
+        b"BORD",
+    ]
+    h5grp["version"] = [
+        b"2024.01",
+    ]
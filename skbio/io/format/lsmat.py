@@ -65,6 +65,21 @@ length. This value is useful for reading a fixed-width text file. However, it
 cannot be automatically determined, nor can it be specified when writing to a
 file.
 
+The reader also accepts the parameter ``dtype``, which is the floating point
+type of the matrix that is read: ``'float64'`` (the default) or ``'float32'``,
+which halves the memory needed. When reading a ``DistanceMatrix``, the
+parameter ``condensed`` (defaults to ``False``) returns a matrix stored in
+condensed form (see ``DistanceMatrix``), without holding the full square matrix
+in memory at any point.
+
+The matrix is read and written a block of rows at a time. The values of each
+block are parsed together by ``numpy.loadtxt`` (or by the C parser of
+``pandas.read_csv`` with NumPy versions older than 1.23, whose ``loadtxt`` is
+implemented in Python) and formatted together when writing, which is
+considerably faster than handling them one row at a time for large matrices.
+Values are written in the shortest representation that is read back to the
+same number in the ``dtype`` of the matrix.
+
 """  # noqa: D205, D415
 
 # ----------------------------------------------------------------------------
@@ -76,15 +91,29 @@ file.
 # ----------------------------------------------------------------------------
 
 import csv
+import io
+import warnings
 
 import numpy as np
+import pandas as pd
 
-from skbio.stats.distance import DissimilarityMatrix, DistanceMatrix
+from skbio.stats.distance import (
+    DissimilarityMatrix,
+    DistanceMatrix,
+    DistanceMatrixError,
+)
 from skbio.io import create_format, LSMatFormatError
 
 
 lsmat = create_format("lsmat")
 
+# Number of values read or written together.
+_BLOCK_SIZE = 2**20
+
+# Whether blocks of values are parsed by pandas rather than by numpy.loadtxt,
+# which is only implemented in C since NumPy 1.23.
+_PANDAS_PARSER = np.lib.NumpyVersion(np.__version__) < "1.23.0"
+
 
 @lsmat.sniffer()
 def _lsmat_sniffer(fh):
@@ -107,13 +136,13 @@ def _lsmat_sniffer(fh):
 
 
 @lsmat.reader(DissimilarityMatrix)
-def _lsmat_to_dissimilarity_matrix(fh, delimiter="\t"):
-    return _lsmat_to_matrix(DissimilarityMatrix, fh, delimiter)
+def _lsmat_to_dissimilarity_matrix(fh, delimiter="\t", dtype="float64"):
+    return _lsmat_to_matrix(DissimilarityMatrix, fh, delimiter, dtype)
 
 
 @lsmat.reader(DistanceMatrix)
-def _lsmat_to_distance_matrix(fh, delimiter="\t"):
-    return _lsmat_to_matrix(DistanceMatrix, fh, delimiter)
+def _lsmat_to_distance_matrix(fh, delimiter="\t", dtype="float64", condensed=False):
+    return _lsmat_to_matrix(DistanceMatrix, fh, delimiter, dtype, condensed)
 
 
 @lsmat.writer(DissimilarityMatrix)
@@ -126,17 +155,17 @@ def _distance_matrix_to_lsmat(obj, fh, delimiter="\t"):
     _matrix_to_lsmat(obj, fh, delimiter)
 
 
-def _lsmat_to_matrix(cls, fh, delimiter):
-    # We aren't using np.loadtxt because it uses *way* too much memory
-    # (e.g, a 2GB matrix eats up 10GB, which then isn't freed after parsing
-    # has finished). See:
-    # http://mail.scipy.org/pipermail/numpy-tickets/2012-August/006749.html
+def _lsmat_to_matrix(cls, fh, delimiter, dtype="float64", condensed=False):
+    # We aren't using np.loadtxt on the whole file because it would need to
+    # hold all of the lines in memory.
 
     # Strategy:
     #   - find the header
-    #   - initialize an empty ndarray
-    #   - for each row of data in the input file:
-    #     - populate the corresponding row in the ndarray with floats
+    #   - initialize an empty ndarray (or condensed vector)
+    #   - for each block of rows of data in the input file:
+    #     - check the row IDs
+    #     - parse the values of all rows of the block together
+    #     - populate the corresponding rows in the ndarray with floats
 
     header = _find_header(fh)
     if header is None:
@@ -148,44 +177,120 @@ def _lsmat_to_matrix(cls, fh, delimiter):
 
     ids = _parse_header(header, delimiter)
     num_ids = len(ids)
-    data = np.empty((num_ids, num_ids), dtype=np.float64)
-
-    row_idx = -1
-    for row_idx, (row_id, row_data) in enumerate(_parse_data(fh, delimiter)):
-        if row_idx >= num_ids:
+    if condensed:
+        data = np.empty(num_ids * (num_ids - 1) // 2, dtype=dtype)
+    else:
+        data = np.empty((num_ids, num_ids), dtype=dtype)
+
+    block_rows = max(1, _BLOCK_SIZE // max(num_ids, 1))
+    row_idx = 0
+    for row_ids, row_values in _parse_data_blocks(fh, delimiter, block_rows):
+        if row_idx + len(row_ids) > num_ids:
             # We've hit a nonempty line after we already filled the data
             # matrix. Raise an error because we shouldn't ignore extra data.
             raise LSMatFormatError(
-                "Encountered extra row(s) without corresponding IDs in " "the header."
-            )
-
-        num_vals = len(row_data)
-        if num_vals != num_ids:
-            raise LSMatFormatError(
-                "There are %d value(s) in row %d, which is not equal to the "
-                "number of ID(s) in the header (%d)." % (num_vals, row_idx + 1, num_ids)
+                "Encountered extra row(s) without corresponding IDs in the header."
             )
 
-        expected_id = ids[row_idx]
-        if row_id == expected_id:
-            data[row_idx, :] = np.asarray(row_data, dtype=float)
+        for row_id, expected_id in zip(row_ids, ids[row_idx:]):
+            if row_id != expected_id:
+                raise LSMatFormatError(
+                    "Encountered mismatched IDs while parsing the "
+                    "dissimilarity matrix file. Found %r but expected "
+                    "%r. Please ensure that the IDs match between the "
+                    "dissimilarity matrix header (first row) and the row "
+                    "labels (first column)." % (str(row_id), str(expected_id))
+                )
+
+        block = _parse_values(row_values, delimiter, num_ids, row_idx, dtype)
+        if condensed:
+            _fill_condensed(data, block, row_idx, num_ids)
         else:
-            raise LSMatFormatError(
-                "Encountered mismatched IDs while parsing the "
-                "dissimilarity matrix file. Found %r but expected "
-                "%r. Please ensure that the IDs match between the "
-                "dissimilarity matrix header (first row) and the row "
-                "labels (first column)." % (str(row_id), str(expected_id))
-            )
+            data[row_idx : row_idx + len(block)] = block
+        row_idx += len(block)
 
-    if row_idx != num_ids - 1:
+    if row_idx != num_ids:
         raise LSMatFormatError(
-            "Expected %d row(s) of data, but found %d." % (num_ids, row_idx + 1)
+            "Expected %d row(s) of data, but found %d." % (num_ids, row_idx)
         )
 
+    if condensed:
+        return cls(data, ids, condensed=True)
     return cls(data, ids)
 
 
+def _parse_values(row_values, delimiter, num_ids, row_idx, dtype):
+    """Parse the values of a block of rows into a 2D array."""
+    try:
+        if _PANDAS_PARSER:
+            block = _read_csv_values(row_values, delimiter, dtype)
+        else:
+            with warnings.catch_warnings():
+                # blank rows are reported below
+                warnings.filterwarnings("ignore", "loadtxt: input contained no data")
+                block = np.loadtxt(
+                    row_values, dtype=dtype, delimiter=delimiter, comments=None, ndmin=2
+                )
+    except (ValueError, pd.errors.ParserError):
+        block = None
+
+    if block is None or block.shape != (len(row_values), num_ids):
+        # Parse one row at a time to find the offending one.
+        block = np.empty((len(row_values), num_ids), dtype=dtype)
+        for i, values in enumerate(row_values):
+            tokens = values.rstrip().split(delimiter) if values.strip() else []
+            num_vals = len(tokens)
+            if num_vals != num_ids:
+                raise LSMatFormatError(
+                    "There are %d value(s) in row %d, which is not equal to the "
+                    "number of ID(s) in the header (%d)."
+                    % (num_vals, row_idx + i + 1, num_ids)
+                )
+            block[i] = np.asarray(tokens, dtype=float)
+
+    return block
+
+
+def _read_csv_values(row_values, delimiter, dtype):
+    """Parse the values of a block of rows with the C parser of pandas."""
+    block = pd.read_csv(
+        io.StringIO("".join(row_values)),
+        sep=r"\s+" if delimiter is None else delimiter,
+        header=None,
+        dtype=dtype,
+        quoting=csv.QUOTE_NONE,
+        # the default converter may be off by one unit in the last place
+        float_precision="round_trip",
+        engine="c",
+    ).to_numpy()
+    # rows shorter than the first one are padded with NaN
+    if np.isnan(block).any():
+        return None
+    return block
+
+
+def _fill_condensed(data, block, row_idx, num_ids):
+    """Store the upper triangle of a block of rows of a distance matrix.
+
+    The rest of each row is checked against the distances already stored, as
+    the full matrix is not available to validate at the end.
+
+    """
+    for i, row in enumerate(block, start=row_idx):
+        if row[i] != 0:
+            raise DistanceMatrixError(
+                "Data must be hollow (i.e., the diagonal can only contain zeros)."
+            )
+        start = i * num_ids - i * (i + 1) // 2
+        data[start : start + num_ids - i - 1] = row[i + 1 :]
+
+        # distance between j and i, for all j < i
+        j = np.arange(i)
+        lower = data[j * num_ids - j * (j + 1) // 2 + i - j - 1]
+        if not np.array_equal(row[:i], lower) or np.isnan(row[i + 1 :]).any():
+            raise DistanceMatrixError("Data must be symmetric and cannot contain NaNs.")
+
+
 def _find_header(fh):
     header = None
 
@@ -227,17 +332,49 @@ def _parse_data(fh, delimiter):
         yield id_, tokens[1:]
 
 
+def _parse_data_blocks(fh, delimiter, block_rows):
+    """Yield the IDs and the unparsed values of blocks of nonempty lines."""
+    ids, values = [], []
+    for line in fh:
+        if not line.strip():
+            continue
+
+        tokens = line.split(delimiter, 1)
+        ids.append(tokens[0].strip())
+        values.append(tokens[1] if len(tokens) > 1 else "")
+
+        if len(ids) == block_rows:
+            yield ids, values
+            ids, values = [], []
+
+    if ids:
+        yield ids, values
+
+
 def _matrix_to_lsmat(obj, fh, delimiter):
     delimiter = "%s" % delimiter
     ids = obj.ids
     fh.write(_format_ids(ids, delimiter))
     fh.write("\n")
 
-    for id_, vals in zip(ids, obj.data):
-        fh.write("%s" % id_)
-        fh.write(delimiter)
-        fh.write(delimiter.join(np.asarray(vals, dtype=str)))
-        fh.write("\n")
+    n = len(ids)
+    columns = np.arange(n)
+    block_rows = max(1, _BLOCK_SIZE // n)
+    for start in range(0, n, block_rows):
+        rows = np.arange(start, min(start + block_rows, n))
+        block = obj._submatrix(rows, columns)
+        if block.dtype == np.float64:
+            # repr of a Python float is the shortest representation of a
+            # float64, as produced by NumPy, but faster to obtain.
+            block = [map(repr, vals) for vals in block.tolist()]
+        else:
+            block = block.astype(str).tolist()
+        fh.write(
+            "".join(
+                "%s%s%s\n" % (ids[i], delimiter, delimiter.join(vals))
+                for i, vals in zip(rows, block)
+            )
+        )
 
 
 def _format_ids(ids, delimiter):
@@ -6,23 +6,29 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import gc
+import gzip
+import io
 import unittest
 import tempfile
 import shutil
 import os
+from unittest import mock
 
 import numpy as np
 import numpy.testing as npt
+import pandas.testing as pdt
 import h5py
 
 from skbio import DistanceMatrix
+from skbio.stats.distance import DissimilarityMatrix
 from skbio.io.format.binary_dm import (_h5py_mat_to_skbio_mat,
                                        _skbio_mat_to_h5py_mat, _get_header,
                                        _parse_ids, _verify_dimensions,
                                        _bytes_decoder, _passthrough_decoder,
                                        _set_header,
-                                       _vlen_dtype,
-                                       _binary_dm_sniffer)
+                                       _vlen_dtype, _lazy_matrix,
+                                       _binary_dm_sniffer, _disk_file_name)
 
 
 class BinaryMatrixTests(unittest.TestCase):
@@ -84,6 +90,131 @@ class BinaryMatrixTests(unittest.TestCase):
         npt.assert_equal(np.asarray(fh1['order'][:], dtype=str), mat.ids)
         npt.assert_equal(fh1['matrix'], mat.data)
 
+    def test_read_write(self):
+        fname = os.path.join(self.tempdir.name, 'roundtrip')
+        for cls in DistanceMatrix, DissimilarityMatrix:
+            exp = cls(self.mat, self.ids)
+            exp.write(fname, format='binary_dm')
+            obs = cls.read(fname, format='binary_dm')
+            self.assertIs(type(obs), cls)
+            self.assertEqual(obs, exp)
+
+            fh = io.BytesIO()
+            exp.write(fh, format='binary_dm')
+            fh.seek(0)
+            self.assertEqual(cls.read(fh, format='binary_dm'), exp)
+
+    def test_read_write_compressed(self):
+        fname = os.path.join(self.tempdir.name, 'roundtrip.h5.gz')
+        exp = DistanceMatrix(self.mat, self.ids)
+        exp.write(fname, format='binary_dm', compression='gzip')
+        with gzip.open(fname) as f:
+            self.assertEqual(f.read(8), b'\x89HDF\r\n\x1a\n')
+        self.assertEqual(DistanceMatrix.read(fname, format='binary_dm'), exp)
+
+        with self.assertRaisesRegex(ValueError, 'uncompressed file on disk'):
+            DistanceMatrix.read(fname, format='binary_dm', lazy=True)
+
+    def test_write_at_offset(self):
+        fname = os.path.join(self.tempdir.name, 'offset')
+        exp = DistanceMatrix(self.mat, self.ids)
+        with open(fname, 'wb') as f:
+            f.write(b'header')
+            exp.write(f, format='binary_dm')
+        with open(fname, 'rb') as f:
+            self.assertEqual(f.read(6), b'header')
+            self.assertEqual(DistanceMatrix.read(io.BytesIO(f.read()),
+                                                 format='binary_dm'), exp)
+
+    def test_disk_file_name(self):
+        fname = os.path.join(self.tempdir.name, 'name')
+        with open(fname, 'wb') as f:
+            self.assertEqual(_disk_file_name(f), fname)
+            self.assertEqual(_disk_file_name(f, at_start=True), fname)
+            f.write(b'a')
+            f.flush()
+            self.assertEqual(_disk_file_name(f), fname)
+            self.assertIsNone(_disk_file_name(f, at_start=True))
+        with open(fname, 'rb') as f:
+            self.assertIsNone(_disk_file_name(gzip.GzipFile(fileobj=f)))
+        self.assertIsNone(_disk_file_name(io.BytesIO()))
+
+    def test_write_in_blocks(self):
+        fname = os.path.join(self.tempdir.name, 'blocks')
+        exp = DistanceMatrix(self.mat.astype(np.float32), self.ids,
+                             condensed=True)
+        with mock.patch('skbio.io.format.binary_dm._LAZY_BLOCK_SIZE', 8):
+            exp.write(fname, format='binary_dm')
+        with h5py.File(fname, 'r') as f:
+            self.assertEqual(f['matrix'].dtype, np.float32)
+            npt.assert_equal(f['matrix'][()], exp.data)
+
+    def test_read_lazy(self):
+        exp = DistanceMatrix(self.mat, self.ids)
+        obs = DistanceMatrix.read(self.basic_fname, format='binary_dm',
+                                  lazy=True)
+        self.assertIsInstance(obs._data, np.memmap)
+        # the file is closed, and can be reopened for writing
+        h5py.File(self.basic_fname, 'r+').close()
+        self.assertEqual(obs.shape, (3, 3))
+        self.assertEqual(obs['c', 'b'], 0.3)
+        npt.assert_equal(obs['b'], exp['b'])
+        self.assertEqual(obs, exp)
+
+        with mock.patch('skbio.stats.distance._base._LAZY_BLOCK_SIZE', 8):
+            obs_filtered = obs.filter(['c', 'a'])
+            self.assertFalse(obs_filtered._lazy)
+            self.assertEqual(obs_filtered, exp.filter(['c', 'a']))
+            pdt.assert_frame_equal(obs.between(['a'], ['b', 'c']),
+                                   exp.between(['a'], ['b', 'c']))
+            pdt.assert_frame_equal(obs.within(['a', 'c']),
+                                   exp.within(['a', 'c']))
+
+        npt.assert_equal(obs.condensed_form(), exp.condensed_form())
+        self.assertEqual(obs.copy(), exp)
+
+    def test_read_lazy_chunked(self):
+        fname = os.path.join(self.tempdir.name, 'chunked')
+        with h5py.File(fname, 'w') as f:
+            _set_header(f)
+            ids = f.create_dataset('order', shape=(3, ), dtype=_vlen_dtype)
+            ids[:] = self.ids
+            f.create_dataset('matrix', data=self.mat, chunks=(1, 3))
+
+        exp = DistanceMatrix(self.mat, self.ids)
+        obs = DistanceMatrix.read(fname, format='binary_dm', lazy=True)
+        self.assertIsInstance(obs._data, h5py.Dataset)
+        self.assertEqual(obs['a', 'c'], 0.2)
+        self.assertEqual(obs.filter(['c', 'b', 'a']),
+                         exp.filter(['c', 'b', 'a']))
+        self.assertEqual(obs.filter(['a', 'c']), exp.filter(['a', 'c']))
+        self.assertEqual(obs, exp)
+
+        # the file stays open as long as the dataset is referenced
+        with self.assertRaises(OSError):
+            h5py.File(fname, 'r+')
+        del obs
+        gc.collect()
+        h5py.File(fname, 'r+').close()
+
+    def test_read_lazy_no_file(self):
+        fh = io.BytesIO()
+        DistanceMatrix(self.mat, self.ids).write(fh, format='binary_dm')
+        fh.seek(0)
+        with self.assertRaisesRegex(ValueError, 'file on disk'):
+            DistanceMatrix.read(fh, format='binary_dm', lazy=True)
+
+    def test_lazy_matrix(self):
+        with h5py.File(self.basic_fname, 'r') as f:
+            obs = _lazy_matrix(f['matrix'])
+            self.assertIsInstance(obs, np.memmap)
+            npt.assert_equal(obs, self.mat)
+
+        fh = h5py.File('f2', 'a', driver='core', backing_store=False)
+        dataset = fh.create_dataset('matrix', data=self.mat,
+                                    compression='gzip')
+        self.assertIs(_lazy_matrix(dataset), dataset)
+
     def test_get_header(self):
         self.assertEqual(_get_header(h5py.File(self.basic_fname, 'r')),
                          {'format': b'BDSM', 'version': b'2020.06'})
@@ -0,0 +1,151 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import gzip
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+import pandas as pd
+
+from skbio import DistanceMatrix, OrdinationResults
+from skbio.stats.ordination import pcoa
+from skbio.io.format.binary_ordination import (
+    _binary_ordination_sniffer, _binary_ordination_to_ordination_results,
+    _ordination_results_to_binary_ordination)
+from skbio.util import get_data_path, assert_ordination_results_equal
+
+
+class BinaryOrdinationTests(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.fname = os.path.join(self.tempdir.name, 'ord')
+
+        # CCA results, with scores of all types
+        self.cca = OrdinationResults.read(
+            get_data_path('ordination_example3_scores'))
+
+        # PCoA results, without features
+        self.pcoa = OrdinationResults.read(
+            get_data_path('ordination_PCoA_sample_data_3_scores'))
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _write_read(self, obj, **kwargs):
+        obj.write(self.fname, format='binary_ordination')
+        return OrdinationResults.read(self.fname, format='binary_ordination',
+                                      **kwargs)
+
+    def test_roundtrip(self):
+        for exp in self.cca, self.pcoa:
+            obs = self._write_read(exp)
+            assert_ordination_results_equal(obs, exp)
+
+    def test_roundtrip_file_object(self):
+        fh = io.BytesIO()
+        _ordination_results_to_binary_ordination(self.cca, fh)
+        fh.seek(0)
+        obs = _binary_ordination_to_ordination_results(fh)
+        assert_ordination_results_equal(obs, self.cca)
+
+    def test_roundtrip_compressed(self):
+        fname = os.path.join(self.tempdir.name, 'ord.h5.gz')
+        self.cca.write(fname, format='binary_ordination', compression='gzip')
+        with gzip.open(fname) as f:
+            self.assertEqual(f.read(8), b'\x89HDF\r\n\x1a\n')
+        obs = OrdinationResults.read(fname, format='binary_ordination')
+        assert_ordination_results_equal(obs, self.cca)
+
+        with self.assertRaisesRegex(ValueError, 'uncompressed file on disk'):
+            OrdinationResults.read(fname, format='binary_ordination',
+                                   lazy=True)
+
+    def test_roundtrip_no_proportion_explained(self):
+        self.pcoa.proportion_explained = None
+        obs = self._write_read(self.pcoa)
+        self.assertIsNone(obs.proportion_explained)
+        assert_ordination_results_equal(obs, self.pcoa)
+
+    def test_number_of_dimensions(self):
+        eigvals = self.cca.eigvals
+        self.cca.proportion_explained = eigvals / eigvals.sum()
+        obs = self._write_read(self.cca, number_of_dimensions=2)
+        for attr in ('samples', 'features', 'biplot_scores',
+                     'sample_constraints'):
+            exp = getattr(self.cca, attr)
+            pd.testing.assert_frame_equal(getattr(obs, attr),
+                                          exp.iloc[:, :2])
+        # All the eigenvalues are read
+        pd.testing.assert_series_equal(obs.eigvals, self.cca.eigvals)
+        pd.testing.assert_series_equal(obs.proportion_explained,
+                                       self.cca.proportion_explained)
+
+    def test_lazy(self):
+        obs = self._write_read(self.cca, lazy=True)
+        assert_ordination_results_equal(obs, self.cca)
+
+        values = obs.samples.values
+        while not isinstance(values, np.memmap) and values.base is not None:
+            values = values.base
+        self.assertIsInstance(values, np.memmap)
+
+        obs = self._write_read(self.cca, lazy=True, number_of_dimensions=3)
+        npt.assert_array_equal(obs.samples.values,
+                               self.cca.samples.values[:, :3])
+
+    def test_lazy_file_object(self):
+        fh = io.BytesIO()
+        _ordination_results_to_binary_ordination(self.cca, fh)
+        fh.seek(0)
+        with self.assertRaisesRegex(ValueError, 'file on disk'):
+            _binary_ordination_to_ordination_results(fh, lazy=True)
+
+    def test_large_pcoa(self):
+        rng = np.random.default_rng(0)
+        coords = rng.normal(size=(100, 5))
+        dm = DistanceMatrix(
+            np.sqrt(((coords[:, None] - coords) ** 2).sum(axis=2)))
+        exp = pcoa(dm)
+        obs = self._write_read(exp, number_of_dimensions=10, lazy=True)
+        self.assertEqual(obs.samples.shape, (100, 10))
+        self.assertEqual(len(obs.eigvals), 100)
+        npt.assert_array_equal(obs.samples.values,
+                               exp.samples.values[:, :10])
+
+
+class SnifferTests(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_sniffer(self):
+        ord_fname = os.path.join(self.tempdir.name, 'ord')
+        OrdinationResults.read(
+            get_data_path('ordination_example3_scores')).write(
+                ord_fname, format='binary_ordination')
+        with open(ord_fname, 'rb') as fh:
+            self.assertEqual(_binary_ordination_sniffer(fh), (True, {}))
+
+        dm_fname = os.path.join(self.tempdir.name, 'dm')
+        DistanceMatrix([[0, 1], [1, 0]], ['a', 'b']).write(
+            dm_fname, format='binary_dm')
+        with open(dm_fname, 'rb') as fh:
+            self.assertEqual(_binary_ordination_sniffer(fh), (False, {}))
+
+        with open(get_data_path('ordination_example3_scores'), 'rb') as fh:
+            self.assertEqual(_binary_ordination_sniffer(fh), (False, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
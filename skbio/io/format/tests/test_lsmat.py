@@ -7,7 +7,10 @@
 # ----------------------------------------------------------------------------
 
 import io
-from unittest import TestCase, main
+import warnings
+from unittest import TestCase, main, mock
+
+import numpy as np
 
 from skbio import DistanceMatrix
 from skbio.io import LSMatFormatError
@@ -42,6 +45,7 @@ class LSMatTestData(TestCase):
         self.invalid_4_fh = io.StringIO(INVALID_4)
         self.invalid_5_fh = io.StringIO(INVALID_5)
         self.invalid_6_fh = io.StringIO(INVALID_6)
+        self.invalid_7_fh = io.StringIO(INVALID_7)
 
         self.invalid_fhs = [
             (self.empty_fh, r'empty'),
@@ -50,7 +54,8 @@ class LSMatTestData(TestCase):
             (self.invalid_3_fh, r'extra row\(s\)'),
             (self.invalid_4_fh, r'2 row\(s\).*found 1'),
             (self.invalid_5_fh, r'2 row\(s\).*found 0'),
-            (self.invalid_6_fh, r"delimiter '\\t'")
+            (self.invalid_6_fh, r"delimiter '\\t'"),
+            (self.invalid_7_fh, r'0 value\(s\) in row 1')
         ]
 
 
@@ -128,10 +133,13 @@ class DissimilarityAndDistanceMatrixReaderWriterTests(LSMatTestData):
     def test_read_invalid_files(self):
         for fn in _lsmat_to_dissimilarity_matrix, _lsmat_to_distance_matrix:
             for invalid_fh, error_msg_regexp in self.invalid_fhs:
-                with self.assertRaisesRegex(LSMatFormatError,
-                                            error_msg_regexp):
-                    invalid_fh.seek(0)
-                    fn(invalid_fh)
+                with warnings.catch_warnings():
+                    # the error is the only thing reported
+                    warnings.simplefilter('error')
+                    with self.assertRaisesRegex(LSMatFormatError,
+                                                error_msg_regexp):
+                        invalid_fh.seek(0)
+                        fn(invalid_fh)
 
         # Asymmetric data only raises an error for DistanceMatrix.
         with self.assertRaises(DistanceMatrixError):
@@ -182,6 +190,78 @@ class DissimilarityAndDistanceMatrixReaderWriterTests(LSMatTestData):
 
                 self.assertEqual(lsmat1, lsmat2)
 
+    def test_read_dtype_and_condensed(self):
+        exp = DistanceMatrix(self.lsmat_3x3_data, ['a', 'b', 'c'])
+        for dtype in 'float64', 'float32':
+            for condensed in False, True:
+                self.lsmat_3x3_whitespace_fh.seek(0)
+                obs = _lsmat_to_distance_matrix(self.lsmat_3x3_whitespace_fh,
+                                                dtype=dtype,
+                                                condensed=condensed)
+                self.assertEqual(obs.dtype, dtype)
+                self.assertEqual(obs.condensed, condensed)
+                np.testing.assert_allclose(obs.data, exp.data)
+
+        self.lsmat_2x2_asym_fh.seek(0)
+        obs = _lsmat_to_dissimilarity_matrix(self.lsmat_2x2_asym_fh,
+                                             dtype='float32')
+        self.assertEqual(obs.dtype, np.float32)
+        self.assertEqual(obs, DissimilarityMatrix(
+            np.asarray(self.lsmat_2x2_asym_data, dtype=np.float32),
+            ['a', 'b']))
+
+    def test_read_condensed_invalid(self):
+        self.lsmat_2x2_asym_fh.seek(0)
+        with self.assertRaisesRegex(DistanceMatrixError, 'symmetric'):
+            _lsmat_to_distance_matrix(self.lsmat_2x2_asym_fh, condensed=True)
+        with self.assertRaisesRegex(DistanceMatrixError, 'hollow'):
+            _lsmat_to_distance_matrix(io.StringIO(LSMat_2x2_NONHOLLOW),
+                                      condensed=True)
+
+    def test_read_write_blocks(self):
+        # One row or one value at a time.
+        for block_size in 1, 2:
+            with mock.patch('skbio.io.format.lsmat._BLOCK_SIZE', block_size):
+                for test in (self.test_read_valid_files,
+                             self.test_read_invalid_files,
+                             self.test_write,
+                             self.test_read_condensed_invalid):
+                    self.setUp()
+                    test()
+
+    def test_read_pandas_parser(self):
+        with mock.patch('skbio.io.format.lsmat._PANDAS_PARSER', True):
+            for test in (self.test_read_valid_files,
+                         self.test_read_invalid_files,
+                         self.test_read_dtype_and_condensed,
+                         self.test_read_condensed_invalid,
+                         self.test_read_write_blocks):
+                self.setUp()
+                test()
+
+            # values are read back exactly
+            rng = np.random.default_rng(0)
+            data = rng.random((50, 50))
+            obj = DistanceMatrix(data + data.T - 2 * np.diag(data.diagonal()))
+            fh = io.StringIO()
+            _distance_matrix_to_lsmat(obj, fh)
+            fh.seek(0)
+            self.assertEqual(_lsmat_to_distance_matrix(fh), obj)
+
+    def test_write_dtype_and_condensed(self):
+        obj = DistanceMatrix(self.lsmat_3x3_data, ['a', 'b', 'c'],
+                             condensed=True)
+        fh = io.StringIO()
+        _distance_matrix_to_lsmat(obj, fh)
+        self.assertEqual(fh.getvalue(), LSMat_3x3)
+
+        # float32 values are written in their shortest representation
+        obj = DistanceMatrix(np.asarray(self.lsmat_3x3_data, np.float32),
+                             ['a', 'b', 'c'])
+        fh = io.StringIO()
+        _distance_matrix_to_lsmat(obj, fh)
+        self.assertEqual(fh.getvalue(), LSMat_3x3)
+
 
 class SnifferTests(LSMatTestData):
     def setUp(self):
@@ -219,6 +299,11 @@ LSMat_2x2_ASYM = (
     'a\t0.0\t1.0\n'
     'b\t-2.0\t0.0\n')
 
+LSMat_2x2_NONHOLLOW = (
+    '\ta\tb\n'
+    'a\t0.0\t1.0\n'
+    'b\t1.0\t2.0\n')
+
 LSMat_3x3 = (
     '\ta\tb\tc\n'
     'a\t0.0\t0.01\t4.2\n'
@@ -277,6 +362,9 @@ INVALID_5 = '\ta\tb\n'
 # missing leading delimiter in header
 INVALID_6 = "a\tb\na\t0.0\t0.123\nb\t0.123\t0.0\n"
 
+# no values in any row
+INVALID_7 = '\ta\tb\na\nb\n'
+
 
 if __name__ == '__main__':
     main()
@@ -349,6 +349,15 @@ class WritableBinarySourceTests:
         self.compare_gzip_file_contents(self.get_contents(self.gzip_file),
                                         self.gzip_contents)
 
+    def test_open_file_gzip(self):
+        # the gzip trailer is written when leaving the context manager
+        with skbio.io.util.open_file(self.gzip_file, mode='w',
+                                     compression='gzip') as fh:
+            fh.write(self.text_contents)
+
+        self.compare_gzip_file_contents(self.get_contents(self.gzip_file),
+                                        self.gzip_contents)
+
     def test_open_bz2(self):
         self.check_open_state_contents(self.bz2_file, self.text_contents,
                                        False, compression='bz2')
@@ -282,11 +282,14 @@ def open_file(file, **kwargs):
 def _flush_compressor(file):
     if isinstance(file, io.TextIOBase) and hasattr(file, "buffer"):
         file = file.buffer
-    if isinstance(file, CompressedBufferedWriter) and not file.streamable:
-        # Some formats like BZ2 compress the entire file, and so they will
-        # only flush once they have been closed. These kinds of files do not
-        # close their underlying buffer, but only testing can prove that...
+    if isinstance(file, CompressedBufferedWriter) and file.raw is not file._before_file:
+        # Compressors only write the end of their stream (e.g., the gzip
+        # trailer) once they have been closed, and some formats like BZ2
+        # compress the entire file, and so they will only flush once they have
+        # been closed. These kinds of files do not close their underlying
+        # buffer, but only testing can prove that...
         file.raw.close()
+        file._before_file.flush()
 
 
 @contextmanager
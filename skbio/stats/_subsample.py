@@ -13,6 +13,7 @@ from copy import copy
 
 import numpy as np
 
+from skbio.util import get_rng
 from skbio.util._decorator import experimental
 from .__subsample import _subsample_counts_without_replacement
 
@@ -150,7 +151,7 @@ def isubsample(items, maximum, minimum=1, buf_size=1000, bin_f=None):
 
 
 @experimental(as_of="0.4.0")
-def subsample_counts(counts, n, replace=False):
+def subsample_counts(counts, n, replace=False, seed=None):
     """Randomly subsample from a vector of counts, with or without replacement.
 
     Parameters
@@ -163,6 +164,11 @@ def subsample_counts(counts, n, replace=False):
     replace : bool, optional
         If ``True``, subsample with replacement. If ``False`` (the default),
         subsample without replacement.
+    seed : int or np.random.Generator, optional
+        A user-provided random seed or random generator instance. If not
+        provided, NumPy's global random state is used.
+
+        .. versionadded:: 0.6.0
 
     Returns
     -------
@@ -242,10 +248,17 @@ def subsample_counts(counts, n, replace=False):
 
     if replace:
         probs = counts / counts_sum
-        result = np.random.multinomial(n, probs)
+        if seed is None:
+            result = np.random.multinomial(n, probs)
+        else:
+            result = get_rng(seed).multinomial(n, probs)
     else:
         if counts_sum == n:
             result = counts
-        else:
+        elif seed is None:
             result = _subsample_counts_without_replacement(counts, n, counts_sum)
+        else:
+            # drawing without replacement is sampling from a multivariate
+            # hypergeometric distribution, which does not expand the counts
+            result = get_rng(seed).multivariate_hypergeometric(counts, n)
     return result
@@ -11,12 +11,28 @@ from functools import partial
 import numpy as np
 from scipy.stats import rankdata
 
-from ._base import _preprocess_input, _run_monte_carlo_stats, _build_results
+from ._base import (
+    _preprocess_input_sng,
+    _run_monte_carlo_stats,
+    _build_results,
+    DistanceMatrix,
+)
+from ._cutils import anosim_within_rank_sum_batch_cy
 from skbio.util._decorator import experimental
+from skbio.util._parallel import _get_num_threads
 
 
 @experimental(as_of="0.4.0")
-def anosim(distance_matrix, grouping, column=None, permutations=999):
+def anosim(
+    distance_matrix,
+    grouping,
+    column=None,
+    permutations=999,
+    seed=None,
+    n_jobs=None,
+    batch_size=None,
+    max_exceedances=None,
+):
     """Test for significant differences between groups using ANOSIM.
 
     Analysis of Similarities (ANOSIM) is a non-parametric method that tests
@@ -58,6 +74,22 @@ def anosim(distance_matrix, grouping, column=None, permutations=999):
         significance. Must be greater than or equal to zero. If zero,
         statistical significance calculations will be skipped and the p-value
         will be ``np.nan``.
+    seed : int or np.random.Generator, optional
+        A user-provided random seed or random generator instance used to
+        permute `grouping`. If not provided, NumPy's global random state is
+        used.
+    n_jobs : int, optional
+        Number of threads used to evaluate the permutations. If not provided,
+        the default number of threads of OpenMP is used (``OMP_NUM_THREADS``
+        if set, otherwise all CPUs available to the process). If -1, all
+        available CPUs are used.
+    batch_size : int, optional
+        Number of permutations generated and evaluated together. Defaults to
+        64.
+    max_exceedances : int, optional
+        Stop permuting once this many permuted R statistics are greater than
+        or equal to the original one. The reported number of permutations is
+        then the number actually used.
 
     Returns
     -------
@@ -77,6 +109,14 @@ def anosim(distance_matrix, grouping, column=None, permutations=999):
 
     The p-value will be ``np.nan`` if `permutations` is zero.
 
+    The permutations are evaluated in batches by a compiled routine, which
+    reads the ranked distances once per batch and distributes the objects
+    among `n_jobs` threads, without building the matrix of pairs of objects
+    belonging to the same group.
+
+    With `max_exceedances`, the p-value is a sequential Monte Carlo p-value
+    [3]_ (see ``permanova`` for details).
+
     References
     ----------
     .. [1] Clarke, KR. "Non-parametric multivariate analyses of changes in
@@ -85,6 +125,9 @@ def anosim(distance_matrix, grouping, column=None, permutations=999):
 
     .. [2] http://cran.r-project.org/web/packages/vegan/index.html
 
+    .. [3] Besag, J., and Clifford, P. "Sequential Monte Carlo p-values."
+       Biometrika 78.2 (1991): 301-304.
+
     Examples
     --------
     Load a 4x4 distance matrix and grouping vector denoting 2 groups of
@@ -167,38 +210,57 @@ def anosim(distance_matrix, grouping, column=None, permutations=999):
     *must* be present in the ``DataFrame`` or an error will be raised.
 
     """
-    sample_size, num_groups, grouping, tri_idxs, distances = _preprocess_input(
-        distance_matrix, grouping, column
+    if not isinstance(distance_matrix, DistanceMatrix):
+        raise TypeError("Input must be a DistanceMatrix.")
+    sample_size = distance_matrix.shape[0]
+
+    num_groups, grouping = _preprocess_input_sng(
+        distance_matrix.ids, sample_size, grouping, column
     )
 
     divisor = sample_size * ((sample_size - 1) / 4)
-    ranked_dists = rankdata(distances, method="average")
-
-    test_stat_function = partial(_compute_r_stat, tri_idxs, ranked_dists, divisor)
-    stat, p_value = _run_monte_carlo_stats(test_stat_function, grouping, permutations)
+    ranked_dists = rankdata(distance_matrix.condensed_form(), method="average")
+    group_sizes = np.bincount(grouping)
+
+    test_stat_function = partial(_compute_r_stat, ranked_dists, divisor, group_sizes)
+    batch_stat_function = partial(
+        _compute_r_stat_batch,
+        ranked_dists,
+        divisor,
+        group_sizes,
+        _get_num_threads(n_jobs),
+    )
+    stat, p_value, permutations = _run_monte_carlo_stats(
+        test_stat_function,
+        grouping,
+        permutations,
+        seed=seed,
+        n_jobs=n_jobs,
+        batch_size=batch_size,
+        batch_stat_function=batch_stat_function,
+        max_exceedances=max_exceedances,
+    )
 
     return _build_results(
         "ANOSIM", "R", sample_size, num_groups, stat, p_value, permutations
     )
 
 
-def _compute_r_stat(tri_idxs, ranked_dists, divisor, grouping):
+def _compute_r_stat(ranked_dists, divisor, group_sizes, grouping):
     """Compute ANOSIM R statistic (between -1 and +1)."""
-    # Create a matrix where True means that the two objects are in the same
-    # group. This ufunc requires that grouping is a numeric vector (e.g., it
-    # won't work with a grouping vector of strings).
-    grouping_matrix = np.equal.outer(grouping, grouping)
-
-    # Extract upper triangle from the grouping matrix. It is important to
-    # extract the values in the same order that the distances are extracted
-    # from the distance matrix (see ranked_dists). Extracting the upper
-    # triangle (excluding the diagonal) preserves this order.
-    grouping_tri = grouping_matrix[tri_idxs]
+    grouping = np.asarray(grouping)[np.newaxis]
+    return _compute_r_stat_batch(ranked_dists, divisor, group_sizes, 1, grouping)[0]
 
-    # within
-    r_W = np.mean(ranked_dists[grouping_tri])
 
-    # between
-    r_B = np.mean(ranked_dists[np.invert(grouping_tri)])
+def _compute_r_stat_batch(ranked_dists, divisor, group_sizes, num_threads, groupings):
+    """Compute ANOSIM R statistic for each row of `groupings`."""
+    # The number of within-group distances only depends on the group sizes,
+    # which are the same in all permutations, so only the sum of the
+    # within-group ranks needs to be computed for each grouping.
+    num_within = (group_sizes * (group_sizes - 1)).sum() // 2
+    num_between = len(ranked_dists) - num_within
+    sum_within = anosim_within_rank_sum_batch_cy(ranked_dists, groupings, num_threads)
 
+    r_W = sum_within / num_within
+    r_B = (ranked_dists.sum() - sum_within) / num_between
     return (r_B - r_W) / divisor
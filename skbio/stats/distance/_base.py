@@ -7,6 +7,8 @@
 # ----------------------------------------------------------------------------
 
 import itertools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from copy import deepcopy
 
 import numpy as np
@@ -15,13 +17,18 @@ from scipy.spatial.distance import squareform
 
 from skbio._base import SkbioObject
 from skbio.stats._misc import _pprint_strs
-from skbio.util import find_duplicates
+from skbio.util import find_duplicates, get_rng
 from skbio.util._decorator import experimental, classonlymethod
 from skbio.util._misc import resolve_key
+from skbio.util._parallel import _get_num_threads
 from skbio.util._plotting import PlottableMixin
 
 from ._utils import is_symmetric_and_hollow
-from ._utils import distmat_reorder, distmat_reorder_condensed
+from ._utils import distmat_reorder, distmat_reorder_buf, distmat_reorder_condensed
+from ._utils import condensed_submatrix, condensed_num_objects
+
+# Maximum number of bytes read at once from a lazily loaded matrix.
+_LAZY_BLOCK_SIZE = 2**26
 
 
 class DissimilarityMatrixError(Exception):
@@ -97,6 +104,8 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
     default_write_format = "lsmat"
     # Used in __str__
     _matrix_element_name = "dissimilarity"
+    # Whether the data are read on demand from a file (see `_from_lazy`)
+    _lazy = False
 
     @experimental(as_of="0.4.0")
     def __init__(self, data, ids=None, validate=True):
@@ -201,7 +210,7 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
         """
         iterable = list(iterable)
         if key is not None and keys is not None:
-            raise ValueError("Cannot use both `key` and `keys` at the same" " time.")
+            raise ValueError("Cannot use both `key` and `keys` at the same time.")
 
         keys_ = None
         if key is not None:
@@ -229,7 +238,7 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
         This property is not writeable.
 
         """
-        return self._data
+        return self._redundant_data()
 
     @property
     @experimental(as_of="0.4.0")
@@ -249,7 +258,7 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
     @ids.setter
     def ids(self, ids_):
         ids_ = tuple(ids_)
-        self._validate_ids(self.data, ids_)
+        self._validate_ids(self._data, ids_)
         self._ids = ids_
         self._id_index = self._index_list(self._ids)
 
@@ -257,7 +266,7 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
     @experimental(as_of="0.4.0")
     def dtype(self):
         """Data type of the dissimilarities."""
-        return self.data.dtype
+        return self._data.dtype
 
     @property
     @experimental(as_of="0.4.0")
@@ -270,7 +279,7 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
         entries will always be equal.
 
         """
-        return self.data.shape
+        return (len(self._ids),) * 2
 
     @property
     @experimental(as_of="0.4.0")
@@ -282,7 +291,7 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
         Equivalent to ``self.shape[0] * self.shape[1]``.
 
         """
-        return self.data.size
+        return len(self._ids) ** 2
 
     @property
     @experimental(as_of="0.4.0")
@@ -312,7 +321,7 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
 
         """
         # Note: Skip validation, since we assume self was already validated
-        return self.__class__(self.data.T.copy(), deepcopy(self.ids), validate=False)
+        return self._from_data(self._transposed_data(), deepcopy(self.ids))
 
     @experimental(as_of="0.4.0")
     def index(self, lookup_id):
@@ -379,10 +388,10 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
         # We deepcopy IDs in case the tuple contains mutable objects at some
         # point in the future.
         # Note: Skip validation, since we assume self was already validated
-        return self.__class__(self.data.copy(), deepcopy(self.ids), validate=False)
+        return self._from_data(np.array(self._data), deepcopy(self.ids))
 
     @experimental(as_of="0.4.0")
-    def filter(self, ids, strict=True):
+    def filter(self, ids, strict=True, out=None):
         """Filter the dissimilarity matrix by IDs.
 
         Parameters
@@ -394,6 +403,15 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
             If `strict` is ``True`` and an ID that is not found in the distance
             matrix is found in `ids`, a ``MissingIDError`` exception will be
             raised, otherwise the ID will be ignored.
+        out : ndarray, optional
+            C-contiguous array in which to store the filtered dissimilarities,
+            of the same ``dtype`` as this matrix and of shape ``(k, k)``, where
+            ``k`` is the number of retained IDs (or ``(k * (k - 1) / 2,)`` for
+            a ``DistanceMatrix`` stored in condensed form). The returned matrix
+            uses it as its data. For example, a ``numpy.memmap`` allows
+            filtering a matrix into a file instead of memory.
+
+            .. versionadded:: 0.6.0
 
         Returns
         -------
@@ -405,10 +423,15 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
         ------
         MissingIDError
             If an ID in `ids` is not in the object's list of IDs.
+        ValueError
+            If `out` does not have the expected shape or ``dtype``.
 
         """
-        if tuple(self._ids) == tuple(ids):
-            return self.__class__(self._data, self._ids)
+        if out is None and tuple(self._ids) == tuple(ids):
+            if self._lazy:
+                # backed by the same file, which is not loaded
+                return self._from_lazy(self._data, self._ids)
+            return self._from_data(self._data, self._ids, validate=True)
 
         if strict:
             idxs = [self.index(id_) for id_ in ids]
@@ -425,11 +448,19 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
                     pass
             ids = found_ids
 
+        if out is not None:
+            exp_shape = self._reordered_data_shape(len(idxs))
+            if out.shape != exp_shape or out.dtype != self.dtype:
+                raise ValueError(
+                    "`out` must be an array of shape %r and dtype %s."
+                    % (exp_shape, self.dtype)
+                )
+
         # Note: Skip validation, since we assume self was already validated
         # But ids are new, so validate them explicitly
-        filtered_data = distmat_reorder(self._data, idxs)
+        filtered_data = self._reordered_data(idxs, out=out)
         self._validate_ids(filtered_data, ids)
-        return self.__class__(filtered_data, ids, validate=False)
+        return self._from_data(filtered_data, ids)
 
     def _stable_order(self, ids):
         """Obtain a stable ID order with respect to self.
@@ -449,7 +480,7 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
         return np.array(id_order, dtype=int)
 
     @experimental(as_of="0.5.5")
-    def within(self, ids):
+    def within(self, ids, chunksize=None):
         """Obtain all the distances among the set of IDs.
 
         Parameters
@@ -459,12 +490,19 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
             returned such that, if provided ['a', 'b', 'c'], the distances
             for [('a', 'a'), ('a', 'b'), ('a', 'c'), ('b', 'a'), ('b', 'b'),
             ('b', 'c'), ('c', 'a'), ('c', 'b'), ('c', 'c')] are gathered.
+        chunksize : int, optional
+            If provided, return an iterator of data frames, each with (at
+            most) this many rows, rounded to a whole number of source IDs.
+            Only the distances of one chunk are held in memory at a time.
+
+            .. versionadded:: 0.6.0
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame or iterator of pd.DataFrame
             (i, j, value) representing the source ID ("i"), the target ID ("j")
-            and the distance ("value").
+            and the distance ("value"). If `chunksize` is provided, the
+            concatenation of the data frames, whose indices are consecutive.
 
         Raises
         ------
@@ -498,16 +536,16 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
 
         """
         ids = set(ids)
-        not_present = ids - set(self._id_index)
+        not_present = ids - self._id_index.keys()
         if not_present:
             raise MissingIDError(
-                "At least one ID (e.g., '%s') was not " "found." % not_present.pop()
+                "At least one ID (e.g., '%s') was not found." % not_present.pop()
             )
 
-        return self._subset_to_dataframe(ids, ids)
+        return self._subset_to_dataframe(ids, ids, chunksize)
 
     @experimental(as_of="0.5.5")
-    def between(self, from_, to_, allow_overlap=False):
+    def between(self, from_, to_, allow_overlap=False, chunksize=None):
         """Obtain the distances between the two groups of IDs.
 
         Parameters
@@ -522,12 +560,18 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
         allow_overlap : bool, optional
             If True, allow overlap in the IDs of from and to (which would in
             effect be collecting the within distances). Default is False.
+        chunksize : int, optional
+            If provided, return an iterator of data frames of (at most) this
+            many rows each, rounded to a whole number of IDs in `from_`. See
+            `within`.
+
+            .. versionadded:: 0.6.0
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame or iterator of pd.DataFrame
             (i, j, value) representing the source ID ("i"), the target ID ("j")
-            and the distance ("value").
+            and the distance ("value"), in one or several data frames.
 
         Raises
         ------
@@ -561,10 +605,10 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
         to_ = set(to_)
 
         all_ids = from_ | to_
-        not_present = all_ids - set(self._id_index)
+        not_present = all_ids - self._id_index.keys()
         if not_present:
             raise MissingIDError(
-                "At least one ID (e.g., '%s') was not " "found." % not_present.pop()
+                "At least one ID (e.g., '%s') was not found." % not_present.pop()
             )
 
         overlapping = from_ & to_
@@ -575,9 +619,9 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
                 "allow_overlap=True." % overlapping.pop()
             )
 
-        return self._subset_to_dataframe(from_, to_)
+        return self._subset_to_dataframe(from_, to_, chunksize)
 
-    def _subset_to_dataframe(self, i_ids, j_ids):
+    def _subset_to_dataframe(self, i_ids, j_ids, chunksize=None):
         """Extract a subset of self and express as a DataFrame.
 
         Parameters
@@ -586,6 +630,9 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
             The "from" IDs.
         j_ids : Iterable of str
             The "to" IDs.
+        chunksize : int, optional
+            If provided, return an iterator of DataFrames of at most
+            `chunksize` rows (at least one "from" ID per DataFrame).
 
         Notes
         -----
@@ -594,7 +641,7 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame or iterator of pd.DataFrame
             (i, j, value) representing the source ID ("i"), the target ID ("j")
             and the distance ("value").
 
@@ -602,27 +649,38 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
         i_indices = self._stable_order(i_ids)
         j_indices = self._stable_order(j_ids)
 
-        j_length = len(j_indices)
-        j_labels = tuple([self.ids[j] for j in j_indices])
+        if chunksize is None:
+            return self._block_to_dataframe(i_indices, j_indices, 0)
+        return self._iter_block_dataframes(i_indices, j_indices, chunksize)
 
-        i = []
-        j = []
+    def _iter_block_dataframes(self, i_indices, j_indices, chunksize):
+        """Yield the DataFrames of consecutive groups of "from" IDs."""
+        step = max(1, chunksize // max(len(j_indices), 1))
+        for start in range(0, len(i_indices), step):
+            yield self._block_to_dataframe(
+                i_indices[start : start + step], j_indices, start * len(j_indices)
+            )
 
-        # np.hstack([]) throws a ValueError. However, np.hstack([np.array([])])
-        # is valid and returns an empty array. Accordingly, an empty array is
-        # included here so that np.hstack works in the event that either i_ids
-        # or j_ids is empty.
-        values = [np.array([])]
-        for i_idx in i_indices:
-            i.extend([self.ids[i_idx]] * j_length)
-            j.extend(j_labels)
+    def _block_to_dataframe(self, i_indices, j_indices, offset):
+        """Express the block of rows i and columns j as a long-form DataFrame.
 
-            subset = self._data[i_idx, j_indices]
-            values.append(subset)
+        The index of the DataFrame starts at `offset`.
 
-        i = pd.Series(i, name="i", dtype=str)
-        j = pd.Series(j, name="j", dtype=str)
-        values = pd.Series(np.hstack(values), name="value")
+        """
+        i_labels = np.array([self.ids[i] for i in i_indices], dtype=object)
+        j_labels = np.array([self.ids[j] for j in j_indices], dtype=object)
+        block = self._submatrix(i_indices, j_indices)
+
+        index = pd.RangeIndex(offset, offset + block.size)
+        i = pd.Series(
+            np.repeat(i_labels, len(j_labels)), index=index, name="i", dtype=str
+        )
+        j = pd.Series(
+            np.tile(j_labels, len(i_labels)), index=index, name="j", dtype=str
+        )
+        values = pd.Series(
+            np.asarray(block, dtype=float).ravel(), index=index, name="value"
+        )
 
         return pd.concat([i, j, values], axis=1)
 
@@ -773,7 +831,7 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
                 equal = False
             elif self.ids != other.ids:
                 equal = False
-            elif not np.array_equal(self.data, other.data):
+            elif not self._data_equal(other):
                 equal = False
         except AttributeError:
             equal = False
@@ -872,12 +930,92 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
 
         """
         if isinstance(index, str):
-            return self.data[self.index(index)]
+            return self._row(self.index(index))
         elif self._is_id_pair(index):
-            return self.data[self.index(index[0]), self.index(index[1])]
+            return self._element(self.index(index[0]), self.index(index[1]))
         else:
             return self.data.__getitem__(index)
 
+    @classmethod
+    def _from_lazy(cls, data, ids):
+        """Create an instance backed by a matrix that is read on demand.
+
+        Parameters
+        ----------
+        data : h5py.Dataset or np.memmap
+            Square, two-dimensional array of dissimilarities stored in a file.
+            Rows are read from it as needed, and the whole matrix is only
+            loaded into memory when `data` is accessed.
+        ids : sequence of str
+            Object IDs.
+
+        Notes
+        -----
+        The shape, data type and IDs are validated, but the dissimilarities
+        themselves are not (e.g., symmetry of a distance matrix), as that
+        would require reading the entire matrix.
+
+        """
+        obj = cls.__new__(cls)
+        ids = tuple(ids)
+        obj._validate_shape(data)
+        obj._validate_ids(data, ids)
+        obj._data = data
+        obj._ids = ids
+        obj._id_index = obj._index_list(ids)
+        obj._lazy = True
+        return obj
+
+    def _from_data(self, data, ids, validate=False):
+        """Create an instance of the same type (and storage) from data."""
+        return self.__class__(data, ids, validate=validate)
+
+    def _redundant_data(self):
+        """Return the stored dissimilarities in redundant form."""
+        if self._lazy:
+            return np.asarray(self._data[()])
+        return self._data
+
+    def _transposed_data(self):
+        return self._redundant_data().T.copy()
+
+    def _reordered_data(self, idxs, out=None):
+        """Return the stored data reordered (and subset) by `idxs`.
+
+        If provided, the result is written into `out` (of the shape given by
+        `_reordered_data_shape`).
+
+        """
+        if self._lazy:
+            return _read_block(self._data, idxs, idxs, out=out)
+        if out is None:
+            return distmat_reorder(self._data, idxs)
+        distmat_reorder_buf(self._data, idxs, out)
+        return out
+
+    def _reordered_data_shape(self, num_objects):
+        """Return the shape of the stored data of `num_objects` objects."""
+        return (num_objects, num_objects)
+
+    def _submatrix(self, i_indices, j_indices):
+        """Return the block of dissimilarities from i to j as a 2D array."""
+        if self._lazy:
+            return _read_block(self._data, i_indices, j_indices)
+        return self._data[np.ix_(i_indices, j_indices)]
+
+    def _row(self, idx):
+        return self._data[idx]
+
+    def _element(self, i_idx, j_idx):
+        return self._data[i_idx, j_idx]
+
+    def _data_equal(self, other):
+        return np.array_equal(self.data, other.data)
+
+    def _num_objects(self, data):
+        """Return the number of objects described by stored data."""
+        return data.shape[0]
+
     def _validate_ids(self, data, ids):
         """Validate the IDs.
 
@@ -903,12 +1041,13 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
                 "following duplicate IDs: %s" % formatted_duplicates
             )
         if 0 == len(ids):
-            raise DissimilarityMatrixError("IDs must be at least 1 in " "size.")
-        if len(ids) != data.shape[0]:
+            raise DissimilarityMatrixError("IDs must be at least 1 in size.")
+        num_objects = self._num_objects(data)
+        if len(ids) != num_objects:
             raise DissimilarityMatrixError(
                 "The number of IDs (%d) must match "
                 "the number of rows/columns in the "
-                "data (%d)." % (len(ids), data.shape[0])
+                "data (%d)." % (len(ids), num_objects)
             )
 
     def _validate_shape(self, data):
@@ -926,18 +1065,16 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
 
         """
         if 0 in data.shape:
-            raise DissimilarityMatrixError("Data must be at least 1x1 in " "size.")
+            raise DissimilarityMatrixError("Data must be at least 1x1 in size.")
         if len(data.shape) != 2:
-            raise DissimilarityMatrixError("Data must have exactly two " "dimensions.")
+            raise DissimilarityMatrixError("Data must have exactly two dimensions.")
         if data.shape[0] != data.shape[1]:
             raise DissimilarityMatrixError(
-                "Data must be square (i.e., have "
-                "the same number of rows and "
-                "columns)."
+                "Data must be square (i.e., have the same number of rows and columns)."
             )
         if data.dtype not in (np.float32, np.float64):
             raise DissimilarityMatrixError(
-                "Data must contain only floating " "point values."
+                "Data must contain only floating point values."
             )
 
     def _validate(self, data, ids):
@@ -979,16 +1116,43 @@ class DistanceMatrix(DissimilarityMatrix):
     requirement that the matrix data is symmetric. There are additional methods
     made available that take advantage of this symmetry.
 
+    Parameters
+    ----------
+    data : array_like or DissimilarityMatrix
+        Square, hollow, symmetric two-dimensional ``numpy.ndarray`` of
+        distances (floats), or a one-dimensional vector of distances in
+        condensed format. See ``DissimilarityMatrix`` for details.
+    ids : sequence of str, optional
+        Sequence of strings to be used as object IDs. See
+        ``DissimilarityMatrix`` for details.
+    validate : bool, optional
+        If `validate` is ``True`` (the default) and data is not a
+        DissimilarityMatrix object, the input data will be validated.
+    condensed : bool, optional
+        If ``True``, only the condensed form of the distances (the upper
+        triangle, of size :math:`n(n-1)/2`) is stored, in the ``dtype`` of
+        `data` (``float32`` or ``float64``). Defaults to ``False``. See Notes.
+
     See Also
     --------
     DissimilarityMatrix
 
     Notes
     -----
-    The distances are stored in redundant (square-form) format [1]_. To
-    facilitate use with other scientific Python routines (e.g., scipy), the
-    distances can be retrieved in condensed (vector-form) format using
-    `condensed_form`.
+    By default, the distances are stored in redundant (square-form) format
+    [1]_. To facilitate use with other scientific Python routines (e.g.,
+    scipy), the distances can be retrieved in condensed (vector-form) format
+    using `condensed_form`.
+
+    With ``condensed=True``, the distances are stored in condensed format
+    instead, which takes half the memory (a quarter when the distances are
+    ``float32``). `condensed_form` then returns the stored array without
+    copying it, and indexing by ID, `filter`, `within`, `between`, `permute`
+    and `to_series` operate on it directly. The redundant form is only built
+    when explicitly requested: accessing `data` (or calling `redundant_form`)
+    returns a new array every time, as do other kinds of indexing,
+    `to_data_frame` and `plot`. A 1-D `data` is then used as is, and is not
+    validated beyond its size.
 
     `DistanceMatrix` only requires that the distances it stores are symmetric.
     Checks are *not* performed to ensure the other three metric properties
@@ -1005,6 +1169,73 @@ class DistanceMatrix(DissimilarityMatrix):
 
     # Override here, used in superclass __str__
     _matrix_element_name = "distance"
+    _condensed = False
+
+    @experimental(as_of="0.4.0")
+    def __init__(self, data, ids=None, validate=True, condensed=False):
+        if not condensed:
+            super(DistanceMatrix, self).__init__(data, ids=ids, validate=validate)
+            return
+
+        validate_full = validate
+        validate_ids = True
+        if isinstance(data, DistanceMatrix):
+            # The distances of an existing instance are already valid.
+            if ids is None:
+                ids = data.ids
+                validate_ids = False
+            data = data.condensed_form()
+            validate_full = False
+        elif isinstance(data, DissimilarityMatrix):
+            ids = data.ids if ids is None else ids
+            data = data.data
+
+        if not (
+            isinstance(data, np.ndarray) and data.dtype in (np.float32, np.float64)
+        ):
+            data = np.asarray(data, dtype="float")
+
+        if data.ndim == 2:
+            if ids is None:
+                ids = [str(i) for i in range(data.shape[0])]
+                validate_ids = False
+            if validate_full:
+                self._validate(data, tuple(ids))
+            else:
+                self._validate_shape(data)
+            data = squareform(data, force="tovector", checks=False)
+        elif data.ndim != 1:
+            raise DistanceMatrixError("Data must have one or two dimensions.")
+
+        try:
+            num_objects = condensed_num_objects(data.size)
+        except ValueError as e:
+            raise DistanceMatrixError(str(e))
+
+        if ids is None:
+            ids = (str(i) for i in range(num_objects))
+            validate_ids = False
+        ids = tuple(ids)
+        if validate_ids:
+            self._validate_ids(data, ids)
+
+        self._data = data
+        self._ids = ids
+        self._id_index = self._index_list(self._ids)
+        self._condensed = True
+
+    @property
+    @experimental(as_of="0.6.0")
+    def condensed(self):
+        """Whether the distances are stored in condensed format.
+
+        Notes
+        -----
+        This property is not writeable. To change the storage format, create a
+        new instance, e.g., ``DistanceMatrix(dm, condensed=True)``.
+
+        """
+        return self._condensed
 
     @classonlymethod
     @experimental(as_of="0.4.1")
@@ -1052,7 +1283,7 @@ class DistanceMatrix(DissimilarityMatrix):
 
         iterable = list(iterable)
         if key is not None and keys is not None:
-            raise ValueError("Cannot use both `key` and `keys` at the same" " time.")
+            raise ValueError("Cannot use both `key` and `keys` at the same time.")
 
         keys_ = None
         if key is not None:
@@ -1081,14 +1312,18 @@ class DistanceMatrix(DissimilarityMatrix):
         Condensed format is described in [1]_.
 
         The conversion is not a constant-time operation, though it should be
-        relatively quick to perform.
+        relatively quick to perform. If the distances are stored in condensed
+        format (see `condensed`), no conversion is performed and the stored
+        array is returned (a copy is *not* made).
 
         References
         ----------
         .. [1] http://docs.scipy.org/doc/scipy/reference/spatial.distance.html
 
         """
-        return squareform(self._data, force="tovector", checks=False)
+        if self._condensed:
+            return self._data
+        return squareform(self._redundant_data(), force="tovector", checks=False)
 
     @experimental(as_of="0.4.0")
     def permute(self, condensed=False):
@@ -1126,12 +1361,64 @@ class DistanceMatrix(DissimilarityMatrix):
         order = np.random.permutation(self.shape[0])
 
         if condensed:
-            permuted_condensed = distmat_reorder_condensed(self._data, order)
+            data = self._data if self._condensed else self._redundant_data()
+            permuted_condensed = distmat_reorder_condensed(data, order)
             return permuted_condensed
         else:
             # Note: Skip validation, since we assume self was already validated
-            permuted = distmat_reorder(self._data, order)
-            return self.__class__(permuted, self.ids, validate=False)
+            return self._from_data(self._reordered_data(order), self.ids)
+
+    def _from_data(self, data, ids, validate=False):
+        return self.__class__(data, ids, validate=validate, condensed=self._condensed)
+
+    def _redundant_data(self):
+        if self._condensed:
+            return squareform(self._data, force="tomatrix", checks=False)
+        return self._data
+
+    def _transposed_data(self):
+        if self._condensed:
+            # symmetric, so the condensed form is its own transpose
+            return self._data.copy()
+        return super(DistanceMatrix, self)._transposed_data()
+
+    def _reordered_data(self, idxs, out=None):
+        if self._condensed:
+            return distmat_reorder_condensed(self._data, idxs, out_mat=out)
+        return super(DistanceMatrix, self)._reordered_data(idxs, out=out)
+
+    def _reordered_data_shape(self, num_objects):
+        if self._condensed:
+            return (num_objects * (num_objects - 1) // 2,)
+        return super(DistanceMatrix, self)._reordered_data_shape(num_objects)
+
+    def _submatrix(self, i_indices, j_indices):
+        if self._condensed:
+            return condensed_submatrix(self._data, i_indices, j_indices)
+        if self._lazy and len(j_indices) < len(i_indices):
+            # by symmetry, read the smaller number of rows
+            return super(DistanceMatrix, self)._submatrix(j_indices, i_indices).T
+        return super(DistanceMatrix, self)._submatrix(i_indices, j_indices)
+
+    def _row(self, idx):
+        if self._condensed:
+            return self._submatrix([idx], np.arange(self.shape[0]))[0]
+        return super(DistanceMatrix, self)._row(idx)
+
+    def _element(self, i_idx, j_idx):
+        if self._condensed:
+            return self._submatrix([i_idx], [j_idx])[0, 0]
+        return super(DistanceMatrix, self)._element(i_idx, j_idx)
+
+    def _data_equal(self, other):
+        if isinstance(other, DistanceMatrix) and (self._condensed or other._condensed):
+            return np.array_equal(self.condensed_form(), other.condensed_form())
+        return super(DistanceMatrix, self)._data_equal(other)
+
+    def _num_objects(self, data):
+        if data.ndim == 1:
+            return condensed_num_objects(data.size)
+        return super(DistanceMatrix, self)._num_objects(data)
 
     def _validate(self, data, ids):
         """Validate the data array and IDs.
@@ -1149,7 +1436,7 @@ class DistanceMatrix(DissimilarityMatrix):
 
         if not data_hol:
             raise DistanceMatrixError(
-                "Data must be hollow (i.e., the diagonal" " can only contain zeros)."
+                "Data must be hollow (i.e., the diagonal can only contain zeros)."
             )
 
     @experimental(as_of="0.5.1")
@@ -1203,6 +1490,60 @@ class DistanceMatrix(DissimilarityMatrix):
         return pd.Series(data=distances, index=index, dtype=float)
 
 
+def _read_block(data, i_indices, j_indices, out=None):
+    """Read a block of a matrix stored in a file, a few rows at a time.
+
+    Parameters
+    ----------
+    data : h5py.Dataset or np.memmap
+        Two-dimensional matrix.
+    i_indices : 1D array_like of int
+        Indices of the rows to read. They may be unordered or repeated.
+    j_indices : 1D array_like of int
+        Indices of the columns to keep.
+    out : ndarray, optional
+        Array in which to store the result.
+
+    Returns
+    -------
+    ndarray
+        ``data[np.ix_(i_indices, j_indices)]``.
+
+    Notes
+    -----
+    HDF5 datasets only support reading rows in increasing order, so the
+    distinct rows are read in sorted order, in groups whose total size is at
+    most ``_LAZY_BLOCK_SIZE`` bytes (at least one row at a time), and each
+    group is copied to the output rows where it belongs. Groups of
+    consecutive rows are read as slices.
+
+    """
+    i_indices = np.asarray(i_indices, dtype=int)
+    j_indices = np.asarray(j_indices, dtype=int)
+    rows, inverse = np.unique(i_indices, return_inverse=True)
+    inverse = inverse.ravel()
+    if out is None:
+        out = np.empty((i_indices.size, j_indices.size), dtype=data.dtype)
+
+    # output rows, grouped by the position of their row in `rows`
+    positions = np.argsort(inverse, kind="stable")
+    sorted_inverse = inverse[positions]
+
+    step = max(1, _LAZY_BLOCK_SIZE // (data.shape[1] * data.dtype.itemsize))
+    for start in range(0, rows.size, step):
+        chunk = rows[start : start + step]
+        if chunk[-1] - chunk[0] + 1 == chunk.size:
+            block = data[chunk[0] : chunk[-1] + 1]
+        else:
+            block = data[chunk]
+        block = np.asarray(block)[:, j_indices]
+
+        lo, hi = np.searchsorted(sorted_inverse, [start, start + chunk.size])
+        out[positions[lo:hi]] = block[sorted_inverse[lo:hi] - start]
+
+    return out
+
+
 @experimental(as_of="0.4.0")
 def randdm(num_objects, ids=None, constructor=None, random_fn=None):
     """Generate a distance matrix populated with random distances.
@@ -1261,6 +1602,9 @@ def randdm(num_objects, ids=None, constructor=None, random_fn=None):
 
 # helper functions for anosim and permanova
 
+# number of permutations generated and evaluated together
+_DEFAULT_BATCH_SIZE = 64
+
 
 def _preprocess_input_sng(ids, sample_size, grouping, column):
     """Compute intermediate results not affected by permutations.
@@ -1291,8 +1635,7 @@ def _preprocess_input_sng(ids, sample_size, grouping, column):
 
     if len(grouping) != sample_size:
         raise ValueError(
-            "Grouping vector size must match the number of IDs in the "
-            "distance matrix."
+            "Grouping vector size must match the number of IDs in the distance matrix."
         )
 
     # Find the group labels and convert grouping to an integer vector
@@ -1375,31 +1718,134 @@ def _df_to_vector(ids, df, column):
     grouping = df.reindex(ids, axis=0).loc[:, column]
     if grouping.isnull().any():
         raise ValueError(
-            "One or more IDs in the distance matrix are not in the data " "frame."
+            "One or more IDs in the distance matrix are not in the data frame."
         )
     return grouping.tolist()
 
 
-def _run_monte_carlo_stats(test_stat_function, grouping, permutations):
-    """Run stat test and compute significance with Monte Carlo permutations."""
+def _run_monte_carlo_stats(
+    test_stat_function,
+    grouping,
+    permutations,
+    seed=None,
+    n_jobs=None,
+    batch_size=None,
+    batch_stat_function=None,
+    max_exceedances=None,
+):
+    """Run stat test and compute significance with Monte Carlo permutations.
+
+    Permutations of the grouping vector are generated in blocks of
+    `batch_size` rows. If `batch_stat_function` is provided, it is called
+    once per block (and once on the original grouping) and must return one
+    statistic per row; otherwise `test_stat_function` is called on each row,
+    from `n_jobs` threads. If `seed` is None, NumPy's global random state is
+    used, which generates the same permutations as previous versions.
+
+    If `max_exceedances` is provided, no more blocks are generated once that
+    many permuted statistics are greater than or equal to the original one
+    (see ``_sequential_p_value``).
+
+    Returns the statistic, the p-value and the number of permutations that
+    were used to compute it.
+
+    """
     if permutations < 0:
         raise ValueError(
             "Number of permutations must be greater than or equal to zero."
         )
-
-    stat = test_stat_function(grouping)
+    if batch_size is None:
+        batch_size = _DEFAULT_BATCH_SIZE
+    elif batch_size < 1:
+        raise ValueError("`batch_size` must be at least 1.")
+    _validate_max_exceedances(max_exceedances)
+    num_threads = _get_num_threads(n_jobs)
+    grouping = np.asarray(grouping)
+
+    if batch_stat_function is not None:
+        stat = batch_stat_function(grouping[np.newaxis])[0]
+    else:
+        stat = test_stat_function(grouping)
 
     p_value = np.nan
     if permutations > 0:
+        permute = np.random.permutation if seed is None else get_rng(seed).permutation
         perm_stats = np.empty(permutations, dtype=np.float64)
+        num_exceedances = 0
+
+        with ExitStack() as stack:
+            executor = None
+            if batch_stat_function is None and num_threads > 1:
+                executor = stack.enter_context(ThreadPoolExecutor(num_threads))
+
+            for start in range(0, permutations, batch_size):
+                stop = min(start + batch_size, permutations)
+                perm_groupings = np.empty(
+                    (stop - start, len(grouping)), dtype=grouping.dtype
+                )
+                for i in range(stop - start):
+                    perm_groupings[i] = permute(grouping)
+
+                if batch_stat_function is not None:
+                    perm_stats[start:stop] = batch_stat_function(perm_groupings)
+                elif executor is not None:
+                    perm_stats[start:stop] = list(
+                        executor.map(test_stat_function, perm_groupings)
+                    )
+                else:
+                    for i, perm_grouping in enumerate(perm_groupings):
+                        perm_stats[start + i] = test_stat_function(perm_grouping)
 
-        for i in range(permutations):
-            perm_grouping = np.random.permutation(grouping)
-            perm_stats[i] = test_stat_function(perm_grouping)
+                if max_exceedances is not None:
+                    num_exceedances += (perm_stats[start:stop] >= stat).sum()
+                    if num_exceedances >= max_exceedances:
+                        perm_stats = perm_stats[:stop]
+                        break
 
-        p_value = ((perm_stats >= stat).sum() + 1) / (permutations + 1)
+        p_value, permutations = _sequential_p_value(perm_stats >= stat, max_exceedances)
 
-    return stat, p_value
+    return stat, p_value, permutations
+
+
+def _validate_max_exceedances(max_exceedances):
+    if max_exceedances is not None and max_exceedances < 1:
+        raise ValueError("`max_exceedances` must be at least 1.")
+
+
+def _sequential_p_value(exceedances, max_exceedances=None):
+    """Compute a Monte Carlo p-value, optionally with early stopping.
+
+    Parameters
+    ----------
+    exceedances : 1D np.ndarray of bool
+        Whether each permuted statistic is at least as extreme as the
+        original statistic, in the order in which permutations were drawn.
+    max_exceedances : int, optional
+        Number of exceedances after which sampling stops. If it is reached
+        after ``l`` permutations, the p-value is ``max_exceedances / l`` [1]_
+        and the remaining permutations are discarded. Otherwise, or if not
+        provided, the p-value is ``(count + 1) / (permutations + 1)``.
+
+    Returns
+    -------
+    float
+        p-value.
+    int
+        Number of permutations used.
+
+    References
+    ----------
+    .. [1] Besag, J., and Clifford, P. "Sequential Monte Carlo p-values."
+       Biometrika 78.2 (1991): 301-304.
+
+    """
+    permutations = len(exceedances)
+    if max_exceedances is not None:
+        cumulative = np.cumsum(exceedances)
+        if cumulative[-1] >= max_exceedances:
+            permutations = np.searchsorted(cumulative, max_exceedances) + 1
+            return max_exceedances / permutations, int(permutations)
+    return (exceedances.sum() + 1) / (permutations + 1), permutations
 
 
 def _build_results(
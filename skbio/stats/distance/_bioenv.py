@@ -6,19 +6,21 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
-from itertools import combinations
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 from scipy.spatial.distance import pdist
-from scipy.stats import spearmanr
+from scipy.stats import rankdata
 
 from skbio.stats.distance import DistanceMatrix
 from skbio.util._decorator import experimental
+from skbio.util._parallel import _get_num_threads
+
 
 
 @experimental(as_of="0.4.0")
-def bioenv(distance_matrix, data_frame, columns=None):
+def bioenv(distance_matrix, data_frame, columns=None, search="exhaustive", n_jobs=None):
     r"""Find subset of variables maximally correlated with distances.
 
     Finds subsets of variables whose Euclidean distances (after scaling the
@@ -56,6 +58,17 @@ def bioenv(distance_matrix, data_frame, columns=None):
         calculations. If not provided, defaults to all columns in `data_frame`.
         The values in each column must be numeric or convertible to a numeric
         type.
+    search : {'exhaustive', 'forward'}, optional
+        Strategy used to find the "best" subsets. ``'exhaustive'`` (the
+        default) evaluates all possible subsets at each subset size.
+        ``'forward'`` performs a greedy stepwise search, in which the "best"
+        subset of each size is the "best" subset of the previous size plus
+        the single variable that maximizes the correlation. See Notes.
+    n_jobs : int, optional
+        Number of threads used to evaluate the subsets. If not provided, the
+        default number of threads of OpenMP is used (``OMP_NUM_THREADS`` if
+        set, otherwise all CPUs available to the process). If -1, all
+        available CPUs are used.
 
     Returns
     -------
@@ -71,8 +84,8 @@ def bioenv(distance_matrix, data_frame, columns=None):
     ValueError
         If column name(s) or `distance_matrix` IDs cannot be found in
         `data_frame`, if there is missing data (``NaN``) in the environmental
-        variables, or if the environmental variables cannot be scaled (e.g.,
-        due to zero variance).
+        variables, if the environmental variables cannot be scaled (e.g.,
+        due to zero variance), or if `search` is invalid.
 
     See Also
     --------
@@ -92,6 +105,21 @@ def bioenv(distance_matrix, data_frame, columns=None):
     The variables are scaled before computing the Euclidean distance: each
     column is centered and then scaled by its standard deviation.
 
+    The distances in `distance_matrix` are ranked only once. The squared
+    differences between objects are computed once per variable, and the
+    Euclidean distances of a subset are obtained by adding those of one more
+    variable to the distances of a smaller subset, following a depth-first
+    enumeration of the subsets that visits the subsets of each size in the
+    same order as ``itertools.combinations``. The subsets are distributed
+    among `n_jobs` threads according to their first variable.
+
+    With a large number of variables, the exhaustive search becomes
+    impractical, as there are :math:`2^p-1` subsets of :math:`p` variables.
+    ``search='forward'`` only evaluates :math:`p(p+1)/2` subsets, in a
+    manner similar in spirit to the BVSTEP procedure of PRIMER-E [4]_ and
+    ``bvstep`` in the sinkr R package, though it is not guaranteed to find
+    the overall "best" subsets.
+
     References
     ----------
     .. [1] Clarke, K. R & Ainsworth, M. 1993. "A method of linking multivariate
@@ -102,6 +130,9 @@ def bioenv(distance_matrix, data_frame, columns=None):
 
     .. [3] http://www.primer-e.com/primer.htm
 
+    .. [4] Clarke, K. R., & Warwick, R. M. 1998. "Quantifying structural
+       redundancy in ecological communities". Oecologia, 113(2), 278-289.
+
     Examples
     --------
     Import the functionality we'll use in the following examples:
@@ -161,6 +192,9 @@ def bioenv(distance_matrix, data_frame, columns=None):
     if len(columns) < 1:
         raise ValueError("Must provide at least one column.")
 
+    if search not in ("exhaustive", "forward"):
+        raise ValueError("Invalid search strategy '%s'." % search)
+
     for column in columns:
         if column not in data_frame:
             raise ValueError("Column '%s' not in data frame." % column)
@@ -186,35 +220,155 @@ def bioenv(distance_matrix, data_frame, columns=None):
     # columns within a tight loop and using a numpy array ends up being ~2x
     # faster.
     vars_array = _scale(vars_df).values
-    dm_flat = distance_matrix.condensed_form()
 
-    num_vars = len(columns)
-    var_idxs = np.arange(num_vars)
+    # Spearman's rho is Pearson's r between ranks, so the ranks of the
+    # community distances are centered and normalized upfront.
+    dm_ranks = rankdata(distance_matrix.condensed_form())
+    dm_ranks -= dm_ranks.mean()
+    dm_ranks /= np.linalg.norm(dm_ranks)
+
+    # Squared differences between objects, for each variable.
+    sq_diffs = np.vstack(
+        [pdist(vars_array[:, [i]], metric="sqeuclidean") for i in range(len(columns))]
+    )
+
+    num_threads = _get_num_threads(n_jobs)
+    if search == "exhaustive":
+        best = _bioenv_exhaustive(dm_ranks, sq_diffs, num_threads)
+    else:
+        best = _bioenv_forward(dm_ranks, sq_diffs, num_threads)
 
     # For each subset size, store the best combination of variables:
     #     (string identifying best vars, subset size, rho)
     max_rhos = np.empty(
-        num_vars, dtype=[("vars", object), ("size", int), ("correlation", float)]
+        len(best), dtype=[("vars", object), ("size", int), ("correlation", float)]
     )
-    for subset_size in range(1, num_vars + 1):
-        max_rho = None
-        for subset_idxs in combinations(var_idxs, subset_size):
-            # Compute Euclidean distances using the current subset of
-            # variables. pdist returns the distances in condensed form.
-            vars_dm_flat = pdist(vars_array[:, subset_idxs], metric="euclidean")
-            rho = spearmanr(dm_flat, vars_dm_flat)[0]
-
-            # If there are ties for the best rho at a given subset size, choose
-            # the first one in order to match vegan::bioenv's behavior.
-            if max_rho is None or rho > max_rho[0]:
-                max_rho = (rho, subset_idxs)
-
-        vars_label = ", ".join([columns[i] for i in max_rho[1]])
-        max_rhos[subset_size - 1] = (vars_label, subset_size, max_rho[0])
+    for i, (rho, subset_idxs) in enumerate(best):
+        vars_label = ", ".join([columns[j] for j in subset_idxs])
+        max_rhos[i] = (vars_label, i + 1, rho)
 
     return pd.DataFrame.from_records(max_rhos, index="vars")
 
 
+def _bioenv_rho(dm_ranks, sq_dists):
+    """Compute Spearman's rho between (normalized) ranks and distances."""
+    # Ranking the summed squared differences directly would give the same
+    # ranks, except where distinct sums have the same square root. Taking it
+    # keeps the ties identical to those of pdist's Euclidean distances.
+    ranks = rankdata(np.sqrt(sq_dists))
+    ranks -= ranks.mean()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (dm_ranks @ ranks) / np.linalg.norm(ranks)
+
+
+def _update_best(best, rho, subset_idxs):
+    """Record `subset_idxs` if it is the best subset of its size so far."""
+    # If there are ties for the best rho at a given subset size, choose the
+    # first one in order to match vegan::bioenv's behavior.
+    i = len(subset_idxs) - 1
+    if best[i] is None or rho > best[i][0]:
+        best[i] = (rho, subset_idxs)
+
+
+def _bioenv_branch(dm_ranks, sq_diffs, prefix, descend=True):
+    """Find the best subsets of each size starting with `prefix`.
+
+    If `descend` is False, only `prefix` itself is evaluated.
+
+    """
+    num_vars = sq_diffs.shape[0]
+    best = [None] * num_vars
+
+    def visit(subset_idxs, sq_dists):
+        _update_best(best, _bioenv_rho(dm_ranks, sq_dists), subset_idxs)
+        if descend:
+            for i in range(subset_idxs[-1] + 1, num_vars):
+                visit(subset_idxs + (i,), sq_dists + sq_diffs[i])
+
+    visit(prefix, sq_diffs[list(prefix)].sum(axis=0))
+    return best
+
+
+def _bioenv_tasks(num_vars, max_subsets):
+    """Split all subsets into branches of at most `max_subsets` subsets.
+
+    Yields ``(prefix, descend)`` pairs for `_bioenv_branch`. A prefix whose
+    branch is too large is evaluated on its own, and its extensions by one
+    variable are split in turn. Tasks are yielded in the order in which the
+    subsets would be enumerated sequentially.
+
+    """
+
+    def split(prefix):
+        # the branch holds the prefix and all its extensions by later
+        # variables
+        if 2 ** (num_vars - 1 - prefix[-1]) <= max_subsets:
+            yield prefix, True
+        else:
+            yield prefix, False
+            for i in range(prefix[-1] + 1, num_vars):
+                yield from split(prefix + (i,))
+
+    for first in range(num_vars):
+        yield from split((first,))
+
+
+def _bioenv_exhaustive(dm_ranks, sq_diffs, num_threads):
+    """Find the best subsets of each size among all subsets."""
+    num_vars = sq_diffs.shape[0]
+
+    # The branch starting with the first variable holds half of all subsets,
+    # so branches are split until each holds a small share of them, and the
+    # threads stay busy until the end.
+    num_subsets = 2**num_vars - 1
+    if num_threads == 1:
+        max_subsets = num_subsets
+    else:
+        max_subsets = max(1, num_subsets // (4 * num_threads))
+    tasks = _bioenv_tasks(num_vars, max_subsets)
+
+    def branch(task):
+        return _bioenv_branch(dm_ranks, sq_diffs, *task)
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        map_ = map if num_threads == 1 else executor.map
+        branches = list(map_(branch, tasks))
+
+    # Branches are merged in order, so that ties are resolved as if the
+    # subsets were enumerated sequentially.
+    best = [None] * num_vars
+    for branch_best in branches:
+        for candidate in branch_best:
+            if candidate is not None:
+                _update_best(best, *candidate)
+    return best
+
+
+def _bioenv_forward(dm_ranks, sq_diffs, num_threads):
+    """Find the best subsets of each size by greedy forward selection."""
+    num_vars, num_dists = sq_diffs.shape
+    selected = ()
+    sq_dists = np.zeros(num_dists)
+    best = []
+
+    def evaluate(i):
+        return _bioenv_rho(dm_ranks, sq_dists + sq_diffs[i])
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        map_ = map if num_threads == 1 else executor.map
+        for _ in range(num_vars):
+            candidates = [i for i in range(num_vars) if i not in selected]
+            max_rho = None
+            for i, rho in zip(candidates, map_(evaluate, candidates)):
+                if max_rho is None or rho > max_rho:
+                    max_rho, max_idx = rho, i
+
+            selected = tuple(sorted(selected + (max_idx,)))
+            sq_dists = sq_dists + sq_diffs[max_idx]
+            best.append((max_rho, selected))
+    return best
+
+
 def _scale(df):
     """Center and scale each column in a data frame.
 
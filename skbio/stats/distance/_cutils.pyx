@@ -8,7 +8,10 @@
 
 import numpy as np
 cimport cython
-from cython.parallel import prange
+from cython.parallel import prange, parallel, threadid
+from libc.math cimport sqrt, fmax, fmin
+
+from skbio.util._parallel import _default_num_threads
 
 ctypedef fused TReal:
     float
@@ -16,7 +19,7 @@ ctypedef fused TReal:
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def is_symmetric_and_hollow_cy(TReal[:, ::1] mat):
+def is_symmetric_and_hollow_cy(const TReal[:, ::1] mat):
     """
     Check if mat is symmetric and hollow.
     Equivalent to [not (mat.T != mat).any(), np.trace(mat) == 0]
@@ -65,7 +68,7 @@ def is_symmetric_and_hollow_cy(TReal[:, ::1] mat):
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def distmat_reorder_cy(TReal[:, ::1] in_mat, long[::1] reorder_vec,
+def distmat_reorder_cy(const TReal[:, ::1] in_mat, long[::1] reorder_vec,
                        TReal[:, ::1] out_mat):
     """
     Reorder the rows and columns of a distance matrix
@@ -117,7 +120,8 @@ def distmat_reorder_cy(TReal[:, ::1] in_mat, long[::1] reorder_vec,
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def distmat_reorder_condensed_cy(TReal[:, ::1] in_mat, long[::1] reorder_vec,
+def distmat_reorder_condensed_cy(const TReal[:, ::1] in_mat,
+                                  long[::1] reorder_vec,
                                   TReal[::1] out_mat_condensed):
     """
     Reorder the rows and columns of a distance matrix
@@ -167,10 +171,117 @@ def distmat_reorder_condensed_cy(TReal[:, ::1] in_mat, long[::1] reorder_vec,
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def mantel_perm_pearsonr_cy(TReal[:, ::1] x_data, long[:, ::1] perm_order,
+def condensed_reorder_cy(const TReal[::1] in_condensed, long[::1] reorder_vec,
+                         TReal[::1] out_mat_condensed):
+    """
+    Reorder the rows and columns of a condensed distance matrix
+    given a reorder vector, producing a condensed distance matrix.
+    Not all of the columns need to be used.
+
+    Equivalent to distmat_reorder_condensed_cy applied to the redundant
+    form of in_condensed, without building it.
+
+    Note: No error checking is performed.
+          The caller must ensure that all values in reorder_vec are valid
+          and distinct.
+
+    Parameters
+    ----------
+    in_condensed : 1D array_like
+        Condensed distance matrix.
+    reorder_vec : 1D_array_like
+        List of permutation indexes
+    out_mat_condensed : 1D array_like
+        Output, condensed distance matrix
+    """
+    cdef Py_ssize_t in_c = in_condensed.shape[0]
+    cdef Py_ssize_t out_n = reorder_vec.shape[0]
+    cdef Py_ssize_t on2 = out_mat_condensed.shape[0]
+
+    # number of objects, from in_c == n*(n-1)/2
+    cdef Py_ssize_t in_n = <Py_ssize_t>((1 + sqrt(1 + 8.0 * in_c)) / 2 + 0.5)
+
+    assert in_c == ((in_n-1)*in_n)//2
+    assert on2 == ((out_n-1)*out_n)//2
+
+    cdef Py_ssize_t row, col
+    cdef Py_ssize_t vrow, vcol
+    cdef Py_ssize_t idx
+
+    for row in prange(out_n-1, nogil=True):
+        vrow = reorder_vec[row]
+        idx = row*(out_n-1) - ((row-1)*row)//2
+        for col in range(out_n-row-1):
+            vcol = reorder_vec[col+row+1]
+            if vrow < vcol:
+                out_mat_condensed[idx+col] = in_condensed[
+                    in_n*vrow - (vrow*(vrow+1))//2 + vcol - vrow - 1]
+            else:
+                out_mat_condensed[idx+col] = in_condensed[
+                    in_n*vcol - (vcol*(vcol+1))//2 + vrow - vcol - 1]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def condensed_submatrix_cy(const TReal[::1] in_condensed, long[::1] row_vec,
+                           long[::1] col_vec, TReal[:, ::1] out_mat):
+    """
+    Extract the rows and columns of a condensed distance matrix
+    into a (not necessarily square) block.
+
+    Equivalent to in_mat[np.ix_(row_vec, col_vec)], where in_mat is
+    the redundant form of in_condensed, without building it.
+
+    Note: No error checking is performed.
+          The caller must ensure that all values in row_vec and col_vec
+          are valid.
+
+    Parameters
+    ----------
+    in_condensed : 1D array_like
+        Condensed distance matrix.
+    row_vec : 1D_array_like
+        Indexes of the rows to extract
+    col_vec : 1D_array_like
+        Indexes of the columns to extract
+    out_mat : 2D array_like
+        Output, block of the distance matrix
+    """
+    cdef Py_ssize_t in_c = in_condensed.shape[0]
+    cdef Py_ssize_t rows_n = row_vec.shape[0]
+    cdef Py_ssize_t cols_n = col_vec.shape[0]
+
+    cdef Py_ssize_t in_n = <Py_ssize_t>((1 + sqrt(1 + 8.0 * in_c)) / 2 + 0.5)
+
+    assert in_c == ((in_n-1)*in_n)//2
+    assert out_mat.shape[0] == rows_n
+    assert out_mat.shape[1] == cols_n
+
+    cdef Py_ssize_t row, col
+    cdef Py_ssize_t vrow, vcol
+
+    for row in prange(rows_n, nogil=True):
+        vrow = row_vec[row]
+        for col in range(cols_n):
+            vcol = col_vec[col]
+            if vrow < vcol:
+                out_mat[row, col] = in_condensed[
+                    in_n*vrow - (vrow*(vrow+1))//2 + vcol - vrow - 1]
+            elif vrow > vcol:
+                out_mat[row, col] = in_condensed[
+                    in_n*vcol - (vcol*(vcol+1))//2 + vrow - vcol - 1]
+            else:
+                out_mat[row, col] = 0
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def mantel_perm_pearsonr_cy(const TReal[:, ::1] x_data,
+                            long[:, ::1] perm_order,
                             TReal xmean, TReal normxm,
                             TReal[::1] ym_normalized,
-                            TReal[::1] permuted_stats):
+                            TReal[::1] permuted_stats,
+                            int num_threads=0):
     """
     Fused permute, fma, pearsonr for mantel.
 
@@ -202,6 +313,9 @@ def mantel_perm_pearsonr_cy(TReal[:, ::1] x_data, long[:, ::1] perm_order,
         Normalized condensed y_data
     permuted_stats : 1D array_like
         Output, Pearson stats
+    num_threads : int, optional
+        Number of threads to use. If zero, the default number of threads
+        of OpenMP is used.
     """
     cdef Py_ssize_t in_n = x_data.shape[0]
     cdef Py_ssize_t in2 = x_data.shape[1]
@@ -226,7 +340,10 @@ def mantel_perm_pearsonr_cy(TReal[:, ::1] x_data, long[:, ::1] perm_order,
     cdef TReal yval
     cdef TReal xval
 
-    for p in prange(perms_n, nogil=True):
+    if num_threads <= 0:
+        num_threads = _default_num_threads()
+
+    for p in prange(perms_n, nogil=True, num_threads=num_threads):
         my_ps = 0.0
         for row in range(out_n-1):
             vrow = perm_order[p, row]
@@ -249,7 +366,94 @@ def mantel_perm_pearsonr_cy(TReal[:, ::1] x_data, long[:, ::1] perm_order,
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def permanova_f_stat_sW_cy(TReal[:, ::1] distance_matrix,
+def mantel_perm_pearsonr_condensed_cy(const TReal[::1] x_condensed,
+                                      long[:, ::1] perm_order,
+                                      TReal xmean, TReal normxm,
+                                      TReal[::1] ym_normalized,
+                                      TReal[::1] permuted_stats,
+                                      int num_threads=0):
+    """
+    Fused permute, fma, pearsonr for mantel, on a condensed matrix.
+
+    Equivalent to mantel_perm_pearsonr_cy applied to the redundant form
+    of x_condensed, without building it.
+
+    Parameters
+    ----------
+    x_condensed : 1D array_like
+        Condensed distance matrix.
+    perm_order : 2D array_like
+        List of permutation orders.
+    xmean: real
+        Mean value of x_condensed
+    normxm: real
+        Norm of pre-processed xm
+    ym_normalized : 1D_array_like
+        Normalized condensed y_data
+    permuted_stats : 1D array_like
+        Output, Pearson stats
+    num_threads : int, optional
+        Number of threads to use. If zero, the default number of threads
+        of OpenMP is used.
+    """
+    cdef Py_ssize_t in_c = x_condensed.shape[0]
+    cdef Py_ssize_t perms_n = perm_order.shape[0]
+    cdef Py_ssize_t out_n = perm_order.shape[1]
+    cdef Py_ssize_t y_n = ym_normalized.shape[0]
+    cdef Py_ssize_t on2 = permuted_stats.shape[0]
+
+    cdef Py_ssize_t in_n = <Py_ssize_t>((1 + sqrt(1 + 8.0 * in_c)) / 2 + 0.5)
+
+    assert in_c == ((in_n-1)*in_n)//2
+    assert y_n == ((out_n-1)*out_n)//2
+    assert perms_n == on2
+
+    cdef Py_ssize_t p
+    cdef Py_ssize_t row,col,icol
+    cdef Py_ssize_t vrow,vcol
+    cdef Py_ssize_t idx
+
+    cdef TReal mul = 1.0/normxm
+    cdef TReal add = -xmean/normxm
+
+    cdef TReal my_ps
+    cdef TReal yval
+    cdef TReal xval
+
+    if num_threads <= 0:
+        num_threads = _default_num_threads()
+
+    for p in prange(perms_n, nogil=True, num_threads=num_threads):
+        my_ps = 0.0
+        for row in range(out_n-1):
+            vrow = perm_order[p, row]
+            idx = row*(out_n-1) - ((row-1)*row)//2
+            for icol in range(out_n-row-1):
+               col = icol+row+1
+               vcol = perm_order[p, col]
+               yval = ym_normalized[idx+icol]
+               if vrow < vcol:
+                   xval = x_condensed[
+                       in_n*vrow - (vrow*(vrow+1))//2 + vcol - vrow - 1]
+               else:
+                   xval = x_condensed[
+                       in_n*vcol - (vcol*(vcol+1))//2 + vrow - vcol - 1]
+               xval = xval*mul + add
+               # do not use += to avoid having prange consider it for reduction
+               my_ps = yval*xval + my_ps
+
+        # Presumably, if abs(one_stat) > 1, then it is only some small artifact of
+        # floating point arithmetic.
+        if my_ps>1.0:
+            my_ps = 1.0
+        elif my_ps<-1.0:
+            my_ps = -1.0
+        permuted_stats[p] = my_ps
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def permanova_f_stat_sW_cy(const TReal[:, ::1] distance_matrix,
                            Py_ssize_t[::1] group_sizes,
                            Py_ssize_t[::1] grouping):
     """Compute PERMANOVA pseudo-F partial statistic."""
@@ -293,3 +497,381 @@ def permanova_f_stat_sW_cy(TReal[:, ::1] distance_matrix,
             s_W += local_s_W/group_sizes[group_idx]
 
     return s_W
+
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def permanova_f_stat_sW_condensed_cy(const TReal[::1] distances,
+                                     Py_ssize_t[::1] group_sizes,
+                                     Py_ssize_t[::1] grouping):
+    """
+    Compute PERMANOVA pseudo-F partial statistic on a condensed matrix.
+
+    Equivalent to permanova_f_stat_sW_cy applied to the redundant form
+    of distances, without building it.
+    """
+    cdef Py_ssize_t in_n = grouping.shape[0]
+    cdef Py_ssize_t dists_n = distances.shape[0]
+
+    assert dists_n == ((in_n-1)*in_n)//2
+
+    cdef double s_W = 0.0
+
+    cdef Py_ssize_t group_idx
+    cdef double local_s_W
+    cdef double val
+
+    cdef Py_ssize_t row, col, idx
+
+    for row in prange(in_n - 1, nogil=True, schedule='dynamic'):
+        local_s_W = 0.0
+        group_idx = grouping[row]
+        idx = in_n * row - row * (row + 1) // 2 - row - 1
+        for col in range(row + 1, in_n):
+            if grouping[col] == group_idx:
+                val = distances[idx + col]
+                local_s_W = local_s_W + val * val
+        s_W += local_s_W/group_sizes[group_idx]
+
+    return s_W
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def permanova_f_stat_sW_batch_cy(const TReal[:, ::1] distance_matrix,
+                                 Py_ssize_t[::1] group_sizes,
+                                 Py_ssize_t[:, ::1] groupings,
+                                 int num_threads=1):
+    """
+    Compute PERMANOVA pseudo-F partial statistic for a batch of groupings.
+
+    Equivalent to calling permanova_f_stat_sW_cy on each row of groupings,
+    but the distance matrix is read only once for the whole batch: each
+    distance is loaded once and added to the sums of all the groupings in
+    which both objects belong to the same group.
+
+    Parameters
+    ----------
+    distance_matrix : 2D array_like
+        Distance matrix.
+    group_sizes : 1D array_like
+        Number of objects in each group.
+    groupings : 2D array_like
+        One grouping vector per row.
+    num_threads : int, optional
+        Number of threads to use.
+
+    Returns
+    -------
+    1D np.ndarray
+        s_W of each grouping.
+    """
+    cdef Py_ssize_t in_n = distance_matrix.shape[0]
+    cdef Py_ssize_t in2 = distance_matrix.shape[1]
+    cdef Py_ssize_t perms_n = groupings.shape[0]
+    cdef Py_ssize_t in3 = groupings.shape[1]
+
+    assert in_n == in2
+    assert in_n == in3
+
+    # objects by groupings, so that the groups of an object in all the
+    # groupings are contiguous (and narrow enough for SIMD comparisons)
+    cdef int[:, ::1] groupings_t = np.ascontiguousarray(groupings.T,
+                                                        dtype=np.intc)
+
+    # per-row partial sums, reduced in a fixed order below so that the
+    # result does not depend on the scheduling of rows to threads
+    row_sW_arr = np.zeros((perms_n, in_n), dtype=np.float64)
+    cdef double[:, ::1] row_sW = row_sW_arr
+
+    # scratch space of each thread, allocated while holding the GIL so that
+    # running out of memory raises a MemoryError
+    if num_threads <= 0:
+        num_threads = _default_num_threads()
+    cdef double[:, ::1] buffers = np.empty((num_threads, perms_n))
+
+    cdef double *local_s_W
+    cdef double val
+
+    cdef Py_ssize_t p, row, col
+
+    with nogil, parallel(num_threads=num_threads):
+        local_s_W = &buffers[threadid(), 0]
+        for row in prange(in_n - 1, schedule='dynamic'):
+            for p in range(perms_n):
+                local_s_W[p] = 0.0
+            for col in range(row + 1, in_n):
+                val = distance_matrix[row, col]
+                val = val * val
+                # branchless, as group membership is unpredictable
+                for p in range(perms_n):
+                    local_s_W[p] = local_s_W[p] + (
+                        val if groupings_t[col, p] == groupings_t[row, p]
+                        else 0.0)
+            for p in range(perms_n):
+                row_sW[p, row] = (local_s_W[p] /
+                                  group_sizes[groupings_t[row, p]])
+
+    return row_sW_arr.sum(axis=1)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def permanova_f_stat_sW_batch_condensed_cy(const TReal[::1] distances,
+                                           Py_ssize_t[::1] group_sizes,
+                                           Py_ssize_t[:, ::1] groupings,
+                                           int num_threads=1):
+    """
+    Compute PERMANOVA pseudo-F partial statistic for a batch of groupings,
+    on a condensed matrix.
+
+    Equivalent to permanova_f_stat_sW_batch_cy applied to the redundant
+    form of distances, without building it.
+
+    Parameters
+    ----------
+    distances : 1D array_like
+        Condensed distance matrix.
+    group_sizes : 1D array_like
+        Number of objects in each group.
+    groupings : 2D array_like
+        One grouping vector per row.
+    num_threads : int, optional
+        Number of threads to use.
+
+    Returns
+    -------
+    1D np.ndarray
+        s_W of each grouping.
+    """
+    cdef Py_ssize_t in_n = groupings.shape[1]
+    cdef Py_ssize_t perms_n = groupings.shape[0]
+    cdef Py_ssize_t dists_n = distances.shape[0]
+
+    assert dists_n == ((in_n-1)*in_n)//2
+
+    # objects by groupings (see permanova_f_stat_sW_batch_cy)
+    cdef int[:, ::1] groupings_t = np.ascontiguousarray(groupings.T,
+                                                        dtype=np.intc)
+
+    # per-row partial sums, reduced in a fixed order below
+    row_sW_arr = np.zeros((perms_n, in_n), dtype=np.float64)
+    cdef double[:, ::1] row_sW = row_sW_arr
+
+    # scratch space of each thread (see permanova_f_stat_sW_batch_cy)
+    if num_threads <= 0:
+        num_threads = _default_num_threads()
+    cdef double[:, ::1] buffers = np.empty((num_threads, perms_n))
+
+    cdef double *local_s_W
+    cdef double val
+
+    cdef Py_ssize_t p, row, col, idx
+
+    with nogil, parallel(num_threads=num_threads):
+        local_s_W = &buffers[threadid(), 0]
+        for row in prange(in_n - 1, schedule='dynamic'):
+            for p in range(perms_n):
+                local_s_W[p] = 0.0
+            idx = in_n * row - row * (row + 1) // 2 - row - 1
+            for col in range(row + 1, in_n):
+                val = distances[idx + col]
+                val = val * val
+                # branchless, as group membership is unpredictable
+                for p in range(perms_n):
+                    local_s_W[p] = local_s_W[p] + (
+                        val if groupings_t[col, p] == groupings_t[row, p]
+                        else 0.0)
+            for p in range(perms_n):
+                row_sW[p, row] = (local_s_W[p] /
+                                  group_sizes[groupings_t[row, p]])
+
+    return row_sW_arr.sum(axis=1)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def anosim_within_rank_sum_batch_cy(const TReal[::1] ranked_dists,
+                                    Py_ssize_t[:, ::1] groupings,
+                                    int num_threads=1):
+    """
+    Sum the ranked distances within groups for a batch of groupings.
+
+    Replaces building the n x n matrix np.equal.outer(grouping, grouping)
+    for each grouping: the condensed ranked distances are visited once per
+    batch, and each of them is added to the sums of the groupings in which
+    both objects belong to the same group.
+
+    Parameters
+    ----------
+    ranked_dists : 1D array_like
+        Ranks of the distances, in condensed form.
+    groupings : 2D array_like
+        One grouping vector per row.
+    num_threads : int, optional
+        Number of threads to use.
+
+    Returns
+    -------
+    1D np.ndarray
+        Sum of the within-group ranks of each grouping.
+    """
+    cdef Py_ssize_t in_n = groupings.shape[1]
+    cdef Py_ssize_t perms_n = groupings.shape[0]
+    cdef Py_ssize_t dists_n = ranked_dists.shape[0]
+
+    assert dists_n == ((in_n-1)*in_n)//2
+
+    # objects by groupings, so that the groups of an object in all the
+    # groupings are contiguous (and narrow enough for SIMD comparisons)
+    cdef int[:, ::1] groupings_t = np.ascontiguousarray(groupings.T,
+                                                        dtype=np.intc)
+
+    # per-row partial sums, reduced in a fixed order below so that the
+    # result does not depend on the scheduling of rows to threads
+    row_sums_arr = np.zeros((perms_n, in_n), dtype=np.float64)
+    cdef double[:, ::1] row_sums = row_sums_arr
+
+    # scratch space of each thread (see permanova_f_stat_sW_batch_cy)
+    if num_threads <= 0:
+        num_threads = _default_num_threads()
+    cdef double[:, ::1] buffers = np.empty((num_threads, perms_n))
+
+    cdef double *local_sum
+    cdef double val
+
+    cdef Py_ssize_t p, row, col, idx
+
+    with nogil, parallel(num_threads=num_threads):
+        local_sum = &buffers[threadid(), 0]
+        for row in prange(in_n - 1, schedule='dynamic'):
+            for p in range(perms_n):
+                local_sum[p] = 0.0
+            idx = in_n * row - row * (row + 1) // 2 - row - 1
+            for col in range(row + 1, in_n):
+                val = ranked_dists[idx + col]
+                for p in range(perms_n):
+                    local_sum[p] = local_sum[p] + (
+                        val if groupings_t[col, p] == groupings_t[row, p]
+                        else 0.0)
+            for p in range(perms_n):
+                row_sums[p, row] = local_sum[p]
+
+    return row_sums_arr.sum(axis=1)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def permdisp_geomedians_cy(double[:, ::1] samples,
+                           Py_ssize_t[::1] members,
+                           Py_ssize_t[::1] starts,
+                           double[:, ::1] centers,
+                           double eps=1e-8,
+                           Py_ssize_t maxiters=1000,
+                           int num_threads=1):
+    """
+    Find the geometric median of each group with Weiszfeld's algorithm.
+
+    Follows hdmedians.geomedian, including the Vardi-Zhang modification for
+    estimates coinciding with a sample and the convergence criteria, so that
+    the medians of a whole batch of permuted groupings can be found without
+    calling it once per group.
+
+    Parameters
+    ----------
+    samples : 2D array_like
+        Coordinates of the samples (one per row).
+    members : 1D array_like
+        Indices of the samples belonging to each group, group after group.
+    starts : 1D array_like
+        Offset of each group in `members`, followed by the size of `members`.
+    centers : 2D array_like
+        Starting point of each group (usually the centroid). Overwritten
+        with the geometric medians.
+    eps : float, optional
+        Samples closer than `eps` to the estimate coincide with it, and the
+        iterations stop before a step shorter than `eps`.
+    maxiters : int, optional
+        Maximum number of iterations.
+    num_threads : int, optional
+        Number of threads to use.
+    """
+    cdef Py_ssize_t groups_n = starts.shape[0] - 1
+    cdef Py_ssize_t dims_n = samples.shape[1]
+
+    cdef Py_ssize_t max_size = 0
+    cdef Py_ssize_t g
+    for g in range(groups_n):
+        if starts[g + 1] - starts[g] > max_size:
+            max_size = starts[g + 1] - starts[g]
+
+    # scratch space of each thread (see permanova_f_stat_sW_batch_cy)
+    if num_threads <= 0:
+        num_threads = _default_num_threads()
+    cdef double[:, ::1] buffers = np.empty((num_threads,
+                                            max_size + 2 * dims_n))
+
+    cdef double *inv_dists
+    cdef double *new_center
+    cdef double *weighted
+    cdef double dist, diff, inv_sum, r, r_inv, step
+    cdef Py_ssize_t i, j, k, size, num_zeros, iteration
+
+    with nogil, parallel(num_threads=num_threads):
+        inv_dists = &buffers[threadid(), 0]
+        new_center = inv_dists + max_size
+        weighted = new_center + dims_n
+        for g in prange(groups_n, schedule='dynamic'):
+            size = starts[g + 1] - starts[g]
+            for iteration in range(maxiters + 1):
+                num_zeros = 0
+                inv_sum = 0.0
+                for i in range(size):
+                    k = members[starts[g] + i]
+                    dist = 0.0
+                    for j in range(dims_n):
+                        diff = samples[k, j] - centers[g, j]
+                        dist = dist + diff * diff
+                    dist = sqrt(dist)
+                    if dist > eps:
+                        inv_dists[i] = 1.0 / dist
+                        inv_sum = inv_sum + inv_dists[i]
+                    else:
+                        inv_dists[i] = 0.0
+                        num_zeros = num_zeros + 1
+                if num_zeros == size:
+                    break
+
+                for j in range(dims_n):
+                    weighted[j] = 0.0
+                for i in range(size):
+                    k = members[starts[g] + i]
+                    for j in range(dims_n):
+                        weighted[j] = weighted[j] + (
+                            inv_dists[i] / inv_sum) * samples[k, j]
+
+                if num_zeros == 0:
+                    for j in range(dims_n):
+                        new_center[j] = weighted[j]
+                else:
+                    r = 0.0
+                    for j in range(dims_n):
+                        diff = (weighted[j] - centers[g, j]) * inv_sum
+                        r = r + diff * diff
+                    r = sqrt(r)
+                    r_inv = 0.0 if r == 0 else num_zeros / r
+                    for j in range(dims_n):
+                        new_center[j] = (
+                            fmax(0.0, 1.0 - r_inv) * weighted[j]
+                            + fmin(1.0, r_inv) * centers[g, j])
+
+                step = 0.0
+                for j in range(dims_n):
+                    diff = centers[g, j] - new_center[j]
+                    step = step + diff * diff
+                if sqrt(step) < eps or iteration == maxiters:
+                    break
+                for j in range(dims_n):
+                    centers[g, j] = new_center[j]
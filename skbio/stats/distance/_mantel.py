@@ -6,7 +6,11 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
 from itertools import combinations
+from threading import Lock
 
 import warnings
 import numpy as np
@@ -17,9 +21,17 @@ from scipy.stats import ConstantInputWarning
 from scipy.stats import NearConstantInputWarning
 
 from skbio.stats.distance import DistanceMatrix
+from skbio.util import get_rng
 from skbio.util._decorator import experimental
+from skbio.util._parallel import _get_num_threads
 
-from ._cutils import mantel_perm_pearsonr_cy
+from ._base import (
+    _DEFAULT_BATCH_SIZE,
+    _sequential_p_value,
+    _validate_max_exceedances,
+)
+from ._utils import distmat_reorder_condensed
+from ._cutils import mantel_perm_pearsonr_cy, mantel_perm_pearsonr_condensed_cy
 
 
 @experimental(as_of="0.4.0")
@@ -31,6 +43,9 @@ def mantel(
     alternative="two-sided",
     strict=True,
     lookup=None,
+    max_exceedances=None,
+    seed=None,
+    n_jobs=None,
 ):
     r"""Compute correlation between distance matrices using the Mantel test.
 
@@ -114,6 +129,19 @@ def mantel(
         already match between the distance matrices, this parameter is not
         necessary. This parameter is disallowed if `x` and `y` are
         ``array_like``.
+    max_exceedances : int, optional
+        If provided, permutations stop as soon as this many permuted
+        correlation coefficients are at least as extreme as the original one
+        (according to `alternative`). See Notes.
+    seed : int or np.random.Generator, optional
+        A user-provided random seed or random generator instance used to
+        permute `x`. If not provided, NumPy's global random state is used.
+    n_jobs : int, optional
+        Number of threads used to evaluate the permutations when `method` is
+        ``'pearson'`` or ``'spearman'``. If not provided, the default number
+        of threads of OpenMP is used (``OMP_NUM_THREADS`` if set, otherwise
+        all CPUs available to the process). If -1, all available CPUs are
+        used.
 
     Returns
     -------
@@ -156,6 +184,15 @@ def mantel(
     be ``np.nan`` if one or both of the inputs does not have any variation
     (i.e. the distances are all constant) and ``method='spearman'``.
 
+    If `max_exceedances` is provided, the p-value is a sequential Monte Carlo
+    p-value [4]_: permutations are drawn until ``max_exceedances`` of them are
+    at least as extreme as the original correlation coefficient, after ``l``
+    permutations, and the p-value is ``max_exceedances / l``. If fewer
+    exceedances are observed in `permutations` permutations, the p-value is
+    computed as usual. This speeds up screening many pairs of distance
+    matrices, where most tests are clearly non-significant. The number of
+    permutations used in each test is reported by ``pwmantel``.
+
     References
     ----------
     .. [1] Legendre, P. and Legendre, L. (2012) Numerical Ecology. 3rd English
@@ -167,6 +204,9 @@ def mantel(
 
     .. [3] http://cran.r-project.org/web/packages/vegan/index.html
 
+    .. [4] Besag, J., and Clifford, P. "Sequential Monte Carlo p-values."
+       Biometrika 78.2 (1991): 301-304.
+
     Examples
     --------
     Import the functionality we'll use in the following examples:
@@ -262,6 +302,33 @@ def mantel(
     ``array_like`` because there is no notion of IDs.
 
     """
+    return _mantel(
+        x,
+        y,
+        method,
+        permutations,
+        alternative,
+        strict,
+        lookup,
+        max_exceedances,
+        seed,
+        n_jobs,
+    )[:3]
+
+
+def _mantel(
+    x,
+    y,
+    method,
+    permutations,
+    alternative,
+    strict,
+    lookup,
+    max_exceedances,
+    seed,
+    n_jobs,
+):
+    """Run the Mantel test, also returning the number of permutations used."""
     special = False  # set to true, if we have a dedicated implementation
     if method == "pearson":
         special = True
@@ -278,6 +345,7 @@ def mantel(
         )
     if alternative not in ("two-sided", "greater", "less"):
         raise ValueError("Invalid alternative hypothesis '%s'." % alternative)
+    _validate_max_exceedances(max_exceedances)
 
     x, y = _order_dms(x, y, strict=strict, lookup=lookup)
 
@@ -288,14 +356,17 @@ def mantel(
             "between them (i.e., minimum 3x3 in size)."
         )
 
+    permute = np.random.permutation if seed is None else get_rng(seed).permutation
+
     if special:
+        num_threads = _get_num_threads(n_jobs)
         if method == "pearson":
             orig_stat, comp_stat, permuted_stats = _mantel_stats_pearson(
-                x, y, permutations
+                x, y, permutations, alternative, max_exceedances, permute, num_threads
             )
         elif method == "spearman":
             orig_stat, comp_stat, permuted_stats = _mantel_stats_spearman(
-                x, y, permutations
+                x, y, permutations, alternative, max_exceedances, permute, num_threads
             )
         else:
             raise ValueError("Invalid correlation method '%s'." % method)
@@ -308,30 +379,49 @@ def mantel(
 
         permuted_stats = []
         if not (permutations == 0 or np.isnan(orig_stat)):
-            perm_gen = (
-                corr_func(x.permute(condensed=True), y_flat)[0]
-                for _ in range(permutations)
-            )
-            permuted_stats = np.fromiter(perm_gen, float, count=permutations)
+            permuted_stats = np.empty(permutations, dtype=float)
+            num_exceedances = 0
+            for i in range(permutations):
+                x_perm = distmat_reorder_condensed(x._data, permute(n))
+                permuted_stats[i] = corr_func(x_perm, y_flat)[0]
+                if max_exceedances is not None:
+                    num_exceedances += _mantel_exceedances(
+                        permuted_stats[i], comp_stat, alternative
+                    )
+                    if num_exceedances >= max_exceedances:
+                        permuted_stats = permuted_stats[: i + 1]
+                        break
 
         del y_flat
 
     if permutations == 0 or np.isnan(orig_stat):
         p_value = np.nan
     else:
-        if alternative == "two-sided":
-            count_better = (np.absolute(permuted_stats) >= np.absolute(comp_stat)).sum()
-        elif alternative == "greater":
-            count_better = (permuted_stats >= comp_stat).sum()
-        else:
-            count_better = (permuted_stats <= comp_stat).sum()
+        exceedances = _mantel_exceedances(permuted_stats, comp_stat, alternative)
+        p_value, permutations = _sequential_p_value(exceedances, max_exceedances)
+
+    return orig_stat, p_value, n, permutations
 
-        p_value = (count_better + 1) / (permutations + 1)
 
-    return orig_stat, p_value, n
+def _mantel_exceedances(permuted_stats, comp_stat, alternative):
+    """Flag permuted stats at least as extreme as the original one."""
+    if alternative == "two-sided":
+        return np.absolute(permuted_stats) >= np.absolute(comp_stat)
+    elif alternative == "greater":
+        return permuted_stats >= comp_stat
+    else:
+        return permuted_stats <= comp_stat
 
 
-def _mantel_stats_pearson_flat(x, y_flat, permutations):
+def _mantel_stats_pearson_flat(
+    x,
+    y_flat,
+    permutations,
+    alternative="two-sided",
+    max_exceedances=None,
+    permute=np.random.permutation,
+    num_threads=0,
+):
     """Compute original and permuted stats using pearsonr.
 
     Parameters
@@ -345,6 +435,16 @@ def _mantel_stats_pearson_flat(x, y_flat, permutations):
         significance. Must be greater than or equal to zero. If zero,
         statistical significance calculations will be skipped and
         permuted_stats will be an empty array.
+    alternative : {'two-sided', 'greater', 'less'}
+        Alternative hypothesis, used to count exceedances.
+    max_exceedances : int, optional
+        If provided, permutations are evaluated in batches, and no more
+        batches are evaluated once this many exceedances are observed.
+    permute : callable, optional
+        Function returning a random permutation of ``range(n)`` given ``n``.
+    num_threads : int, optional
+        Number of threads used to evaluate the permutations. If zero, all
+        available CPUs are used.
 
     Returns
     -------
@@ -393,35 +493,74 @@ def _mantel_stats_pearson_flat(x, y_flat, permutations):
     # floating point arithmetic.
     orig_stat = max(min(orig_stat, 1.0), -1.0)
 
-    mat_n = x._data.shape[0]
+    mat_n = x.shape[0]
     # note: xmean and normxm do not change with permutations
     permuted_stats = []
     comp_stat = orig_stat
     if not (permutations == 0 or np.isnan(orig_stat)):
-        # inline DistanceMatrix.permute, grouping them together
-        x_data = x._data
-        if not x_data.flags.c_contiguous:
-            x_data = np.asarray(x_data, order="C")
-
-        # compute all pearsonr permutations at once
-        # create first the list of permutations
-        perm_order = np.empty((permutations + 1, mat_n), dtype=int)
-        # first row/statistic will be comp_stat
-        perm_order[0, :] = np.arange(mat_n)
-        for row in range(1, permutations + 1):
-            perm_order[row, :] = np.random.permutation(mat_n)
+        # inline DistanceMatrix.permute, grouping them together (reading the
+        # distances in the format in which they are stored)
+        if x.condensed:
+            x_data = np.ascontiguousarray(x.condensed_form())
+            perm_pearsonr = mantel_perm_pearsonr_condensed_cy
+        else:
+            x_data = np.ascontiguousarray(x.data)
+            perm_pearsonr = mantel_perm_pearsonr_cy
+
+        # compute all pearsonr permutations at once, or in batches if
+        # sampling may stop early
+        batch_size = permutations + 1
+        if max_exceedances is not None:
+            batch_size = min(batch_size, _DEFAULT_BATCH_SIZE)
 
         permuted_stats = np.empty(permutations + 1, dtype=x_data.dtype)
-        mantel_perm_pearsonr_cy(
-            x_data, perm_order, xmean, normxm, ym_normalized, permuted_stats
-        )
+        num_exceedances = 0
+        for start in range(0, permutations + 1, batch_size):
+            stop = min(start + batch_size, permutations + 1)
+            # create first the list of permutations
+            perm_order = np.empty((stop - start, mat_n), dtype=int)
+            for row in range(stop - start):
+                if start + row == 0:
+                    # first row/statistic will be comp_stat
+                    perm_order[row, :] = np.arange(mat_n)
+                else:
+                    perm_order[row, :] = permute(mat_n)
+
+            perm_pearsonr(
+                x_data,
+                perm_order,
+                xmean,
+                normxm,
+                ym_normalized,
+                permuted_stats[start:stop],
+                num_threads,
+            )
+
+            if max_exceedances is not None:
+                num_exceedances += _mantel_exceedances(
+                    permuted_stats[max(start, 1) : stop],
+                    permuted_stats[0],
+                    alternative,
+                ).sum()
+                if num_exceedances >= max_exceedances:
+                    permuted_stats = permuted_stats[:stop]
+                    break
+
         comp_stat = permuted_stats[0]
         permuted_stats = permuted_stats[1:]
 
     return orig_stat, comp_stat, permuted_stats
 
 
-def _mantel_stats_pearson(x, y, permutations):
+def _mantel_stats_pearson(
+    x,
+    y,
+    permutations,
+    alternative="two-sided",
+    max_exceedances=None,
+    permute=np.random.permutation,
+    num_threads=0,
+):
     """Compute original and permuted stats using pearsonr.
 
     Parameters
@@ -433,6 +572,14 @@ def _mantel_stats_pearson(x, y, permutations):
         significance. Must be greater than or equal to zero. If zero,
         statistical significance calculations will be skipped and
         permuted_stats will be an empty array.
+    alternative : {'two-sided', 'greater', 'less'}
+        Alternative hypothesis, used to count exceedances.
+    max_exceedances : int, optional
+        Stop permuting once this many exceedances are observed.
+    permute : callable, optional
+        Function returning a random permutation of ``range(n)`` given ``n``.
+    num_threads : int, optional
+        Number of threads used to evaluate the permutations.
 
     Returns
     -------
@@ -448,10 +595,20 @@ def _mantel_stats_pearson(x, y, permutations):
 
     """
     y_flat = y.condensed_form()
-    return _mantel_stats_pearson_flat(x, y_flat, permutations)
+    return _mantel_stats_pearson_flat(
+        x, y_flat, permutations, alternative, max_exceedances, permute, num_threads
+    )
 
 
-def _mantel_stats_spearman(x, y, permutations):
+def _mantel_stats_spearman(
+    x,
+    y,
+    permutations,
+    alternative="two-sided",
+    max_exceedances=None,
+    permute=np.random.permutation,
+    num_threads=0,
+):
     """Compute original and permuted stats using spearmanr.
 
     Parameters
@@ -463,6 +620,14 @@ def _mantel_stats_spearman(x, y, permutations):
         significance. Must be greater than or equal to zero. If zero,
         statistical significance calculations will be skipped and
         permuted_stats will be an empty array.
+    alternative : {'two-sided', 'greater', 'less'}
+        Alternative hypothesis, used to count exceedances.
+    max_exceedances : int, optional
+        Stop permuting once this many exceedances are observed.
+    permute : callable, optional
+        Function returning a random permutation of ``range(n)`` given ``n``.
+    num_threads : int, optional
+        Number of threads used to evaluate the permutations.
 
     Returns
     -------
@@ -495,7 +660,15 @@ def _mantel_stats_spearman(x, y, permutations):
     del x_rank
 
     # for our purposes, spearman is just pearson on rankdata
-    return _mantel_stats_pearson_flat(x_rank_matrix, y_rank, permutations)
+    return _mantel_stats_pearson_flat(
+        x_rank_matrix,
+        y_rank,
+        permutations,
+        alternative,
+        max_exceedances,
+        permute,
+        num_threads,
+    )
 
 
 @experimental(as_of="0.4.0")
@@ -507,6 +680,9 @@ def pwmantel(
     alternative="two-sided",
     strict=True,
     lookup=None,
+    max_exceedances=None,
+    seed=None,
+    n_jobs=None,
 ):
     """Run Mantel tests for every pair of given distance matrices.
 
@@ -538,6 +714,19 @@ def pwmantel(
         Handling of nonmatching IDs. See ``mantel`` function for more details.
     lookup : dict, optional
         Map existing IDs to new IDs. See ``mantel`` function for more details.
+    max_exceedances : int, optional
+        Stop permuting once this many exceedances are observed. See
+        ``mantel`` function for more details. Column ``permutations`` of the
+        results then holds the number of permutations used in each test.
+    seed : int or np.random.Generator, optional
+        A user-provided random seed or random generator instance, from which
+        the seed of each pairwise test is drawn. If not provided, NumPy's
+        global random state is used.
+    n_jobs : int, optional
+        Number of threads used. If provided, this many pairwise tests are run
+        concurrently, each with a single thread; if -1, all available CPUs
+        are used. If not provided, the tests are run one after another, each
+        using the default number of threads of OpenMP, as ``mantel`` does.
 
     Returns
     -------
@@ -560,6 +749,14 @@ def pwmantel(
     of memory consumption as it only loads two matrices at a time as opposed to
     loading all distance matrices into memory.
 
+    ``DistanceMatrix`` instances given in `dms` are reordered to the IDs
+    shared with the other matrix of a pair only once per distinct ID order.
+    The condensed distances of an order used by several pairs are kept until
+    the last of these pairs is run, and are then released.
+    With `n_jobs` greater than 1, pairwise tests are run in a pool of threads
+    (the permutation kernel releases the GIL), and the result is the same
+    ``DataFrame`` as when running them one at a time with the same `seed`.
+
     Examples
     --------
     Import the functionality we'll use in the following examples:
@@ -622,30 +819,70 @@ def pwmantel(
     ]
     results = np.empty(num_combs, dtype=results_dtype)
 
-    for i, pair in enumerate(combinations(zip(labels, dms), 2)):
+    # Each test only gets a share of the CPUs if several tests run at once.
+    if n_jobs is None:
+        num_threads, mantel_jobs = 1, None
+    else:
+        num_threads, mantel_jobs = _get_num_threads(n_jobs), 1
+    if seed is not None:
+        seeds = get_rng(seed).integers(2**32, size=num_combs)
+    elif num_threads > 1:
+        # Draw from the global random state upfront so that the outcome does
+        # not depend on the order in which the threads run.
+        seeds = np.random.randint(2**31, size=num_combs)
+    else:
+        seeds = [None] * num_combs
+
+    # Reordered matrices needed by several pairs (see _order_dms).
+    cache = _ReorderCache(_count_reorders(dms, lookup))
+
+    def _run_pair(pair, seed):
         (xlabel, x), (ylabel, y) = pair
+        # Matrices loaded from files only live for one test, so they cannot
+        # be looked up by identity in the cache.
+        pair_cache = cache
         if isinstance(x, str):
             x = DistanceMatrix.read(x)
+            pair_cache = None
         if isinstance(y, str):
             y = DistanceMatrix.read(y)
+            pair_cache = None
 
-        stat, p_val, n = mantel(
+        x, y = _order_dms(x, y, strict=strict, lookup=lookup, cache=pair_cache)
+        stat, p_val, n, used = _mantel(
             x,
             y,
-            method=method,
-            permutations=permutations,
-            alternative=alternative,
-            strict=strict,
-            lookup=lookup,
+            method,
+            permutations,
+            alternative,
+            True,
+            None,
+            max_exceedances,
+            None if seed is None else int(seed),
+            mantel_jobs,
         )
+        return (xlabel, ylabel, stat, p_val, n, method, used, alternative)
 
-        results[i] = (xlabel, ylabel, stat, p_val, n, method, permutations, alternative)
+    pairs = combinations(zip(labels, dms), 2)
+    if num_threads == 1:
+        for i, (pair, seed) in enumerate(zip(pairs, seeds)):
+            results[i] = _run_pair(pair, seed)
+    else:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            for i, record in enumerate(executor.map(_run_pair, pairs, seeds)):
+                results[i] = record
 
     return pd.DataFrame.from_records(results, index=("dm1", "dm2"))
 
 
-def _order_dms(x, y, strict=True, lookup=None):
-    """Intersect distance matrices and put them in the same order."""
+def _order_dms(x, y, strict=True, lookup=None, cache=None):
+    """Intersect distance matrices and put them in the same order.
+
+    If `cache` (a ``_ReorderCache``) is provided, reordered distance matrices
+    are looked up in it, keyed by the identity of the input matrix and the ID
+    order (see ``_count_reorders``).
+
+    """
     x_is_dm = isinstance(x, DistanceMatrix)
     y_is_dm = isinstance(y, DistanceMatrix)
 
@@ -656,6 +893,7 @@ def _order_dms(x, y, strict=True, lookup=None):
             "or array_like, but not mixed."
         )
     elif x_is_dm and y_is_dm:
+        x_key, y_key = id(x), id(y)
         if lookup is not None:
             x = _remap_ids(x, lookup, "x", "first")
             y = _remap_ids(y, lookup, "y", "second")
@@ -672,7 +910,13 @@ def _order_dms(x, y, strict=True, lookup=None):
         if num_matches < 1:
             raise ValueError("No matching IDs exist between the distance " "matrices.")
 
-        return x.filter(id_order), y.filter(id_order)
+        id_order = tuple(id_order)
+        if cache is None:
+            return x.filter(id_order), y.filter(id_order)
+        return (
+            cache.get((x_key, id_order), x.filter, id_order),
+            cache.get((y_key, id_order), y.filter, id_order),
+        )
     else:
         # Both x and y aren't DistanceMatrix instances.
         if lookup is not None:
@@ -690,8 +934,85 @@ def _order_dms(x, y, strict=True, lookup=None):
         return x, y
 
 
+def _count_reorders(dms, lookup):
+    """Count the pairs of `dms` needing each reordered distance matrix.
+
+    The counts are keyed like the reordered matrices in ``_order_dms``. Only
+    pairs of ``DistanceMatrix`` instances are counted, as matrices loaded
+    from files are read again for each pair.
+
+    """
+    ids = []
+    for dm in dms:
+        if not isinstance(dm, DistanceMatrix):
+            ids.append(None)
+        elif lookup is None:
+            ids.append(dm.ids)
+        else:
+            try:
+                ids.append(tuple(lookup[id_] for id_ in dm.ids))
+            except KeyError:
+                # raised by _order_dms when the pair is run
+                ids.append(None)
+
+    counts = Counter()
+    for (x, x_ids), (y, y_ids) in combinations(zip(dms, ids), 2):
+        if x_ids is not None and y_ids is not None and x_ids != y_ids:
+            y_ids = set(y_ids)
+            id_order = tuple(id_ for id_ in x_ids if id_ in y_ids)
+            counts[id(x), id_order] += 1
+            counts[id(y), id_order] += 1
+    return counts
+
+
+class _ReorderCache:
+    """Reordered distance matrices shared by several pairs of ``pwmantel``.
+
+    `counts` holds the number of times each key will be looked up (see
+    ``_count_reorders``). Only matrices looked up more than once are stored,
+    and each is dropped after its last lookup, so that the cache does not
+    outgrow the matrices still needed by later pairs. Lookups may come from
+    several threads. Matrices are returned in condensed storage whether or
+    not they were stored, so that the results do not depend on the order in
+    which the threads run.
+
+    """
+
+    def __init__(self, counts):
+        self._remaining = dict(counts)
+        self._stored = {}
+        self._lock = Lock()
+
+    def get(self, key, func, *args):
+        """Return the matrix stored under `key`, or compute ``func(*args)``."""
+        with self._lock:
+            remaining = self._remaining.pop(key, 0) - 1
+            if remaining > 0:
+                self._remaining[key] = remaining
+                stored = self._stored.get(key)
+            else:
+                stored = self._stored.pop(key, None)
+
+        if stored is not None:
+            distances, ids = stored
+            return DistanceMatrix(distances, ids, validate=False, condensed=True)
+
+        dm = DistanceMatrix(func(*args), condensed=True)
+        if remaining > 0:
+            stored = (dm.condensed_form(), dm.ids)
+            with self._lock:
+                # unless the last lookup already happened in another thread
+                if key in self._remaining:
+                    self._stored.setdefault(key, stored)
+        return dm
+
+
 def _remap_ids(dm, lookup, label, order):
-    """Return a copy of `dm` with its IDs remapped based on `lookup`."""
+    """Return a copy of `dm` with its IDs remapped based on `lookup`.
+
+    The copy shares the distances of `dm`, which are not modified.
+
+    """
     try:
         remapped_ids = [lookup[id_] for id_ in dm.ids]
     except KeyError as e:
@@ -700,7 +1021,7 @@ def _remap_ids(dm, lookup, label, order):
             "the lookup. Missing ID: %s" % (order, label, str(e))
         )
 
-    # Create a copy as we'll be modifying the IDs in place.
-    dm_copy = dm.copy()
+    # Create a shallow copy as we'll be modifying the IDs in place.
+    dm_copy = copy(dm)
     dm_copy.ids = remapped_ids
     return dm_copy
@@ -17,11 +17,26 @@ from ._base import (
     DistanceMatrix,
 )
 from skbio.util._decorator import experimental
-from ._cutils import permanova_f_stat_sW_cy
+from skbio.util._parallel import _get_num_threads
+from ._cutils import (
+    permanova_f_stat_sW_cy,
+    permanova_f_stat_sW_batch_cy,
+    permanova_f_stat_sW_condensed_cy,
+    permanova_f_stat_sW_batch_condensed_cy,
+)
 
 
 @experimental(as_of="0.4.0")
-def permanova(distance_matrix, grouping, column=None, permutations=999):
+def permanova(
+    distance_matrix,
+    grouping,
+    column=None,
+    permutations=999,
+    seed=None,
+    n_jobs=None,
+    batch_size=None,
+    max_exceedances=None,
+):
     """Test for significant differences between groups using PERMANOVA.
 
     Permutational Multivariate Analysis of Variance (PERMANOVA) is a
@@ -64,6 +79,24 @@ def permanova(distance_matrix, grouping, column=None, permutations=999):
         significance. Must be greater than or equal to zero. If zero,
         statistical significance calculations will be skipped and the p-value
         will be ``np.nan``.
+    seed : int or np.random.Generator, optional
+        A user-provided random seed or random generator instance used to
+        permute `grouping`. If not provided, NumPy's global random state is
+        used.
+    n_jobs : int, optional
+        Number of threads used to evaluate the permutations. If not provided,
+        the default number of threads of OpenMP is used (``OMP_NUM_THREADS``
+        if set, otherwise all CPUs available to the process). If -1, all
+        available CPUs are used.
+    batch_size : int, optional
+        Number of permutations generated and evaluated together. Each batch
+        requires a single pass over the distance matrix. Defaults to 64.
+    max_exceedances : int, optional
+        If provided, permutations stop as soon as this many permuted
+        statistics are at least as extreme as the original statistic, and
+        the reported number of permutations is the number actually used.
+        Clearly non-significant results are then obtained after a small
+        fraction of `permutations`. See Notes.
 
     Returns
     -------
@@ -82,6 +115,19 @@ def permanova(distance_matrix, grouping, column=None, permutations=999):
 
     The p-value will be ``np.nan`` if `permutations` is zero.
 
+    The permutations are evaluated in batches by a compiled routine, which
+    reads each row of the distance matrix once per batch and distributes the
+    rows among `n_jobs` threads.
+
+    If `max_exceedances` is provided, the p-value is computed by sequential
+    Monte Carlo sampling [3]_: if ``max_exceedances`` permuted pseudo-F
+    statistics greater than or equal to the original one are reached after
+    ``l`` permutations, sampling stops and the p-value is
+    ``max_exceedances / l``. Otherwise, all `permutations` are used and the
+    p-value is computed as usual. Values of 10 to 20 give p-values accurate
+    enough to decide significance, while skipping most permutations for
+    non-significant results.
+
     References
     ----------
     .. [1] Anderson, Marti J. "A new method for non-parametric multivariate
@@ -89,6 +135,9 @@ def permanova(distance_matrix, grouping, column=None, permutations=999):
 
     .. [2] http://cran.r-project.org/web/packages/vegan/index.html
 
+    .. [3] Besag, J., and Clifford, P. "Sequential Monte Carlo p-values."
+       Biometrika 78.2 (1991): 301-304.
+
     Examples
     --------
     See :mod:`skbio.stats.distance.anosim` for usage examples (both functions
@@ -105,27 +154,78 @@ def permanova(distance_matrix, grouping, column=None, permutations=999):
 
     # Calculate number of objects in each group.
     group_sizes = np.bincount(grouping)
-    s_T = (distance_matrix[:] ** 2).sum() / sample_size
-    # we are going over the whole matrix, instead of just upper triangle
-    # so cut in half
-    s_T /= 2.0
+
+    # Read the distances once, in the format in which they are stored (a
+    # matrix read on demand from a file is loaded here, not on every batch).
+    if distance_matrix.condensed:
+        distances = distance_matrix.condensed_form()
+        s_T = (distances**2).sum() / sample_size
+    else:
+        distances = distance_matrix.data
+        # we are going over the whole matrix, instead of just upper triangle
+        # so cut in half
+        s_T = (distances**2).sum() / sample_size / 2.0
 
     test_stat_function = partial(
-        _compute_f_stat, sample_size, num_groups, distance_matrix, group_sizes, s_T
+        _compute_f_stat, sample_size, num_groups, distances, group_sizes, s_T
+    )
+    batch_stat_function = partial(
+        _compute_f_stat_batch,
+        sample_size,
+        num_groups,
+        distances,
+        group_sizes,
+        s_T,
+        _get_num_threads(n_jobs),
+    )
+    stat, p_value, permutations = _run_monte_carlo_stats(
+        test_stat_function,
+        grouping,
+        permutations,
+        seed=seed,
+        n_jobs=n_jobs,
+        batch_size=batch_size,
+        batch_stat_function=batch_stat_function,
+        max_exceedances=max_exceedances,
     )
-    stat, p_value = _run_monte_carlo_stats(test_stat_function, grouping, permutations)
 
     return _build_results(
         "PERMANOVA", "pseudo-F", sample_size, num_groups, stat, p_value, permutations
     )
 
 
-def _compute_f_stat(
-    sample_size, num_groups, distance_matrix, group_sizes, s_T, grouping
-):
-    """Compute PERMANOVA pseudo-F statistic."""
+def _compute_f_stat(sample_size, num_groups, distances, group_sizes, s_T, grouping):
+    """Compute PERMANOVA pseudo-F statistic.
+
+    `distances` is either a square or a condensed distance matrix.
+
+    """
     # Calculate s_W for each group, accounting for different group sizes.
-    s_W = permanova_f_stat_sW_cy(distance_matrix.data, group_sizes, grouping)
+    if distances.ndim == 1:
+        s_W = permanova_f_stat_sW_condensed_cy(distances, group_sizes, grouping)
+    else:
+        s_W = permanova_f_stat_sW_cy(distances, group_sizes, grouping)
+
+    s_A = s_T - s_W
+    return (s_A / (num_groups - 1)) / (s_W / (sample_size - num_groups))
+
+
+def _compute_f_stat_batch(
+    sample_size, num_groups, distances, group_sizes, s_T, num_threads, groupings
+):
+    """Compute PERMANOVA pseudo-F statistic for each row of `groupings`.
+
+    `distances` is either a square or a condensed distance matrix.
+
+    """
+    if distances.ndim == 1:
+        s_W = permanova_f_stat_sW_batch_condensed_cy(
+            distances, group_sizes, groupings, num_threads
+        )
+    else:
+        s_W = permanova_f_stat_sW_batch_cy(
+            distances, group_sizes, groupings, num_threads
+        )
 
     s_A = s_T - s_W
     return (s_A / (num_groups - 1)) / (s_W / (sample_size - num_groups))
@@ -6,14 +6,11 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 import numpy as np
-import pandas as pd
-from scipy.stats import f_oneway
-from scipy.spatial.distance import cdist
-
-import hdmedians as hd
+from scipy.sparse import csr_matrix
 
 from ._base import (
     _preprocess_input_sng,
@@ -21,9 +18,11 @@ from ._base import (
     _build_results,
     DistanceMatrix,
 )
+from ._cutils import permdisp_geomedians_cy
 
 from skbio.stats.ordination import pcoa, OrdinationResults
 from skbio.util._decorator import experimental
+from skbio.util._parallel import _get_num_threads
 
 
 @experimental(as_of="0.5.2")
@@ -35,6 +34,10 @@ def permdisp(
     permutations=999,
     method="eigh",
     number_of_dimensions=10,
+    seed=None,
+    n_jobs=None,
+    batch_size=None,
+    max_exceedances=None,
 ):
     """Test for Homogeneity of Multivariate Groups Disperisons.
 
@@ -86,6 +89,22 @@ def permdisp(
     number_of_dimensions : int, optional
         Dimensions to reduce the distance matrix to if using the `fsvd` method.
         Not used if the `eigh` method is being selected.
+    seed : int or np.random.Generator, optional
+        A user-provided random seed or random generator instance used to
+        permute `grouping`. If not provided, NumPy's global random state is
+        used.
+    n_jobs : int, optional
+        Number of threads used to evaluate the permutations. If not provided,
+        the default number of threads of OpenMP is used (``OMP_NUM_THREADS``
+        if set, otherwise all CPUs available to the process). If -1, all
+        available CPUs are used.
+    batch_size : int, optional
+        Number of permutations generated and evaluated together. Defaults to
+        64.
+    max_exceedances : int, optional
+        Stop permuting once this many permuted F statistics are greater than
+        or equal to the original one. The number of permutations reported in
+        the results is then the number actually used.
 
     Returns
     -------
@@ -133,6 +152,17 @@ def permdisp(
     See [1]_ for the original method reference, as well as
     ``vegan::betadisper``, available in R's vegan package [2]_.
 
+    When `max_exceedances` is given, sampling stops early following Besag and
+    Clifford [3]_, as described in ``permanova``.
+
+    The test statistic is computed for a whole batch of permutations at once.
+    The group centroids and the distances of the samples to them are obtained
+    with array operations, and the F statistic of each permutation is computed
+    in closed form from the per-group sums of these distances. The geometric
+    medians are found by a compiled implementation of the Weiszfeld algorithm
+    used by the ``hdmedians`` package, which processes all groups of the batch
+    in one call.
+
     References
     ----------
     .. [1] Anderson, M. J. (2006). Distance-based tests for homogeneity of multivariate
@@ -140,6 +170,9 @@ def permdisp(
 
     .. [2] http://cran.r-project.org/web/packages/vegan/index.html
 
+    .. [3] Besag, J., and Clifford, P. "Sequential Monte Carlo p-values."
+       Biometrika 78.2 (1991): 301-304.
+
     Examples
     --------
     Load a 6x6 distance matrix and grouping vector denoting 2 groups of
@@ -271,48 +304,114 @@ def permdisp(
     else:
         raise TypeError("Input must be a DistanceMatrix or OrdinationResults.")
 
-    samples = ordination.samples
+    samples = np.ascontiguousarray(ordination.samples.values, dtype=np.float64)
 
     num_groups, grouping = _preprocess_input_sng(ids, sample_size, grouping, column)
 
     test_stat_function = partial(_compute_groups, samples, test)
+    batch_stat_function = partial(
+        _compute_groups_batch, samples, test, num_groups, _get_num_threads(n_jobs)
+    )
 
-    stat, p_value = _run_monte_carlo_stats(test_stat_function, grouping, permutations)
+    stat, p_value, permutations = _run_monte_carlo_stats(
+        test_stat_function,
+        grouping,
+        permutations,
+        seed=seed,
+        n_jobs=n_jobs,
+        batch_size=batch_size,
+        batch_stat_function=batch_stat_function,
+        max_exceedances=max_exceedances,
+    )
 
     return _build_results(
         "PERMDISP", "F-value", sample_size, num_groups, stat, p_value, permutations
     )
 
 
-def _compute_groups(samples, test_type, grouping):
-    groups = []
-
-    samples["grouping"] = grouping
-    if test_type == "centroid":
-        centroids = samples.groupby("grouping").aggregate("mean")
-    elif test_type == "median":
-        centroids = samples.groupby("grouping").apply(_config_med)
-
-    for label, df in samples.groupby("grouping"):
-        groups.append(
-            cdist(
-                df.values[:, :-1].astype("float64"),
-                [centroids.loc[label].values],
-                metric="euclidean",
-            )
-        )
+# Maximum number of elements of the (permutations x samples x dimensions)
+# arrays built while evaluating a batch of permutations.
+_CHUNK_SIZE = 2**22
 
-    stat, _ = f_oneway(*groups)
-    stat = stat[0]
 
-    return stat
+def _compute_groups(samples, test_type, grouping):
+    """Compute the PERMDISP F statistic of a single grouping."""
+    _, grouping = np.unique(grouping, return_inverse=True)
+    samples = np.ascontiguousarray(samples, dtype=np.float64)
+    num_groups = grouping.max() + 1
+    return _compute_groups_batch(samples, test_type, num_groups, 1, grouping[None])[0]
 
 
-def _config_med(x):
-    """Slice and transpose the vector.
+def _compute_groups_batch(samples, test_type, num_groups, num_threads, groupings):
+    """Compute the PERMDISP F statistic of each row of `groupings`.
+
+    `groupings` holds group indices (from 0 to `num_groups` - 1). The rows are
+    split in chunks, which are evaluated by up to `num_threads` threads.
 
-    Slice the vector up to the last value to exclude grouping column
-    and transpose the vector to be compatible with hd.geomedian.
     """
-    X = x.values[:, :-1]
-    return pd.Series(np.array(hd.geomedian(X.T)), index=x.columns[:-1])
+    num_perms, num_samples = groupings.shape
+    chunk_size = max(1, _CHUNK_SIZE // samples.size)
+    chunk_size = min(chunk_size, -(-num_perms // num_threads))
+    chunks = [groupings[i : i + chunk_size] for i in range(0, num_perms, chunk_size)]
+
+    func = partial(_compute_groups_chunk, samples, test_type, num_groups)
+    if num_threads == 1 or len(chunks) == 1:
+        return np.concatenate(list(map(func, chunks)))
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        return np.concatenate(list(executor.map(func, chunks)))
+
+
+def _compute_groups_chunk(samples, test_type, num_groups, groupings):
+    """Compute the PERMDISP F statistic of each row of a chunk of groupings."""
+    num_perms, num_samples = groupings.shape
+
+    # Each group of each permutation is given a distinct label, so that all
+    # groups can be processed at once.
+    labels = (groupings + np.arange(num_perms)[:, None] * num_groups).ravel()
+    points = np.tile(np.arange(num_samples), num_perms)
+    num_labels = num_perms * num_groups
+    group_sizes = np.bincount(labels, minlength=num_labels)
+
+    membership = csr_matrix(
+        (np.ones(labels.size), (labels, points)), shape=(num_labels, num_samples)
+    )
+    centers = (membership @ samples) / group_sizes[:, None]
+    if test_type == "median":
+        centers = _geomedians(samples, labels, points, centers)
+
+    dists = np.linalg.norm(samples[points] - centers[labels], axis=1)
+    return _f_stat_batch(dists.reshape(num_perms, num_samples), labels, num_groups)
+
+
+def _geomedians(samples, labels, points, centers):
+    """Find the geometric median of each group, starting from `centers`."""
+    order = np.argsort(labels, kind="stable")
+    starts = np.zeros(centers.shape[0] + 1, dtype=np.intp)
+    np.cumsum(np.bincount(labels, minlength=centers.shape[0]), out=starts[1:])
+
+    samples = np.ascontiguousarray(samples, dtype=np.float64)
+    centers = np.ascontiguousarray(centers)
+    permdisp_geomedians_cy(samples, points[order].astype(np.intp), starts, centers)
+    return centers
+
+
+def _f_stat_batch(dists, labels, num_groups):
+    """Compute the one-way ANOVA F statistic of each row of `dists`."""
+    num_perms, num_samples = dists.shape
+    # Permuting a grouping does not change the group sizes.
+    group_sizes = np.bincount(labels[:num_samples], minlength=num_groups)
+
+    # Center the distances to limit round-off, as scipy.stats.f_oneway does.
+    dists = dists - dists.mean(axis=1, keepdims=True)
+    group_sums = np.bincount(
+        labels, dists.ravel(), minlength=num_perms * num_groups
+    ).reshape(num_perms, num_groups)
+
+    ss_total = (dists**2).sum(axis=1)
+    ss_between = (group_sums**2 / group_sizes).sum(axis=1)
+    ss_within = ss_total - ss_between
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (ss_between / (num_groups - 1)) / (
+            ss_within / (num_samples - num_groups)
+        )
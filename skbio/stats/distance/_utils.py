@@ -10,6 +10,7 @@ import numpy as np
 
 from ._cutils import is_symmetric_and_hollow_cy
 from ._cutils import distmat_reorder_cy, distmat_reorder_condensed_cy
+from ._cutils import condensed_reorder_cy, condensed_submatrix_cy
 
 
 def is_symmetric_and_hollow(mat):
@@ -173,7 +174,7 @@ def distmat_reorder(in_mat, reorder_vec, validate=False):
     return out_mat
 
 
-def distmat_reorder_condensed(in_mat, reorder_vec, validate=False):
+def distmat_reorder_condensed(in_mat, reorder_vec, validate=False, out_mat=None):
     """Reorder the rows and columns of a distance matrix given a reorder vector.
 
     Not all of the columns need to be used.
@@ -191,11 +192,17 @@ def distmat_reorder_condensed(in_mat, reorder_vec, validate=False):
     Parameters
     ----------
     in_mat : 2D array_like
-        Distance matrix, must be in c_order
+        Distance matrix, must be in c_order. Can instead be a condensed
+        distance matrix (1D), in which case the values of `reorder_vec` must
+        be distinct.
     reorder_vec : 1D_array_like
         List of permutation indexes
     validate: boolean
         Optional, if True, validate reorder_vec content, detaults to False
+    out_mat : 1D array_like
+        Optional, output condensed distance matrix, must be in c_order and
+        of size ``n * (n - 1) / 2``, where ``n`` is the size of reorder_vec.
+        If not provided, a new array is allocated.
 
     Returns
     -------
@@ -205,7 +212,10 @@ def distmat_reorder_condensed(in_mat, reorder_vec, validate=False):
     """
     np_reorder = np.asarray(reorder_vec, dtype=int)
     if validate:
-        maxsize = in_mat.shape[0]
+        if in_mat.ndim == 1:
+            maxsize = condensed_num_objects(in_mat.size)
+        else:
+            maxsize = in_mat.shape[0]
         bad_cnt = np.where((np_reorder < 0) or (np_reorder >= maxsize))[0].size
         if bad_cnt > 0:
             raise ValueError("Invalid reorder_vec")
@@ -213,7 +223,80 @@ def distmat_reorder_condensed(in_mat, reorder_vec, validate=False):
     if not in_mat.flags.c_contiguous:
         in_mat = np.asarray(in_mat, order="C")
 
-    csize = ((np_reorder.size - 1) * np_reorder.size) // 2
-    out_mat_condensed = np.empty([csize], in_mat.dtype)
-    distmat_reorder_condensed_cy(in_mat, np_reorder, out_mat_condensed)
+    if out_mat is None:
+        csize = ((np_reorder.size - 1) * np_reorder.size) // 2
+        out_mat_condensed = np.empty([csize], in_mat.dtype)
+    else:
+        out_mat_condensed = out_mat
+    if in_mat.ndim == 1:
+        condensed_reorder_cy(in_mat, np_reorder, out_mat_condensed)
+    else:
+        distmat_reorder_condensed_cy(in_mat, np_reorder, out_mat_condensed)
     return out_mat_condensed
+
+
+def condensed_submatrix(in_condensed, row_vec, col_vec):
+    """Extract a block of a condensed distance matrix.
+
+    For example:
+     [ 1, 2, 3, 4, 5, 6 ]
+     (i.e., [ [0, 1, 2, 3] ,
+              [1, 0, 4, 5] ,
+              [2, 4, 0, 6] ,
+              [3, 5, 6, 0] ])
+     with rows [1, 3] and columns [0, 1, 2]
+     will result in
+     [ [1, 0, 4] ,
+       [3, 5, 6] ]
+
+    Parameters
+    ----------
+    in_condensed : 1D array_like
+        Condensed distance matrix
+    row_vec : 1D_array_like
+        Indexes of the rows to extract
+    col_vec : 1D_array_like
+        Indexes of the columns to extract
+
+    Returns
+    -------
+    out_mat : 2D array_like
+        Block of the redundant distance matrix
+
+    """
+    np_rows = np.asarray(row_vec, dtype=int)
+    np_cols = np.asarray(col_vec, dtype=int)
+    if not in_condensed.flags.c_contiguous:
+        in_condensed = np.asarray(in_condensed, order="C")
+
+    out_mat = np.empty([np_rows.size, np_cols.size], in_condensed.dtype)
+    condensed_submatrix_cy(in_condensed, np_rows, np_cols, out_mat)
+    return out_mat
+
+
+def condensed_num_objects(size):
+    """Return the number of objects of a condensed distance matrix.
+
+    Parameters
+    ----------
+    size : int
+        Number of elements of the condensed distance matrix.
+
+    Returns
+    -------
+    int
+        Number of objects, i.e., the number of rows of the redundant form.
+
+    Raises
+    ------
+    ValueError
+        If `size` is not of the form ``n * (n - 1) / 2``.
+
+    """
+    num_objects = int(round((1 + np.sqrt(1 + 8 * size)) / 2))
+    if num_objects * (num_objects - 1) // 2 != size:
+        raise ValueError(
+            "The size of a condensed distance matrix must be a triangular "
+            "number (got %d)." % size
+        )
+    return num_objects
@@ -13,9 +13,11 @@ from unittest import TestCase, main
 import numpy as np
 import pandas as pd
 from pandas.testing import assert_series_equal
+from scipy.stats import rankdata
 
 from skbio import DistanceMatrix
 from skbio.stats.distance import anosim
+from skbio.stats.distance._anosim import _compute_r_stat_batch
 
 
 class TestANOSIM(TestCase):
@@ -114,6 +116,37 @@ class TestANOSIM(TestCase):
         obs = anosim(self.dm_unequal, self.grouping_unequal_relabeled)
         self.assert_series_equal(obs, exp)
 
+    def test_compute_r_stat_batch(self):
+        ranked_dists = rankdata(self.dm_unequal.condensed_form())
+        divisor = 6 * 5 / 4
+        grouping = np.array([0, 1, 2, 1, 0, 0])
+        groupings = np.array([np.random.permutation(grouping)
+                              for _ in range(5)])
+
+        obs = _compute_r_stat_batch(ranked_dists, divisor,
+                                    np.bincount(grouping), 2, groupings)
+
+        tri_idxs = np.triu_indices(6, k=1)
+        for g, o in zip(groupings, obs):
+            within = np.equal.outer(g, g)[tri_idxs]
+            exp = (ranked_dists[~within].mean() -
+                   ranked_dists[within].mean()) / divisor
+            self.assertAlmostEqual(o, exp)
+
+    def test_seed(self):
+        obs1 = anosim(self.dm_unequal, self.grouping_unequal, seed=42)
+        obs2 = anosim(self.dm_unequal, self.grouping_unequal, seed=42,
+                      n_jobs=2, batch_size=7)
+        self.assert_series_equal(obs1, obs2)
+        self.assertAlmostEqual(obs1['test statistic'], -0.363636, places=6)
+
+        np.random.seed(0)
+        exp = anosim(self.dm_unequal, self.grouping_unequal)
+        np.random.seed(0)
+        obs = anosim(self.dm_unequal, self.grouping_unequal, n_jobs=2,
+                     batch_size=10)
+        self.assert_series_equal(obs, exp)
+
 
 if __name__ == '__main__':
     main()
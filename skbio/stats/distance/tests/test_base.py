@@ -8,7 +8,7 @@
 
 import io
 import unittest
-from unittest import TestCase, main
+from unittest import TestCase, main, mock
 
 import numpy as np
 import numpy.testing as npt
@@ -29,8 +29,11 @@ from skbio.stats.distance import (
     DissimilarityMatrixError, DistanceMatrixError, MissingIDError,
     DissimilarityMatrix, randdm)
 from skbio.stats.distance._base import (_preprocess_input,
-                                        _run_monte_carlo_stats)
-from skbio.stats.distance._utils import is_symmetric_and_hollow
+                                        _run_monte_carlo_stats,
+                                        _sequential_p_value)
+from skbio.stats.distance._utils import (is_symmetric_and_hollow,
+                                         distmat_reorder_condensed,
+                                         condensed_submatrix)
 from skbio.util import assert_data_frame_almost_equal
 from skbio.util._testing import assert_series_almost_equal
 
@@ -115,6 +118,17 @@ class DissimilarityMatrixTestBase(DissimilarityMatrixTestData):
         with self.assertRaisesRegex(MissingIDError, "not found."):
             self.dm_3x3.within(['x', 'a'])
 
+    def test_within_chunksize(self):
+        exp = self.dm_5x5.within(['e', 'a', 'c', 'd'])
+        for chunksize in 1, 4, 7, 100:
+            obs = list(self.dm_5x5.within(['e', 'a', 'c', 'd'],
+                                          chunksize=chunksize))
+            self.assertEqual(len(obs), 4 if chunksize < 8 else 1)
+            pdt.assert_frame_equal(pd.concat(obs), exp)
+
+        obs = list(self.dm_5x5.within([], chunksize=2))
+        self.assertEqual(obs, [])
+
     def test_between(self):
         exp = pd.DataFrame([['b', 'a', 5.],
                             ['b', 'c', 6.],
@@ -180,6 +194,17 @@ class DissimilarityMatrixTestBase(DissimilarityMatrixTestData):
         with self.assertRaisesRegex(MissingIDError, "not found."):
             self.dm_3x3.between(['a', 'y'], ['a', 'x', 'c'])
 
+    def test_between_chunksize(self):
+        exp = self.dm_5x5.between(['d', 'b', 'a'], ['c', 'e'])
+        obs = list(self.dm_5x5.between(['d', 'b', 'a'], ['c', 'e'],
+                                       chunksize=4))
+        self.assertEqual([len(df) for df in obs], [4, 2])
+        self.assertEqual(list(obs[1].index), [4, 5])
+        pdt.assert_frame_equal(pd.concat(obs), exp)
+
+        with self.assertRaises(MissingIDError):
+            self.dm_5x5.between(['x'], ['c'], chunksize=4)
+
     def test_stable_order(self):
         exp = np.array([1, 3, 4], dtype=int)
         obs = self.dm_5x5._stable_order(['d', 'e', 'b'])
@@ -548,6 +573,23 @@ class DissimilarityMatrixTestBase(DissimilarityMatrixTestData):
         with self.assertRaises(DissimilarityMatrixError):
             self.dm_3x3.filter([])
 
+    def test_filter_out(self):
+        exp = self.dm_3x3.filter(['c', 'a'])
+        out = np.empty((2, 2))
+        obs = self.dm_3x3.filter(['c', 'a'], out=out)
+        self.assertEqual(obs, exp)
+        self.assertIs(obs.data, out)
+
+        # an unfiltered matrix is also copied
+        out = np.empty((3, 3))
+        obs = self.dm_3x3.filter(self.dm_3x3.ids, out=out)
+        self.assertEqual(obs, self.dm_3x3)
+        self.assertIs(obs.data, out)
+
+        for out in np.empty((3, 3)), np.empty((2, 2), dtype=np.float32):
+            with self.assertRaisesRegex(ValueError, 'shape'):
+                self.dm_3x3.filter(['c', 'a'], out=out)
+
     @unittest.skipUnless(has_matplotlib, "Matplotlib not available.")
     def test_plot_default(self):
         fig = self.dm_1x1.plot()
@@ -1178,16 +1220,81 @@ class CategoricalStatsHelperFunctionTests(TestCase):
 
     def test_run_monte_carlo_stats_with_permutations(self):
         obs = _run_monte_carlo_stats(lambda e: 42, self.grouping, 50)
-        npt.assert_equal(obs, (42, 1.0))
+        npt.assert_equal(obs, (42, 1.0, 50))
 
     def test_run_monte_carlo_stats_no_permutations(self):
         obs = _run_monte_carlo_stats(lambda e: 42, self.grouping, 0)
-        npt.assert_equal(obs, (42, np.nan))
+        npt.assert_equal(obs, (42, np.nan, 0))
 
     def test_run_monte_carlo_stats_invalid_permutations(self):
         with self.assertRaises(ValueError):
             _run_monte_carlo_stats(lambda e: 42, self.grouping, -1)
 
+    def test_run_monte_carlo_stats_max_exceedances(self):
+        # every permuted statistic is an exceedance
+        obs = _run_monte_carlo_stats(lambda e: 42, self.grouping, 50,
+                                     max_exceedances=5, batch_size=3)
+        npt.assert_equal(obs, (42, 1.0, 5))
+
+        # no exceedances: all permutations are used
+        calls = iter(range(100, 0, -1))
+        obs = _run_monte_carlo_stats(lambda e: next(calls), self.grouping, 50,
+                                     max_exceedances=5)
+        npt.assert_equal(obs, (100, 1 / 51, 50))
+
+        def stat(grouping):
+            return 1.0 if list(grouping) == [1, 2, 1] else 0.0
+
+        # results do not depend on the batch size
+        exp = _run_monte_carlo_stats(stat, self.grouping, 500, seed=0,
+                                     max_exceedances=3, batch_size=1)
+        obs = _run_monte_carlo_stats(stat, self.grouping, 500, seed=0,
+                                     max_exceedances=3, batch_size=64)
+        npt.assert_equal(obs, exp)
+        self.assertLess(exp[2], 500)
+        self.assertAlmostEqual(exp[1], 3 / exp[2])
+
+        with self.assertRaisesRegex(ValueError, 'max_exceedances'):
+            _run_monte_carlo_stats(stat, self.grouping, 5, max_exceedances=0)
+
+    def test_sequential_p_value(self):
+        exceedances = np.array([False, True, False, True, True, False])
+        npt.assert_equal(_sequential_p_value(exceedances), (4 / 7, 6))
+        npt.assert_equal(_sequential_p_value(exceedances, 2), (2 / 4, 4))
+        npt.assert_equal(_sequential_p_value(exceedances, 3), (3 / 5, 5))
+        npt.assert_equal(_sequential_p_value(exceedances, 4), (4 / 7, 6))
+
+    def test_run_monte_carlo_stats_invalid_batch_size_and_n_jobs(self):
+        with self.assertRaisesRegex(ValueError, 'batch_size'):
+            _run_monte_carlo_stats(lambda e: 42, self.grouping, 5,
+                                   batch_size=0)
+        with self.assertRaisesRegex(ValueError, 'n_jobs'):
+            _run_monte_carlo_stats(lambda e: 42, self.grouping, 5, n_jobs=0)
+
+    def test_run_monte_carlo_stats_seed(self):
+        def stat(grouping):
+            return float(grouping[0] * 4 + grouping[1] * 2 + grouping[2])
+
+        def batch_stat(groupings):
+            return np.array([stat(g) for g in groupings])
+
+        exp = _run_monte_carlo_stats(stat, self.grouping, 99, seed=0)
+        for n_jobs, batch_size in (1, 1), (2, 10), (-1, 1000):
+            obs = _run_monte_carlo_stats(stat, self.grouping, 99, seed=0,
+                                         n_jobs=n_jobs, batch_size=batch_size)
+            npt.assert_equal(obs, exp)
+            obs = _run_monte_carlo_stats(
+                None, self.grouping, 99, seed=np.random.default_rng(0),
+                batch_size=batch_size, batch_stat_function=batch_stat)
+            npt.assert_equal(obs, exp)
+
+        np.random.seed(0)
+        exp = _run_monte_carlo_stats(stat, self.grouping, 99)
+        np.random.seed(0)
+        obs = _run_monte_carlo_stats(None, self.grouping, 99, batch_size=8,
+                                     batch_stat_function=batch_stat)
+        npt.assert_equal(obs, exp)
+
 
 class DissimilarityMatrixTests(DissimilarityMatrixTestBase, TestCase):
     matobj = DissimilarityMatrix
@@ -1203,5 +1310,130 @@ class DistanceMatrixTests(DistanceMatrixTestBase, TestCase):
         super(DistanceMatrixTests, self).setUp()
 
 
+class CondensedDistanceMatrixTests(TestCase):
+    def setUp(self):
+        self.data = np.array([[0.0, 1.0, 2.0, 3.0],
+                              [1.0, 0.0, 4.0, 5.0],
+                              [2.0, 4.0, 0.0, 6.0],
+                              [3.0, 5.0, 6.0, 0.0]])
+        self.ids = ['a', 'b', 'c', 'd']
+        self.square = DistanceMatrix(self.data, self.ids)
+        self.condensed = DistanceMatrix(self.data, self.ids, condensed=True)
+
+    def test_init(self):
+        flat = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        for data in flat, self.data, self.square:
+            obs = DistanceMatrix(data, self.ids, condensed=True)
+            self.assertTrue(obs.condensed)
+            self.assertEqual(obs.shape, (4, 4))
+            self.assertEqual(obs.size, 16)
+            self.assertEqual(obs, self.square)
+        self.assertFalse(self.square.condensed)
+
+        obs = DistanceMatrix(flat.astype(np.float32), condensed=True)
+        self.assertEqual(obs.dtype, np.float32)
+        self.assertEqual(obs.ids, ('0', '1', '2', '3'))
+
+    def test_init_invalid_input(self):
+        with self.assertRaises(DistanceMatrixError):
+            DistanceMatrix([1.0, 2.0], condensed=True)
+        with self.assertRaises(DistanceMatrixError):
+            DistanceMatrix([[0.0, 2.0], [1.0, 0.0]], condensed=True)
+        with self.assertRaises(DissimilarityMatrixError):
+            DistanceMatrix([1.0, 2.0, 3.0], ['a', 'b'], condensed=True)
+
+    def test_data(self):
+        npt.assert_array_equal(self.condensed.data, self.data)
+        obs = self.condensed.condensed_form()
+        self.assertIs(obs, self.condensed._data)
+        npt.assert_array_equal(obs, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+
+    def test_getitem(self):
+        npt.assert_array_equal(self.condensed['c'], [2.0, 4.0, 0.0, 6.0])
+        self.assertEqual(self.condensed['b', 'd'], 5.0)
+        self.assertEqual(self.condensed['d', 'b'], 5.0)
+        self.assertEqual(self.condensed['a', 'a'], 0.0)
+        with self.assertRaises(MissingIDError):
+            self.condensed['x']
+
+    def test_copy_and_transpose(self):
+        for obs in self.condensed.copy(), self.condensed.T:
+            self.assertTrue(obs.condensed)
+            self.assertEqual(obs, self.square)
+        self.assertIsNot(self.condensed.copy()._data, self.condensed._data)
+
+    def test_filter(self):
+        obs = self.condensed.filter(['d', 'a', 'c'])
+        exp = self.square.filter(['d', 'a', 'c'])
+        self.assertTrue(obs.condensed)
+        self.assertEqual(obs, exp)
+
+        out = np.empty(3)
+        obs = self.condensed.filter(['d', 'a', 'c'], out=out)
+        self.assertIs(obs.condensed_form(), out)
+        self.assertEqual(obs, exp)
+        with self.assertRaisesRegex(ValueError, 'shape'):
+            self.condensed.filter(['d', 'a', 'c'], out=np.empty((3, 3)))
+
+    def test_permute(self):
+        np.random.seed(0)
+        exp = self.square.permute(condensed=True)
+        np.random.seed(0)
+        obs = self.condensed.permute(condensed=True)
+        npt.assert_array_equal(obs, exp)
+
+        np.random.seed(0)
+        exp = self.square.permute()
+        np.random.seed(0)
+        obs = self.condensed.permute()
+        self.assertTrue(obs.condensed)
+        self.assertEqual(obs, exp)
+
+    def test_within_between(self):
+        pdt.assert_frame_equal(self.condensed.within(['a', 'c']),
+                               self.square.within(['a', 'c']))
+        pdt.assert_frame_equal(self.condensed.between(['a', 'b'], ['c']),
+                               self.square.between(['a', 'b'], ['c']))
+        pdt.assert_series_equal(self.condensed.to_series(),
+                                self.square.to_series())
+
+    def test_ids_setter(self):
+        self.condensed.ids = ['w', 'x', 'y', 'z']
+        self.assertEqual(self.condensed['x', 'z'], 5.0)
+        with self.assertRaises(DissimilarityMatrixError):
+            self.condensed.ids = ['w', 'x']
+
+    def test_lazy(self):
+        obs = DistanceMatrix._from_lazy(self.data.copy(), self.ids)
+        self.assertTrue(obs._lazy)
+        self.assertEqual(obs, self.square)
+        self.assertEqual(obs['d', 'b'], 5.0)
+
+        # filtering by the same IDs does not load the matrix
+        unfiltered = obs.filter(self.ids)
+        self.assertTrue(unfiltered._lazy)
+        self.assertIs(unfiltered._data, obs._data)
+        self.assertEqual(unfiltered, self.square)
+
+        with mock.patch('skbio.stats.distance._base._LAZY_BLOCK_SIZE', 1):
+            out = np.empty((3, 3))
+            filtered = obs.filter(['d', 'a', 'c'], out=out)
+            self.assertIs(filtered.data, out)
+            self.assertEqual(filtered, self.square.filter(['d', 'a', 'c']))
+            pdt.assert_frame_equal(
+                obs.between(['c', 'd'], ['a', 'b', 'c'], allow_overlap=True),
+                self.square.between(['c', 'd'], ['a', 'b', 'c'],
+                                    allow_overlap=True))
+
+    def test_condensed_helpers(self):
+        flat = self.square.condensed_form()
+        order = np.array([3, 0, 2])
+        npt.assert_array_equal(distmat_reorder_condensed(flat, order),
+                               distmat_reorder_condensed(self.data, order))
+        npt.assert_array_equal(
+            condensed_submatrix(flat, np.array([1, 3]), np.array([0, 1, 2])),
+            self.data[[1, 3]][:, [0, 1, 2]])
+
+
 if __name__ == '__main__':
     main()
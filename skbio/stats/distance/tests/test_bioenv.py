@@ -6,14 +6,16 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+from itertools import combinations
 from unittest import TestCase, main
 
 import numpy as np
+import numpy.testing as npt
 import pandas as pd
 
 from skbio import DistanceMatrix
 from skbio.stats.distance import bioenv
-from skbio.stats.distance._bioenv import _scale
+from skbio.stats.distance._bioenv import _scale, _bioenv_tasks
 from skbio.util import get_data_path, assert_data_frame_almost_equal
 
 
@@ -148,6 +150,62 @@ class BIOENVTests(TestCase):
         obs = bioenv(self.dm_vegan, self.df_vegan)
         assert_data_frame_almost_equal(obs, self.exp_results_vegan, rtol=1e-3)
 
+    def test_bioenv_n_jobs(self):
+        for n_jobs in 1, 2, 8:
+            obs = bioenv(self.dm, self.df, n_jobs=n_jobs)
+            assert_data_frame_almost_equal(obs, self.exp_results)
+
+            obs = bioenv(self.dm_vegan, self.df_vegan, n_jobs=n_jobs)
+            assert_data_frame_almost_equal(obs, self.exp_results_vegan,
+                                           rtol=1e-3)
+
+    def test_bioenv_tasks(self):
+        def subsets(prefix, descend, num_vars):
+            yield prefix
+            if descend:
+                for i in range(prefix[-1] + 1, num_vars):
+                    yield from subsets(prefix + (i,), True, num_vars)
+
+        for num_vars in range(1, 7):
+            for max_subsets in 1, 3, 2 ** num_vars:
+                branches = [list(subsets(*task, num_vars))
+                            for task in _bioenv_tasks(num_vars, max_subsets)]
+                self.assertTrue(all(len(branch) <= max_subsets
+                                    for branch in branches))
+                # all subsets, in the order of a sequential enumeration
+                obs = [s for branch in branches for s in branch]
+                for size in range(1, num_vars + 1):
+                    self.assertEqual(
+                        [s for s in obs if len(s) == size],
+                        list(combinations(range(num_vars), size)))
+                self.assertEqual(len(obs), 2 ** num_vars - 1)
+
+        # the first variable's branch is split
+        self.assertEqual(list(_bioenv_tasks(3, 2)),
+                         [((0,), False), ((0, 1), True), ((0, 2), True),
+                          ((1,), True), ((2,), True)])
+
+    def test_bioenv_forward_search(self):
+        exp = bioenv(self.dm, self.df)
+        for n_jobs in 1, 2:
+            obs = bioenv(self.dm, self.df, search='forward', n_jobs=n_jobs)
+            self.assertEqual(obs.index[0], exp.index[0])
+            self.assertEqual(obs.index[-1], exp.index[-1])
+            obs_rhos = obs['correlation'].values
+            exp_rhos = exp['correlation'].values
+            npt.assert_almost_equal(obs_rhos[[0, -1]], exp_rhos[[0, -1]])
+            npt.assert_array_equal(obs['size'], exp['size'])
+            self.assertTrue((obs_rhos <= exp_rhos + 1e-12).all())
+
+            # each subset extends the previous one
+            subsets = [set(vars_.split(', ')) for vars_ in obs.index]
+            for smaller, larger in zip(subsets[:-1], subsets[1:]):
+                self.assertLess(smaller, larger)
+
+    def test_bioenv_invalid_search(self):
+        with self.assertRaisesRegex(ValueError, 'search'):
+            bioenv(self.dm, self.df, search='backward')
+
     def test_bioenv_no_distance_matrix(self):
         with self.assertRaises(TypeError):
             bioenv('breh', self.df)
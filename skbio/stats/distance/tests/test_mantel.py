@@ -6,6 +6,8 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import os
+import tempfile
 from unittest import TestCase, main
 
 import numpy as np
@@ -19,10 +21,13 @@ from scipy.stats import pearsonr, spearmanr
 from skbio import DistanceMatrix
 from skbio.stats.distance import (DissimilarityMatrixError,
                                   DistanceMatrixError, mantel, pwmantel)
-from skbio.stats.distance._mantel import _order_dms
+from skbio.stats.distance._mantel import (_order_dms, _count_reorders,
+                                          _ReorderCache)
+from skbio.stats.distance._mantel import _mantel
 from skbio.stats.distance._mantel import _mantel_stats_pearson
 from skbio.stats.distance._mantel import _mantel_stats_spearman
-from skbio.stats.distance._cutils import mantel_perm_pearsonr_cy
+from skbio.stats.distance._cutils import (mantel_perm_pearsonr_cy,
+                                          mantel_perm_pearsonr_condensed_cy)
 from skbio.stats.distance._utils import distmat_reorder_condensed
 from skbio.util import get_data_path, assert_data_frame_almost_equal
 
@@ -171,6 +176,12 @@ class InternalMantelTests(MantelTestData):
                                              xmean, normxm, ym_normalized)
             self.assertAlmostEqual(permuted_stats[i], exp_res)
 
+        # same statistics from the condensed matrix
+        obs_stats = np.empty(len(perm_order), dtype=x_data.dtype)
+        mantel_perm_pearsonr_condensed_cy(x_flat, perm_order, xmean, normxm,
+                                          ym_normalized, obs_stats)
+        npt.assert_allclose(obs_stats, permuted_stats)
+
     def test_pearsonr_full(self):
         """
         Compare the optimized version of pearson mantel
@@ -417,6 +428,84 @@ class MantelTests(MantelTestData):
                      alternative='greater', method='spearman')
         self.assert_mantel_almost_equal(obs, [0.283791, 0.003, 24])
 
+    def test_max_exceedances(self):
+        # every permutation ties with the original statistic
+        for method in self.methods:
+            obs = mantel(self.minx, self.minx, method=method,
+                         alternative='less', max_exceedances=10)
+            npt.assert_almost_equal(obs, (1, 1, 3))
+            obs = _mantel(self.minx, self.minx, method, 999, 'less', True,
+                          None, 10, None, None)
+            npt.assert_almost_equal(obs, (1, 1, 3, 10))
+
+        # the significant vegan example runs all permutations
+        for method in 'pearson', 'spearman':
+            np.random.seed(0)
+            exp = mantel(self.veg_dm_vegan, self.env_dm_vegan,
+                         alternative='greater', method=method)
+            np.random.seed(0)
+            obs = _mantel(self.veg_dm_vegan, self.env_dm_vegan, method, 999,
+                          'greater', True, None, 10, None, None)
+            self.assertEqual(obs[:3], exp)
+            self.assertEqual(obs[3], 999)
+
+        # a non-significant test stops early
+        np.random.seed(0)
+        obs = _mantel(self.veg_dm_vegan, self.env_dm_vegan, 'pearson', 999,
+                      'less', True, None, 10, None, None)
+        self.assertEqual(obs[3], 10)
+        self.assertEqual(obs[1], 1.0)
+
+        with self.assertRaisesRegex(ValueError, 'max_exceedances'):
+            mantel(self.minx, self.miny, max_exceedances=0)
+
+    def test_seed(self):
+        for method in self.methods:
+            exp = mantel(self.veg_dm_vegan, self.env_dm_vegan, method=method,
+                         permutations=99, seed=42)
+            obs = mantel(self.veg_dm_vegan, self.env_dm_vegan, method=method,
+                         permutations=99, seed=42, n_jobs=1)
+            self.assertEqual(obs, exp)
+
+        obs = mantel(self.veg_dm_vegan, self.env_dm_vegan, method=method,
+                     permutations=99, seed=np.random.default_rng(42))
+        self.assertEqual(obs, exp)
+
+        with self.assertRaisesRegex(ValueError, 'n_jobs'):
+            mantel(self.minx, self.miny, n_jobs=0)
+
+    def test_condensed(self):
+        x = DistanceMatrix(self.veg_dm_vegan, condensed=True)
+        y = DistanceMatrix(self.env_dm_vegan, condensed=True)
+        for method in self.methods:
+            exp = mantel(self.veg_dm_vegan, self.env_dm_vegan, method=method,
+                         permutations=99, seed=42)
+            obs = mantel(x, y, method=method, permutations=99, seed=42)
+            npt.assert_allclose(obs, exp)
+
+    def test_lazy(self):
+        # memory-mapped binary_dm data is read-only
+        with tempfile.TemporaryDirectory() as tmp:
+            x_fp = os.path.join(tmp, 'x')
+            y_fp = os.path.join(tmp, 'y')
+            DistanceMatrix(self.veg_dm_vegan).write(x_fp, format='binary_dm')
+            DistanceMatrix(self.env_dm_vegan).write(y_fp, format='binary_dm')
+            x = DistanceMatrix.read(x_fp, format='binary_dm', lazy=True)
+            y = DistanceMatrix.read(y_fp, format='binary_dm', lazy=True)
+            self.assertFalse(x.data.flags.writeable)
+            for method in self.methods:
+                exp = mantel(self.veg_dm_vegan, self.env_dm_vegan,
+                             method=method, permutations=99, seed=42)
+                obs = mantel(x, y, method=method, permutations=99, seed=42)
+                npt.assert_allclose(obs, exp)
+
+            np.random.seed(0)
+            obs = x.permute(condensed=True)
+            np.random.seed(0)
+            exp = DistanceMatrix(self.veg_dm_vegan).permute(condensed=True)
+            npt.assert_equal(obs, exp)
+            del x, y
+
     def test_no_variation_pearson(self):
         for alt in self.alternatives:
             # test one or both inputs having no variation in their
@@ -565,6 +654,41 @@ class PairwiseMantelTests(MantelTestData):
                        alternative='less')
         assert_data_frame_almost_equal(obs, self.exp_results_duplicate_dms)
 
+    def test_max_exceedances(self):
+        obs = pwmantel((self.minx_dm, self.minx_dm, self.minx_dm),
+                       alternative='less', max_exceedances=5)
+        exp = self.exp_results_duplicate_dms.copy()
+        exp['permutations'] = 5
+        assert_data_frame_almost_equal(obs, exp)
+
+    def test_no_variation(self):
+        # a test with no p-value still reports the requested permutations
+        dm = DistanceMatrix([[0, 1, 1], [1, 0, 1], [1, 1, 0]])
+        for max_exceedances in None, 5:
+            obs = pwmantel((dm, self.minx_dm), method='spearman',
+                           max_exceedances=max_exceedances)
+            self.assertTrue(np.isnan(obs['p-value'].iloc[0]))
+            self.assertEqual(obs['permutations'].iloc[0], 999)
+
+    def test_seed_and_n_jobs(self):
+        dms = (self.minx_dm_extra.filter(['1', '0', 'foo', '2']),
+               self.miny_dm.filter(['0', '2', '1']),
+               self.minz_dm_extra.filter(['bar', '1', '2', '0']),
+               self.minx_dm)
+        for method in 'pearson', 'spearman', 'kendalltau':
+            exp = pwmantel(dms, method=method, strict=False, seed=42)
+            for n_jobs in 1, 3:
+                obs = pwmantel(dms, method=method, strict=False, seed=42,
+                               n_jobs=n_jobs)
+                assert_data_frame_almost_equal(obs, exp)
+
+        # the global random state is honored when running concurrently
+        np.random.seed(0)
+        exp = pwmantel(dms, strict=False, n_jobs=2)
+        np.random.seed(0)
+        obs = pwmantel(dms, strict=False, n_jobs=2)
+        assert_data_frame_almost_equal(obs, exp)
+
     def test_na_p_value(self):
         obs = pwmantel((self.miny_dm, self.minx_dm), method='spearman',
                        permutations=0)
@@ -715,6 +839,49 @@ class OrderDistanceMatricesTests(MantelTestData):
         self.assertEqual(x, x_copy)
         self.assertEqual(z, z_copy)
 
+    def test_cache(self):
+        x = self.minx_dm_extra.filter(['1', '0', 'foo', '2'])
+        y = self.miny_dm.filter(['0', '2', '1'])
+        z = self.minz_dm_extra.filter(['bar', '0', '2', '1'])
+
+        # only the order of x shared by (x, y) and (x, z) is needed twice
+        counts = _count_reorders([x, y, z], None)
+        self.assertEqual(counts[id(x), ('1', '0', '2')], 2)
+        self.assertEqual(sorted(counts.values()), [1, 1, 1, 1, 2])
+
+        cache = _ReorderCache(counts)
+        x1, y1 = _order_dms(x, y, strict=False, cache=cache)
+        self.assertEqual(x1, x.filter(['1', '0', '2']))
+        self.assertEqual(y1, y.filter(['1', '0', '2']))
+        self.assertTrue(x1.condensed)
+        self.assertEqual(len(cache._stored), 1)
+
+        # the stored distances are released after their last use
+        x2, z2 = _order_dms(x, z, strict=False, cache=cache)
+        self.assertEqual(x2, x1)
+        self.assertEqual(z2, z.filter(['1', '0', '2']))
+        self.assertEqual(cache._stored, {})
+        y3, z3 = _order_dms(y, z, strict=False, cache=cache)
+        self.assertEqual(z3, z.filter(['0', '2', '1']))
+        self.assertEqual(cache._stored, {})
+        self.assertEqual(cache._remaining, {})
+
+        lookup = {'0': 'a', '1': 'b', '2': 'c', 'foo': 'foo', 'bar': 'bar'}
+        counts = _count_reorders([x, y, z], lookup)
+        self.assertEqual(counts[id(x), ('b', 'a', 'c')], 2)
+        cache = _ReorderCache(counts)
+        x1, y1 = _order_dms(x, y, strict=False, lookup=lookup, cache=cache)
+        x2, z2 = _order_dms(x, z, strict=False, lookup=lookup, cache=cache)
+        self.assertEqual(x1.ids, ('b', 'a', 'c'))
+        self.assertEqual(x2, x1)
+        self.assertEqual(x.ids, ('1', '0', 'foo', '2'))
+
+        # matrices are not stored if no other pair needs them
+        cache = _ReorderCache({})
+        x1, y1 = _order_dms(x, y, strict=False, cache=cache)
+        self.assertEqual(x1, x.filter(['1', '0', '2']))
+        self.assertEqual(cache._stored, {})
+
     def test_lookup_with_array_like(self):
         lookup = {'0': 'a', '1': 'b', '2': 'c'}
         with self.assertRaises(ValueError):
@@ -7,6 +7,8 @@
 # ----------------------------------------------------------------------------
 
 import io
+import os
+import tempfile
 from functools import partial
 from unittest import TestCase, main
 
@@ -18,6 +20,8 @@ from skbio import DistanceMatrix
 from skbio.stats.distance import permanova
 from skbio.util import get_data_path
 from skbio.stats.distance._base import _preprocess_input_sng
+from skbio.stats.distance._permanova import (_compute_f_stat,
+                                             _compute_f_stat_batch)
 
 
 class TestPERMANOVA(TestCase):
@@ -116,6 +120,78 @@ class TestPERMANOVA(TestCase):
         obs = permanova(self.dm_unequal, self.grouping_unequal_relabeled)
         self.assert_series_equal(obs, exp)
 
+    def test_call_seed(self):
+        obs1 = permanova(self.dm_unequal, self.grouping_unequal, seed=42)
+        obs2 = permanova(self.dm_unequal, self.grouping_unequal, seed=42,
+                         n_jobs=1, batch_size=7)
+        self.assert_series_equal(obs1, obs2)
+        self.assertAlmostEqual(obs1['test statistic'], 0.578848, places=6)
+
+    def test_call_batches_match_global_random_state(self):
+        np.random.seed(0)
+        exp = permanova(self.dm_unequal, self.grouping_unequal)
+        for batch_size in 1, 10, 999, 5000:
+            np.random.seed(0)
+            obs = permanova(self.dm_unequal, self.grouping_unequal,
+                            batch_size=batch_size, n_jobs=2)
+            self.assert_series_equal(obs, exp)
+
+    def test_call_max_exceedances(self):
+        obs = permanova(self.dm_unequal, self.grouping_unequal, seed=42,
+                        max_exceedances=10)
+        self.assertAlmostEqual(obs['test statistic'], 0.578848, places=6)
+        self.assertLess(obs['number of permutations'], 100)
+        self.assertEqual(obs['p-value'], 10 / obs['number of permutations'])
+
+        # fewer exceedances than requested: as without early stopping
+        np.random.seed(0)
+        exp = permanova(self.dm_unequal, self.grouping_unequal)
+        np.random.seed(0)
+        obs = permanova(self.dm_unequal, self.grouping_unequal,
+                        max_exceedances=1000)
+        self.assert_series_equal(obs, exp)
+
+    def test_compute_f_stat_batch(self):
+        grouping = np.array([0, 1, 2, 1, 0, 0])
+        group_sizes = np.bincount(grouping)
+        s_T = (self.dm_unequal[:] ** 2).sum() / 12.0
+        groupings = np.array([np.random.permutation(grouping)
+                              for _ in range(5)])
+
+        data = self.dm_unequal.data
+        obs = _compute_f_stat_batch(6, 3, data, group_sizes, s_T, 2,
+                                    groupings)
+        exp = [_compute_f_stat(6, 3, data, group_sizes, s_T, g)
+               for g in groupings]
+        np.testing.assert_allclose(obs, exp)
+
+        # condensed distances give the same statistics
+        condensed = self.dm_unequal.condensed_form()
+        obs = _compute_f_stat_batch(6, 3, condensed, group_sizes, s_T, 2,
+                                    groupings)
+        np.testing.assert_allclose(obs, exp)
+        obs = [_compute_f_stat(6, 3, condensed, group_sizes, s_T, g)
+               for g in groupings]
+        np.testing.assert_allclose(obs, exp)
+
+    def test_call_condensed(self):
+        dm = DistanceMatrix(self.dm_unequal, condensed=True)
+        obs = permanova(dm, self.grouping_unequal, seed=42)
+        exp = permanova(self.dm_unequal, self.grouping_unequal, seed=42)
+        self.assert_series_equal(obs, exp)
+
+    def test_call_lazy(self):
+        # memory-mapped binary_dm data is read-only
+        with tempfile.TemporaryDirectory() as tmp:
+            fp = os.path.join(tmp, 'dm')
+            self.dm_unequal.write(fp, format='binary_dm')
+            dm = DistanceMatrix.read(fp, format='binary_dm', lazy=True)
+            self.assertFalse(dm.data.flags.writeable)
+            obs = permanova(dm, self.grouping_unequal, seed=42)
+            exp = permanova(self.dm_unequal, self.grouping_unequal, seed=42)
+            self.assert_series_equal(obs, exp)
+            del dm
+
     def test_call_via_series(self):
         # test https://github.com/scikit-bio/scikit-bio/issues/1877
         # permanova gives different results if grouping is either
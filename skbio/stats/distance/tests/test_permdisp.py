@@ -19,7 +19,9 @@ import hdmedians as hd
 from skbio import DistanceMatrix
 from skbio.stats.ordination import pcoa
 from skbio.stats.distance import permdisp
-from skbio.stats.distance._permdisp import _compute_groups
+from skbio.stats.distance._permdisp import (_compute_groups,
+                                            _compute_groups_batch,
+                                            _geomedians)
 from skbio.util import get_data_path
 
 
@@ -251,6 +253,45 @@ class testPERMDISP(TestCase):
         obs = np.array(hd.geomedian(self.eq_mat.data))
         npt.assert_almost_equal(obs, exp, decimal=6)
 
+    def test_geomedians(self):
+        rng = np.random.default_rng(0)
+        samples = rng.normal(size=(40, 3))
+        # duplicated samples, and estimates coinciding with a sample
+        samples[5] = samples[6] = samples[7]
+        samples[30] = samples[31]
+        samples[20] = samples[21] + 1e-10
+        labels = rng.integers(0, 8, size=40)
+        labels[39] = 8
+        centroids = np.array([samples[labels == i].mean(axis=0)
+                              for i in range(9)])
+
+        obs = _geomedians(samples, labels, np.arange(40), centroids)
+        exp = [hd.geomedian(samples[labels == i].T) for i in range(9)]
+        npt.assert_almost_equal(obs, exp)
+
+    def test_compute_groups_batch(self):
+        samples = pcoa(self.unifrac_dm).samples
+        rng = np.random.default_rng(42)
+        groupings = np.array([rng.permutation([0, 0, 0, 0, 1, 1, 1, 2, 2])
+                              for _ in range(10)])
+        for test in 'centroid', 'median':
+            exp = [_compute_groups(samples, test, grouping)
+                   for grouping in groupings]
+            for num_threads in 1, 3:
+                obs = _compute_groups_batch(samples.values, test, 3,
+                                            num_threads, groupings)
+                npt.assert_almost_equal(obs, exp)
+
+        # F statistic of the distances to the centroids
+        grouping = groupings[0]
+        data = samples.values
+        dists = [np.linalg.norm(data[grouping == i] -
+                                data[grouping == i].mean(axis=0), axis=1)
+                 for i in range(3)]
+        self.assertAlmostEqual(
+            _compute_groups(samples, 'centroid', grouping),
+            f_oneway(*dists)[0])
+
     def test_confirm_betadispr_results(self):
         mp_dm = DistanceMatrix.read(get_data_path('moving_pictures_dm.tsv'))
         mp_mf = pd.read_csv(get_data_path('moving_pictures_mf.tsv'), sep='\t')
@@ -277,6 +318,21 @@ class testPERMDISP(TestCase):
 
         self.assert_series_equal(exp_cen_mp, obs_cen_mp)
 
+    def test_seed(self):
+        grouping = ['Control', 'Control', 'Control', 'Control', 'Control',
+                    'Fast', 'Fast', 'Fast', 'Fast']
+        obs1 = permdisp(self.unifrac_dm, grouping, test='centroid',
+                        permutations=99, seed=42)
+        obs2 = permdisp(self.unifrac_dm, grouping, test='centroid',
+                        permutations=99, seed=42, n_jobs=2, batch_size=7)
+        self.assert_series_equal(obs1, obs2)
+
+        # the input ordination is not modified
+        ordination = pcoa(self.unifrac_dm)
+        columns = list(ordination.samples.columns)
+        permdisp(ordination, grouping, permutations=9, n_jobs=2)
+        self.assertEqual(list(ordination.samples.columns), columns)
+
     def test_call_via_series(self):
         # test https://github.com/scikit-bio/scikit-bio/issues/1877
         # actual issue is with _base._preprocess_input_sng but permdisp is
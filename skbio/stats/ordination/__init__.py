@@ -16,6 +16,7 @@ Ordination Functions
    ca
    pcoa
    pcoa_biplot
+   pcoa_project
    cca
    rda
 
@@ -130,7 +131,7 @@ References
 from ._redundancy_analysis import rda
 from ._correspondence_analysis import ca
 from ._canonical_correspondence_analysis import cca
-from ._principal_coordinate_analysis import pcoa, pcoa_biplot
+from ._principal_coordinate_analysis import pcoa, pcoa_biplot, pcoa_project
 from ._ordination_results import OrdinationResults
 from ._utils import (
     mean_and_std,
@@ -148,6 +149,7 @@ __all__ = [
     "cca",
     "pcoa",
     "pcoa_biplot",
+    "pcoa_project",
     "OrdinationResults",
     "mean_and_std",
     "scale",
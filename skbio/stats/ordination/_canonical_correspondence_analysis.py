@@ -8,15 +8,22 @@
 
 import numpy as np
 import pandas as pd
-from scipy.linalg import svd, lstsq
+from scipy.linalg import lstsq
 
 from ._ordination_results import OrdinationResults
-from ._utils import corr, svd_rank, scale
+from ._utils import (
+    corr,
+    svd_rank,
+    scale,
+    _check_svd_method,
+    _ordination_svd,
+    _truncate_axes,
+)
 from skbio.util._decorator import experimental
 
 
 @experimental(as_of="0.4.0")
-def cca(y, x, scaling=1):
+def cca(y, x, scaling=1, method="svd", number_of_dimensions=0):
     r"""Compute canonical (also known as constrained) correspondence analysis.
 
     Canonical (or constrained) correspondence analysis is a
@@ -46,6 +53,21 @@ def cca(y, x, scaling=1):
         Scaling type 2 preserves :math:`\chi^2` distances between columns.
         For a more detailed explanation of the interpretation, check Legendre &
         Legendre 1998, section 9.4.3.
+    method : {'svd', 'fsvd'}, optional
+        Singular value decomposition method. ``'svd'`` (default) decomposes
+        the whole fitted and residual matrices with SciPy's `svd`. ``'fsvd'``
+        computes the first `number_of_dimensions` axes with a randomized,
+        approximate method (see ``pcoa``), which is much faster when few axes
+        are needed from a large table.
+
+        .. versionadded:: 0.6.0
+
+    number_of_dimensions : int, optional
+        Number of axes to return (canonical axes first, then residual axes).
+        If 0 (default), all axes of non-zero eigenvalue are returned. Must be
+        specified with `method` ``'fsvd'``.
+
+        .. versionadded:: 0.6.0
 
     Returns
     -------
@@ -58,6 +80,7 @@ def cca(y, x, scaling=1):
         If `x` and `y` have different number of rows
         If `y` contains negative values
         If `y` contains a row of only 0's.
+        If `number_of_dimensions` is negative, or is 0 with `method` ``'fsvd'``.
     NotImplementedError
         If scaling is not 1 or 2.
 
@@ -119,6 +142,7 @@ def cca(y, x, scaling=1):
         )
     if scaling not in {1, 2}:
         raise NotImplementedError("Scaling {0} not implemented.".format(scaling))
+    _check_svd_method(method, number_of_dimensions)
 
     # Step 1 (similar to Pearson chi-square statistic)
     grand_total = Y.sum()
@@ -146,7 +170,7 @@ def cca(y, x, scaling=1):
     Y_res = Q_bar - Y_hat
 
     # Step 4. Eigenvalue decomposition
-    u, s, vt = svd(Y_hat, full_matrices=False)
+    u, s, vt = _ordination_svd(Y_hat, method, number_of_dimensions)
     rank = svd_rank(Y_hat.shape, s)
     s = s[:rank]
     u = u[:, :rank]
@@ -157,7 +181,7 @@ def cca(y, x, scaling=1):
     U_hat = Q_bar.dot(U) * s**-1
 
     # Residuals analysis
-    u_res, s_res, vt_res = svd(Y_res, full_matrices=False)
+    u_res, s_res, vt_res = _ordination_svd(Y_res, method, number_of_dimensions - rank)
     rank = svd_rank(Y_res.shape, s_res)
     s_res = s_res[:rank]
     u_res = u_res[:, :rank]
@@ -224,7 +248,14 @@ def cca(y, x, scaling=1):
         sample_constraints, index=sample_ids, columns=pc_ids
     )
 
-    return OrdinationResults(
+    if method == "svd":
+        total_inertia = eigvals.sum()
+    else:
+        # The eigenvalues of the fitted values and of the residuals sum to the
+        # total inertia
+        total_inertia = (Q_bar**2).sum()
+
+    ordination = OrdinationResults(
         "CCA",
         "Canonical Correspondence Analysis",
         eigvals,
@@ -232,5 +263,10 @@ def cca(y, x, scaling=1):
         features=features,
         biplot_scores=biplot_scores,
         sample_constraints=sample_constraints,
-        proportion_explained=eigvals / eigvals.sum(),
+        proportion_explained=eigvals / total_inertia,
     )
+    if number_of_dimensions:
+        # With method 'svd', all axes were computed (and taken into account in
+        # the proportions explained)
+        _truncate_axes(ordination, number_of_dimensions)
+    return ordination
@@ -8,15 +8,16 @@
 
 import numpy as np
 import pandas as pd
-from scipy.linalg import svd
+from scipy.sparse import issparse
+from scipy.sparse.linalg import LinearOperator
 
 from ._ordination_results import OrdinationResults
-from ._utils import svd_rank
+from ._utils import svd_rank, _check_svd_method, _ordination_svd
 from skbio.util._decorator import experimental
 
 
 @experimental(as_of="0.4.0")
-def ca(X, scaling=1):
+def ca(X, scaling=1, method="svd", number_of_dimensions=0):
     r"""Compute correspondence analysis.
 
     Correspondence analysis is a multivariate statistical technique for ordination.
@@ -38,7 +39,9 @@ def ca(X, scaling=1):
         Samples by features table (n, m). It can be applied to different kinds
         of data tables but data must be non-negative and dimensionally
         homogeneous (quantitative or binary). The rows correspond to the
-        samples and the columns correspond to the features.
+        samples and the columns correspond to the features. If all its columns
+        are sparse (i.e., have a ``pd.SparseDtype``), the table is kept sparse
+        with `method` ``'fsvd'``.
     scaling : {1, 2}
         For a more detailed explanation of the interpretation, check Legendre &
         Legendre 1998, section 9.4.3. The notes that follow are quick
@@ -65,6 +68,20 @@ def ca(X, scaling=1):
         far from its edges will probably exhibit better relationships than
         features either in the center (may be multimodal features, not related
         to the shown ordination axes...) or the edges (sparse features...).
+    method : {'svd', 'fsvd'}, optional
+        Singular value decomposition method. ``'svd'`` (default) decomposes
+        the whole matrix with SciPy's `svd`. ``'fsvd'`` computes the first
+        `number_of_dimensions` axes with a randomized, approximate method
+        (see ``pcoa``), which is much faster when few axes are needed from a
+        large table.
+
+        .. versionadded:: 0.6.0
+
+    number_of_dimensions : int, optional
+        Number of axes to return. If 0 (default), all axes of non-zero
+        eigenvalue are returned. Must be specified with `method` ``'fsvd'``.
+
+        .. versionadded:: 0.6.0
 
     Returns
     -------
@@ -79,6 +96,8 @@ def ca(X, scaling=1):
         If the scaling value is not either `1` or `2`.
     ValueError
         If any of the input matrix elements are negative.
+    ValueError
+        If `number_of_dimensions` is negative, or is 0 with `method` ``'fsvd'``.
 
     See Also
     --------
@@ -91,6 +110,12 @@ def ca(X, scaling=1):
     The algorithm is based on [1]_, \S 9.4.1., and is expected to give the same
     results as ``cca(X)`` in R's package vegan.
 
+    With `method` ``'fsvd'``, only the products of the matrix of
+    contributions to the :math:`\chi^2` statistic (Eq. 9.32 in [1]_) with
+    blocks of vectors are computed, directly from `X`, without building this
+    matrix. Proportions explained are relative to the total inertia, which is
+    computed from `X` as well.
+
     References
     ----------
     .. [1] Legendre P. and Legendre L. 1998. Numerical Ecology. Elsevier,
@@ -99,6 +124,7 @@ def ca(X, scaling=1):
     """
     if scaling not in {1, 2}:
         raise NotImplementedError("Scaling {0} not implemented.".format(scaling))
+    _check_svd_method(method, number_of_dimensions)
 
     short_method_name = "CA"
     long_method_name = "Correspondance Analysis"
@@ -107,7 +133,10 @@ def ca(X, scaling=1):
     # to perform operations on the matrix
     row_ids = X.index
     column_ids = X.columns
-    X = np.asarray(X.values, dtype=np.float64)
+    if method == "fsvd" and hasattr(X, "sparse"):
+        X = X.sparse.to_coo().tocsr().astype(np.float64)
+    else:
+        X = np.asarray(X.values, dtype=np.float64)
 
     # Correspondance Analysis
     r, c = X.shape
@@ -119,21 +148,32 @@ def ca(X, scaling=1):
     grand_total = X.sum()
     Q = X / grand_total
 
-    column_marginals = Q.sum(axis=0)
-    row_marginals = Q.sum(axis=1)
+    column_marginals = np.asarray(Q.sum(axis=0)).ravel()
+    row_marginals = np.asarray(Q.sum(axis=1)).ravel()
+
+    if method == "svd":
+        # Formula 9.32 in Lagrange & Lagrange (1998). Notice that it's
+        # an scaled version of the contribution of each cell towards
+        # Pearson chi-square statistic.
+        expected = np.outer(row_marginals, column_marginals)
+        Q_bar = (Q - expected) / np.sqrt(expected)  # Eq. 9.32
 
-    # Formula 9.32 in Lagrange & Lagrange (1998). Notice that it's
-    # an scaled version of the contribution of each cell towards
-    # Pearson chi-square statistic.
-    expected = np.outer(row_marginals, column_marginals)
-    Q_bar = (Q - expected) / np.sqrt(expected)  # Eq. 9.32
+        total_inertia = (Q_bar**2).sum()
+    else:
+        Q_bar, total_inertia = _chi_square_contributions(
+            Q, row_marginals, column_marginals
+        )
 
     # Step 2 (Singular Value Decomposition)
-    U_hat, W, Ut = svd(Q_bar, full_matrices=False)
+    U_hat, W, Ut = _ordination_svd(
+        Q_bar, method, min(number_of_dimensions, min(r, c) - 1)
+    )
     # Due to the centering, there are at most min(r, c) - 1 non-zero
     # eigenvalues (which are all positive)
     rank = svd_rank(Q_bar.shape, W)
     assert rank <= min(r, c) - 1
+    if number_of_dimensions:
+        rank = min(rank, number_of_dimensions)
     U_hat = U_hat[:, :rank]
     W = W[:rank]
     U = Ut[:rank].T
@@ -188,7 +228,7 @@ def ca(X, scaling=1):
     )
     samples = pd.DataFrame(sample_scores, row_ids, sample_columns)
     features = pd.DataFrame(features_scores, column_ids, feature_columns)
-    proportion_explained = eigvals / eigvals.sum()
+    proportion_explained = eigvals / total_inertia
     return OrdinationResults(
         short_method_name,
         long_method_name,
@@ -197,3 +237,66 @@ def ca(X, scaling=1):
         features=features,
         proportion_explained=proportion_explained,
     )
+
+
+def _chi_square_contributions(Q, row_marginals, column_marginals):
+    """Represent the matrix of contributions to the chi-square statistic.
+
+    Parameters
+    ----------
+    Q : np.ndarray or scipy.sparse matrix
+        Table of relative frequencies.
+    row_marginals, column_marginals : np.ndarray
+        Sums of the rows and columns of `Q`.
+
+    Returns
+    -------
+    scipy.sparse.linalg.LinearOperator
+        Operator multiplying (blocks of) vectors by the matrix Q_bar of Eq.
+        9.32 in Legendre & Legendre (1998).
+    float
+        Total inertia, i.e., sum of the squared elements of Q_bar.
+
+    Notes
+    -----
+    With D_r and D_c the diagonal matrices of the row and column marginals
+    and r and c the vectors of their square roots,
+    Q_bar = D_r^{-1/2} Q D_c^{-1/2} - rc', which is computed without
+    building the dense matrix, and whose squared elements sum to
+    sum(Q^2 / rc') - 1.
+
+    """
+    row_weights = row_marginals**-0.5
+    column_weights = column_marginals**-0.5
+    row_roots = np.sqrt(row_marginals)
+    column_roots = np.sqrt(column_marginals)
+
+    def matmat(V):
+        V = np.asarray(V).reshape(len(column_marginals), -1)
+        out = row_weights[:, None] * (Q @ (column_weights[:, None] * V))
+        out -= np.outer(row_roots, column_roots @ V)
+        return out
+
+    def rmatmat(V):
+        V = np.asarray(V).reshape(len(row_marginals), -1)
+        out = column_weights[:, None] * (Q.T @ (row_weights[:, None] * V))
+        out -= np.outer(column_roots, row_roots @ V)
+        return out
+
+    operator = LinearOperator(
+        Q.shape,
+        matvec=lambda v: matmat(v)[:, 0],
+        rmatvec=lambda v: rmatmat(v)[:, 0],
+        matmat=matmat,
+        rmatmat=rmatmat,
+        dtype=Q.dtype,
+    )
+
+    if issparse(Q):
+        Q = Q.tocoo()
+        contributions = Q.data**2 / (row_marginals[Q.row] * column_marginals[Q.col])
+    else:
+        contributions = Q**2 / np.outer(row_marginals, column_marginals)
+    total_inertia = contributions.sum() - 1
+
+    return operator, total_inertia
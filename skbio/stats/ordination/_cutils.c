@@ -6,7 +6,12 @@
         "depends": [],
         "extra_compile_args": [
             "-I.",
-            "-openmp:experimental"
+            "-fopenmp-simd",
+            "-DSIMDE_ENABLE_OPENMP",
+            "-fopenmp"
+        ],
+        "extra_link_args": [
+            "-fopenmp"
         ],
         "name": "skbio.stats.ordination._cutils",
         "sources": [
@@ -1469,7 +1474,7 @@ static const char *__pyx_filename;
 /* #### Code section: filename_table ### */
 
 static const char *__pyx_f[] = {
-  "skbio\\\\stats\\\\ordination\\\\_cutils.pyx",
+  "skbio/stats/ordination/_cutils.pyx",
   "<stringsource>",
 };
 /* #### Code section: utility_code_proto_before_types ### */
@@ -2795,10 +2800,10 @@ static int __Pyx_ValidateAndInit_memviewslice(
                 PyObject *original_obj);
 
 /* ObjectToMemviewSlice.proto */
-static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_float(PyObject *, int writable_flag);
+static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_float__const__(PyObject *, int writable_flag);
 
 /* ObjectToMemviewSlice.proto */
-static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_double(PyObject *, int writable_flag);
+static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_double__const__(PyObject *, int writable_flag);
 
 /* ObjectToMemviewSlice.proto */
 static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_dc_float(PyObject *, int writable_flag);
@@ -2806,13 +2811,25 @@ static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_dc_flo
 /* ObjectToMemviewSlice.proto */
 static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_dc_double(PyObject *, int writable_flag);
 
+/* ObjectToMemviewSlice.proto */
+static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_float(PyObject *, int writable_flag);
+
+/* ObjectToMemviewSlice.proto */
+static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_double(PyObject *, int writable_flag);
+
 /* PyUCS4InUnicode.proto */
 static CYTHON_INLINE int __Pyx_UnicodeContainsUCS4(PyObject* unicode, Py_UCS4 character);
 
+/* MemviewDtypeToObject.proto */
+static CYTHON_INLINE PyObject *__pyx_memview_get_float__const__(const char *itemp);
+
 /* MemviewDtypeToObject.proto */
 static CYTHON_INLINE PyObject *__pyx_memview_get_float(const char *itemp);
 static CYTHON_INLINE int __pyx_memview_set_float(const char *itemp, PyObject *obj);
 
+/* MemviewDtypeToObject.proto */
+static CYTHON_INLINE PyObject *__pyx_memview_get_double__const__(const char *itemp);
+
 /* MemviewDtypeToObject.proto */
 static CYTHON_INLINE PyObject *__pyx_memview_get_double(const char *itemp);
 static CYTHON_INLINE int __pyx_memview_set_double(const char *itemp, PyObject *obj);
@@ -2954,6 +2971,8 @@ static void __pyx_memoryview_slice_assign_scalar(__Pyx_memviewslice *, int, size
 static void __pyx_memoryview__slice_assign_scalar(char *, Py_ssize_t *, Py_ssize_t *, int, size_t, void *); /*proto*/
 static PyObject *__pyx_unpickle_Enum__set_state(struct __pyx_MemviewEnum_obj *, PyObject *); /*proto*/
 /* #### Code section: typeinfo ### */
+static __Pyx_TypeInfo __Pyx_TypeInfo_float__const__ = { "const float", NULL, sizeof(float const ), { 0 }, 0, 'R', 0, 0 };
+static __Pyx_TypeInfo __Pyx_TypeInfo_double__const__ = { "const double", NULL, sizeof(double const ), { 0 }, 0, 'R', 0, 0 };
 static __Pyx_TypeInfo __Pyx_TypeInfo_float = { "float", NULL, sizeof(float), { 0 }, 0, 'R', 0, 0 };
 static __Pyx_TypeInfo __Pyx_TypeInfo_double = { "double", NULL, sizeof(double), { 0 }, 0, 'R', 0, 0 };
 /* #### Code section: before_global_var ### */
@@ -3137,7 +3156,7 @@ static const char __pyx_k_Out_of_bounds_on_buffer_access_a[] = "Out of bounds on
 static const char __pyx_k_Unable_to_convert_item_to_object[] = "Unable to convert item to object";
 static const char __pyx_k_got_differing_extents_in_dimensi[] = "got differing extents in dimension ";
 static const char __pyx_k_no_default___reduce___due_to_non[] = "no default __reduce__ due to non-trivial __cinit__";
-static const char __pyx_k_skbio_stats_ordination__cutils_p[] = "skbio\\stats\\ordination\\_cutils.pyx";
+static const char __pyx_k_skbio_stats_ordination__cutils_p[] = "skbio/stats/ordination/_cutils.pyx";
 static const char __pyx_k_unable_to_allocate_shape_and_str[] = "unable to allocate shape and strides.";
 /* #### Code section: decls ### */
 static int __pyx_array___pyx_pf_15View_dot_MemoryView_5array___cinit__(struct __pyx_array_obj *__pyx_v_self, PyObject *__pyx_v_shape, Py_ssize_t __pyx_v_itemsize, PyObject *__pyx_v_format, PyObject *__pyx_v_mode, int __pyx_v_allocate_buffer); /* proto */
@@ -17790,7 +17809,7 @@ static PyObject *__pyx_unpickle_Enum__set_state(struct __pyx_MemviewEnum_obj *__
  * 
  * @cython.boundscheck(False)             # <<<<<<<<<<<<<<
  * @cython.wraparound(False)
- * def e_matrix_means_cy(TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
+ * def e_matrix_means_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
  */
 
 /* Python wrapper */
@@ -18140,7 +18159,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_e_matrix_means_cy(
           case 0x75:
           break;
           case 0x66:
-          __pyx_t_4 = ((sizeof(float)) == __pyx_v_itemsize);
+          __pyx_t_4 = ((sizeof(float const )) == __pyx_v_itemsize);
           if (__pyx_t_4) {
           } else {
             __pyx_t_2 = __pyx_t_4;
@@ -18157,7 +18176,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_e_matrix_means_cy(
             if (unlikely((__Pyx_SetItemInt(__pyx_v_dest_sig, 0, __pyx_n_s_float, long, 1, __Pyx_PyInt_From_long, 1, 0, 0) < 0))) __PYX_ERR(0, 17, __pyx_L1_error)
             goto __pyx_L10_break;
           }
-          __pyx_t_4 = ((sizeof(double)) == __pyx_v_itemsize);
+          __pyx_t_4 = ((sizeof(double const )) == __pyx_v_itemsize);
           if (__pyx_t_4) {
           } else {
             __pyx_t_2 = __pyx_t_4;
@@ -18208,13 +18227,13 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_e_matrix_means_cy(
         } else {
         }
         __pyx_t_5 = __Pyx_PyMemoryView_Get_itemsize(__pyx_v_arg_as_memoryview); if (unlikely(__pyx_t_5 == ((Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 17, __pyx_L24_except_error)
-        __pyx_t_4 = (__pyx_t_5 == (sizeof(float)));
+        __pyx_t_4 = (__pyx_t_5 == (sizeof(float const )));
         if (!__pyx_t_4) {
         } else {
           goto __pyx_L32_next_and;
         }
         __pyx_L33_next_or:;
-        __pyx_t_4 = (__pyx_v_itemsize == (sizeof(float)));
+        __pyx_t_4 = (__pyx_v_itemsize == (sizeof(float const )));
         if (__pyx_t_4) {
         } else {
           __pyx_t_2 = __pyx_t_4;
@@ -18226,7 +18245,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_e_matrix_means_cy(
         __pyx_t_2 = __pyx_t_4;
         __pyx_L31_bool_binop_done:;
         if (__pyx_t_2) {
-          __pyx_t_12 = __Pyx_PyObject_to_MemoryviewSlice_d_dc_float(__pyx_v_arg_as_memoryview, 0); 
+          __pyx_t_12 = __Pyx_PyObject_to_MemoryviewSlice_d_dc_float__const__(__pyx_v_arg_as_memoryview, 0); 
           __pyx_v_memslice = __pyx_t_12;
           __pyx_t_2 = (__pyx_v_memslice.memview != 0);
           if (__pyx_t_2) {
@@ -18244,13 +18263,13 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_e_matrix_means_cy(
         } else {
         }
         __pyx_t_5 = __Pyx_PyMemoryView_Get_itemsize(__pyx_v_arg_as_memoryview); if (unlikely(__pyx_t_5 == ((Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 17, __pyx_L24_except_error)
-        __pyx_t_4 = (__pyx_t_5 == (sizeof(double)));
+        __pyx_t_4 = (__pyx_t_5 == (sizeof(double const )));
         if (!__pyx_t_4) {
         } else {
           goto __pyx_L38_next_and;
         }
         __pyx_L39_next_or:;
-        __pyx_t_4 = (__pyx_v_itemsize == (sizeof(double)));
+        __pyx_t_4 = (__pyx_v_itemsize == (sizeof(double const )));
         if (__pyx_t_4) {
         } else {
           __pyx_t_2 = __pyx_t_4;
@@ -18262,7 +18281,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_e_matrix_means_cy(
         __pyx_t_2 = __pyx_t_4;
         __pyx_L37_bool_binop_done:;
         if (__pyx_t_2) {
-          __pyx_t_12 = __Pyx_PyObject_to_MemoryviewSlice_d_dc_double(__pyx_v_arg_as_memoryview, 0); 
+          __pyx_t_12 = __Pyx_PyObject_to_MemoryviewSlice_d_dc_double__const__(__pyx_v_arg_as_memoryview, 0); 
           __pyx_v_memslice = __pyx_t_12;
           __pyx_t_2 = (__pyx_v_memslice.memview != 0);
           if (__pyx_t_2) {
@@ -18806,7 +18825,7 @@ static PyObject *__pyx_fuse_0__pyx_pw_5skbio_5stats_10ordination_7_cutils_7e_mat
       values[1] = __Pyx_Arg_VARARGS(__pyx_args, 1);
       values[2] = __Pyx_Arg_VARARGS(__pyx_args, 2);
     }
-    __pyx_v_mat = __Pyx_PyObject_to_MemoryviewSlice_d_dc_float(values[0], PyBUF_WRITABLE); if (unlikely(!__pyx_v_mat.memview)) __PYX_ERR(0, 19, __pyx_L3_error)
+    __pyx_v_mat = __Pyx_PyObject_to_MemoryviewSlice_d_dc_float__const__(values[0], 0); if (unlikely(!__pyx_v_mat.memview)) __PYX_ERR(0, 19, __pyx_L3_error)
     __pyx_v_centered = __Pyx_PyObject_to_MemoryviewSlice_d_dc_float(values[1], PyBUF_WRITABLE); if (unlikely(!__pyx_v_centered.memview)) __PYX_ERR(0, 19, __pyx_L3_error)
     __pyx_v_row_means = __Pyx_PyObject_to_MemoryviewSlice_dc_float(values[2], PyBUF_WRITABLE); if (unlikely(!__pyx_v_row_means.memview)) __PYX_ERR(0, 19, __pyx_L3_error)
   }
@@ -19092,7 +19111,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_6e_matrix_means_cy
  */
                               __pyx_t_8 = __pyx_v_row;
                               __pyx_t_9 = __pyx_v_col;
-                              __pyx_v_el0 = (*((float *) ( /* dim=1 */ ((char *) (((float *) ( /* dim=0 */ (__pyx_v_mat.data + __pyx_t_8 * __pyx_v_mat.strides[0]) )) + __pyx_t_9)) )));
+                              __pyx_v_el0 = (*((float const  *) ( /* dim=1 */ ((char *) (((float const  *) ( /* dim=0 */ (__pyx_v_mat.data + __pyx_t_8 * __pyx_v_mat.strides[0]) )) + __pyx_t_9)) )));
 
                               /* "skbio/stats/ordination/_cutils.pyx":63
  *         for col in range(n_samples):
@@ -19174,7 +19193,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_6e_matrix_means_cy
                             goto __pyx_L12;
                             __pyx_L12:;
                             #ifdef _OPENMP
-                            #pragma omp critical(__pyx_parallel_lastprivates2)
+                            #pragma omp critical(__pyx_parallel_lastprivates0)
                             #endif /* _OPENMP */
                             {
                                 __pyx_parallel_temp0 = __pyx_v_col;
@@ -19304,7 +19323,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_6e_matrix_means_cy
  * 
  * @cython.boundscheck(False)             # <<<<<<<<<<<<<<
  * @cython.wraparound(False)
- * def e_matrix_means_cy(TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
+ * def e_matrix_means_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
  */
 
   /* function exit code */
@@ -19395,7 +19414,7 @@ static PyObject *__pyx_fuse_1__pyx_pw_5skbio_5stats_10ordination_7_cutils_9e_mat
       values[1] = __Pyx_Arg_VARARGS(__pyx_args, 1);
       values[2] = __Pyx_Arg_VARARGS(__pyx_args, 2);
     }
-    __pyx_v_mat = __Pyx_PyObject_to_MemoryviewSlice_d_dc_double(values[0], PyBUF_WRITABLE); if (unlikely(!__pyx_v_mat.memview)) __PYX_ERR(0, 19, __pyx_L3_error)
+    __pyx_v_mat = __Pyx_PyObject_to_MemoryviewSlice_d_dc_double__const__(values[0], 0); if (unlikely(!__pyx_v_mat.memview)) __PYX_ERR(0, 19, __pyx_L3_error)
     __pyx_v_centered = __Pyx_PyObject_to_MemoryviewSlice_d_dc_double(values[1], PyBUF_WRITABLE); if (unlikely(!__pyx_v_centered.memview)) __PYX_ERR(0, 19, __pyx_L3_error)
     __pyx_v_row_means = __Pyx_PyObject_to_MemoryviewSlice_dc_double(values[2], PyBUF_WRITABLE); if (unlikely(!__pyx_v_row_means.memview)) __PYX_ERR(0, 19, __pyx_L3_error)
   }
@@ -19681,7 +19700,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_8e_matrix_means_cy
  */
                               __pyx_t_8 = __pyx_v_row;
                               __pyx_t_9 = __pyx_v_col;
-                              __pyx_v_el0 = (*((double *) ( /* dim=1 */ ((char *) (((double *) ( /* dim=0 */ (__pyx_v_mat.data + __pyx_t_8 * __pyx_v_mat.strides[0]) )) + __pyx_t_9)) )));
+                              __pyx_v_el0 = (*((double const  *) ( /* dim=1 */ ((char *) (((double const  *) ( /* dim=0 */ (__pyx_v_mat.data + __pyx_t_8 * __pyx_v_mat.strides[0]) )) + __pyx_t_9)) )));
 
                               /* "skbio/stats/ordination/_cutils.pyx":63
  *         for col in range(n_samples):
@@ -19763,7 +19782,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_8e_matrix_means_cy
                             goto __pyx_L12;
                             __pyx_L12:;
                             #ifdef _OPENMP
-                            #pragma omp critical(__pyx_parallel_lastprivates3)
+                            #pragma omp critical(__pyx_parallel_lastprivates1)
                             #endif /* _OPENMP */
                             {
                                 __pyx_parallel_temp0 = __pyx_v_col;
@@ -19893,7 +19912,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_8e_matrix_means_cy
  * 
  * @cython.boundscheck(False)             # <<<<<<<<<<<<<<
  * @cython.wraparound(False)
- * def e_matrix_means_cy(TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
+ * def e_matrix_means_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
  */
 
   /* function exit code */
@@ -21670,7 +21689,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_14f_matrix_inplace
  * 
  * @cython.boundscheck(False)             # <<<<<<<<<<<<<<
  * @cython.wraparound(False)
- * def center_distance_matrix_cy(TReal[:, ::1] mat, TReal[:, ::1] centered):
+ * def center_distance_matrix_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered):
  */
 
 /* Python wrapper */
@@ -22020,7 +22039,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_4center_distance_m
           case 0x75:
           break;
           case 0x66:
-          __pyx_t_4 = ((sizeof(float)) == __pyx_v_itemsize);
+          __pyx_t_4 = ((sizeof(float const )) == __pyx_v_itemsize);
           if (__pyx_t_4) {
           } else {
             __pyx_t_2 = __pyx_t_4;
@@ -22037,7 +22056,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_4center_distance_m
             if (unlikely((__Pyx_SetItemInt(__pyx_v_dest_sig, 0, __pyx_n_s_float, long, 1, __Pyx_PyInt_From_long, 1, 0, 0) < 0))) __PYX_ERR(0, 121, __pyx_L1_error)
             goto __pyx_L10_break;
           }
-          __pyx_t_4 = ((sizeof(double)) == __pyx_v_itemsize);
+          __pyx_t_4 = ((sizeof(double const )) == __pyx_v_itemsize);
           if (__pyx_t_4) {
           } else {
             __pyx_t_2 = __pyx_t_4;
@@ -22088,13 +22107,13 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_4center_distance_m
         } else {
         }
         __pyx_t_5 = __Pyx_PyMemoryView_Get_itemsize(__pyx_v_arg_as_memoryview); if (unlikely(__pyx_t_5 == ((Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 121, __pyx_L24_except_error)
-        __pyx_t_4 = (__pyx_t_5 == (sizeof(float)));
+        __pyx_t_4 = (__pyx_t_5 == (sizeof(float const )));
         if (!__pyx_t_4) {
         } else {
           goto __pyx_L32_next_and;
         }
         __pyx_L33_next_or:;
-        __pyx_t_4 = (__pyx_v_itemsize == (sizeof(float)));
+        __pyx_t_4 = (__pyx_v_itemsize == (sizeof(float const )));
         if (__pyx_t_4) {
         } else {
           __pyx_t_2 = __pyx_t_4;
@@ -22106,7 +22125,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_4center_distance_m
         __pyx_t_2 = __pyx_t_4;
         __pyx_L31_bool_binop_done:;
         if (__pyx_t_2) {
-          __pyx_t_12 = __Pyx_PyObject_to_MemoryviewSlice_d_dc_float(__pyx_v_arg_as_memoryview, 0); 
+          __pyx_t_12 = __Pyx_PyObject_to_MemoryviewSlice_d_dc_float__const__(__pyx_v_arg_as_memoryview, 0); 
           __pyx_v_memslice = __pyx_t_12;
           __pyx_t_2 = (__pyx_v_memslice.memview != 0);
           if (__pyx_t_2) {
@@ -22124,13 +22143,13 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_4center_distance_m
         } else {
         }
         __pyx_t_5 = __Pyx_PyMemoryView_Get_itemsize(__pyx_v_arg_as_memoryview); if (unlikely(__pyx_t_5 == ((Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 121, __pyx_L24_except_error)
-        __pyx_t_4 = (__pyx_t_5 == (sizeof(double)));
+        __pyx_t_4 = (__pyx_t_5 == (sizeof(double const )));
         if (!__pyx_t_4) {
         } else {
           goto __pyx_L38_next_and;
         }
         __pyx_L39_next_or:;
-        __pyx_t_4 = (__pyx_v_itemsize == (sizeof(double)));
+        __pyx_t_4 = (__pyx_v_itemsize == (sizeof(double const )));
         if (__pyx_t_4) {
         } else {
           __pyx_t_2 = __pyx_t_4;
@@ -22142,7 +22161,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_4center_distance_m
         __pyx_t_2 = __pyx_t_4;
         __pyx_L37_bool_binop_done:;
         if (__pyx_t_2) {
-          __pyx_t_12 = __Pyx_PyObject_to_MemoryviewSlice_d_dc_double(__pyx_v_arg_as_memoryview, 0); 
+          __pyx_t_12 = __Pyx_PyObject_to_MemoryviewSlice_d_dc_double__const__(__pyx_v_arg_as_memoryview, 0); 
           __pyx_v_memslice = __pyx_t_12;
           __pyx_t_2 = (__pyx_v_memslice.memview != 0);
           if (__pyx_t_2) {
@@ -22672,7 +22691,7 @@ static PyObject *__pyx_fuse_0__pyx_pw_5skbio_5stats_10ordination_7_cutils_19cent
       values[0] = __Pyx_Arg_VARARGS(__pyx_args, 0);
       values[1] = __Pyx_Arg_VARARGS(__pyx_args, 1);
     }
-    __pyx_v_mat = __Pyx_PyObject_to_MemoryviewSlice_d_dc_float(values[0], PyBUF_WRITABLE); if (unlikely(!__pyx_v_mat.memview)) __PYX_ERR(0, 123, __pyx_L3_error)
+    __pyx_v_mat = __Pyx_PyObject_to_MemoryviewSlice_d_dc_float__const__(values[0], 0); if (unlikely(!__pyx_v_mat.memview)) __PYX_ERR(0, 123, __pyx_L3_error)
     __pyx_v_centered = __Pyx_PyObject_to_MemoryviewSlice_d_dc_float(values[1], PyBUF_WRITABLE); if (unlikely(!__pyx_v_centered.memview)) __PYX_ERR(0, 123, __pyx_L3_error)
   }
   goto __pyx_L6_skip;
@@ -22898,7 +22917,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_18center_distance_
  */
   __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_e_matrix_means_cy); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 161, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
-  __pyx_t_3 = __pyx_memoryview_fromslice(__pyx_v_mat, 2, (PyObject *(*)(char *)) __pyx_memview_get_float, (int (*)(char *, PyObject *)) __pyx_memview_set_float, 0);; if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 161, __pyx_L1_error)
+  __pyx_t_3 = __pyx_memoryview_fromslice(__pyx_v_mat, 2, (PyObject *(*)(char *)) __pyx_memview_get_float__const__, (int (*)(char *, PyObject *)) NULL, 0);; if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 161, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
   __pyx_t_2 = __pyx_memoryview_fromslice(__pyx_v_centered, 2, (PyObject *(*)(char *)) __pyx_memview_get_float, (int (*)(char *, PyObject *)) __pyx_memview_set_float, 0);; if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 161, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
@@ -22979,7 +22998,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_18center_distance_
  * 
  * @cython.boundscheck(False)             # <<<<<<<<<<<<<<
  * @cython.wraparound(False)
- * def center_distance_matrix_cy(TReal[:, ::1] mat, TReal[:, ::1] centered):
+ * def center_distance_matrix_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered):
  */
 
   /* function exit code */
@@ -23067,7 +23086,7 @@ static PyObject *__pyx_fuse_1__pyx_pw_5skbio_5stats_10ordination_7_cutils_21cent
       values[0] = __Pyx_Arg_VARARGS(__pyx_args, 0);
       values[1] = __Pyx_Arg_VARARGS(__pyx_args, 1);
     }
-    __pyx_v_mat = __Pyx_PyObject_to_MemoryviewSlice_d_dc_double(values[0], PyBUF_WRITABLE); if (unlikely(!__pyx_v_mat.memview)) __PYX_ERR(0, 123, __pyx_L3_error)
+    __pyx_v_mat = __Pyx_PyObject_to_MemoryviewSlice_d_dc_double__const__(values[0], 0); if (unlikely(!__pyx_v_mat.memview)) __PYX_ERR(0, 123, __pyx_L3_error)
     __pyx_v_centered = __Pyx_PyObject_to_MemoryviewSlice_d_dc_double(values[1], PyBUF_WRITABLE); if (unlikely(!__pyx_v_centered.memview)) __PYX_ERR(0, 123, __pyx_L3_error)
   }
   goto __pyx_L6_skip;
@@ -23293,7 +23312,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_20center_distance_
  */
   __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_e_matrix_means_cy); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 161, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
-  __pyx_t_3 = __pyx_memoryview_fromslice(__pyx_v_mat, 2, (PyObject *(*)(char *)) __pyx_memview_get_double, (int (*)(char *, PyObject *)) __pyx_memview_set_double, 0);; if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 161, __pyx_L1_error)
+  __pyx_t_3 = __pyx_memoryview_fromslice(__pyx_v_mat, 2, (PyObject *(*)(char *)) __pyx_memview_get_double__const__, (int (*)(char *, PyObject *)) NULL, 0);; if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 161, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_3);
   __pyx_t_2 = __pyx_memoryview_fromslice(__pyx_v_centered, 2, (PyObject *(*)(char *)) __pyx_memview_get_double, (int (*)(char *, PyObject *)) __pyx_memview_set_double, 0);; if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 161, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
@@ -23374,7 +23393,7 @@ static PyObject *__pyx_pf_5skbio_5stats_10ordination_7_cutils_20center_distance_
  * 
  * @cython.boundscheck(False)             # <<<<<<<<<<<<<<
  * @cython.wraparound(False)
- * def center_distance_matrix_cy(TReal[:, ::1] mat, TReal[:, ::1] centered):
+ * def center_distance_matrix_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered):
  */
 
   /* function exit code */
@@ -24596,7 +24615,7 @@ static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
  * 
  * @cython.boundscheck(False)             # <<<<<<<<<<<<<<
  * @cython.wraparound(False)
- * def e_matrix_means_cy(TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
+ * def e_matrix_means_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
  */
   __pyx_tuple__11 = PyTuple_Pack(1, __pyx_kp_s_No_matching_signature_found); if (unlikely(!__pyx_tuple__11)) __PYX_ERR(0, 17, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_tuple__11);
@@ -24711,7 +24730,7 @@ static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
  * 
  * @cython.boundscheck(False)             # <<<<<<<<<<<<<<
  * @cython.wraparound(False)
- * def e_matrix_means_cy(TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
+ * def e_matrix_means_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
  */
   __pyx_tuple__24 = PyTuple_Pack(14, __pyx_n_s_mat, __pyx_n_s_centered, __pyx_n_s_row_means, __pyx_n_s_n_samples, __pyx_n_s_d2, __pyx_n_s_d3, __pyx_n_s_d4, __pyx_n_s_d5, __pyx_n_s_row, __pyx_n_s_col, __pyx_n_s_row_sum, __pyx_n_s_el0, __pyx_n_s_global_sum, __pyx_n_s_global_mean); if (unlikely(!__pyx_tuple__24)) __PYX_ERR(0, 17, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_tuple__24);
@@ -24735,7 +24754,7 @@ static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
  * 
  * @cython.boundscheck(False)             # <<<<<<<<<<<<<<
  * @cython.wraparound(False)
- * def center_distance_matrix_cy(TReal[:, ::1] mat, TReal[:, ::1] centered):
+ * def center_distance_matrix_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered):
  */
   __pyx_tuple__28 = PyTuple_Pack(10, __pyx_n_s_mat, __pyx_n_s_centered, __pyx_n_s_n_samples, __pyx_n_s_d2, __pyx_n_s_d3, __pyx_n_s_d4, __pyx_n_s_global_mean, __pyx_n_s_dtype_real, __pyx_n_s_row_means_np, __pyx_n_s_row_means); if (unlikely(!__pyx_tuple__28)) __PYX_ERR(0, 121, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_tuple__28);
@@ -25820,7 +25839,7 @@ if (!__Pyx_RefNanny) {
  * 
  * @cython.boundscheck(False)             # <<<<<<<<<<<<<<
  * @cython.wraparound(False)
- * def e_matrix_means_cy(TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
+ * def e_matrix_means_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
  */
   __pyx_t_7 = __Pyx_PyDict_NewPresized(2); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 17, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_7);
@@ -25888,7 +25907,7 @@ if (!__Pyx_RefNanny) {
  * 
  * @cython.boundscheck(False)             # <<<<<<<<<<<<<<
  * @cython.wraparound(False)
- * def center_distance_matrix_cy(TReal[:, ::1] mat, TReal[:, ::1] centered):
+ * def center_distance_matrix_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered):
  */
   __pyx_t_7 = __Pyx_PyDict_NewPresized(2); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 121, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_7);
@@ -32253,7 +32272,7 @@ no_fail:
 }
 
 /* ObjectToMemviewSlice */
-  static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_float(PyObject *obj, int writable_flag) {
+  static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_float__const__(PyObject *obj, int writable_flag) {
     __Pyx_memviewslice result = { 0, 0, { 0 }, { 0 }, { 0 } };
     __Pyx_BufFmt_StackElem stack[1];
     int axes_specs[] = { (__Pyx_MEMVIEW_DIRECT | __Pyx_MEMVIEW_FOLLOW), (__Pyx_MEMVIEW_DIRECT | __Pyx_MEMVIEW_CONTIG) };
@@ -32264,7 +32283,7 @@ no_fail:
     }
     retcode = __Pyx_ValidateAndInit_memviewslice(axes_specs, __Pyx_IS_C_CONTIG,
                                                  (PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) | writable_flag, 2,
-                                                 &__Pyx_TypeInfo_float, stack,
+                                                 &__Pyx_TypeInfo_float__const__, stack,
                                                  &result, obj);
     if (unlikely(retcode == -1))
         goto __pyx_fail;
@@ -32276,7 +32295,7 @@ __pyx_fail:
 }
 
 /* ObjectToMemviewSlice */
-  static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_double(PyObject *obj, int writable_flag) {
+  static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_double__const__(PyObject *obj, int writable_flag) {
     __Pyx_memviewslice result = { 0, 0, { 0 }, { 0 }, { 0 } };
     __Pyx_BufFmt_StackElem stack[1];
     int axes_specs[] = { (__Pyx_MEMVIEW_DIRECT | __Pyx_MEMVIEW_FOLLOW), (__Pyx_MEMVIEW_DIRECT | __Pyx_MEMVIEW_CONTIG) };
@@ -32287,7 +32306,7 @@ __pyx_fail:
     }
     retcode = __Pyx_ValidateAndInit_memviewslice(axes_specs, __Pyx_IS_C_CONTIG,
                                                  (PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) | writable_flag, 2,
-                                                 &__Pyx_TypeInfo_double, stack,
+                                                 &__Pyx_TypeInfo_double__const__, stack,
                                                  &result, obj);
     if (unlikely(retcode == -1))
         goto __pyx_fail;
@@ -32344,6 +32363,52 @@ __pyx_fail:
     return result;
 }
 
+/* ObjectToMemviewSlice */
+  static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_float(PyObject *obj, int writable_flag) {
+    __Pyx_memviewslice result = { 0, 0, { 0 }, { 0 }, { 0 } };
+    __Pyx_BufFmt_StackElem stack[1];
+    int axes_specs[] = { (__Pyx_MEMVIEW_DIRECT | __Pyx_MEMVIEW_FOLLOW), (__Pyx_MEMVIEW_DIRECT | __Pyx_MEMVIEW_CONTIG) };
+    int retcode;
+    if (obj == Py_None) {
+        result.memview = (struct __pyx_memoryview_obj *) Py_None;
+        return result;
+    }
+    retcode = __Pyx_ValidateAndInit_memviewslice(axes_specs, __Pyx_IS_C_CONTIG,
+                                                 (PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) | writable_flag, 2,
+                                                 &__Pyx_TypeInfo_float, stack,
+                                                 &result, obj);
+    if (unlikely(retcode == -1))
+        goto __pyx_fail;
+    return result;
+__pyx_fail:
+    result.memview = NULL;
+    result.data = NULL;
+    return result;
+}
+
+/* ObjectToMemviewSlice */
+  static CYTHON_INLINE __Pyx_memviewslice __Pyx_PyObject_to_MemoryviewSlice_d_dc_double(PyObject *obj, int writable_flag) {
+    __Pyx_memviewslice result = { 0, 0, { 0 }, { 0 }, { 0 } };
+    __Pyx_BufFmt_StackElem stack[1];
+    int axes_specs[] = { (__Pyx_MEMVIEW_DIRECT | __Pyx_MEMVIEW_FOLLOW), (__Pyx_MEMVIEW_DIRECT | __Pyx_MEMVIEW_CONTIG) };
+    int retcode;
+    if (obj == Py_None) {
+        result.memview = (struct __pyx_memoryview_obj *) Py_None;
+        return result;
+    }
+    retcode = __Pyx_ValidateAndInit_memviewslice(axes_specs, __Pyx_IS_C_CONTIG,
+                                                 (PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) | writable_flag, 2,
+                                                 &__Pyx_TypeInfo_double, stack,
+                                                 &result, obj);
+    if (unlikely(retcode == -1))
+        goto __pyx_fail;
+    return result;
+__pyx_fail:
+    result.memview = NULL;
+    result.data = NULL;
+    return result;
+}
+
 /* PyUCS4InUnicode */
   #if PY_VERSION_HEX < 0x03090000 || (defined(PyUnicode_WCHAR_KIND) && defined(PyUnicode_AS_UNICODE))
 #if PY_VERSION_HEX < 0x03090000
@@ -32413,6 +32478,11 @@ static CYTHON_INLINE int __Pyx_UnicodeContainsUCS4(PyObject* unicode, Py_UCS4 ch
 #endif
 }
 
+/* MemviewDtypeToObject */
+  static CYTHON_INLINE PyObject *__pyx_memview_get_float__const__(const char *itemp) {
+    return (PyObject *) PyFloat_FromDouble(*(float const  *) itemp);
+}
+
 /* MemviewDtypeToObject */
   static CYTHON_INLINE PyObject *__pyx_memview_get_float(const char *itemp) {
     return (PyObject *) PyFloat_FromDouble(*(float *) itemp);
@@ -32425,6 +32495,11 @@ static CYTHON_INLINE int __pyx_memview_set_float(const char *itemp, PyObject *ob
     return 1;
 }
 
+/* MemviewDtypeToObject */
+  static CYTHON_INLINE PyObject *__pyx_memview_get_double__const__(const char *itemp) {
+    return (PyObject *) PyFloat_FromDouble(*(double const  *) itemp);
+}
+
 /* MemviewDtypeToObject */
   static CYTHON_INLINE PyObject *__pyx_memview_get_double(const char *itemp) {
     return (PyObject *) PyFloat_FromDouble(*(double *) itemp);
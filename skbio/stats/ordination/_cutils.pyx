@@ -16,7 +16,7 @@ ctypedef fused TReal:
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def e_matrix_means_cy(TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
+def e_matrix_means_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered, TReal[::1] row_means):
     """
     Compute E matrix from a distance matrix, and 
     also compute the means in the process.
@@ -120,7 +120,7 @@ def f_matrix_inplace_cy(TReal[::1] row_means, TReal global_mean, TReal[:, ::1] c
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def center_distance_matrix_cy(TReal[:, ::1] mat, TReal[:, ::1] centered):
+def center_distance_matrix_cy(const TReal[:, ::1] mat, TReal[:, ::1] centered):
     """
     Centers a distance matrix.
 
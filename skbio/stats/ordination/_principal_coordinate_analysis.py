@@ -8,16 +8,19 @@
 
 import numpy as np
 import pandas as pd
-from numpy import dot, hstack
-from numpy.linalg import qr, svd
-from numpy.random import standard_normal
 from scipy.linalg import eigh
 from warnings import warn
 
 from skbio.stats.distance import DistanceMatrix
 from skbio.util._decorator import experimental
 from ._ordination_results import OrdinationResults
-from ._utils import center_distance_matrix, scale
+from ._utils import (
+    center_distance_matrix,
+    scale,
+    _centered_distance_operator,
+    _e_matrix_row_means,
+    _randomized_svd,
+)
 
 
 @experimental(as_of="0.4.0")
@@ -51,6 +54,8 @@ def pcoa(distance_matrix, method="eigh", number_of_dimensions=0, inplace=False):
         eigenvectors and eigenvalues for all dimensions. The alternate
         method, `fsvd`, uses faster heuristic eigendecomposition but loses
         accuracy. The magnitude of accuracy lost is dependent on dataset.
+        `fsvd` never builds the centered distance matrix (see Notes), and is
+        therefore suited to very large distance matrices.
     number_of_dimensions : int, optional
         Dimensions to reduce the distance matrix to. This number determines
         how many eigenvectors and eigenvalues will be returned.
@@ -68,7 +73,9 @@ def pcoa(distance_matrix, method="eigh", number_of_dimensions=0, inplace=False):
         specified `distance_matrix`.
     inplace : bool, optional
         If true, centers a distance matrix in-place in a manner that reduces
-        memory consumption.
+        memory consumption. Ignored if the distances are read-only, or if they
+        are not stored as a square matrix in memory and `method` is `fsvd`
+        (see Notes).
 
     Returns
     -------
@@ -92,11 +99,33 @@ def pcoa(distance_matrix, method="eigh", number_of_dimensions=0, inplace=False):
         appear, allowing the user to decide if they can be safely
         ignored.
 
+    Computations are performed in the floating point type of
+    `distance_matrix`, so that a ``float32`` distance matrix takes half the
+    memory (at the cost of precision).
+
+    With `fsvd`, if the distance matrix is stored in condensed form (see
+    ``DistanceMatrix``) or read from a file on demand (see
+    ``skbio.io.format.binary_dm``), the centered distance matrix is not
+    built: the products with blocks of vectors required by the algorithm are
+    computed from blocks of rows of the distance matrix, which are squared
+    and centered on the fly. Only one block of rows is in memory at a time in
+    addition to the stored distances. This takes several times longer than
+    multiplying by a centered square matrix, which is done otherwise.
+
     """
-    distance_matrix = DistanceMatrix(distance_matrix)
+    if not isinstance(distance_matrix, DistanceMatrix):
+        distance_matrix = DistanceMatrix(distance_matrix)
 
-    # Center distance matrix, a requirement for PCoA here
-    matrix_data = center_distance_matrix(distance_matrix.data, inplace=inplace)
+    if method == "fsvd" and (distance_matrix.condensed or distance_matrix._lazy):
+        # Center distance matrix blocks on demand, rather than expanding (or
+        # loading) the whole matrix
+        matrix_data, trace = _centered_distance_operator(distance_matrix)
+    else:
+        # Center distance matrix, a requirement for PCoA here
+        data = distance_matrix.data
+        inplace = inplace and data.flags.writeable
+        matrix_data = center_distance_matrix(data, inplace=inplace)
+        trace = np.trace(matrix_data)
 
     # If no dimension specified, by default will compute all eigenvectors
     # and eigenvalues
@@ -184,7 +213,7 @@ def pcoa(distance_matrix, method="eigh", number_of_dimensions=0, inplace=False):
         # An alternative method of calculating th sum of eigenvalues is by
         # computing the trace of the centered distance matrix.
         # See proof outlined here: https://goo.gl/VAYiXx
-        sum_eigenvalues = np.trace(matrix_data)
+        sum_eigenvalues = trace
     else:
         # Calculate proportions the usual way
         sum_eigenvalues = np.sum(eigvals)
@@ -228,9 +257,11 @@ def _fsvd(centered_distance_matrix, number_of_dimensions=10):
 
     Parameters
     ----------
-    centered_distance_matrix : np.array
+    centered_distance_matrix : np.array or scipy.sparse.linalg.LinearOperator
        Numpy matrix representing the distance matrix for which the
-       eigenvectors and eigenvalues shall be computed
+       eigenvectors and eigenvalues shall be computed, or an operator
+       computing its products with matrices. Computations are performed in
+       its ``dtype``.
     number_of_dimensions : int
        Number of dimensions to keep. Must be lower than or equal to the
        rank of the given distance_matrix.
@@ -244,24 +275,14 @@ def _fsvd(centered_distance_matrix, number_of_dimensions=10):
 
     Notes
     -----
-    The algorithm is based on 'An Algorithm for the Principal
-    Component analysis of Large Data Sets'
-    by N. Halko, P.G. Martinsson, Y. Shkolnisky, and M. Tygert.
-    Original Paper: https://arxiv.org/abs/1007.5510
-
-    Ported from MATLAB implementation described here:
+    The decomposition is computed by ``_randomized_svd``, which is shared
+    with the other ordination methods. It was ported from the MATLAB
+    implementation described here:
     https://stats.stackexchange.com/a/11934/211065
 
     """
     m, n = centered_distance_matrix.shape
 
-    # Number of levels of the Krylov method to use.
-    # For most applications, num_levels=1 or num_levels=2 is sufficient.
-    num_levels = 1
-
-    # Changes the power of the spectral norm, thus minimizing the error).
-    use_power_method = False
-
     # Note: a (conjugate) transpose is removed for performance, since we
     # only expect square matrices.
     if m != n:
@@ -282,54 +303,10 @@ def _fsvd(centered_distance_matrix, number_of_dimensions=10):
             "dimensionality of the given distance matrix?"
         )
 
-    k = number_of_dimensions + 2
-
-    # Form a real nxl matrix G whose entries are independent, identically
-    # distributed Gaussian random variables of zero mean and unit variance
-    G = standard_normal(size=(n, k))
-
-    if use_power_method:
-        # use only the given exponent
-        H = dot(centered_distance_matrix, G)
-
-        for x in range(2, num_levels + 2):
-            # enhance decay of singular values
-            # note: distance_matrix is no longer transposed, saves work
-            # since we're expecting symmetric, square matrices anyway
-            # (Daniel McDonald's changes)
-            H = dot(centered_distance_matrix, dot(centered_distance_matrix, H))
-
-    else:
-        # compute the m x l matrices H^{(0)}, ..., H^{(i)}
-        # Note that this is done implicitly in each iteration below.
-        H = dot(centered_distance_matrix, G)
-        # to enhance performance
-        H = hstack((H, dot(centered_distance_matrix, dot(centered_distance_matrix, H))))
-        for x in range(3, num_levels + 2):
-            tmp = dot(centered_distance_matrix, dot(centered_distance_matrix, H))
-
-            H = hstack(
-                (H, dot(centered_distance_matrix, dot(centered_distance_matrix, tmp)))
-            )
-
-    # Using the pivoted QR-decomposition, form a real m * ((i+1)l) matrix Q
-    # whose columns are orthonormal, s.t. there exists a real
-    # ((i+1)l) * ((i+1)l) matrix R for which H = QR
-    Q, R = qr(H)
-
-    # Compute the n * ((i+1)l) product matrix T = A^T Q
-    T = dot(centered_distance_matrix, Q)  # step 3
-
-    # Form an SVD of T
-    Vt, St, W = svd(T, full_matrices=False)
-    W = W.transpose()
-
-    # Compute the m * ((i+1)l) product matrix
-    Ut = dot(Q, W)
-
-    U_fsvd = Ut[:, :number_of_dimensions]
-
-    S = St[:number_of_dimensions]
+    # The centered distance matrix is symmetric, so its singular vectors are
+    # eigenvectors, and its singular values are the absolute values of its
+    # eigenvalues
+    U_fsvd, S, _ = _randomized_svd(centered_distance_matrix, number_of_dimensions)
 
     # drop imaginary component, if we got one
     # Note:
@@ -406,3 +383,131 @@ def pcoa_biplot(ordination, y):
     ordination.features.fillna(0.0, inplace=True)
 
     return ordination
+
+
+@experimental(as_of="0.6.0")
+def pcoa_project(ordination, distances, distance_matrix=None):
+    r"""Project new samples into an existing PCoA space.
+
+    Computes the coordinates of new samples in the principal coordinates of
+    a set of reference samples from the distances between the new and the
+    reference samples, without recomputing the ordination.
+
+    Parameters
+    ----------
+    ordination : OrdinationResults
+        The principal coordinates analysis of the reference samples (e.g.,
+        computed with ``pcoa``).
+    distances : DataFrame
+        Distances between the new samples (rows) and the reference samples
+        (columns) of dimensions (m, n). The columns must be the sample IDs of
+        `ordination`, in any order.
+    distance_matrix : DistanceMatrix, optional
+        Distance matrix of the reference samples, from which `ordination` was
+        computed. If provided, it is used to center the distances of the new
+        samples exactly (see Notes).
+
+    Returns
+    -------
+    DataFrame
+        Coordinates of the new samples (rows) on the axes of `ordination`
+        (columns).
+
+    See Also
+    --------
+    pcoa
+
+    Notes
+    -----
+    The new samples are added to the ordination as described by Gower [1]_
+    (a.k.a. the Nyström extension): with :math:`\mathbf{d}` the distances
+    between a new sample and the :math:`n` reference samples, its coordinate
+    on an axis of eigenvalue :math:`\lambda` and reference coordinates
+    :math:`\mathbf{x}` is
+
+    .. math::
+
+       y = \frac{1}{\lambda} \mathbf{x}^T \mathbf{b}
+
+    where :math:`\mathbf{b}` is the vector :math:`-\mathbf{d}^2 / 2`,
+    centered with the row means of the reference matrix of squared distances
+    divided by -2 (see ``e_matrix``). Projecting a new sample therefore takes
+    :math:`O(nk)` time for :math:`k` axes.
+
+    The row means are computed from `distance_matrix` if it is provided.
+    Otherwise, they are derived from the squared norms of the reference
+    coordinates, which is exact only if `ordination` retains all the axes of
+    positive eigenvalue and the distances are Euclidean (i.e., there are no
+    negative eigenvalues). Provide `distance_matrix` if `ordination` was
+    computed with a reduced `number_of_dimensions`.
+
+    Projecting a reference sample yields its coordinates in `ordination`.
+    Coordinates on axes of zero eigenvalue are zero.
+
+    References
+    ----------
+    .. [1] Gower, J. C. "Adding a point to vector diagrams in multivariate
+       analysis." Biometrika 55.3 (1968): 582-585.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import pandas as pd
+    >>> from skbio import DistanceMatrix
+    >>> from skbio.stats.ordination import pcoa, pcoa_project
+    >>> dm = DistanceMatrix([[0, 3, 4],
+    ...                      [3, 0, 5],
+    ...                      [4, 5, 0]], ['a', 'b', 'c'])
+    >>> ordination = pcoa(dm)
+
+    Project a new sample (with distances to the reference samples such that
+    it lies in the middle of ``b`` and ``c``):
+
+    >>> distances = pd.DataFrame([[2.5, 2.5, 2.5]], index=['d'],
+    ...                          columns=['a', 'b', 'c'])
+    >>> coords = pcoa_project(ordination, distances)
+    >>> mid = (ordination.samples.loc['b'] + ordination.samples.loc['c']) / 2
+    >>> bool(np.allclose(coords.loc['d'], mid))
+    True
+
+    """
+    if ordination.short_method_name != "" and ordination.short_method_name != "PCoA":
+        raise ValueError("Samples can only be projected into a PCoA space.")
+
+    coordinates = ordination.samples
+    if set(distances.columns) != set(coordinates.index):
+        raise ValueError(
+            "The distances must be to the samples of the ordination, and to all "
+            "of them."
+        )
+    distances = distances.reindex(columns=coordinates.index)
+
+    if distance_matrix is not None:
+        if set(distance_matrix.ids) != set(coordinates.index):
+            raise ValueError(
+                "The distance matrix and the ordination must describe the same samples."
+            )
+        ref_means = pd.Series(
+            _e_matrix_row_means(distance_matrix), index=distance_matrix.ids
+        )
+        ref_means = ref_means.reindex(coordinates.index).values
+    else:
+        # The diagonal of the centered matrix F is -2 times the row means of
+        # E (up to a constant), and is the squared norm of the coordinates.
+        ref_means = -0.5 * np.nansum(np.square(coordinates.values), axis=1)
+
+    # Center -d^2 / 2 like the rows of E are centered in F (Eq. 9.21 in
+    # Legendre & Legendre 1998).
+    b = -0.5 * np.square(distances.values)
+    b -= b.mean(axis=1, keepdims=True)
+    b -= ref_means - ref_means.mean()
+
+    eigvals = ordination.eigvals.values
+    projected = b @ np.nan_to_num(coordinates.values)
+    projected = np.divide(
+        projected, eigvals, out=np.zeros_like(projected), where=eigvals != 0
+    )
+
+    return pd.DataFrame(
+        projected, index=distances.index.copy(), columns=coordinates.columns.copy()
+    )
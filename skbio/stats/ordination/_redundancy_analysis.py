@@ -8,15 +8,22 @@
 
 import numpy as np
 import pandas as pd
-from scipy.linalg import svd, lstsq
+from scipy.linalg import lstsq
 
 from skbio.util._decorator import experimental
 from ._ordination_results import OrdinationResults
-from ._utils import corr, svd_rank, scale
+from ._utils import (
+    corr,
+    svd_rank,
+    scale,
+    _check_svd_method,
+    _ordination_svd,
+    _truncate_axes,
+)
 
 
 @experimental(as_of="0.4.0")
-def rda(y, x, scale_Y=False, scaling=1):
+def rda(y, x, scale_Y=False, scaling=1, method="svd", number_of_dimensions=0):
     r"""Compute redundancy analysis, a type of canonical analysis.
 
     It is related to PCA and multiple regression because the explained
@@ -59,6 +66,21 @@ def rda(y, x, scale_Y=False, scaling=1):
 
         See more details about distance and correlation biplots in
         [1]_, \S 9.1.4.
+    method : {'svd', 'fsvd'}, optional
+        Singular value decomposition method. ``'svd'`` (default) decomposes
+        the whole fitted and residual matrices with SciPy's `svd`. ``'fsvd'``
+        computes the first `number_of_dimensions` axes with a randomized,
+        approximate method (see ``pcoa``), which is much faster when few axes
+        are needed from a large table.
+
+        .. versionadded:: 0.6.0
+
+    number_of_dimensions : int, optional
+        Number of axes to return (canonical axes first, then residual axes).
+        If 0 (default), all axes of non-zero eigenvalue are returned. Must be
+        specified with `method` ``'fsvd'``.
+
+        .. versionadded:: 0.6.0
 
     Returns
     -------
@@ -83,12 +105,19 @@ def rda(y, x, scale_Y=False, scaling=1):
     and `s` is the original eigenvalues. Here we will only return
     the original eigenvalues, as recommended in [1]_.
 
+    With `method` ``'fsvd'``, the eigenvalues of the axes that are not
+    computed are unknown, so the proportions explained are ``np.nan``, unless
+    the returned axes are all the axes of non-zero eigenvalue. The scaling of
+    the scores, which depends on the sum of all squared eigenvalues, is exact.
+
     References
     ----------
     .. [1] Legendre P. and Legendre L. 1998. Numerical
        Ecology. Elsevier, Amsterdam.
 
     """
+    _check_svd_method(method, number_of_dimensions)
+
     Y = y.values
     X = x.values
 
@@ -139,7 +168,7 @@ def rda(y, x, scale_Y=False, scaling=1):
     Y_hat = X.dot(B)
     # Now let's perform PCA on the fitted values from the multiple
     # regression
-    u, s, vt = svd(Y_hat, full_matrices=False)
+    u, s, vt = _ordination_svd(Y_hat, method, number_of_dimensions)
     # vt are the right eigenvectors, which is what we need to
     # perform PCA. That is, we're changing points in Y_hat from the
     # canonical basis to the orthonormal basis given by the right
@@ -163,7 +192,7 @@ def rda(y, x, scale_Y=False, scaling=1):
 
     Y_res = Y - Y_hat
     # PCA on the residuals
-    u_res, s_res, vt_res = svd(Y_res, full_matrices=False)
+    u_res, s_res, vt_res = _ordination_svd(Y_res, method, number_of_dimensions - rank)
     # See 9) in p. 587 in L&L 1998
     rank_res = svd_rank(Y_res.shape, s_res)
     # Theoretically, there're at most min(p, n - 1) non-zero eigenvalues as
@@ -182,7 +211,16 @@ def rda(y, x, scale_Y=False, scaling=1):
     eigvals = pd.Series(
         eigenvalues, index=["RDA%d" % (i + 1) for i in range(len(eigenvalues))]
     )
-    const = np.sum(eigenvalues**2) ** 0.25
+    # The fitted values and the residuals are orthogonal, so the sum of all
+    # their squared singular values is the squared norm of Y
+    sum_squares = np.sum(eigenvalues**2)
+    if method == "svd":
+        const = sum_squares**0.25
+    else:
+        const = np.sum(Y**2) ** 0.25
+        # The sum of all singular values, relative to which the proportions
+        # explained are expressed, is only known if no axis is missing
+        complete = np.isclose(sum_squares, const**4)
     if scaling == 1:
         scaling_factor = const
     elif scaling == 2:
@@ -223,11 +261,15 @@ def rda(y, x, scale_Y=False, scaling=1):
     # scores" from table 11.4 are quite similar to vegan's biplot
     # scores, but they're computed like this:
     # corr(X, F))
+    if method == "svd" or complete:
+        p_explained = eigenvalues / eigenvalues.sum()
+    else:
+        p_explained = np.full(len(eigenvalues), np.nan)
     p_explained = pd.Series(
-        eigenvalues / eigenvalues.sum(),
+        p_explained,
         index=["RDA%d" % (i + 1) for i in range(len(eigenvalues))],
     )
-    return OrdinationResults(
+    ordination = OrdinationResults(
         "RDA",
         "Redundancy Analysis",
         eigvals=eigvals,
@@ -237,3 +279,8 @@ def rda(y, x, scale_Y=False, scaling=1):
         biplot_scores=biplot_scores,
         sample_constraints=sample_constraints,
     )
+    if number_of_dimensions:
+        # With method 'svd', all axes were computed (and taken into account in
+        # the scaling and the proportions explained)
+        _truncate_axes(ordination, number_of_dimensions)
+    return ordination
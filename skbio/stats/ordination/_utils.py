@@ -7,10 +7,18 @@
 # ----------------------------------------------------------------------------
 
 import numpy as np
+from numpy.linalg import qr, svd
+from numpy.random import standard_normal
+import scipy.linalg
+from scipy.sparse.linalg import LinearOperator
 
 from skbio.util._decorator import experimental
 from ._cutils import center_distance_matrix_cy
 
+# Maximum number of bytes of distances processed at once by
+# `_e_matrix_blocks`.
+_BLOCK_SIZE = 2**26
+
 
 @experimental(as_of="0.4.0")
 def mean_and_std(a, axis=None, weights=None, with_mean=True, with_std=True, ddof=0):
@@ -137,7 +145,7 @@ def svd_rank(M_shape, S, tol=None):
     precomputed SVD).
     """
     if tol is None:
-        tol = S.max() * max(M_shape) * np.finfo(S.dtype).eps
+        tol = S.max(initial=0) * max(M_shape) * np.finfo(S.dtype).eps
     return np.sum(S > tol)
 
 
@@ -236,6 +244,237 @@ def center_distance_matrix(distance_matrix, inplace=False):
         return centered
 
 
+def _e_matrix_blocks(distance_matrix):
+    """Yield blocks of rows of the E matrix of a distance matrix.
+
+    Each block is a new array of at most ``_BLOCK_SIZE`` bytes (but at least
+    one row), yielded with the index of its first row.
+
+    """
+    n = distance_matrix.shape[0]
+    columns = np.arange(n)
+    step = max(1, _BLOCK_SIZE // (n * distance_matrix.dtype.itemsize))
+    for start in range(0, n, step):
+        rows = np.arange(start, min(start + step, n))
+        # _submatrix returns a new array, which can be modified
+        block = distance_matrix._submatrix(rows, columns)
+        np.square(block, out=block)
+        block *= -0.5
+        yield start, block
+
+
+def _e_matrix_row_means(distance_matrix):
+    """Compute the row means of the E matrix of a distance matrix."""
+    row_means = np.empty(distance_matrix.shape[0], dtype=distance_matrix.dtype)
+    for start, block in _e_matrix_blocks(distance_matrix):
+        row_means[start : start + block.shape[0]] = block.mean(axis=1)
+    return row_means
+
+
+def _centered_distance_operator(distance_matrix):
+    """Represent a centered distance matrix without building it.
+
+    Parameters
+    ----------
+    distance_matrix : DistanceMatrix
+        Distance matrix, stored in any form (square, condensed or lazily
+        loaded).
+
+    Returns
+    -------
+    scipy.sparse.linalg.LinearOperator
+        Operator multiplying (blocks of) vectors by the centered matrix F
+        (Eq. 9.21 in Legendre & Legendre 1998), in the ``dtype`` of
+        `distance_matrix`.
+    float
+        Trace of F.
+
+    Notes
+    -----
+    With E the matrix of squared distances divided by -2, r its row (and
+    column) means and g its overall mean, F = E - r1' - 1r' + g11', so
+    FX = EX - r(1'X) - 1(r'X) + g1(1'X). E is computed a block of rows at a
+    time (of at most ``_BLOCK_SIZE`` bytes) every time the operator is
+    applied, therefore only a block of E is held in memory at once. E is
+    hollow, so the trace of F is -2 sum(r) + ng = -ng.
+
+    """
+    n = distance_matrix.shape[0]
+    dtype = distance_matrix.dtype
+    row_means = _e_matrix_row_means(distance_matrix)
+    global_mean = row_means.mean()
+
+    def matmat(X):
+        X = np.asarray(X, dtype=dtype)
+        out = np.empty((n, X.shape[1]), dtype=dtype)
+        for start, block in _e_matrix_blocks(distance_matrix):
+            np.dot(block, X, out=out[start : start + block.shape[0]])
+        col_sums = X.sum(axis=0)
+        out -= np.outer(row_means, col_sums)
+        out -= row_means @ X
+        out += global_mean * col_sums
+        return out
+
+    def matvec(x):
+        return matmat(np.reshape(x, (n, 1)))[:, 0]
+
+    # F is symmetric
+    operator = LinearOperator(
+        (n, n),
+        matvec=matvec,
+        rmatvec=matvec,
+        matmat=matmat,
+        rmatmat=matmat,
+        dtype=dtype,
+    )
+    return operator, -n * global_mean
+
+
+def _randomized_svd(matrix, rank, oversampling=2):
+    """Compute the leading singular values and vectors of a matrix.
+
+    Uses the randomized block Krylov method ("FSVD") of Halko et al. (2011),
+    with one level of the Krylov method, which is sufficient for most
+    applications.
+
+    Parameters
+    ----------
+    matrix : np.ndarray, scipy.sparse matrix or LinearOperator
+        Matrix (m, n) to decompose. Only its products (and those of its
+        transpose) with blocks of vectors are computed, in its ``dtype``.
+    rank : int
+        Number of singular values and vectors to compute.
+    oversampling : int, optional
+        Number of random vectors sampled in addition to `rank`. More vectors
+        improve the accuracy of the decomposition (especially when the
+        singular values decay slowly), at the expense of speed.
+
+    Returns
+    -------
+    np.ndarray
+        Left singular vectors (m, rank).
+    np.ndarray
+        Singular values (rank,), in decreasing order.
+    np.ndarray
+        Right singular vectors (rank, n).
+
+    Notes
+    -----
+    The algorithm is based on 'An Algorithm for the Principal
+    Component analysis of Large Data Sets'
+    by N. Halko, P.G. Martinsson, Y. Shkolnisky, and M. Tygert.
+    Original Paper: https://arxiv.org/abs/1007.5510
+
+    """
+    m, n = matrix.shape
+    k = rank + oversampling
+
+    # Form a real n * k matrix G whose entries are independent, identically
+    # distributed Gaussian random variables of zero mean and unit variance
+    G = standard_normal(size=(n, k)).astype(matrix.dtype, copy=False)
+
+    # Compute the m * 2k matrix H = [AG, AA^TAG]
+    H = matrix @ G
+    H = np.hstack((H, matrix @ (matrix.T @ H)))
+
+    # Form a matrix Q whose columns are an orthonormal basis of the range of H
+    Q, _ = qr(H)
+
+    # Compute the SVD of T = A^T Q = V S W^T, so that A ~ Q T^T = (QW) S V^T
+    T = matrix.T @ Q
+    V, S, Wt = svd(T, full_matrices=False)
+    U = Q @ Wt.T
+
+    return U[:, :rank], S[:rank], V[:, :rank].T
+
+
+def _check_svd_method(method, number_of_dimensions):
+    """Validate the SVD method and number of axes of CA, RDA and CCA."""
+    if method not in {"svd", "fsvd"}:
+        raise ValueError("SVD method {} not supported.".format(method))
+    if number_of_dimensions < 0 or (method == "fsvd" and number_of_dimensions == 0):
+        raise ValueError(
+            "number_of_dimensions must be positive (or 0 to return all axes with "
+            "method 'svd')."
+        )
+
+
+def _ordination_svd(matrix, method, number_of_dimensions):
+    """Compute the SVD of a matrix to ordinate with CA, RDA or CCA.
+
+    With method 'svd', the whole thin SVD of `matrix` is computed (whatever
+    `number_of_dimensions`). With method 'fsvd', only (at most)
+    `number_of_dimensions` singular values and vectors are computed, with
+    `_randomized_svd`.
+
+    """
+    if method == "svd":
+        return scipy.linalg.svd(matrix, full_matrices=False)
+    m, n = matrix.shape
+    rank = min(number_of_dimensions, m, n)
+    if rank == 0:
+        return np.empty((m, 0)), np.empty(0), np.empty((0, n))
+    # The spectra of ecological tables often decay slowly, hence the
+    # oversampling recommended by Halko et al. (2011)
+    return _randomized_svd(matrix, rank, oversampling=10)
+
+
+def _truncate_axes(ordination, number_of_dimensions):
+    """Keep (in place) the first axes of ordination results."""
+    ordination.eigvals = ordination.eigvals.iloc[:number_of_dimensions]
+    ordination.proportion_explained = ordination.proportion_explained.iloc[
+        :number_of_dimensions
+    ]
+    for attr in "samples", "features", "biplot_scores", "sample_constraints":
+        scores = getattr(ordination, attr)
+        setattr(ordination, attr, scores.iloc[:, :number_of_dimensions])
+    return ordination
+
+
+def _procrustes(reference, coordinates):
+    """Align coordinates to reference coordinates by Procrustes analysis.
+
+    The coordinates are translated, scaled, rotated and possibly reflected
+    to best match the reference, which is left unchanged (unlike
+    ``scipy.spatial.procrustes``, which standardizes both).
+
+    Parameters
+    ----------
+    reference : 2D array_like
+        Reference coordinates, one row per object.
+    coordinates : 2D array_like
+        Coordinates of the same objects, in the same order.
+
+    Returns
+    -------
+    aligned : 2D np.ndarray
+        The coordinates, expressed in the frame of the reference.
+    m_squared : float
+        Procrustes M^2 statistic, i.e., the sum of the squared differences
+        between the two configurations once both are standardized, as
+        returned by ``scipy.spatial.procrustes``.
+
+    """
+    reference = np.asarray(reference, dtype=float)
+    coordinates = np.asarray(coordinates, dtype=float)
+    ref_mean = reference.mean(axis=0)
+    ref = reference - ref_mean
+    coords = coordinates - coordinates.mean(axis=0)
+    ref_ss = (ref**2).sum()
+    coords_ss = (coords**2).sum()
+    if ref_ss == 0 or coords_ss == 0:
+        return np.broadcast_to(ref_mean, coordinates.shape).copy(), 1.0
+
+    # the rotation maximizing the trace of ref.T @ coords @ R, whose maximum
+    # is the sum of the singular values of the cross-product matrix
+    rotation, trace = scipy.linalg.orthogonal_procrustes(coords, ref)
+    aligned = coords @ rotation
+    aligned *= trace / coords_ss
+    aligned += ref_mean
+    m_squared = 1 - trace**2 / (ref_ss * coords_ss)
+    return aligned, max(m_squared, 0.0)
+
+
 def _e_matrix_inplace(distance_matrix):
     """Compute E matrix from a distance matrix inplace.
 
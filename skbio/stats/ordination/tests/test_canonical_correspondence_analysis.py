@@ -171,5 +171,47 @@ class TestCCAResults1(TestCase):
                                         decimal=6)
 
 
+class TestCCAMethods(TestCase):
+    def setUp(self):
+        """varespec and varechem from Väre etal. 1995 DOI: 10.2307/3236351"""
+        self.Y = pd.read_csv(get_data_path('varespec.csv'), index_col=0)
+        self.X = pd.read_csv(get_data_path('varechem.csv'), index_col=0)
+
+    def test_number_of_dimensions(self):
+        exp = cca(self.Y, self.X)
+        for k in 3, 16:
+            obs = cca(self.Y, self.X, number_of_dimensions=k)
+            self.assertEqual(obs.eigvals.shape, (k,))
+            npt.assert_array_equal(obs.eigvals, exp.eigvals.iloc[:k])
+            npt.assert_array_equal(obs.proportion_explained,
+                                   exp.proportion_explained.iloc[:k])
+            for attr in ('samples', 'features', 'biplot_scores',
+                         'sample_constraints'):
+                npt.assert_array_equal(getattr(obs, attr),
+                                       getattr(exp, attr).iloc[:, :k])
+
+    def test_fsvd(self):
+        # all the axes are found exactly
+        for scaling in 1, 2:
+            exp = cca(self.Y, self.X, scaling=scaling)
+            obs = cca(self.Y, self.X, scaling=scaling, method='fsvd',
+                      number_of_dimensions=len(exp.eigvals))
+            assert_ordination_results_equal(obs, exp, decimal=6,
+                                            ignore_directionality=True)
+
+        # proportions explained are relative to the total inertia
+        exp = cca(self.Y, self.X, number_of_dimensions=2)
+        np.random.seed(0)
+        obs = cca(self.Y, self.X, method='fsvd', number_of_dimensions=2)
+        npt.assert_almost_equal(obs.proportion_explained.values,
+                                exp.proportion_explained.values, decimal=2)
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValueError, 'not supported'):
+            cca(self.Y, self.X, method='eigh')
+        with self.assertRaisesRegex(ValueError, 'number_of_dimensions'):
+            cca(self.Y, self.X, number_of_dimensions=-2)
+
+
 if __name__ == '__main__':
     main()
@@ -9,6 +9,7 @@
 import numpy as np
 import numpy.testing as npt
 import pandas as pd
+import pandas.testing as pdt
 from scipy.spatial.distance import pdist
 from unittest import TestCase, main
 
@@ -197,5 +198,54 @@ class TestCAErrors(TestCase):
             ca(pd.DataFrame(X))
 
 
+class TestCAMethods(TestCase):
+    def setUp(self):
+        """varespec from Väre etal. 1995 DOI: 10.2307/3236351"""
+        self.Y = pd.read_csv(get_data_path('varespec.csv'), index_col=0)
+
+    def test_number_of_dimensions(self):
+        exp = ca(self.Y)
+        obs = ca(self.Y, number_of_dimensions=3)
+        self.assertEqual(obs.samples.shape, (24, 3))
+        self.assertEqual(obs.features.shape, (44, 3))
+        pdt.assert_series_equal(obs.eigvals, exp.eigvals.iloc[:3])
+        pdt.assert_series_equal(obs.proportion_explained,
+                                exp.proportion_explained.iloc[:3])
+        pdt.assert_frame_equal(obs.samples, exp.samples.iloc[:, :3])
+        pdt.assert_frame_equal(obs.features, exp.features.iloc[:, :3])
+
+    def test_fsvd(self):
+        # all the axes are found exactly
+        for scaling in 1, 2:
+            exp = ca(self.Y, scaling)
+            obs = ca(self.Y, scaling, method='fsvd',
+                     number_of_dimensions=len(exp.eigvals))
+            assert_ordination_results_equal(obs, exp, decimal=6,
+                                            ignore_directionality=True)
+
+    def test_fsvd_sparse(self):
+        exp = ca(self.Y, method='fsvd', number_of_dimensions=23)
+        Y = self.Y.astype(pd.SparseDtype(float, 0))
+        obs = ca(Y, method='fsvd', number_of_dimensions=23)
+        assert_ordination_results_equal(obs, exp, decimal=6,
+                                        ignore_directionality=True)
+
+        # the total inertia is computed from the sparse table
+        np.random.seed(0)
+        obs = ca(Y, method='fsvd', number_of_dimensions=2)
+        np.random.seed(0)
+        exp = ca(self.Y, method='fsvd', number_of_dimensions=2)
+        assert_ordination_results_equal(obs, exp,
+                                        ignore_directionality=True)
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValueError, 'not supported'):
+            ca(self.Y, method='eigh')
+        with self.assertRaisesRegex(ValueError, 'number_of_dimensions'):
+            ca(self.Y, number_of_dimensions=-1)
+        with self.assertRaisesRegex(ValueError, 'number_of_dimensions'):
+            ca(self.Y, method='fsvd')
+
+
 if __name__ == '__main__':
     main()
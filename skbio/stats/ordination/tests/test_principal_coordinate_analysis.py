@@ -14,7 +14,7 @@ from unittest import TestCase, main
 
 from skbio import DistanceMatrix, OrdinationResults
 from skbio.stats.distance import DissimilarityMatrixError
-from skbio.stats.ordination import pcoa, pcoa_biplot
+from skbio.stats.ordination import pcoa, pcoa_biplot, pcoa_project
 from skbio.util import (get_data_path, assert_ordination_results_equal,
                         assert_data_frame_almost_equal)
 
@@ -68,6 +68,9 @@ class TestPCoA(TestCase):
                                         ignore_directionality=True,
                                         ignore_method_names=True)
 
+        # a square matrix is centered in place
+        npt.assert_array_almost_equal(dm2.data.sum(axis=0), 0)
+
     def test_fsvd(self):
         dm1 = DistanceMatrix.read(get_data_path('PCoA_sample_data_3'))
         dm2 = DistanceMatrix.read(get_data_path('PCoA_sample_data_3'))
@@ -123,6 +126,55 @@ class TestPCoA(TestCase):
                                    r"no value for number_of_dimensions"):
             pcoa(dm_big, method="fsvd", number_of_dimensions=0)
 
+    def test_fsvd_condensed(self):
+        dm = DistanceMatrix.read(get_data_path('PCoA_sample_data_3'))
+        dm_condensed = DistanceMatrix(dm, condensed=True)
+
+        np.random.seed(0)
+        expected_results = pcoa(dm, method="fsvd", number_of_dimensions=3)
+        np.random.seed(0)
+        results = pcoa(dm_condensed, method="fsvd", number_of_dimensions=3)
+
+        assert_ordination_results_equal(results, expected_results,
+                                        ignore_directionality=True)
+
+        # same with a matrix read on demand
+        dm_lazy = DistanceMatrix._from_lazy(dm.data.copy(), dm.ids)
+        np.random.seed(0)
+        results = pcoa(dm_lazy, method="fsvd", number_of_dimensions=3,
+                       inplace=True)
+
+        assert_ordination_results_equal(results, expected_results,
+                                        ignore_directionality=True)
+        npt.assert_array_equal(dm_lazy._data, dm.data)
+
+    def test_single_precision(self):
+        dm = DistanceMatrix.read(get_data_path('PCoA_sample_data_3'))
+        dm_fp32 = DistanceMatrix(dm.data.astype(np.float32), dm.ids)
+
+        for method in "eigh", "fsvd":
+            expected_results = pcoa(dm, method=method,
+                                    number_of_dimensions=3)
+            results = pcoa(dm_fp32, method=method, number_of_dimensions=3)
+
+            self.assertEqual(results.samples.values.dtype, np.float32)
+            assert_ordination_results_equal(results, expected_results,
+                                            ignore_directionality=True,
+                                            decimal=5)
+
+    def test_read_only(self):
+        dm = DistanceMatrix.read(get_data_path('PCoA_sample_data_3'))
+        data = dm.data.copy()
+        data.flags.writeable = False
+        dm_read_only = DistanceMatrix(data, dm.ids, validate=False)
+
+        expected_results = pcoa(dm)
+        results = pcoa(dm_read_only, inplace=True)
+
+        assert_ordination_results_equal(results, expected_results,
+                                        ignore_directionality=True)
+        npt.assert_array_equal(dm_read_only.data, dm.data)
+
     def test_permutted(self):
         dm1 = DistanceMatrix.read(get_data_path('PCoA_sample_data_3'))
         # this should not throw
@@ -313,5 +365,70 @@ class TestPCoABiplot(TestCase):
                                         ignore_method_names=True)
 
 
+class TestPCoAProject(TestCase):
+    def setUp(self):
+        fp = get_data_path('PCoA_sample_data_3')
+        self.dm = DistanceMatrix.read(fp)
+        self.ordination = pcoa(self.dm)
+        self.distances = pd.DataFrame(self.dm.data, index=self.dm.ids,
+                                      columns=self.dm.ids)
+
+    def test_reference_samples(self):
+        # projecting the reference samples gives back their coordinates,
+        # whatever the order of the columns
+        distances = self.distances.iloc[::-1, ::-1]
+        obs = pcoa_project(self.ordination, distances)
+        exp = self.ordination.samples.reindex(distances.index)
+        assert_data_frame_almost_equal(obs, exp)
+
+        obs = pcoa_project(self.ordination, distances, self.dm)
+        assert_data_frame_almost_equal(obs, exp)
+
+    def test_reduced_dimensions(self):
+        ordination = pcoa(self.dm, number_of_dimensions=3)
+        obs = pcoa_project(ordination, self.distances, self.dm)
+        assert_data_frame_almost_equal(obs, ordination.samples)
+
+    def test_euclidean(self):
+        # new points are placed exactly where they belong with respect to
+        # Euclidean reference points
+        rng = np.random.default_rng(0)
+        points = rng.random((10, 3))
+        new_points = rng.random((4, 3))
+        ids = ['r%d' % i for i in range(10)]
+        dm = DistanceMatrix(
+            np.linalg.norm(points[:, None] - points, axis=2), ids)
+        ordination = pcoa(dm, number_of_dimensions=3)
+
+        distances = pd.DataFrame(
+            np.linalg.norm(new_points[:, None] - points, axis=2),
+            index=['n%d' % i for i in range(4)], columns=ids)
+        obs = pcoa_project(ordination, distances).values
+
+        exp = np.linalg.norm(new_points[:, None] - new_points, axis=2)
+        npt.assert_almost_equal(
+            np.linalg.norm(obs[:, None] - obs, axis=2), exp)
+        ref = ordination.samples.values
+        npt.assert_almost_equal(
+            np.linalg.norm(obs[:, None] - ref, axis=2), distances.values)
+
+    def test_zero_eigenvalue(self):
+        obs = pcoa_project(self.ordination, self.distances.iloc[:2])
+        npt.assert_array_equal(obs['PC9'], [0., 0.])
+
+    def test_errors(self):
+        self.ordination.short_method_name = 'CA'
+        with self.assertRaisesRegex(ValueError, 'PCoA space'):
+            pcoa_project(self.ordination, self.distances)
+        self.ordination.short_method_name = 'PCoA'
+
+        with self.assertRaisesRegex(ValueError, 'all of them'):
+            pcoa_project(self.ordination, self.distances.iloc[:, 1:])
+
+        dm = self.dm.filter(self.dm.ids[1:])
+        with self.assertRaisesRegex(ValueError, 'same samples'):
+            pcoa_project(self.ordination, self.distances, dm)
+
+
 if __name__ == "__main__":
     main()
@@ -253,5 +253,52 @@ class TestRDAResults_biplot_score(TestCase):
             decimal=6)
 
 
+class TestRDAMethods(TestCase):
+    def setUp(self):
+        """varespec and varechem from Väre etal. 1995 DOI: 10.2307/3236351"""
+        self.Y = pd.read_csv(get_data_path('varespec.csv'), index_col=0)
+        self.X = pd.read_csv(get_data_path('varechem.csv'), index_col=0)
+
+    def test_number_of_dimensions(self):
+        exp = rda(self.Y, self.X)
+        # 14 canonical axes, then residual axes
+        for k in 3, 16:
+            obs = rda(self.Y, self.X, number_of_dimensions=k)
+            self.assertEqual(obs.eigvals.shape, (k,))
+            npt.assert_array_equal(obs.eigvals, exp.eigvals.iloc[:k])
+            npt.assert_array_equal(obs.proportion_explained,
+                                   exp.proportion_explained.iloc[:k])
+            for attr in ('samples', 'features', 'biplot_scores',
+                         'sample_constraints'):
+                npt.assert_array_equal(getattr(obs, attr),
+                                       getattr(exp, attr).iloc[:, :k])
+
+    def test_fsvd(self):
+        # all the axes are found exactly
+        for scaling in 1, 2:
+            exp = rda(self.Y, self.X, scaling=scaling,
+                      number_of_dimensions=23)
+            obs = rda(self.Y, self.X, scaling=scaling, method='fsvd',
+                      number_of_dimensions=23)
+            assert_ordination_results_equal(obs, exp, decimal=6,
+                                            ignore_directionality=True)
+
+        # the scaling of the scores does not depend on the number of axes
+        # (in scaling 1, the feature scores are unit vectors scaled by it)
+        exp = rda(self.Y, self.X)
+        obs = rda(self.Y, self.X, method='fsvd', number_of_dimensions=2)
+        npt.assert_almost_equal(np.linalg.norm(obs.features, axis=0),
+                                np.linalg.norm(exp.features, axis=0)[:2])
+
+        # the proportions explained by the first axes are not known
+        self.assertTrue(obs.proportion_explained.isna().all())
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValueError, 'not supported'):
+            rda(self.Y, self.X, method='eigh')
+        with self.assertRaisesRegex(ValueError, 'number_of_dimensions'):
+            rda(self.Y, self.X, method='fsvd')
+
+
 if __name__ == '__main__':
     main()
@@ -6,16 +6,21 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
-from unittest import TestCase, main
+from unittest import TestCase, main, mock
 import copy
 
 import numpy as np
 import numpy.testing as npt
+from scipy.spatial import procrustes
 
 from skbio.stats.ordination import corr, mean_and_std, e_matrix, f_matrix, \
     center_distance_matrix
 
-from skbio.stats.ordination._utils import _e_matrix_inplace, _f_matrix_inplace
+from skbio import DistanceMatrix
+from skbio.stats.ordination._utils import (_e_matrix_inplace,
+                                           _f_matrix_inplace,
+                                           _centered_distance_operator,
+                                           _procrustes)
 
 
 class TestUtils(TestCase):
@@ -122,6 +127,62 @@ class TestUtils(TestCase):
         # and ensure that the result of inplace centering was correct
         npt.assert_almost_equal(dm_expected, dm_centered_inp)
 
+    def test_centered_distance_operator(self):
+        exp = center_distance_matrix(self.dist_mat)
+        X = np.arange(8.).reshape(4, 2)
+        for condensed in False, True:
+            dm = DistanceMatrix(self.dist_mat, condensed=condensed)
+            op, trace = _centered_distance_operator(dm)
+            self.assertEqual(op.shape, (4, 4))
+            self.assertEqual(op.dtype, np.float64)
+            npt.assert_almost_equal(op @ X, exp @ X)
+            npt.assert_almost_equal(op @ X[:, 0], exp @ X[:, 0])
+            npt.assert_almost_equal(trace, np.trace(exp))
+
+    def test_centered_distance_operator_blocks(self):
+        exp = center_distance_matrix(self.dist_mat)
+        X = np.arange(8.).reshape(4, 2)
+        dm = DistanceMatrix(self.dist_mat)
+        # one row of distances per block
+        with mock.patch('skbio.stats.ordination._utils._BLOCK_SIZE', 32):
+            op, trace = _centered_distance_operator(dm)
+            npt.assert_almost_equal(op @ X, exp @ X)
+        npt.assert_almost_equal(trace, np.trace(exp))
+
+    def test_centered_distance_operator_single(self):
+        exp = center_distance_matrix(self.dist_mat_fp32)
+        X = np.arange(8., dtype=np.float32).reshape(4, 2)
+        op, trace = _centered_distance_operator(
+            DistanceMatrix(self.dist_mat_fp32))
+        self.assertEqual(op.dtype, np.float32)
+        obs = op @ X
+        self.assertEqual(obs.dtype, np.float32)
+        npt.assert_almost_equal(obs, exp @ X, decimal=5)
+        npt.assert_almost_equal(trace, np.trace(exp), decimal=5)
+
+    def test_procrustes(self):
+        rng = np.random.default_rng(0)
+        ref = rng.normal(size=(20, 3))
+        rotation, _ = np.linalg.qr(rng.normal(size=(3, 3)))
+
+        # an exact similarity transform is undone
+        obs, m_squared = _procrustes(ref, 3 * ref @ rotation - 4)
+        npt.assert_allclose(obs, ref, atol=1e-12)
+        self.assertAlmostEqual(m_squared, 0)
+
+        # M^2 matches scipy, which standardizes both configurations
+        coords = 3 * ref @ rotation + rng.normal(scale=0.1, size=ref.shape)
+        obs, m_squared = _procrustes(ref, coords)
+        self.assertAlmostEqual(m_squared, procrustes(ref, coords)[2])
+        npt.assert_allclose(obs.mean(axis=0), ref.mean(axis=0))
+        self.assertLess(np.abs(obs - ref).max(), 0.2)
+
+    def test_procrustes_degenerate(self):
+        ref = np.arange(6.).reshape(3, 2)
+        obs, m_squared = _procrustes(ref, np.ones((3, 2)))
+        npt.assert_allclose(obs, [[2, 3]] * 3)
+        self.assertEqual(m_squared, 1)
+
 
 if __name__ == '__main__':
     main()
@@ -92,6 +92,25 @@ class SubsampleCountsTests(unittest.TestCase):
             actual.add(tuple(obs))
         self.assertTrue(len(actual) > 1)
 
+    def test_subsample_counts_seed(self):
+        a = np.array([2, 0, 1, 2, 1, 8, 6, 0, 3, 3, 5, 0, 0, 0, 5])
+        for replace in False, True:
+            obs = subsample_counts(a, 20, replace=replace, seed=42)
+            self.assertEqual(obs.sum(), 20)
+            self.assertEqual(obs.shape, a.shape)
+            if not replace:
+                self.assertTrue((obs <= a).all())
+            npt.assert_array_equal(
+                subsample_counts(a, 20, replace=replace, seed=42), obs)
+
+            rng = np.random.default_rng(42)
+            npt.assert_array_equal(
+                subsample_counts(a, 20, replace=replace, seed=rng), obs)
+
+        # Different seeds yield different subsamples.
+        actual = {tuple(subsample_counts(a, 20, seed=i)) for i in range(10)}
+        self.assertTrue(len(actual) > 1)
+
     def test_subsample_counts_invalid_input(self):
         # Negative n.
         with self.assertRaises(ValueError):
@@ -0,0 +1,59 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import os
+
+
+def _available_cpus():
+    """Return the number of CPUs the current process may run on.
+
+    Unlike ``os.cpu_count``, this respects the CPU affinity of the process
+    (e.g., as restricted by a job scheduler), where it is supported.
+
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        # not available on macOS and Windows
+        return os.cpu_count() or 1
+
+
+def _default_num_threads():
+    """Return the number of threads OpenMP uses by default.
+
+    This is the first value of ``OMP_NUM_THREADS`` if it is set, capped by
+    the number of available CPUs, and otherwise the number of available
+    CPUs. It is resolved here rather than by OpenMP, as the compiled kernels
+    allocate their per-thread buffers upfront, and may be built without
+    OpenMP.
+
+    """
+    num_cpus = _available_cpus()
+    try:
+        requested = int(os.environ.get("OMP_NUM_THREADS", "").split(",")[0])
+    except ValueError:
+        return num_cpus
+    if requested < 1:
+        return num_cpus
+    return min(requested, num_cpus)
+
+
+def _get_num_threads(n_jobs):
+    """Resolve the number of threads requested through ``n_jobs``.
+
+    If `n_jobs` is None, the default number of threads of OpenMP is used
+    (see ``_default_num_threads``). If it is -1, all available CPUs are used.
+
+    """
+    if n_jobs is None:
+        return _default_num_threads()
+    if n_jobs == -1:
+        return _available_cpus()
+    if n_jobs < 1:
+        raise ValueError("`n_jobs` must be >= 1 or -1.")
+    return n_jobs
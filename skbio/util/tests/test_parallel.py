@@ -0,0 +1,49 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import os
+import unittest
+from unittest import mock
+
+from skbio.util._parallel import (_available_cpus, _default_num_threads,
+                                  _get_num_threads)
+
+
+class TestParallel(unittest.TestCase):
+    def test_available_cpus(self):
+        obs = _available_cpus()
+        self.assertGreaterEqual(obs, 1)
+        self.assertLessEqual(obs, os.cpu_count())
+
+    def test_default_num_threads(self):
+        with mock.patch('skbio.util._parallel._available_cpus',
+                        return_value=8):
+            for value, exp in (('2', 2), ('3,2', 3), ('16', 8), ('0', 8),
+                               ('', 8), ('abc', 8)):
+                with mock.patch.dict(os.environ, {'OMP_NUM_THREADS': value}):
+                    self.assertEqual(_default_num_threads(), exp)
+
+            with mock.patch.dict(os.environ):
+                os.environ.pop('OMP_NUM_THREADS', None)
+                self.assertEqual(_default_num_threads(), 8)
+
+    def test_get_num_threads(self):
+        with mock.patch('skbio.util._parallel._available_cpus',
+                        return_value=8), \
+                mock.patch.dict(os.environ, {'OMP_NUM_THREADS': '2'}):
+            self.assertEqual(_get_num_threads(None), 2)
+            self.assertEqual(_get_num_threads(-1), 8)
+            self.assertEqual(_get_num_threads(3), 3)
+
+        for n_jobs in 0, -2:
+            with self.assertRaisesRegex(ValueError, 'n_jobs'):
+                _get_num_threads(n_jobs)
+
+
+if __name__ == '__main__':
+    unittest.main()